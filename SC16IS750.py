@@ -21,13 +21,23 @@
 
 # NOTES
 #
-#  - Only I2C is implemented at this point
+#  - I2C natively through SC16IS750I2CDev on /dev/i2c-N, the default when no I2C provider is handed in
+#     (earlier versions imported Adafruit_GPIO.I2C); Adafruit_GPIO.I2C, or any object with its
+#     get_i2c_device() interface, still works as _oExistingI2CInstance.  SPI through SC16IS750SpiTransport
+#     on a spidev style object, handed in as oTransport
+#  - Devices on one bus share one bus lock, keyed by the bus path (/dev/i2c-N), whichever provider they use
+#  - Dual channel SC16IS752/SC16IS762: open channel B with OpenChannel(); the channels share the
+#     device handle, the bus lock and the I/O pins
 #  - Xon Any function (MCR[5]) is not implemented
-#  - Special character (EFR[5]) is not implemented
-#  - Because of I2C use, interrupt support is not implemented
-#  - RS485 support needs expanding on EFCR
-#  - EFCR Transmit and Receive disable flags not implemented
-#  - GPIO interface not yet implemented
+#  - Special character (EFR[5]) is only used for the RS-485 address match (SetRS485Address)
+#  - Interrupts are served in IRQ mode (StartIrqMode) from a pluggable IRQ edge source
+#  - RS-485: auto RTS direction (EFCR[4:5]), 9-bit address frames and hardware address matching;
+#     the EFCR Receive disable flag is only used by the address match
+#  - EFCR Transmit disable flag not implemented
+#  - GPIO: whole port reads and writes (ReadPort / WritePort) and pin change callbacks (WatchPins)
+#     served from the IIR I/O pins interrupt; the modem pins of a channel are not GPIOs while in use
+#  - Many devices on a bus from one worker thread (SC16IS750BusScheduler), and devices on several buses
+#     (SC16IS750BusManager, SC16IS750WorkerPool): see SC16IS750Scheduler.py
 #
 
 
@@ -38,8 +48,16 @@
 
 # -- Frequency of the crystal feeding XTAL
 # !! Crucial for setting baud rate; must match crystal in use !!
+#    (the default for instances; pass iCrystalFreq for boards with another crystal)
 SC16IS750_CRYSTAL_FREQ	= 14745600
 
+# -- Largest relative baud rate error accepted by the divisor solver (the receiver samples mid bit, so
+#     the two ends of a link together must stay well inside half a bit over one character)
+SC16IS750_BAUD_MAX_ERROR	= 0.02
+
+# -- Baud rates solved in advance for every crystal in use
+SC16IS750_STANDARD_BAUDRATES	= ( 300, 600, 1200, 2400, 4800, 9600, 14400, 19200, 28800, 38400, 57600, 76800, 115200, 128000, 153600, 230400, 250000, 256000, 460800, 500000, 576000, 921600, 1000000 )
+
 # -- General Registers
 SC16IS750_REG_RHR		= 0x00	# Receive Holding Register (R)
 SC16IS750_REG_THR		= 0x00	# Transmit Holding Register (W)
@@ -72,10 +90,140 @@ SC16IS750_REG_LCR_0XBF_XON2		= 0x05	# XOff Nr.1 Word (R/W)
 SC16IS750_REG_LCR_0XBF_XOFF1	= 0x06	# XOn Nr.2 Word (R/W)
 SC16IS750_REG_LCR_0XBF_XOFF2	= 0x07	# XOff Nr.2 Word (R/W)
 
+# -- Depth of the receive and the transmit FIFO
+SC16IS750_FIFO_SIZE		= 64
+
+# -- UART channels of the dual channel SC16IS752/SC16IS762, selected by sub-address bits 1-2 - see spec table 33
+SC16IS750_CHANNEL_A		= 0
+SC16IS750_CHANNEL_B		= 1
+SC16IS750_CHANNELS		= 2
+
+# -- I/O pin registers, shared by both channels and always addressed through channel A
+SC16IS750_REG_SHARED	= ( SC16IS750_REG_IODIR, SC16IS750_REG_IOSTATE, SC16IS750_REG_IOINTENA, SC16IS750_REG_IOCONTROL )
+
+# -- IOControl modem pins flag per channel: GPIO[7:4] for channel A at IOControl[1], GPIO[3:0] for channel B at IOControl[2]
+SC16IS750_IOCONTROL_MODEM_PINS	= { SC16IS750_CHANNEL_A:0x02, SC16IS750_CHANNEL_B:0x04 }
+
+# -- I/O pins per chip and the GPIO[n] bits taken by each channel's modem pins
+SC16IS750_GPIO_PINS		= 8
+SC16IS750_GPIO_MODEM_PINS	= { SC16IS750_CHANNEL_A:0xF0, SC16IS750_CHANNEL_B:0x0F }
+
+# -- Pin change directions WatchPins() can report
+SC16IS750_GPIO_EDGES		= ( "rising", "falling", "both" )
+
+# -- Bounds for the sleep between two polls of the FIFO levels, in seconds
+SC16IS750_POLL_MIN_SEC	= 0.0001
+SC16IS750_POLL_MAX_SEC	= 0.05
+
+# -- FCR trigger level bits by FIFO spaces: receive on FCR[7:6], transmit on FCR[5:4] (needs EFR[4]) - see spec tables 11 & 12
+SC16IS750_FCR_RX_TRIGGERS	= { 8:0x00, 16:0x40, 56:0x80, 60:0xC0 }
+SC16IS750_FCR_TX_TRIGGERS	= { 8:0x00, 16:0x10, 32:0x20, 56:0x30 }
+
+# -- LCR line settings: data length on LCR[1:0], stop bits on LCR[2], parity on LCR[5:3] - see spec tables 13, 14 & 15
+SC16IS750_LCR_DATA_BITS		= { 5:0x00, 6:0x01, 7:0x02, 8:0x03 }
+SC16IS750_LCR_STOP_BITS		= { 1:0x00, 2:0x04 }
+SC16IS750_LCR_PARITY		= { 'N':0x00, 'O':0x08, 'E':0x18, 'M':0x28, 'S':0x38 }
+
+# -- EFCR bits - see spec table 32
+SC16IS750_EFCR_9BIT_MODE	= 0x01	# Multidrop (9-bit) mode
+SC16IS750_EFCR_RX_DISABLE	= 0x02	# Receiver disabled
+SC16IS750_EFCR_TX_DISABLE	= 0x04	# Transmitter disabled
+SC16IS750_EFCR_RTS_CONTROL	= 0x10	# Transmitter drives RTS: RS-485 auto direction
+SC16IS750_EFCR_RTS_INVERT	= 0x20	# RTS high (instead of low) while transmitting
+
+# -- EFR[5]: special character detect; in 9-bit mode the receiver matches address bytes against XOFF2
+SC16IS750_EFR_SPECIAL_CHAR	= 0x20
+
+# -- Bus quiet time around RS-485 frames, in characters at the line settings, and its floor
+#     (the Modbus RTU inter-frame gap: 3.5 characters, at least 1.75ms)
+SC16IS750_RS485_TURNAROUND_CHARS	= 3.5
+SC16IS750_RS485_TURNAROUND_MIN_SEC	= 0.00175
+
 # -- Register Bitfield 
 SC16IS750_REG_LSR_FIELDS = { 0:"data-in-receiver", 1:"overrun-error", 2:"parity-error", 3:"framing-error", 4:"break-interrupt", 5:"thr-empty", 6:"thr-tsr-empty", 7:"fifo-data-error" }
 SC16IS750_REG_MSR_FIELDS = { 0:"cts-delta", 1:"dsr-delta", 2:"ri-delta", 3:"cd-delta", 4:"cts-high", 5:"dsr-high", 6:"ri-high", 7:"cd-high" }
 
+# -- Interrupt Enable Register bits - see spec table 19 (IER[7:4] require EFR[4] = 1)
+SC16IS750_IER_RHR		= 0x01	# RX data available / RX time-out
+SC16IS750_IER_THR		= 0x02	# THR empty
+SC16IS750_IER_RLS		= 0x04	# Receive line status
+SC16IS750_IER_MODEM		= 0x08	# Modem status
+SC16IS750_IER_SLEEP		= 0x10	# Sleep mode
+SC16IS750_IER_XOFF		= 0x20	# Xoff received
+SC16IS750_IER_RTS		= 0x40	# RTS change
+SC16IS750_IER_CTS		= 0x80	# CTS change
+SC16IS750_IER_IRQ_DEFAULT	= ( SC16IS750_IER_RHR | SC16IS750_IER_THR | SC16IS750_IER_RLS | SC16IS750_IER_MODEM )
+
+# -- Interrupt Identification Register sources on IIR[5:1], highest priority first - see spec table 23
+SC16IS750_IIR_NO_INTERRUPT	= 0x01	# IIR[0] = 1: no interrupt pending
+SC16IS750_IIR_SOURCE_MASK	= 0x3E
+SC16IS750_IIR_RLS			= 0x06	# Receiver line status error
+SC16IS750_IIR_RX_TIMEOUT	= 0x0C	# Receiver time-out
+SC16IS750_IIR_RHR			= 0x04	# RHR interrupt (RX trigger level reached)
+SC16IS750_IIR_THR			= 0x02	# THR interrupt (TX trigger level / FIFO empty)
+SC16IS750_IIR_MODEM			= 0x00	# Modem status change
+SC16IS750_IIR_IO_PINS		= 0x30	# Input pin change of state
+SC16IS750_IIR_XOFF			= 0x10	# Received Xoff signal / special character
+SC16IS750_IIR_CTS_RTS		= 0x20	# CTS, RTS change of state from active (LOW) to inactive (HIGH)
+
+# -- Service() event names by IIR source, and the register each event hands its callbacks (None: no extra read)
+SC16IS750_IIR_EVENTS = { SC16IS750_IIR_RLS:"line-status", SC16IS750_IIR_RX_TIMEOUT:"rx-timeout", SC16IS750_IIR_RHR:"rx-data", SC16IS750_IIR_THR:"tx-empty", SC16IS750_IIR_MODEM:"modem-status", SC16IS750_IIR_IO_PINS:"io-pins", SC16IS750_IIR_XOFF:"xoff", SC16IS750_IIR_CTS_RTS:"cts-rts" }
+SC16IS750_EVENT_REGISTERS = { "line-status":SC16IS750_REG_LSR, "rx-timeout":SC16IS750_REG_RXLVL, "rx-data":SC16IS750_REG_RXLVL, "tx-empty":SC16IS750_REG_TXLVL, "modem-status":SC16IS750_REG_MSR, "io-pins":SC16IS750_REG_IOSTATE, "xoff":None, "cts-rts":None }
+# -- Events whose register read is what clears the interrupt, so it is read even without callbacks
+SC16IS750_EVENT_CLEARING_READS = ( "line-status", "modem-status", "io-pins" )
+
+# -- SPI: read flag in the register byte - see spec table 32 - and the default clock (SC16IS750/752: 4 MHz, SC16IS760/762: 15 MHz)
+SC16IS750_SPI_READ			= 0x80
+SC16IS750_SPI_MAX_SPEED_HZ	= 4000000
+
+# -- Linux i2c-dev combined transfers, from <linux/i2c-dev.h> and <linux/i2c.h>
+SC16IS750_I2C_RDWR			= 0x0707
+SC16IS750_I2C_M_RD			= 0x0001
+SC16IS750_I2C_RDWR_MAX_MSGS	= 42		# I2C_RDWR_IOCTL_MAX_MSGS
+
+# -- Upper bound on IIR reads per IRQ edge, so a stuck interrupt source cannot hold the IRQ thread
+SC16IS750_IRQ_MAX_PASSES	= 64
+
+# -- Linux GPIO character device (v1 uAPI) requests, from <linux/gpio.h>
+SC16IS750_GPIO_GET_LINEEVENT_IOCTL		= 0xC030B404	# _IOWR(0xB4, 0x04, struct gpioevent_request)
+SC16IS750_GPIOHANDLE_GET_LINE_VALUES_IOCTL	= 0xC040B408	# _IOWR(0xB4, 0x08, struct gpiohandle_data)
+SC16IS750_GPIOHANDLE_REQUEST_INPUT		= 0x01
+SC16IS750_GPIOEVENT_REQUEST_FALLING_EDGE	= 0x02
+SC16IS750_GPIOEVENT_DATA_SIZE			= 16		# struct gpioevent_data { u64 timestamp; u32 id; }
+
+# -- Register banks, selected by the LCR register state
+SC16IS750_BANK_GENERAL		= 0	# LCR[7] = 0
+SC16IS750_BANK_LCR7			= 1	# LCR[7] = 1 & LCR != 0xBF
+SC16IS750_BANK_LCR_0XBF		= 2	# LCR = 0xBF
+
+# -- Host owned registers kept in the register shadow cache, keyed by (bank, register)
+#     The LCR register is reachable from every bank, so it is always keyed in the general bank.
+SC16IS750_REG_CACHE_GENERAL	= ( SC16IS750_REG_IER, SC16IS750_REG_FCR, SC16IS750_REG_LCR, SC16IS750_REG_MCR, SC16IS750_REG_IODIR, SC16IS750_REG_IOINTENA, SC16IS750_REG_IOCONTROL, SC16IS750_REG_EFCR )
+SC16IS750_REG_CACHE_LCR7	= ( SC16IS750_REG_LCR7_DLL, SC16IS750_REG_LCR7_DLH )
+SC16IS750_REG_CACHE_LCR_0XBF	= ( SC16IS750_REG_LCR_0XBF_EFR, SC16IS750_REG_LCR_0XBF_XON1, SC16IS750_REG_LCR_0XBF_XON2, SC16IS750_REG_LCR_0XBF_XOFF1, SC16IS750_REG_LCR_0XBF_XOFF2 )
+# -- Shadow cache keys of the host owned I/O pin registers; a write through one channel updates every channel's copy
+SC16IS750_REG_CACHE_SHARED	= ( (SC16IS750_BANK_GENERAL, SC16IS750_REG_IODIR), (SC16IS750_BANK_GENERAL, SC16IS750_REG_IOINTENA), (SC16IS750_BANK_GENERAL, SC16IS750_REG_IOCONTROL) )
+
+# -- Registers ApplyConfig() modifies rather than overwrites, so their current values must be known
+SC16IS750_REG_CONFIG_BASE_KEYS = ( (SC16IS750_BANK_GENERAL, SC16IS750_REG_IER), (SC16IS750_BANK_GENERAL, SC16IS750_REG_LCR), (SC16IS750_BANK_GENERAL, SC16IS750_REG_MCR), (SC16IS750_BANK_GENERAL, SC16IS750_REG_EFCR), (SC16IS750_BANK_GENERAL, SC16IS750_REG_IOCONTROL), (SC16IS750_BANK_LCR_0XBF, SC16IS750_REG_LCR_0XBF_EFR) )
+
+# -- Register values after a software reset - see spec table 9 (the divisor latches are undefined)
+SC16IS750_REG_RESET_VALUES = {
+	(SC16IS750_BANK_GENERAL, SC16IS750_REG_IER):			0x00,
+	(SC16IS750_BANK_GENERAL, SC16IS750_REG_FCR):			0x00,
+	(SC16IS750_BANK_GENERAL, SC16IS750_REG_LCR):			0x1D,
+	(SC16IS750_BANK_GENERAL, SC16IS750_REG_MCR):			0x00,
+	(SC16IS750_BANK_GENERAL, SC16IS750_REG_IODIR):			0x00,
+	(SC16IS750_BANK_GENERAL, SC16IS750_REG_IOINTENA):		0x00,
+	(SC16IS750_BANK_GENERAL, SC16IS750_REG_IOCONTROL):		0x00,
+	(SC16IS750_BANK_GENERAL, SC16IS750_REG_EFCR):			0x00,
+	(SC16IS750_BANK_LCR_0XBF, SC16IS750_REG_LCR_0XBF_EFR):		0x00,
+	(SC16IS750_BANK_LCR_0XBF, SC16IS750_REG_LCR_0XBF_XON1):		0x00,
+	(SC16IS750_BANK_LCR_0XBF, SC16IS750_REG_LCR_0XBF_XON2):		0x00,
+	(SC16IS750_BANK_LCR_0XBF, SC16IS750_REG_LCR_0XBF_XOFF1):	0x00,
+	(SC16IS750_BANK_LCR_0XBF, SC16IS750_REG_LCR_0XBF_XOFF2):	0x00,
+}
+
 
 
 
@@ -85,1121 +233,4408 @@ SC16IS750_REG_MSR_FIELDS = { 0:"cts-delta", 1:"dsr-delta", 2:"ri-delta", 3:"cd-d
 # ====================================================
 
 # Import core python functions
+import os
+import sys
 import time
-import inspect
+import select
+import ctypes
+import threading
+import itertools
+import contextlib
 
 
 
 
 # ====================================================
-#   S C 1 6 I S 7 5 0   C O M M   I / O
-#      C L A S S   D E F I N I T I O N
+#   E X C E P T I O N S
 # ====================================================
 
-class SC16IS750(object):
-
-#
-# == Class scope variables ==
-#
-	_bPrintDebug = False
-	_oI2CInstance = None
-	_oDeviceInst = None
-	_bBaudSet = False
-	_bLineSet = False
-	_bFlagLockIO = False
-	_hRegLCR = 0x00
-# -- Determine the sleep millisec. based on one chip cycle by the crystal frequency
-	_fSleepMsec = ( ( 1.0 / SC16IS750_CRYSTAL_FREQ ) / 1000.0 )
-# -- Timeout must be >2x chip cycles
-	_iTimeoutLockIOmsec = ( _fSleepMsec * 10.0 )
-
-
-
-#
-# == Class Initialization and Setup ==
-#
-	def __init__(self, hI2CAddress, hI2CBus = 1, _oExistingI2CInstance = None, **kwargs):
-	# -- Setup the Adafruit I2C class if a pointer to one is not provided
-		if _oExistingI2CInstance is None:
-			import Adafruit_GPIO.I2C as oI2C
-			self._oI2CInstance = oI2C
+# -- Base class for errors raised by the driver
+class SC16IS750Error(Exception):
+	pass
 
-	# -- Init the I2C instance for the designated address 
-		self._oDeviceInst = self._oI2CInstance.get_i2c_device(hI2CAddress, **kwargs)
+# -- A host side buffer is full and the caller asked for an error instead of waiting
+class SC16IS750BufferFull(SC16IS750Error):
+	pass
 
-	# -- Issue the UART Software Reset...
-		self.ResetDevice()
 
-	# -- Always return init without a state
-		return
 
 
+# ====================================================
+#   R E G I S T E R   S H A D O W   C A C H E   M A P S
+# ====================================================
 
 #
-# == Enable debug printing ==
+# == Build the register address to shadow cache key lookup for one bank ==
 #
-	def fPrintDebug(self):
-		self._bPrintDebug = True
-		return
+def _BuildRegisterCacheKeys(iBank, bForRead):
+# -- Bank unknown: only the LCR register, which selects the bank, can be keyed
+	if ( iBank == None ):
+		return { SC16IS750_REG_LCR:(SC16IS750_BANK_GENERAL, SC16IS750_REG_LCR) }
 
+# -- Start from the general registers; FCR is write only so reads at its address are IIR
+	_dKeys = {}
+	for _hRegisterAddr in SC16IS750_REG_CACHE_GENERAL:
+		if ( ( bForRead == True ) and ( _hRegisterAddr == SC16IS750_REG_FCR ) ):	continue
+		_dKeys[_hRegisterAddr] = (SC16IS750_BANK_GENERAL, _hRegisterAddr)
 
+# -- Overlay the divisor latches when LCR[7] is set
+	if ( iBank == SC16IS750_BANK_LCR7 ):
+		for _hRegisterAddr in SC16IS750_REG_CACHE_LCR7:
+			_dKeys[_hRegisterAddr] = (SC16IS750_BANK_LCR7, _hRegisterAddr)
 
+# -- Overlay the enhanced registers when LCR = 0xBF; addresses 0x00 & 0x01 are not host owned there
+	elif ( iBank == SC16IS750_BANK_LCR_0XBF ):
+		_dKeys.pop(SC16IS750_REG_IER, None)
+		for _hRegisterAddr in SC16IS750_REG_CACHE_LCR_0XBF:
+			_dKeys[_hRegisterAddr] = (SC16IS750_BANK_LCR_0XBF, _hRegisterAddr)
 
-# ----------------------------------------------------
-#   C L A S S   I N T E R N A L   C H I P
-#      R E G I S T E R   I / O   F U N C T I O N S
-# ----------------------------------------------------
+	return _dKeys
 
-#
-# == Read a register from the chip by address ==
-#
-	def _ReadRegister(self, hRegisterAddr):
-	# -- Test for device instance before attempting use
-		if ( self._oDeviceInst == None ):
-		# -- Device not init'ed properly.  Return None
-			return None
+# -- Lookups per bank, for register writes (includes FCR) and register reads (excludes FCR)
+SC16IS750_REG_CACHE_WRITE_KEYS	= dict( (iBank, _BuildRegisterCacheKeys(iBank, False)) for iBank in (None, SC16IS750_BANK_GENERAL, SC16IS750_BANK_LCR7, SC16IS750_BANK_LCR_0XBF) )
+SC16IS750_REG_CACHE_READ_KEYS	= dict( (iBank, _BuildRegisterCacheKeys(iBank, True)) for iBank in (None, SC16IS750_BANK_GENERAL, SC16IS750_BANK_LCR7, SC16IS750_BANK_LCR_0XBF) )
 
-	# -- Test if IO is not locked -- needed for some reset conditions
-		if ( self._bFlagLockIO == True ):
-		# -- Loop wait wile the lock remains set
-			_iLoopCounter = 0
-			while ( self._bFlagLockIO == True ):
-			# -- Wait one chip cycle
-				time.sleep(self._fSleepMsec)
-				_iLoopCounter += self._fSleepMsec
-			# -- Check if the loop timeout was exceeded
-				if ( ( self._bFlagLockIO == True ) and ( _iLoopCounter >= self._iTimeoutLockIOmsec ) ):
-					if (self._bPrintDebug == True):	print "ReadRegister: I/O Lock timeout exceeded.  Read request aborted."
-					return None
 
-	# -- Shift in the register address three bits - see spec table 33
-	#     bit0: not used		bits1-2: channel select
-	#     bits3-6: register		bit7: not used
-		_hShiftedRegisterAddr = (hRegisterAddr<<3)
 
-	# -- Read the unsigned 8-bit value
-		_hRegReadVal = self._oDeviceInst.readU8(_hShiftedRegisterAddr)
 
-	# -- Print register value if debugging is enabled
-		if (self._bPrintDebug == True):
-			print inspect.stack(context=1)[1]
-			print "Read register " + str(hex(hRegisterAddr)) + "(" + str(bin(hRegisterAddr)) + ") = " + str(hex(_hRegReadVal)) + "(" + str(bin(_hRegReadVal)) + ")"
+# ====================================================
+#   S T A T U S   O B J E C T S
+# ====================================================
 
-	# -- Return the result...
-		return _hRegReadVal
+#
+# == Register flags held as the raw byte; one attribute per bit, named after the field with "_" for "-" ==
+#     Dictionary style access by field name (status['thr-empty'], .get(), .keys(), as_dict()) is kept
+#     for code written against the dictionaries the status functions used to return.
+#
+class SC16IS750RegisterFlags(object):
+	__slots__ = ( "hValue", )
+	_dFields = {}
+	_lFieldNames = ()
 
+	def __init__(self, hValue):
+		self.hValue = hValue
 
+	def __int__(self):
+		return self.hValue
 
-#
-# == Write a value to a register on the chip by address ==
-#
-	def _WriteRegister(self, hRegisterAddr, hValue, bReadVerifyWrite = True):
-	# -- Test for device instance before attempting use
-		if ( self._oDeviceInst == None ):
-		# -- Device not init'ed properly.  Return None
-			return None
+	__index__ = __int__
 
-	# -- Test if IO is not locked -- needed for some reset conditions
-		if ( self._bFlagLockIO == True ):
-		# -- Loop wait wile the lock remains set
-			_iLoopCounter = 0
-			while ( self._bFlagLockIO == True ):
-			# -- Wait one chip cycle
-				time.sleep(self._fSleepMsec)
-				_iLoopCounter += self._fSleepMsec
-			# -- Check if the loop timeout was exceeded
-				if ( ( self._bFlagLockIO == True ) and ( _iLoopCounter >= self._iTimeoutLockIOmsec ) ):
-					if (self._bPrintDebug == True):	print "WriteRegister: I/O Lock timeout exceeded.  Write request aborted."
-					return None
-
-	# -- Shift in the register address three bits - see spec table 33
-	#     bit0: not used		bits1-2: channel select
-	#     bits3-6: register		bit7: not used
-		_hShiftedRegisterAddr = (hRegisterAddr<<3)
-
-	# -- Print register write value if debugging is enabled
-		if (self._bPrintDebug == True):
-			print inspect.stack(context=1)[1]
-			print "Write register " + str(hex(hRegisterAddr)) + "(" + str(bin(hRegisterAddr)) + ") = " + str(hex(hValue)) + "(" + str(bin(hValue)) + ")"
-
-	# -- Write out the unsigned 8-bit value and return the status
-		try:
-			if ( self._oDeviceInst.write8(_hShiftedRegisterAddr, hValue) == False ):	return False
-		except:
-			pass
+	def _FieldNames(self):
+		return self._lFieldNames
 
-	# -- Read the register to verify the write results, if enabled.
-		if ( bReadVerifyWrite == True ):
-			if ( self._ReadRegister(hRegisterAddr) != hValue ):
-				if (self._bPrintDebug == True):	print "!! Register readback validation Failed !! -- Value returned does not match write."
-				return False
+	def _Flag(self, sField):
+		return ( ( self.hValue & self._dFields[sField] ) != 0 )
 
-	# -- If everything worked, return True
-		return True
+	def __getitem__(self, sField):
+		if ( sField not in self._FieldNames() ):
+			raise KeyError(sField)
+		return self._Flag(sField)
 
+	def get(self, sField, bDefault = None):
+		if ( sField not in self._FieldNames() ):
+			return bDefault
+		return self._Flag(sField)
 
+	def __contains__(self, sField):
+		return ( sField in self._FieldNames() )
 
+	def __iter__(self):
+		return iter(self._FieldNames())
 
-# ----------------------------------------------------
-#   C L A S S   I N T E R N A L   F U N C T I O N S
-# ----------------------------------------------------
+	def __len__(self):
+		return len(self._FieldNames())
 
-#
-# == LOCAL: Enable/Disable exposure of the Enhanced Register Set via LCR Register ==
-#
-	def _ExposeEnhancedRegisterSet(self, bExposeRegisterSet):
-	# -- Expose the Register Set
-		if ( (bExposeRegisterSet == True) and (self._hRegLCR == 0x00) ):
-		# -- Read in the current LCR register
-			_hRegLCR = self._ReadRegister(SC16IS750_REG_LCR)
+	def keys(self):
+		return list(self._FieldNames())
 
-		# -- Save the current LCR register state
-			self._hRegLCR = _hRegLCR
+	def items(self):
+		return [ (_sField, self._Flag(_sField)) for _sField in self._FieldNames() ]
 
-		# -- Enable Enhanced Feature Register with LCR = 0xBF
-			if ( self._WriteRegister(SC16IS750_REG_LCR, 0xbf) == False ):	return False
+	def as_dict(self):
+		return dict(self.items())
 
-		elif ( (bExposeRegisterSet == False) and (self._hRegLCR != 0x00) ):
-		# -- Retrieve the prior LCR register state
-			_hRegLCR = self._hRegLCR
-			self._hRegLCR = 0x00
+	def __eq__(self, oOther):
+		if ( isinstance(oOther, dict) ):
+			return ( self.as_dict() == oOther )
+		if ( isinstance(oOther, SC16IS750RegisterFlags) ):
+			return ( ( type(self) == type(oOther) ) and ( self.as_dict() == oOther.as_dict() ) )
+		return NotImplemented
 
-		# -- Restore the LCR Register with to the previous state
-			if ( self._WriteRegister(SC16IS750_REG_LCR, _hRegLCR) == False ):	return False
+	def __ne__(self, oOther):
+		_bEqual = self.__eq__(oOther)
+		if ( _bEqual is NotImplemented ):
+			return _bEqual
+		return ( not _bEqual )
 
-		else:
-		# -- Something was in the wrong state...
-			return False
+	__hash__ = None
 
-	# -- If everything worked, return True
-		return True
+	def __repr__(self):
+		return type(self).__name__ + "(0x%02x: " % self.hValue + ", ".join([ _sField for _sField, _bSet in self.items() if _bSet ]) + ")"
 
 
 
 #
-# == LOCAL: Enable/Disable the Enhanced Functions flag in the EFR register ==
+# == LOCAL: Add the per bit attributes to a flags class ==
 #
-	def _EnableEnhancedFunctionSet(self, bEnableAdvancedSet):
-	# -- Enable Enhanced Register access
-		if ( self._ExposeEnhancedRegisterSet(bExposeRegisterSet = True) == False ):	return False
+def _AddRegisterFlagFields(oClass, dFieldsByBit):
+	oClass._dFields = dict( (sField, (1 << iBit)) for iBit, sField in dFieldsByBit.items() )
+	oClass._lFieldNames = tuple( dFieldsByBit[iBit] for iBit in sorted(dFieldsByBit) )
+	for sField in oClass._lFieldNames:
+		setattr(oClass, sField.replace("-", "_"), property(lambda self, sField = sField: self.get(sField, False)))
+	return oClass
 
-	# -- Read the EFR register
-		_hRegValue = self._ReadRegister(SC16IS750_REG_LCR_0XBF_EFR)
-
-	# -- Enable/Disable Enhanced Function Set with EFR[4]
-		if ( bEnableAdvancedSet == True ):
-			_hRegValue |= 0x10
-		else:
-			_hRegValue &= 0xef
 
-	# -- Write out the modified EFR register
-		if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_EFR, _hRegValue) == False ):	return False
 
-	# -- Disable Enhanced Register access
-		if ( self._ExposeEnhancedRegisterSet(bExposeRegisterSet = False) == False ):	return False
+#
+# == Line Status Register (LSR) flags ==
+#
+class SC16IS750LineStatus(SC16IS750RegisterFlags):
+	__slots__ = ()
 
-	# -- If everything worked, return True
-		return True
+_AddRegisterFlagFields(SC16IS750LineStatus, SC16IS750_REG_LSR_FIELDS)
 
 
 
 #
-# == LOCAL: Enable special GPIO[4:7] pins for Modem flow control signals ==
+# == Modem Status Register (MSR) flags ==
+#     MSR[7:5] are modem inputs only with the GPIO[4:7] modem pins enabled (IOControl[1]); otherwise
+#     those fields are left out, and their attributes read False.
 #
-	def _SetGPIO47forModemFlowcontrol(self, bModemUse):
-	# -- Read the IOControl register
-		_hRegValue = self._ReadRegister(SC16IS750_REG_IOCONTROL)
+class SC16IS750ModemStatus(SC16IS750RegisterFlags):
+	__slots__ = ( "bModemPins", )
+	_lFieldNamesNoModemPins = ()
 
-	# -- Set the GPIO[4:7] Modem Pins flag at IOControl[1]
-		if ( bModemUse == True ):
-			_hRegValue |= 0x02
-		else:
-			_hRegValue &= 0xfd
+	def __init__(self, hValue, bModemPins = True):
+		self.hValue = hValue
+		self.bModemPins = bModemPins
 
-	# -- Write out the modified IOControl register
-		if ( self._WriteRegister(SC16IS750_REG_IOCONTROL, _hRegValue) == False ):	return False
+	def _FieldNames(self):
+		if ( self.bModemPins == True ):
+			return self._lFieldNames
+		return self._lFieldNamesNoModemPins
 
-	# -- If everything worked, return True
-		return True
+_AddRegisterFlagFields(SC16IS750ModemStatus, SC16IS750_REG_MSR_FIELDS)
+SC16IS750ModemStatus._lFieldNamesNoModemPins = SC16IS750ModemStatus._lFieldNames[:5]
 
 
 
 #
-# == LOCAL: Check that special GPIO[4:7] pins are set for Modem flow control signals ==
+# == Line status, modem status and FIFO levels read together by GetStatusSnapshot() ==
 #
-	def _CheckGPIO47forModemFlowcontrol(self):
-	# -- Read the IOControl register
-		_hRegIOC = self._ReadRegister(SC16IS750_REG_IOCONTROL)
+class SC16IS750StatusSnapshot(object):
+	__slots__ = ( "oLineStatus", "oModemStatus", "iRxLevel", "iTxLevel" )
 
-	# -- Check the GPIO[4:7] Modem Pins flag at IOControl[1]
-		if ( ( int(_hRegIOC) & (1 << 1) ) > 0 ):
-			if (self._bPrintDebug == True):	print("_CheckGPIO47forModemFlowcontrol: IOControl[1] = 1; Pins are for modem hardware flow control.")
-			return True
-		else:
-			if (self._bPrintDebug == True):	print("_CheckGPIO47forModemFlowcontrol: IOControl[1] = 0; Pins are in GPIO mode.")
-			return False
+	def __init__(self, oLineStatus, oModemStatus, iRxLevel, iTxLevel):
+		self.oLineStatus = oLineStatus
+		self.oModemStatus = oModemStatus
+		self.iRxLevel = iRxLevel
+		self.iTxLevel = iTxLevel
 
-	# -- If we fall through -- should never happen -- return false
-		return False
+	def as_dict(self):
+		return { "line-status":self.oLineStatus.as_dict(), "modem-status":self.oModemStatus.as_dict(), "rx-level":self.iRxLevel, "tx-level":self.iTxLevel }
 
+	def __repr__(self):
+		return "SC16IS750StatusSnapshot(" + repr(self.oLineStatus) + ", " + repr(self.oModemStatus) + ", rx-level=" + str(self.iRxLevel) + ", tx-level=" + str(self.iTxLevel) + ")"
 
 
 
-# ----------------------------------------------------
-#   C H I P   S E T U P
-# ----------------------------------------------------
+
+
+# ====================================================
+#   U A R T   C O N F I G U R A T I O N
+# ====================================================
 
 #
-# == Issue a UART software reset to the chip ==
+# == Complete line, FIFO and flow control setup of one UART, applied by SC16IS750.ApplyConfig() ==
+#     eFlowControl is 'NONE', 'SOFT', 'HARD' or 'AUTO' as for Connect().  A None XOn/XOff character
+#     keeps the chip's current one.  iTcrHalt/iTcrResume (RTS/RX flow thresholds) and iTlrRx/iTlrTx
+#     (FIFO trigger levels overriding FCR) are in characters, multiples of 4; None leaves TCR/TLR alone.
+#     bRS485AutoRts/bRS485InvertRts set the RS-485 auto direction (EFCR[4:5]); hRS485Address turns on
+#     9-bit mode with the hardware address match (see SC16IS750.SetRS485Address), which takes XOFF2.
 #
-	def ResetDevice(self):
-	# -- Read the IOControl register
-		_hRegValue = self._ReadRegister(SC16IS750_REG_IOCONTROL)
+class SC16IS750UartConfig(object):
+	__slots__ = ( "iBaudRate", "eParity", "iDataBits", "iStopBits", "eFlowControl", "bRS485Mode", "hXOn1", "hXOff1", "hXOn2", "hXOff2", "bFifoEnable", "iRxTrigger", "iTxTrigger", "iTcrHalt", "iTcrResume", "iTlrRx", "iTlrTx", "bRS485AutoRts", "bRS485InvertRts", "hRS485Address" )
+
+	def __init__(self, iBaudRate = 9600, eParity = 'N', iDataBits = 8, iStopBits = 1, eFlowControl = 'NONE', bRS485Mode = False, hXOn1 = 0x11, hXOff1 = 0x13, hXOn2 = None, hXOff2 = None, bFifoEnable = True, iRxTrigger = 8, iTxTrigger = 0, iTcrHalt = None, iTcrResume = None, iTlrRx = None, iTlrTx = None, bRS485AutoRts = False, bRS485InvertRts = False, hRS485Address = None):
+		self.iBaudRate = iBaudRate
+		self.eParity = eParity
+		self.iDataBits = iDataBits
+		self.iStopBits = iStopBits
+		self.eFlowControl = eFlowControl
+		self.bRS485Mode = bRS485Mode
+		self.hXOn1 = hXOn1
+		self.hXOff1 = hXOff1
+		self.hXOn2 = hXOn2
+		self.hXOff2 = hXOff2
+		self.bFifoEnable = bFifoEnable
+		self.iRxTrigger = iRxTrigger
+		self.iTxTrigger = iTxTrigger
+		self.iTcrHalt = iTcrHalt
+		self.iTcrResume = iTcrResume
+		self.iTlrRx = iTlrRx
+		self.iTlrTx = iTlrTx
+		self.bRS485AutoRts = bRS485AutoRts
+		self.bRS485InvertRts = bRS485InvertRts
+		self.hRS485Address = hRS485Address
+
+	def Replace(self, **kwargs):
+		_dFields = self.as_dict()
+		_dFields.update(kwargs)
+		return SC16IS750UartConfig(**_dFields)
+
+	def as_dict(self):
+		return dict( (_sField, getattr(self, _sField)) for _sField in self.__slots__ )
+
+	def __eq__(self, oOther):
+		if ( isinstance(oOther, SC16IS750UartConfig) == False ):
+			return NotImplemented
+		return ( self.as_dict() == oOther.as_dict() )
+
+	def __ne__(self, oOther):
+		_bEqual = self.__eq__(oOther)
+		if ( _bEqual is NotImplemented ):
+			return _bEqual
+		return not _bEqual
+
+	__hash__ = None
+
+	def __repr__(self):
+		return "SC16IS750UartConfig(" + ", ".join( _sField + "=" + repr(getattr(self, _sField)) for _sField in self.__slots__ ) + ")"
 
-	# -- Or in the software reset IOControl[3]
-		_hRegValue |= 0x08
 
-	# -- Write the reset bit - It will produce a write I/O error because the I2C bus
-	#     receives a NAK.  So we can't verify the write was successful.
-		self._WriteRegister(SC16IS750_REG_IOCONTROL, _hRegValue, bReadVerifyWrite = False)
 
-	# -- Assume everything worked, return True
-		return True
 
+# ====================================================
+#   B A U D   R A T E   S O L V E R
+# ====================================================
+
+# -- Solutions per crystal frequency: { crystal: { baud rate: ( prescaler, divisor, actual baud rate ) } }
+_dSC16IS750BaudTables = {}
+_oSC16IS750BaudTablesGuard = threading.Lock()
 
+# -- Upper bound on the non-standard rates remembered per crystal
+SC16IS750_BAUD_TABLE_MAX	= 1024
 
 #
-# == "Ping" the chip by a scratchpad (SPR) write and read test ==
+# == LOCAL: Best MCR[7] prescaler (1 or 4) and 16-bit divisor for a baud rate; None if out of range ==
+#     baud = crystal / ( 16 * prescaler * divisor ) - see spec sec. 7.8.  The divisor is rounded both
+#     ways; on a tie the divide-by-1 prescaler wins.
 #
-	def Ping(self):
-	# -- Write all bits high and verify read
-		self._WriteRegister(SC16IS750_REG_SPR, 0xFF, bReadVerifyWrite = False)
-		if (self._ReadRegister(SC16IS750_REG_SPR) != 0xFF):
-			return False
+def _SC16IS750SolveBaud(iCrystalFreq, iBaud):
+	_tBest = None
+	_fBestError = None
+	for _iPrescaler in ( 1, 4 ):
+		_fDivisor = float(iCrystalFreq) / ( 16.0 * _iPrescaler * iBaud )
+		for _iDivisor in ( int(_fDivisor), int(_fDivisor) + 1 ):
+			if ( ( _iDivisor < 1 ) or ( _iDivisor > 0xFFFF ) ):	continue
+			_fActual = float(iCrystalFreq) / ( 16.0 * _iPrescaler * _iDivisor )
+			_fError = abs(_fActual - iBaud) / float(iBaud)
+			if ( ( _fBestError == None ) or ( _fError < _fBestError ) ):
+				_tBest = ( _iPrescaler, _iDivisor, _fActual )
+				_fBestError = _fError
+	return _tBest
 
-	# -- Write 10101010 alternating bit pattern and verify read
-		self._WriteRegister(SC16IS750_REG_SPR, 0xAA, bReadVerifyWrite = False)
-		if (self._ReadRegister(SC16IS750_REG_SPR) != 0xAA):
-			return False
 
-	# -- Write 10000001 bookend bit pattern and verify read
-		self._WriteRegister(SC16IS750_REG_SPR, 0x81, bReadVerifyWrite = False)
-		if (self._ReadRegister(SC16IS750_REG_SPR) != 0x81):
-			return False
 
-	# -- We can read/write cleanly to scratch register, we can assume alive
-		return True
+#
+# == LOCAL: The solution table for a crystal, built on first use; call with _oSC16IS750BaudTablesGuard held ==
+#
+def _SC16IS750BaudTable(iCrystalFreq):
+	_dTable = _dSC16IS750BaudTables.get(iCrystalFreq)
+	if ( _dTable == None ):
+		_dTable = _dSC16IS750BaudTables[iCrystalFreq] = {}
+		for _iBaud in SC16IS750_STANDARD_BAUDRATES:
+			_tSolution = _SC16IS750SolveBaud(iCrystalFreq, _iBaud)
+			if ( _tSolution != None ):	_dTable[_iBaud] = _tSolution
+	return _dTable
 
 
 
 #
-# == Place the IC into Sleep Mode to greatly reduce power consumption. (See Spec. 7.6) ==
+# == Lookup table of the standard baud rates achievable with a crystal: { baud rate: ( prescaler, divisor, actual baud rate ) } ==
+#     Built once per crystal frequency; rates the crystal cannot reach at all are left out.
 #
-	def SetSleepState(self, bDiscardRxBuffer = False):
-	# -- Check that there is no data is in the RX buffer
-		if ( self.RxFifoBufferUsed() > 0 ):
-			if (self._bPrintDebug == True):	print("SetSleepState: Data present in RX buffer; Cannot sleep now.")
-			return False
+def SC16IS750GetBaudTable(iCrystalFreq = SC16IS750_CRYSTAL_FREQ):
+	with _oSC16IS750BaudTablesGuard:
+		_dTable = _SC16IS750BaudTable(iCrystalFreq)
+		return dict( (_iBaud, _tSolution) for _iBaud, _tSolution in _dTable.items() if ( _iBaud in SC16IS750_STANDARD_BAUDRATES ) )
 
-	# -- Check that there is no data is in the TX buffers
-		if ( GetLineStatus()['thr-tsr-empty'] == False ):
-			if (self._bPrintDebug == True):	print("SetSleepState: Data present in TX hold or send buffers; Cannot sleep now.")
-			return False
 
-	# -- Enable enhanced function mode on EFR[4]
-		if ( self._EnableEnhancedFunctionSet(bEnableAdvancedSet = True) == False ):	return False
 
-	# -- Read in the current IER register
-		_hRegIER = self._ReadRegister(SC16IS750_REG_IER)
+#
+# == Prescaler, divisor and actual baud rate for a baud rate; None if the error would exceed fMaxError ==
+#     The tables are shared by every instance, so the lookup and the insert of a new rate hold the guard.
+#
+def SC16IS750SolveBaudrate(iBaud, iCrystalFreq = SC16IS750_CRYSTAL_FREQ, fMaxError = SC16IS750_BAUD_MAX_ERROR):
+	if ( iBaud <= 0 ):
+		return None
+	with _oSC16IS750BaudTablesGuard:
+		_dTable = _SC16IS750BaudTable(iCrystalFreq)
+		_tSolution = _dTable.get(iBaud)
+		if ( _tSolution == None ):
+			_tSolution = _SC16IS750SolveBaud(iCrystalFreq, iBaud)
+			if ( ( _tSolution != None ) and ( len(_dTable) < ( len(SC16IS750_STANDARD_BAUDRATES) + SC16IS750_BAUD_TABLE_MAX ) ) ):
+				_dTable[iBaud] = _tSolution
+	if ( ( _tSolution == None ) or ( ( abs(_tSolution[2] - iBaud) / float(iBaud) ) > fMaxError ) ):
+		return None
+	return _tSolution
 
-	# -- Enable sleep mode with IER[4]
-		_hRegIER |= 0x10
 
-	# -- Write out the modified IER register
-		if ( self._WriteRegister(SC16IS750_REG_IER, _hRegIER) == False ):	return False
 
-	# -- If everything worked, return True
-		return True
 
+# ====================================================
+#   B U S   L O C K S
+# ====================================================
+
+# -- One reentrant lock per bus, keyed by the bus path
+_dSC16IS750BusLocks = {}
+_oSC16IS750BusLocksGuard = threading.Lock()
 
+# -- Serial numbers for buses without a device path
+_oSC16IS750BusNumbers = itertools.count()
 
 #
-# == Check if the IC is in Sleep Mode from the IER[4] register state ==
+# == New unique bus path for a bus without a device path (an SPI transport without one, the model) ==
 #
-	def GetSleepState(self):
-	# -- Read in the current IER register
-		_hRegIER = self._ReadRegister(SC16IS750_REG_IER)
+def SC16IS750NewBusPath(sKind):
+	return ( sKind + ":" + str(next(_oSC16IS750BusNumbers)) )
 
-	# -- Check if sleep mode bit is set on IER[4]
-		if ( ( int(_hRegIER) & (1 << 4) ) > 0 ):
-			if (self._bPrintDebug == True):	print("GetSleepState: UART sleeping.")
-			return True
-		else:
-			if (self._bPrintDebug == True):	print("GetSleepState: UART awake.")
-			return False
 
 
 
 #
-# == Wake the IC from Sleep Mode by de-asserting the IER[4] register state ==
+# == Bus path of bus hI2CBus behind a provider or transport ==
+#     A provider that is not an I2C bus of its own (a transport, the model) names its bus with GetBusPath();
+#     any other provider reaches the bus through /dev/i2c-N, so e.g. Adafruit_GPIO.I2C and SC16IS750I2CDev
+#     on the same bus get the same path.
 #
-	def SetWakeState(self):
-	# -- Check if we are in a sleep state first
-		if ( self.GetSleepState() == False ):
-			if (self._bPrintDebug == True):	print("SetWakeState: UART not sleeping and already awake. Skipping wake protocol.")
-			return True
+def SC16IS750GetBusPath(oI2CInstance, hI2CBus):
+	if ( hasattr(oI2CInstance, "GetBusPath") == True ):
+		return oI2CInstance.GetBusPath(hI2CBus)
+	return ( "/dev/i2c-" + str(hI2CBus) )
 
-	# -- Read in the current IER register
-		_hRegIER = self._ReadRegister(SC16IS750_REG_IER)
 
-	# -- Disable sleep mode with IER[4]
-		_hRegIER &= 0xef
 
-	# -- Write out the modified IER register
-		if ( self._WriteRegister(SC16IS750_REG_IER, _hRegIER) == False ):	return False
+#
+# == Get the lock shared by every SC16IS750 on a bus ==
+#
+def SC16IS750GetBusLock(oI2CInstance, hI2CBus):
+	_sBusPath = SC16IS750GetBusPath(oI2CInstance, hI2CBus)
+	with _oSC16IS750BusLocksGuard:
+		if ( _sBusPath not in _dSC16IS750BusLocks ):
+			_dSC16IS750BusLocks[_sBusPath] = threading.RLock()
+		return _dSC16IS750BusLocks[_sBusPath]
 
-	# -- If everything worked, return True
-		return True
 
 
 
+# ====================================================
+#   S C 1 6 I S 7 5 0   C O M M   I / O
+#      C L A S S   D E F I N I T I O N
+# ====================================================
 
-# ----------------------------------------------------
-#   U A R T   S E T U P
-# ----------------------------------------------------
+class SC16IS750(object):
 
 #
-# == Set the UART Wire Mode as RS-232 or Multidrop RS-485 (aka 9-bit mode) ==
+# == Class scope variables ==
 #
-	def SetMultidropMode(self, b9BitMode = False):
-	# -- Read in the current EFCR register
-		_hRegEFCR = self._ReadRegister(SC16IS750_REG_EFCR)
-
-	# -- Modify the EFCR register as appropriate...
-		if ( b9BitMode == True ):
-		# -- Set the 9bit mode flag on EFCR[0]
-			_hRegEFCR |= 0x01
-			if (self._bPrintDebug == True):	print "SetMultidropMode: Setup in Multi-Drop RS-485 (aka 9-bit) mode."
-		else:
-		# -- Clear the 9bit mode flag on EFCR[0]
-			_hRegEFCR &= 0xfe
-			if (self._bPrintDebug == True):	print "SetMultidropMode: Setup in RS-232 mode."
-
-	# -- Write out the modified EFCR register
-		if ( self._WriteRegister(SC16IS750_REG_EFCR, _hRegEFCR) == False ):	return False
-
-	# -- If everything worked, return True
-		return True
+	_bPrintDebug = False
+	_oI2CInstance = None
+	_oDeviceInst = None
+	_bBaudSet = False
+	_bLineSet = False
+	_oBusLock = None
+	_iTransactionDepth = 0
+	_hRegLCR = None
+	_dRegCache = None
+	_iRegBank = None
+	_bRegCacheEnabled = True
+	_bRegCacheFault = False
+	_bReadVerifyWrites = False
+	_lTraceRing = None
+	_iTraceCount = 0
+	_bTraceEcho = False
+	_oMetrics = None
+	_oRxRing = None
+	_oRxPumpThread = None
+	_oRxPumpStop = None
+	_oRxPumpError = None
+	_iRxPumpDropped = 0
+	_iRxPumpHighWater = None
+	_fnRxPumpHighWater = None
+	_fRxPumpPollSec = None
+	_oTxQueue = None
+	_oTxWriterThread = None
+	_oTxWriterStop = None
+	_oTxWriterCondition = None
+	_oTxWriterError = None
+	_eTxWriterFullPolicy = "BLOCK"
+	_iTxWriterInFlight = 0
+	_iTxWriterDropped = 0
+	_fTxWriterPollSec = None
+	_oIrqSource = None
+	_oIrqThread = None
+	_oIrqStop = None
+	_oIrqError = None
+	_lIrqWakePipe = None
+	_hIrqSavedIER = None
+	_aIrqTxBlock = None
+	_dCallbacks = None
+	_iIrqEdges = 0
+	_iIrqLineErrors = 0
+	_oScheduler = None
+	_hI2CAddress = None
+	_hI2CBus = None
+	_iChannel = SC16IS750_CHANNEL_A
+	_lChannels = None
+	_lSubAddress = None
+	_aServiceTxBlock = None
+	_oConfig = None
+	_dGpio = None
+	_lGpioWatches = None
+	_fRS485FrameEnd = 0.0
+	_bRS485FrameHold = False
+# -- Line settings used to time the FIFO polling; updated by SetBaudrate(), SetLine() and SetFifo()
+	_fBaudrate = 9600.0
+	_iCrystalFreq = SC16IS750_CRYSTAL_FREQ
+	_fMaxBaudError = SC16IS750_BAUD_MAX_ERROR
+	_fCharBits = 10.0
+	_iRxTriggerLevel = 8
+	_iTxTriggerLevel = 0
+# -- Polling trade-off: 0.0 polls as often as allowed (lowest latency), 1.0 sleeps until the data is due (least CPU)
+	_fPollCpuFactor = 0.5
+	_fPollMinSec = SC16IS750_POLL_MIN_SEC
+	_fPollMaxSec = SC16IS750_POLL_MAX_SEC
 
 
 
 #
-# == Set the Baud rate for the UART ==
+# == Class Initialization and Setup ==
+#     For the second channel of an SC16IS752/SC16IS762 use OpenChannel() on the channel A instance,
+#     or pass that instance as oChannelOf: the channels share the device handle and the bus lock.
+#     oTransport replaces the I2C device handle, e.g. an SC16IS750SpiTransport (hI2CAddress may be None).
 #
-	def SetBaudrate(self, iBaud):
-	# -- Check for sleep mode
-		_bSleepState = self.GetSleepState()
-		if ( _bSleepState == True ):
-		# -- Wake the chip for setting the baud rate
-			if ( SetWakeState() == False ):	return False
-
-	# -- Read the LCR register
-		_hRegLCR = self._ReadRegister(SC16IS750_REG_LCR)
-
-	# -- Check that the LCR register is not in the special 0xBF state, else exit.
-		if ( _hRegLCR == 0xbf ):
-			return False
-
-	# -- Find the clock divisor prescaler from register MCR[7]
-		if ((self._ReadRegister(SC16IS750_REG_MCR) & 0x80) == 0):
-		# -- logic 0 = divide-by-1 clock input
-			_iClockDivisorPrescaler = 1
+	def __init__(self, hI2CAddress, hI2CBus = 1, _oExistingI2CInstance = None, oBusLock = None, iChannel = SC16IS750_CHANNEL_A, oChannelOf = None, oTransport = None, iCrystalFreq = SC16IS750_CRYSTAL_FREQ, **kwargs):
+		if ( ( iChannel < 0 ) or ( iChannel >= SC16IS750_CHANNELS ) ):
+			raise SC16IS750Error("SC16IS750: invalid channel " + str(iChannel))
+
+		if ( oChannelOf != None ):
+		# -- Another channel of an open chip: share its I2C provider, device handle and bus lock
+			if ( oChannelOf._lChannels[iChannel] != None ):
+				raise SC16IS750Error("SC16IS750: channel " + str(iChannel) + " is already open")
+			self._oI2CInstance = oChannelOf._oI2CInstance
+			self._oDeviceInst = oChannelOf._oDeviceInst
+			if ( isinstance(self._oDeviceInst, _SC16IS750MeteredDevice) == True ):
+				self._oDeviceInst = self._oDeviceInst._oDevice
+			self._hI2CAddress = oChannelOf._hI2CAddress
+			self._hI2CBus = oChannelOf._hI2CBus
+			oBusLock = oChannelOf._oBusLock
+			self._lChannels = oChannelOf._lChannels
+			self._dGpio = oChannelOf._dGpio
+			iCrystalFreq = oChannelOf._iCrystalFreq
+		elif ( oTransport != None ):
+		# -- A ready made device handle, such as the SPI transport; it is its own bus
+			self._oI2CInstance = None
+			self._oDeviceInst = oTransport
+			self._hI2CAddress = hI2CAddress
+			self._hI2CBus = kwargs.get("busnum", hI2CBus)
+			self._lChannels = [ None ] * SC16IS750_CHANNELS
+			self._dGpio = { "latch":0x00, "state":None }
+			if ( oBusLock == None ):
+				oBusLock = SC16IS750GetBusLock(oTransport, self._hI2CBus)
 		else:
-		# -- logic 1 = divide-by-4 clock input
-			_iClockDivisorPrescaler = 4
-
-	# -- Calculate the Clock Divisor - See specifications sec. 7.8 for detail
-		_iClockDivisor = ( (SC16IS750_CRYSTAL_FREQ / _iClockDivisorPrescaler) / (iBaud * 16) )
-
-	# -- Set LCR[7] to enable Divisor Latch and expose DLL & DLH registers
-		_hRegLCR |= 0x80
-		if ( self._WriteRegister(SC16IS750_REG_LCR, _hRegLCR) == False ):	return False
+		# -- Use the shared native i2c-dev provider if an I2C provider is not handed in
+			if _oExistingI2CInstance is None:
+				self._oI2CInstance = SC16IS750GetI2CDev()
+				kwargs.setdefault("busnum", hI2CBus)
+			else:
+				self._oI2CInstance = _oExistingI2CInstance
+
+		# -- Init the I2C instance for the designated address 
+			self._oDeviceInst = self._oI2CInstance.get_i2c_device(hI2CAddress, **kwargs)
+			self._hI2CAddress = hI2CAddress
+			self._hI2CBus = kwargs.get("busnum", hI2CBus)
+			self._lChannels = [ None ] * SC16IS750_CHANNELS
+			self._dGpio = { "latch":0x00, "state":None }
+
+	# -- Crystal feeding the baud rate generator
+		self._iCrystalFreq = iCrystalFreq
+
+	# -- Register sub-addresses for this channel; the I/O pin registers always go through channel A
+		self._iChannel = iChannel
+		self._lChannels[iChannel] = self
+		self._lSubAddress = [ ( ( _hRegisterAddr << 3 ) | ( iChannel << 1 ) ) for _hRegisterAddr in range(16) ]
+		for _hRegisterAddr in SC16IS750_REG_SHARED:
+			self._lSubAddress[_hRegisterAddr] = ( _hRegisterAddr << 3 )
+
+	# -- Share one lock with every device on the same bus, unless one is handed in
+		if ( oBusLock == None ):
+			oBusLock = SC16IS750GetBusLock(self._oI2CInstance, self._hI2CBus)
+		self._oBusLock = oBusLock
+		self._iTransactionDepth = 0
+
+	# -- No enhanced register bank exposure in progress
+		self._hRegLCR = None
+
+	# -- Start with an empty register shadow cache for this device
+		self._dRegCache = {}
+		self._iRegBank = None
+
+	# -- No Service() callbacks or watched I/O pins registered yet
+		self._dCallbacks = {}
+		self._lGpioWatches = []
+
+		if ( oChannelOf == None ):
+		# -- Issue the UART Software Reset...
+			self.ResetDevice()
+		else:
+		# -- A software reset would reset the open channel too; assume this channel is as the reset left it
+			self._SeedRegisterCache()
 
-	# -- Write the first 8bits of the calculated clock divisor to the divisor latch LSB register
-		if ( self._WriteRegister(SC16IS750_REG_LCR7_DLL, _iClockDivisor) == False ):	return False
+	# -- Always return init without a state
+		return
 
-	# -- Write the 8bit overflow of the calculated clock divisor to the divisor latch MSB register
-		if ( self._WriteRegister(SC16IS750_REG_LCR7_DLH, (_iClockDivisor>>8)) == False ):	return False
 
-	# -- Set LCR[7] to disable Divisor Latch again and return the remaining LCR register flags to their prior states
-		_hRegLCR = self._ReadRegister(SC16IS750_REG_LCR)
-		_hRegLCR &= 0x7F
-		if ( self._WriteRegister(SC16IS750_REG_LCR,_hRegLCR) == False ):	return False
 
-	# -- Calculate the real baud rate and the difference between desired and actual
-		_iRealBaud = ( (SC16IS750_CRYSTAL_FREQ / _iClockDivisorPrescaler) / (16 * _iClockDivisor) )
-		_eBaudError = (_iRealBaud - iBaud) * 1000 / iBaud
+#
+# == Open another channel of a dual channel SC16IS752/SC16IS762 ==
+#
+	def OpenChannel(self, iChannel = SC16IS750_CHANNEL_B):
+		return SC16IS750(self._hI2CAddress, self._hI2CBus, iChannel = iChannel, oChannelOf = self)
 
-	# -- Print calculation debugging if enabled
-		if (self._bPrintDebug == True):	print "Desired baudrate =" + str(iBaud) + " ; Calculated divisor =" + str(_iClockDivisor) + " ; Actual baudrate =" + str(_iRealBaud) + " ; Baudrate error =" + str(_eBaudError) + " ;"
 
-	# -- If the chip was in sleep mode prior, return it to sleep state
-		if ( _bSleepState == True ):
-			if ( SetSleepState() == False ):	return False
 
-	# -- If everything worked, return True
-		return True
+#
+# == The open channels of this chip, in channel order (None for a channel not opened) ==
+#
+	def GetChannels(self):
+		return list(self._lChannels)
 
 
 
 #
-# == Set the line attributes for the UART ==
+# == Channel of this instance ==
 #
-	def SetLine(self, iDataBits, sParityTyp, iStopBits):
-	# -- Read the LCR register
-		_hRegLCR = self._ReadRegister(SC16IS750_REG_LCR)
+	def GetChannel(self):
+		return self._iChannel
 
-	# -- Check that the LCR register is not in the special 0xBF state, else exit.
-		if ( _hRegLCR == 0xbf ):
-			return False
-
-	# -- Setup a Clear bitted var for the LCR
-		_hRegLCR = 0x00;
-
-	# -- Set data length on LCR[1] and LCR[0]  (See spec table 15)
-		if   ( iDataBits == 8 ):
-			_hRegLCR |= 0x03
-		elif ( iDataBits == 7 ):
-			_hRegLCR |= 0x02
-		elif ( iDataBits == 6 ):
-			_hRegLCR |= 0x01
-		elif ( iDataBits == 5 ):
-			_hRegLCR |= 0x00
-		else:
-			return False
 
-	# -- Set the number of stop bits on LCR[2]  (See spec table 14)
-		if   ( iStopBits == 2 ):
-			_hRegLCR |= 0x04
-		elif ( iStopBits == 1 ):
-			_hRegLCR |= 0x00
-		else:
-			return False
-
-	# -- Set parity method on LCR[5], LCR[4], and LCR[3]  (See spec table 13)
-		sParityTyp = sParityTyp[:1]
-		sParityTyp = sParityTyp.upper()
-		if   ( sParityTyp == 'N' ):
-			_hRegLCR |= 0x00
-		elif ( sParityTyp == 'O' ):
-			_hRegLCR |= 0x08
-		elif ( sParityTyp == 'E' ):
-			_hRegLCR |= 0x18
-		else:
-			return False
 
-	# -- Write the line attributes into the LCR register
-		if ( self._WriteRegister(SC16IS750_REG_LCR, _hRegLCR) == False ):	return False
+#
+# == Enable debug printing ==
+#
+	def fPrintDebug(self):
+		self._bPrintDebug = True
 
-	# -- If everything worked, return True
-		return True
+	# -- Echo every register access through the tracing facility
+		self.EnableTrace(bEcho = True)
+		return
 
 
 
 #
-# == Enable/Configure/Disable FIFO Buffers ==
+# == Enable/Disable serving host owned register reads from the shadow cache ==
 #
-	def SetFifo(self, bFifoEnable = True, iRxFifoTriggerSpaces = 8, iTxFifoTriggerSpaces = 0):
-	# -- Read in the current FCR register
-		_hRegFCR = self._ReadRegister(SC16IS750_REG_FCR)
-
-	# -- If both FIFO modes are False, we can just set the global FIFO flags to 0s
-		if ( bFifoEnable == False ):
-			if ( self._WriteRegister(SC16IS750_REG_FCR, 0x00, False) == True ):
-				return True
-			else:
-				return False
-
-	# -- If either FIFO mode is enabled, set the global FIFO flag on FCR[0]
-		_hRegFCR |= 0x01
-
-	# -- Set the receive FIFO buffer on FCR[6:7]
-		if   (iRxFifoTriggerSpaces != 8):
-			_hRegFCR |= 0x00
-		elif (iRxFifoTriggerSpaces != 16):
-			_hRegFCR |= 0x40
-		elif (iRxFifoTriggerSpaces != 56):
-			_hRegFCR |= 0x80
-		elif (iRxFifoTriggerSpaces != 60):
-			_hRegFCR |= 0xC0
-		else:
-			if (self._bPrintDebug == True):	print "Desired iRxFifoTriggerSpaces =" + str(iRxFifoTriggerSpaces) + " is not a valid input. Must be 8, 16, 56, or 60."
-			return False
+	def SetRegisterCache(self, bEnable = True):
+		self._bRegCacheEnabled = bEnable
+		return
 
-	# -- See if TxFifo trigger spaces was defined
-		if ( iTxFifoTriggerSpaces > 0 ):
-		# -- Enable enhanced function set as this is required for Tx FIFO
-			if ( self._EnableEnhancedFunctionSet(bEnableAdvancedSet = True) == False ):	return False
 
-		# -- Set the transmit FIFO buffer on FCR[4:5]
-			if   (iTxFifoTriggerSpaces != 8):
-				_hRegFCR |= 0x00
-			elif (iTxFifoTriggerSpaces != 16):
-				_hRegFCR |= 0x10
-			elif (iTxFifoTriggerSpaces != 56):
-				_hRegFCR |= 0x20
-			elif (iTxFifoTriggerSpaces != 60):
-				_hRegFCR |= 0x30
-			else:
-				if (self._bPrintDebug == True):	print "Desired iTxFifoTriggerSpaces =" + str(iTxFifoTriggerSpaces) + " is not a valid input. Must be 8, 16, 56, or 60."
-				return False
 
-	# -- Write out the modified FCR register
-		if ( self._WriteRegister(SC16IS750_REG_FCR, _hRegFCR, False) == False ):	return False
+#
+# == Enable/Disable read back verification of register writes ==
+#
+	def SetWriteVerify(self, bEnable = True):
+		self._bReadVerifyWrites = bEnable
+		return
 
-	# -- If everything worked, return True
-		return True
 
 
 
 #
-# == Enable the Automatic chip internal Hardware flow control with GPIO[4:7] control pins ==
+# == Run a multi-register operation as one bus transaction ==
+#     Holds the bus lock from the first access to the last, so no other thread or device on the bus
+#     gets in between a bank switch and its restore.  Transactions nest; should the outermost one end
+#     with the enhanced register bank still exposed (an early return), LCR is restored.
 #
-	def SetAutoHardFlowcontrol(self):
-		if (self._bPrintDebug == True):	print "SetAutoHardFlowcontrol: Enable Automatic Hardware Flow control."
-	# -- Enable Enhanced Register access
-		if ( self._ExposeEnhancedRegisterSet(bExposeRegisterSet = True) == False ):	return False
-
-	# -- Read the EFR register
-		_hRegValue = self._ReadRegister(SC16IS750_REG_LCR_0XBF_EFR)
-
-	# -- Enable Auto RTS with EFR[6]
-		_hRegValue |= 0x40
+	@contextlib.contextmanager
+	def Transaction(self):
+		with self._oBusLock:
+			self._iTransactionDepth += 1
+			try:
+				yield self
+			finally:
+				self._iTransactionDepth -= 1
+				if ( ( self._iTransactionDepth == 0 ) and ( self._hRegLCR != None ) ):
+					self._ExposeEnhancedRegisterSet(bExposeRegisterSet = False)
 
-	# -- Enable Auto CTS with EFR[7]
-		_hRegValue |= 0x80
 
-	# -- Write out the modified EFR register
-		if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_EFR, _hRegValue) == False ):	return False
 
-	# -- Empty out the XON1 Register
-		if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_XON1, 0x00) == False ):	return False
 
-	# -- Empty out the XON2 Register
-		if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_XON2, 0x00) == False ):	return False
+# ----------------------------------------------------
+#   C L A S S   I N T E R N A L   C H I P
+#      R E G I S T E R   I / O   F U N C T I O N S
+# ----------------------------------------------------
+
+#
+# == Read a register from the chip by address ==
+#
+	def _ReadRegister(self, hRegisterAddr, bUseCache = True):
+	# -- Test for device instance before attempting use
+		if ( self._oDeviceInst == None ):
+		# -- Device not init'ed properly.  Return None
+			return None
+
+	# -- Hold the bus lock; no other access can switch the register bank under this one
+		with self._oBusLock:
+		# -- Serve host owned registers from the shadow cache when a copy is held
+			_tCacheKey = SC16IS750_REG_CACHE_READ_KEYS[self._iRegBank].get(hRegisterAddr)
+			if ( ( _tCacheKey != None ) and ( bUseCache == True ) and ( self._bRegCacheEnabled == True ) ):
+				_hRegReadVal = self._dRegCache.get(_tCacheKey)
+				if ( _hRegReadVal != None ):	return _hRegReadVal
+
+		# -- Shift in the register address three bits and the channel - see spec table 33
+		#     bit0: not used		bits1-2: channel select
+		#     bits3-6: register		bit7: not used
+			_hShiftedRegisterAddr = self._lSubAddress[hRegisterAddr]
+
+		# -- Read the unsigned 8-bit value
+			_hRegReadVal = self._oDeviceInst.readU8(_hShiftedRegisterAddr)
+
+		# -- Keep a shadow copy of host owned registers
+			if ( _tCacheKey != None ):
+				self._CacheRegister(_tCacheKey, _hRegReadVal)
+
+		# -- Return the result...
+			return _hRegReadVal
+
+
+
+#
+# == Write a value to a register on the chip by address ==
+#
+	def _WriteRegister(self, hRegisterAddr, hValue, bReadVerifyWrite = True):
+	# -- Test for device instance before attempting use
+		if ( self._oDeviceInst == None ):
+		# -- Device not init'ed properly.  Return None
+			return None
+
+	# -- Hold the bus lock; no other access can switch the register bank under this one
+		with self._oBusLock:
+		# -- Shift in the register address three bits and the channel - see spec table 33
+		#     bit0: not used		bits1-2: channel select
+		#     bits3-6: register		bit7: not used
+			_hShiftedRegisterAddr = self._lSubAddress[hRegisterAddr]
+
+		# -- Find the shadow cache entry before the write can change the register bank
+			_tCacheKey = SC16IS750_REG_CACHE_WRITE_KEYS[self._iRegBank].get(hRegisterAddr)
+
+		# -- Write out the unsigned 8-bit value and return the status
+			try:
+				if ( self._oDeviceInst.write8(_hShiftedRegisterAddr, hValue) == False ):
+					self._bRegCacheFault = True
+					return False
+			except:
+				if ( self._oMetrics != None ):	self._oMetrics.Count("swallowed-write-exceptions")
+				self._bRegCacheFault = True
+
+		# -- Write through to the shadow copy of host owned registers
+			if ( _tCacheKey != None ):
+				self._CacheRegister(_tCacheKey, hValue)
+
+		# -- Read the register back from the chip to verify the write results, if enabled by policy.
+			if ( ( bReadVerifyWrite == True ) and ( self._bReadVerifyWrites == True ) ):
+				if ( self._ReadRegister(hRegisterAddr, bUseCache = False) != hValue ):
+					if (self._bPrintDebug == True):	print("!! Register readback validation Failed !! -- Value returned does not match write.")
+					if ( self._oMetrics != None ):	self._oMetrics.Count("readback-verify-failures")
+					self._bRegCacheFault = True
+					return False
+
+		# -- If everything worked, return True
+			return True
+
+
+
+#
+# == Read a block of bytes from a single register on the chip in one bus transaction ==
+#
+	def _ReadRegisterBlock(self, hRegisterAddr, iLength):
+	# -- Test for device instance before attempting use
+		if ( self._oDeviceInst == None ):
+		# -- Device not init'ed properly.  Return None
+			return None
+
+	# -- Hold the bus lock; no other access can switch the register bank under this one
+		with self._oBusLock:
+		# -- Shift in the register address three bits and the channel - see spec table 33
+			_hShiftedRegisterAddr = self._lSubAddress[hRegisterAddr]
+
+		# -- Read the bytes with one block read.  The RHR register does not auto-increment,
+		#     so every byte of the block is pulled from the receive FIFO.
+			_aRegReadVals = self._oDeviceInst.readList(_hShiftedRegisterAddr, iLength)
+
+		# -- smbus style providers return a list; the callers copy the block into buffers, so make it bytes-like
+			if ( ( _aRegReadVals != None ) and ( isinstance(_aRegReadVals, bytearray) == False ) ):
+				_aRegReadVals = bytearray(_aRegReadVals)
+
+		# -- Return the result...
+			return _aRegReadVals
+
+
+
+#
+# == Write a block of bytes to a single register on the chip in one bus transaction ==
+#
+	def _WriteRegisterBlock(self, hRegisterAddr, aValues):
+	# -- Test for device instance before attempting use
+		if ( self._oDeviceInst == None ):
+		# -- Device not init'ed properly.  Return None
+			return None
+
+	# -- Hold the bus lock; no other access can switch the register bank under this one
+		with self._oBusLock:
+		# -- Shift in the register address three bits and the channel - see spec table 33
+			_hShiftedRegisterAddr = self._lSubAddress[hRegisterAddr]
+
+		# -- Write out the bytes with one block write.  The THR register does not auto-increment,
+		#     so every byte of the block is pushed into the transmit FIFO.
+			try:
+				if ( self._oDeviceInst.writeList(_hShiftedRegisterAddr, aValues) == False ):	return False
+			except:
+				if ( self._oMetrics != None ):	self._oMetrics.Count("swallowed-write-exceptions")
+
+		# -- If everything worked, return True
+			return True
+
+
+
+#
+# == Read several registers in one bus transaction; returns the values in order ==
+#     Device handles that can combine transfers (bCombinedTransfers, e.g. SC16IS750I2CDevDevice) read every
+#     register not served from the shadow cache in one go; others fall back to one read per register.
+#
+	def _ReadRegisters(self, lRegisterAddrs):
+	# -- Test for device instance before attempting use
+		if ( self._oDeviceInst == None ):
+			return None
+
+		with self._oBusLock:
+			if ( getattr(self._oDeviceInst, "bCombinedTransfers", False) == False ):
+				return [ SC16IS750._ReadRegister(self, _hRegisterAddr) for _hRegisterAddr in lRegisterAddrs ]
+
+		# -- Serve what the shadow cache holds; reads do not switch the register bank
+			_dCacheKeys = SC16IS750_REG_CACHE_READ_KEYS[self._iRegBank]
+			_lValues = [ None ] * len(lRegisterAddrs)
+			_lMissing = []
+			for _iIndex in range(len(lRegisterAddrs)):
+				_tCacheKey = _dCacheKeys.get(lRegisterAddrs[_iIndex])
+				if ( ( _tCacheKey != None ) and ( self._bRegCacheEnabled == True ) ):
+					_lValues[_iIndex] = self._dRegCache.get(_tCacheKey)
+				if ( _lValues[_iIndex] == None ):
+					_lMissing.append(_iIndex)
+			if ( len(_lMissing) == 0 ):
+				return _lValues
+
+		# -- One combined transfer for the rest, keeping a shadow copy of host owned registers
+			_lRead = self._oDeviceInst.readRegisters([ self._lSubAddress[lRegisterAddrs[_iIndex]] for _iIndex in _lMissing ])
+			for _iIndex, _hRegReadVal in zip(_lMissing, _lRead):
+				_lValues[_iIndex] = _hRegReadVal
+				_tCacheKey = _dCacheKeys.get(lRegisterAddrs[_iIndex])
+				if ( _tCacheKey != None ):
+					self._CacheRegister(_tCacheKey, _hRegReadVal)
+			return _lValues
+
+
+
+#
+# == Write several registers, in order, in one bus transaction ==
+#     lRegisterValues holds ( register, value ) pairs, or ( register, value, verify ) tuples.  Without a
+#     device handle that can combine transfers, or with write verification on, this is one write per register.
+#
+	def _WriteRegisters(self, lRegisterValues):
+	# -- Test for device instance before attempting use
+		if ( self._oDeviceInst == None ):
+			return None
+
+		with self._oBusLock:
+			if ( ( getattr(self._oDeviceInst, "bCombinedTransfers", False) == False ) or ( self._bReadVerifyWrites == True ) ):
+				for _tWrite in lRegisterValues:
+					if ( SC16IS750._WriteRegister(self, *_tWrite) == False ):	return False
+				return True
+
+			try:
+				if ( self._oDeviceInst.writeRegisters([ ( self._lSubAddress[_tWrite[0]], _tWrite[1] ) for _tWrite in lRegisterValues ]) == False ):
+					self._bRegCacheFault = True
+					return False
+			except:
+				if ( self._oMetrics != None ):	self._oMetrics.Count("swallowed-write-exceptions")
+				self._bRegCacheFault = True
+
+		# -- Write through to the shadow cache in order, so LCR writes move the bank as they go
+			for _tWrite in lRegisterValues:
+				_hRegisterAddr, _hValue = _tWrite[0], _tWrite[1]
+				_tCacheKey = SC16IS750_REG_CACHE_WRITE_KEYS[self._iRegBank].get(_hRegisterAddr)
+				if ( _tCacheKey != None ):
+					self._CacheRegister(_tCacheKey, _hValue)
+			return True
+
+
+
+
+# ----------------------------------------------------
+#   R E G I S T E R   I / O   T R A C I N G
+# ----------------------------------------------------
+
+#
+# == Start recording register accesses into a fixed size ring buffer ==
+#
+	def EnableTrace(self, iDepth = 1024, bEcho = False):
+	# -- Preallocate the ring buffer; keep the existing one if the depth is unchanged
+		if ( ( self._lTraceRing == None ) or ( len(self._lTraceRing) != iDepth ) ):
+			self._lTraceRing = [ None ] * iDepth
+			self._iTraceCount = 0
+		self._bTraceEcho = bEcho
+
+	# -- Swap the traced register I/O functions in for this instance only.  Untraced
+	#     instances keep calling the plain class functions, so tracing costs nothing when off.
+		self._ReadRegister = self._TracedReadRegister
+		self._WriteRegister = self._TracedWriteRegister
+		self._ReadRegisterBlock = self._TracedReadRegisterBlock
+		self._WriteRegisterBlock = self._TracedWriteRegisterBlock
+		self._ReadRegisters = self._TracedReadRegisters
+		self._WriteRegisters = self._TracedWriteRegisters
+		return
+
+
+
+#
+# == Stop recording register accesses; the ring buffer is kept for DumpTrace() ==
+#
+	def DisableTrace(self):
+		for _sName in ("_ReadRegister", "_WriteRegister", "_ReadRegisterBlock", "_WriteRegisterBlock", "_ReadRegisters", "_WriteRegisters"):
+			self.__dict__.pop(_sName, None)
+		self._bTraceEcho = False
+		return
+
+
+
+#
+# == Return the recorded entries, oldest first ==
+#     Entries are (timestamp, direction, register, value, caller) tuples.  The direction is
+#     "R"/"W" for register reads/writes and "RB"/"WB" for block transfers, whose value is the data.
+#
+	def DumpTrace(self, bClear = False):
+		if ( self._lTraceRing == None ):
+			return []
+
+	# -- Unroll the ring from the oldest entry
+		_iDepth = len(self._lTraceRing)
+		if ( self._iTraceCount <= _iDepth ):
+			_lEntries = self._lTraceRing[:self._iTraceCount]
+		else:
+			_iHead = self._iTraceCount % _iDepth
+			_lEntries = self._lTraceRing[_iHead:] + self._lTraceRing[:_iHead]
+
+		if ( bClear == True ):
+			self._lTraceRing = [ None ] * _iDepth
+			self._iTraceCount = 0
+
+		return _lEntries
+
+
+
+#
+# == LOCAL: Record one trace entry ==
+#
+	def _Trace(self, sDirection, hRegisterAddr, hValue, sCaller):
+		_tEntry = ( time.time(), sDirection, hRegisterAddr, hValue, sCaller )
+		self._lTraceRing[ self._iTraceCount % len(self._lTraceRing) ] = _tEntry
+		self._iTraceCount += 1
+
+	# -- Echo the entry when debug printing is on
+		if ( self._bTraceEcho == True ):
+			if ( sDirection in ("RB", "WB") ):
+				print(sCaller + ": " + sDirection + " register " + str(hex(hRegisterAddr)) + " = " + str(len(hValue or [])) + " bytes")
+			elif ( hValue != None ):
+				print(sCaller + ": " + sDirection + " register " + str(hex(hRegisterAddr)) + "(" + str(bin(hRegisterAddr)) + ") = " + str(hex(hValue)) + "(" + str(bin(hValue)) + ")")
+		return
+
+
+
+#
+# == LOCAL: Traced variants of the register I/O functions ==
+#
+	def _TracedReadRegister(self, hRegisterAddr, bUseCache = True):
+		_hValue = SC16IS750._ReadRegister(self, hRegisterAddr, bUseCache)
+		self._Trace("R", hRegisterAddr, _hValue, sys._getframe(1).f_code.co_name)
+		return _hValue
+
+	def _TracedWriteRegister(self, hRegisterAddr, hValue, bReadVerifyWrite = True):
+		self._Trace("W", hRegisterAddr, hValue, sys._getframe(1).f_code.co_name)
+		return SC16IS750._WriteRegister(self, hRegisterAddr, hValue, bReadVerifyWrite)
+
+	def _TracedReadRegisterBlock(self, hRegisterAddr, iLength):
+		_aValues = SC16IS750._ReadRegisterBlock(self, hRegisterAddr, iLength)
+		self._Trace("RB", hRegisterAddr, _aValues, sys._getframe(1).f_code.co_name)
+		return _aValues
+
+	def _TracedWriteRegisterBlock(self, hRegisterAddr, aValues):
+		self._Trace("WB", hRegisterAddr, aValues, sys._getframe(1).f_code.co_name)
+		return SC16IS750._WriteRegisterBlock(self, hRegisterAddr, aValues)
+
+	def _TracedReadRegisters(self, lRegisterAddrs):
+		_lValues = SC16IS750._ReadRegisters(self, lRegisterAddrs)
+		_sCaller = sys._getframe(1).f_code.co_name
+		for _hRegisterAddr, _hValue in zip(lRegisterAddrs, _lValues or []):
+			self._Trace("R", _hRegisterAddr, _hValue, _sCaller)
+		return _lValues
+
+	def _TracedWriteRegisters(self, lRegisterValues):
+		_sCaller = sys._getframe(1).f_code.co_name
+		for _tWrite in lRegisterValues:
+			self._Trace("W", _tWrite[0], _tWrite[1], _sCaller)
+		return SC16IS750._WriteRegisters(self, lRegisterValues)
+
+
+
+
+# ----------------------------------------------------
+#   B U S   M E T R I C S
+# ----------------------------------------------------
+
+#
+# == Start counting bus transactions and timing the device I/O calls ==
+#     bPerMethod also attributes every transaction to the driver's public method that issued it; that
+#     walks the call stack on each device call, so it is off unless asked for.
+#
+	def EnableMetrics(self, bPerMethod = False):
+		if ( self._oMetrics == None ):
+			self._oMetrics = SC16IS750Metrics()
+
+	# -- Put the metering proxy between the driver and the device object
+		if ( isinstance(self._oDeviceInst, _SC16IS750MeteredDevice) == False ):
+			self._oDeviceInst = _SC16IS750MeteredDevice(self._oDeviceInst, self._oMetrics)
+		self._oDeviceInst._bPerMethod = bPerMethod
+		return
+
+
+
+#
+# == Stop collecting metrics; the last counts stay readable with GetMetrics() ==
+#
+	def DisableMetrics(self):
+		if ( isinstance(self._oDeviceInst, _SC16IS750MeteredDevice) == True ):
+			self._oDeviceInst = self._oDeviceInst._oDevice
+		return
+
+
+
+#
+# == Snapshot of the metrics as a plain dictionary ==
+#
+	def GetMetrics(self):
+		if ( self._oMetrics == None ):
+			return {}
+		return self._oMetrics.Snapshot()
+
+
+
+#
+# == Zero all metrics ==
+#
+	def ResetMetrics(self):
+		if ( self._oMetrics != None ):
+			self._oMetrics.Reset()
+		return
+
+
+
+
+# ----------------------------------------------------
+#   C L A S S   I N T E R N A L   R E G I S T E R
+#      S H A D O W   C A C H E   F U N C T I O N S
+# ----------------------------------------------------
+
+#
+# == Store a register value in the shadow cache ==
+#
+	def _CacheRegister(self, tCacheKey, hValue):
+	# -- FIFO reset flags FCR[1:2] clear themselves, so never keep them in the shadow
+		if ( tCacheKey == (SC16IS750_BANK_GENERAL, SC16IS750_REG_FCR) ):
+			hValue &= 0xf9
+
+		self._dRegCache[tCacheKey] = hValue
+
+	# -- The I/O pin registers are shared by the channels of a dual channel chip
+		if ( tCacheKey in SC16IS750_REG_CACHE_SHARED ):
+			for _oChannel in self._lChannels:
+				if ( ( _oChannel != None ) and ( _oChannel is not self ) ):
+					_oChannel._dRegCache[tCacheKey] = hValue
+
+	# -- Track the register bank selected by the LCR register
+		if ( tCacheKey == (SC16IS750_BANK_GENERAL, SC16IS750_REG_LCR) ):
+			if ( hValue == 0xbf ):
+				self._iRegBank = SC16IS750_BANK_LCR_0XBF
+			elif ( ( hValue & 0x80 ) > 0 ):
+				self._iRegBank = SC16IS750_BANK_LCR7
+			else:
+				self._iRegBank = SC16IS750_BANK_GENERAL
+
+		return
+
+
+
+#
+# == Look up the shadow copy of a register, or None if it is not held ==
+#
+	def _GetCachedRegister(self, iBank, hRegisterAddr):
+		return self._dRegCache.get((iBank, hRegisterAddr))
+
+
+
+#
+# == Reload the shadow cache with the chip's register state ==
+#
+	def Resync(self):
+		with self.Transaction():
+		# -- FCR is write only and cannot be read back; after a chip reset its old shadow copy would be wrong,
+		#     so it is left unknown and the next ApplyConfig() or SetFifo() writes it out
+			self._dRegCache = {}
+			self._iRegBank = None
+
+		# -- Read the current LCR register; this also selects the bank in the cache
+			_hRegLCR = self._ReadRegister(SC16IS750_REG_LCR, bUseCache = False)
+			if ( _hRegLCR == None ):	return False
+
+		# -- Read the general registers with LCR[7] cleared
+			if ( self._WriteRegister(SC16IS750_REG_LCR, (_hRegLCR & 0x7f)) == False ):	return False
+			for _hRegisterAddr in SC16IS750_REG_CACHE_GENERAL:
+				if ( _hRegisterAddr in (SC16IS750_REG_FCR, SC16IS750_REG_LCR) ):	continue
+				if ( self._ReadRegister(_hRegisterAddr, bUseCache = False) == None ):	return False
+
+		# -- Read the divisor latches with LCR[7] set (but not 0xBF)
+			_hRegLCR7 = (_hRegLCR | 0x80)
+			if ( _hRegLCR7 == 0xbf ):	_hRegLCR7 = 0x80
+			if ( self._WriteRegister(SC16IS750_REG_LCR, _hRegLCR7) == False ):	return False
+			for _hRegisterAddr in SC16IS750_REG_CACHE_LCR7:
+				if ( self._ReadRegister(_hRegisterAddr, bUseCache = False) == None ):	return False
+
+		# -- Read the enhanced registers with LCR = 0xBF
+			if ( self._WriteRegister(SC16IS750_REG_LCR, 0xbf) == False ):	return False
+			for _hRegisterAddr in SC16IS750_REG_CACHE_LCR_0XBF:
+				if ( self._ReadRegister(_hRegisterAddr, bUseCache = False) == None ):	return False
+
+		# -- Restore the LCR Register to the state it was found in
+			if ( self._WriteRegister(SC16IS750_REG_LCR, _hRegLCR) == False ):	return False
+
+		# -- The shadow cache matches the chip again
+			self._bRegCacheFault = False
+
+		# -- If everything worked, return True
+			return True
+
+
+
+#
+# == LOCAL: Check whether the shadow cache can still be trusted, at the cost of one LCR read ==
+#     A failed or unverified write leaves it in doubt; a chip reset or brown out since the last call shows as
+#     an LCR that differs from its shadow copy.
+#
+	def _RegisterCacheValid(self):
+		if ( self._bRegCacheFault == True ):
+			return False
+		for _tCacheKey in SC16IS750_REG_CONFIG_BASE_KEYS:
+			if ( self._dRegCache.get(_tCacheKey) == None ):
+				return False
+		_hRegLCRCached = self._dRegCache.get((SC16IS750_BANK_GENERAL, SC16IS750_REG_LCR))
+		return ( self._ReadRegister(SC16IS750_REG_LCR, bUseCache = False) == _hRegLCRCached )
+
+
+
+
+# ----------------------------------------------------
+#   C L A S S   I N T E R N A L   F U N C T I O N S
+# ----------------------------------------------------
+
+#
+# == LOCAL: Enable/Disable exposure of the Enhanced Register Set via LCR Register ==
+#     Call from within a Transaction(), which keeps the bank switch and its restore together.
+#
+	def _ExposeEnhancedRegisterSet(self, bExposeRegisterSet):
+	# -- Expose the Register Set
+		if ( (bExposeRegisterSet == True) and (self._hRegLCR == None) ):
+		# -- Read in the current LCR register
+			_hRegLCR = self._ReadRegister(SC16IS750_REG_LCR)
+
+		# -- Save the current LCR register state
+			self._hRegLCR = _hRegLCR
+
+		# -- Enable Enhanced Feature Register with LCR = 0xBF
+			if ( self._WriteRegister(SC16IS750_REG_LCR, 0xbf) == False ):	return False
+
+		elif ( (bExposeRegisterSet == False) and (self._hRegLCR != None) ):
+		# -- Retrieve the prior LCR register state
+			_hRegLCR = self._hRegLCR
+			self._hRegLCR = None
+
+		# -- Restore the LCR Register with to the previous state
+			if ( self._WriteRegister(SC16IS750_REG_LCR, _hRegLCR) == False ):	return False
+
+		else:
+		# -- Something was in the wrong state...
+			return False
+
+	# -- If everything worked, return True
+		return True
+
+
+
+#
+# == LOCAL: Enable/Disable the Enhanced Functions flag in the EFR register ==
+#
+	def _EnableEnhancedFunctionSet(self, bEnableAdvancedSet):
+		with self.Transaction():
+		# -- With LCR and EFR in the shadow cache: LCR = 0xBF, EFR and the LCR restore go out as one combined write
+			_hRegLCR = self._GetCachedRegister(SC16IS750_BANK_GENERAL, SC16IS750_REG_LCR)
+			_hRegEFR = self._GetCachedRegister(SC16IS750_BANK_LCR_0XBF, SC16IS750_REG_LCR_0XBF_EFR)
+			if ( ( self._hRegLCR == None ) and ( _hRegLCR != None ) and ( _hRegEFR != None ) and ( self._bRegCacheEnabled == True ) and ( _hRegLCR != 0xbf ) ):
+				if ( bEnableAdvancedSet == True ):
+					_hRegEFR |= 0x10
+				else:
+					_hRegEFR &= 0xef
+				return self._WriteRegisters(( (SC16IS750_REG_LCR, 0xbf), (SC16IS750_REG_LCR_0XBF_EFR, _hRegEFR), (SC16IS750_REG_LCR, _hRegLCR) ))
+
+		# -- Enable Enhanced Register access
+			if ( self._ExposeEnhancedRegisterSet(bExposeRegisterSet = True) == False ):	return False
+
+		# -- Read the EFR register
+			_hRegValue = self._ReadRegister(SC16IS750_REG_LCR_0XBF_EFR)
+
+		# -- Enable/Disable Enhanced Function Set with EFR[4]
+			if ( bEnableAdvancedSet == True ):
+				_hRegValue |= 0x10
+			else:
+				_hRegValue &= 0xef
+
+		# -- Write out the modified EFR register
+			if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_EFR, _hRegValue) == False ):	return False
+
+		# -- Disable Enhanced Register access
+			if ( self._ExposeEnhancedRegisterSet(bExposeRegisterSet = False) == False ):	return False
+
+		# -- If everything worked, return True
+			return True
+
+
+
+#
+# == LOCAL: Enable special GPIO[4:7] pins for Modem flow control signals ==
+#     On channel B of a dual channel chip the modem pins are GPIO[0:3], flagged at IOControl[2].
+#
+	def _SetGPIO47forModemFlowcontrol(self, bModemUse):
+		with self.Transaction():
+		# -- Read the IOControl register
+			_hRegValue = self._ReadRegister(SC16IS750_REG_IOCONTROL)
+
+		# -- Set the GPIO[4:7] Modem Pins flag at IOControl[1]
+			if ( bModemUse == True ):
+				_hRegValue |= SC16IS750_IOCONTROL_MODEM_PINS[self._iChannel]
+			else:
+				_hRegValue &= ( ~SC16IS750_IOCONTROL_MODEM_PINS[self._iChannel] & 0xff )
+
+		# -- Write out the modified IOControl register
+			if ( self._WriteRegister(SC16IS750_REG_IOCONTROL, _hRegValue) == False ):	return False
+
+		# -- If everything worked, return True
+			return True
+
+
+
+#
+# == LOCAL: Check that special GPIO[4:7] pins are set for Modem flow control signals ==
+#
+	def _CheckGPIO47forModemFlowcontrol(self):
+	# -- Read the IOControl register
+		_hRegIOC = self._ReadRegister(SC16IS750_REG_IOCONTROL)
+
+	# -- Check the GPIO[4:7] Modem Pins flag at IOControl[1]
+		if ( ( int(_hRegIOC) & SC16IS750_IOCONTROL_MODEM_PINS[self._iChannel] ) > 0 ):
+			if (self._bPrintDebug == True):	print("_CheckGPIO47forModemFlowcontrol: IOControl[1] = 1; Pins are for modem hardware flow control.")
+			return True
+		else:
+			if (self._bPrintDebug == True):	print("_CheckGPIO47forModemFlowcontrol: IOControl[1] = 0; Pins are in GPIO mode.")
+			return False
+
+	# -- If we fall through -- should never happen -- return false
+		return False
+
+
+
+
+# ----------------------------------------------------
+#   C H I P   S E T U P
+# ----------------------------------------------------
+
+#
+# == Issue a UART software reset to the chip ==
+#
+	def ResetDevice(self):
+		with self.Transaction():
+		# -- Read the IOControl register
+			_hRegValue = self._ReadRegister(SC16IS750_REG_IOCONTROL)
+
+		# -- Or in the software reset IOControl[3]
+			_hRegValue |= 0x08
+
+		# -- Write the reset bit - It will produce a write I/O error because the I2C bus
+		#     receives a NAK.  So we can't verify the write was successful.
+			self._WriteRegister(SC16IS750_REG_IOCONTROL, _hRegValue, bReadVerifyWrite = False)
+
+		# -- The reset covers the whole chip: seed every open channel's shadow cache with the reset values
+			for _oChannel in self._lChannels:
+				if ( _oChannel != None ):
+					_oChannel._SeedRegisterCache(bKeepShared = False)
+
+		# -- The reset clears the I/O pin output latch; the pin levels are unknown until read
+			self._dGpio["latch"] = 0x00
+			self._dGpio["state"] = None
+
+		# -- Assume everything worked, return True
+			return True
+
+
+
+#
+# == LOCAL: Seed the register shadow cache with the reset values, keeping the shared I/O pin registers ==
+#
+	def _SeedRegisterCache(self, bKeepShared = True):
+		_dShared = {}
+		for _oChannel in self._lChannels:
+			if ( bKeepShared == False ):	break
+			if ( ( _oChannel != None ) and ( _oChannel is not self ) and ( _oChannel._dRegCache != None ) ):
+				for _tCacheKey in SC16IS750_REG_CACHE_SHARED:
+					if ( _tCacheKey in _oChannel._dRegCache ):	_dShared[_tCacheKey] = _oChannel._dRegCache[_tCacheKey]
+				break
+		self._dRegCache = dict(SC16IS750_REG_RESET_VALUES)
+		self._dRegCache.update(_dShared)
+		self._iRegBank = SC16IS750_BANK_GENERAL
+		self._hRegLCR = None
+		self._bRegCacheFault = False
+		return
+
+
+
+#
+# == "Ping" the chip by a scratchpad (SPR) write and read test ==
+#
+	def Ping(self):
+		with self.Transaction():
+		# -- Write all bits high and verify read
+			self._WriteRegister(SC16IS750_REG_SPR, 0xFF, bReadVerifyWrite = False)
+			if (self._ReadRegister(SC16IS750_REG_SPR) != 0xFF):
+				return False
+
+		# -- Write 10101010 alternating bit pattern and verify read
+			self._WriteRegister(SC16IS750_REG_SPR, 0xAA, bReadVerifyWrite = False)
+			if (self._ReadRegister(SC16IS750_REG_SPR) != 0xAA):
+				return False
+
+		# -- Write 10000001 bookend bit pattern and verify read
+			self._WriteRegister(SC16IS750_REG_SPR, 0x81, bReadVerifyWrite = False)
+			if (self._ReadRegister(SC16IS750_REG_SPR) != 0x81):
+				return False
+
+		# -- We can read/write cleanly to scratch register, we can assume alive
+			return True
+
+
+
+#
+# == Place the IC into Sleep Mode to greatly reduce power consumption. (See Spec. 7.6) ==
+#
+	def SetSleepState(self, bDiscardRxBuffer = False):
+		with self.Transaction():
+		# -- Check that there is no data is in the RX buffer
+			if ( self.RxFifoBufferUsed() > 0 ):
+				if (self._bPrintDebug == True):	print("SetSleepState: Data present in RX buffer; Cannot sleep now.")
+				return False
+
+		# -- Check that there is no data is in the TX buffers
+			if ( self.GetLineStatus().thr_tsr_empty == False ):
+				if (self._bPrintDebug == True):	print("SetSleepState: Data present in TX hold or send buffers; Cannot sleep now.")
+				return False
+
+		# -- Enable enhanced function mode on EFR[4]
+			if ( self._EnableEnhancedFunctionSet(bEnableAdvancedSet = True) == False ):	return False
+
+		# -- Read in the current IER register
+			_hRegIER = self._ReadRegister(SC16IS750_REG_IER)
+
+		# -- Enable sleep mode with IER[4]
+			_hRegIER |= 0x10
+
+		# -- Write out the modified IER register
+			if ( self._WriteRegister(SC16IS750_REG_IER, _hRegIER) == False ):	return False
+
+		# -- If everything worked, return True
+			return True
+
+
+
+#
+# == Check if the IC is in Sleep Mode from the IER[4] register state ==
+#
+	def GetSleepState(self):
+	# -- Read in the current IER register
+		_hRegIER = self._ReadRegister(SC16IS750_REG_IER)
+
+	# -- Check if sleep mode bit is set on IER[4]
+		if ( ( int(_hRegIER) & (1 << 4) ) > 0 ):
+			if (self._bPrintDebug == True):	print("GetSleepState: UART sleeping.")
+			return True
+		else:
+			if (self._bPrintDebug == True):	print("GetSleepState: UART awake.")
+			return False
+
+
+
+#
+# == Wake the IC from Sleep Mode by de-asserting the IER[4] register state ==
+#
+	def SetWakeState(self):
+		with self.Transaction():
+		# -- Check if we are in a sleep state first
+			if ( self.GetSleepState() == False ):
+				if (self._bPrintDebug == True):	print("SetWakeState: UART not sleeping and already awake. Skipping wake protocol.")
+				return True
+
+		# -- Read in the current IER register
+			_hRegIER = self._ReadRegister(SC16IS750_REG_IER)
+
+		# -- Disable sleep mode with IER[4]
+			_hRegIER &= 0xef
+
+		# -- Write out the modified IER register
+			if ( self._WriteRegister(SC16IS750_REG_IER, _hRegIER) == False ):	return False
+
+		# -- If everything worked, return True
+			return True
+
+
+
+
+# ----------------------------------------------------
+#   U A R T   S E T U P
+# ----------------------------------------------------
+
+#
+# == Set the UART Wire Mode as RS-232 or Multidrop RS-485 (aka 9-bit mode) ==
+#
+	def SetMultidropMode(self, b9BitMode = False):
+		with self.Transaction():
+		# -- Read in the current EFCR register
+			_hRegEFCR = self._ReadRegister(SC16IS750_REG_EFCR)
+
+		# -- Modify the EFCR register as appropriate...
+			if ( b9BitMode == True ):
+			# -- Set the 9bit mode flag on EFCR[0]
+				_hRegEFCR |= 0x01
+				if (self._bPrintDebug == True):	print("SetMultidropMode: Setup in Multi-Drop RS-485 (aka 9-bit) mode.")
+			else:
+			# -- Clear the 9bit mode flag on EFCR[0]
+				_hRegEFCR &= 0xfe
+				if (self._bPrintDebug == True):	print("SetMultidropMode: Setup in RS-232 mode.")
+
+		# -- Write out the modified EFCR register
+			if ( self._WriteRegister(SC16IS750_REG_EFCR, _hRegEFCR) == False ):	return False
+
+		# -- If everything worked, return True
+			return True
+
+
+
+#
+# == Let the transmitter drive RTS as the RS-485 driver enable (auto direction) ==
+#     With bAutoRts the chip asserts RTS from the first start bit to the last stop bit of every
+#     transmission, so the host no longer toggles it around frames.  bInvertRts drives RTS high
+#     (instead of low) while transmitting, for transceivers with an active high driver enable.
+#
+	def SetRS485Direction(self, bAutoRts = True, bInvertRts = False):
+		with self.Transaction():
+		# -- Read in the current EFCR register
+			_hRegEFCR = self._ReadRegister(SC16IS750_REG_EFCR)
+
+		# -- Transmitter control of RTS on EFCR[4] and its polarity on EFCR[5]
+			_hRegEFCR &= ~( SC16IS750_EFCR_RTS_CONTROL | SC16IS750_EFCR_RTS_INVERT ) & 0xFF
+			if ( bAutoRts == True ):	_hRegEFCR |= SC16IS750_EFCR_RTS_CONTROL
+			if ( bInvertRts == True ):	_hRegEFCR |= SC16IS750_EFCR_RTS_INVERT
+
+		# -- Write out the modified EFCR register
+			if ( self._WriteRegister(SC16IS750_REG_EFCR, _hRegEFCR) == False ):	return False
+
+		# -- If everything worked, return True
+			return True
+
+
+
+#
+# == Receive only the RS-485 (9-bit) frames sent to hAddress; None turns the address match off ==
+#     Sets 9-bit mode (EFCR[0]) with space parity for data bytes, puts the address in XOFF2 with the
+#     special character detect (EFR[5]) and disables the receiver (EFCR[1]).  The chip discards
+#     everything until an address byte matching XOFF2 arrives; then it enables the receiver and puts the
+#     address byte in the RX FIFO, flagged by LSR[2].  The receiver stays on until RearmRS485Address().
+#     The address takes XOFF2, so the second XOn/XOff pair cannot be used at the same time.
+#
+	def SetRS485Address(self, hAddress):
+		with self.Transaction():
+		# -- Data bytes carry a 0 as the 9th bit: forced (space) parity on LCR[5:3]
+			if ( hAddress != None ):
+				_hRegLCR = self._ReadRegister(SC16IS750_REG_LCR)
+				if ( _hRegLCR == 0xbf ):	return False
+				_hRegLCR = ( _hRegLCR & 0xC7 ) | SC16IS750_LCR_PARITY['S']
+				if ( self._WriteRegister(SC16IS750_REG_LCR, _hRegLCR) == False ):	return False
+
+		# -- Enable Enhanced Register access
+			if ( self._ExposeEnhancedRegisterSet(bExposeRegisterSet = True) == False ):	return False
+
+		# -- The address to match goes in XOFF2; the match is on with EFR[5]
+			_hRegEFR = self._ReadRegister(SC16IS750_REG_LCR_0XBF_EFR)
+			if ( hAddress != None ):
+				if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_XOFF2, hAddress) == False ):	return False
+				_hRegEFR |= SC16IS750_EFR_SPECIAL_CHAR
+			else:
+				_hRegEFR &= ~SC16IS750_EFR_SPECIAL_CHAR & 0xFF
+			if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_EFR, _hRegEFR) == False ):	return False
+
+		# -- Disable Enhanced Register access
+			if ( self._ExposeEnhancedRegisterSet(bExposeRegisterSet = False) == False ):	return False
+
+		# -- 9-bit mode on EFCR[0]; the receiver waits for the address with EFCR[1], or is back on without the match
+			_hRegEFCR = self._ReadRegister(SC16IS750_REG_EFCR)
+			if ( hAddress != None ):
+				_hRegEFCR |= ( SC16IS750_EFCR_9BIT_MODE | SC16IS750_EFCR_RX_DISABLE )
+				if (self._bPrintDebug == True):	print("SetRS485Address: Receiving frames for address " + hex(hAddress) + " only.")
+			else:
+				_hRegEFCR &= ~SC16IS750_EFCR_RX_DISABLE & 0xFF
+			if ( self._WriteRegister(SC16IS750_REG_EFCR, _hRegEFCR) == False ):	return False
+
+		# -- If everything worked, return True
+			return True
+
+
+
+#
+# == Disable the receiver again until the next frame for this node's address ==
+#     Call once a frame has been taken (e.g. on the "rx-timeout" event).  The chip enables the receiver
+#     by itself on a match, so the shadow copy of EFCR[1] cannot be trusted and EFCR is always written.
+#
+	def RearmRS485Address(self):
+		with self.Transaction():
+			_hRegEFCR = self._GetCachedRegister(SC16IS750_BANK_GENERAL, SC16IS750_REG_EFCR)
+			if ( _hRegEFCR == None ):
+				_hRegEFCR = self._ReadRegister(SC16IS750_REG_EFCR)
+			return self._WriteRegister(SC16IS750_REG_EFCR, _hRegEFCR | SC16IS750_EFCR_RX_DISABLE, bReadVerifyWrite = False)
+
+
+
+#
+# == Bus quiet time between RS-485 frames at the current baud rate and line settings, in seconds ==
+#
+	def GetRS485Turnaround(self, fChars = SC16IS750_RS485_TURNAROUND_CHARS):
+		return max(fChars * self.GetCharTime(), SC16IS750_RS485_TURNAROUND_MIN_SEC)
+
+
+
+#
+# == Set the crystal frequency feeding XTAL; shared by the channels of a dual channel chip ==
+#     The baud rate is not reprogrammed; call SetBaudrate() or ApplyConfig() afterwards.
+#
+	def SetCrystal(self, iCrystalFreq):
+		for _oChannel in self._lChannels:
+			if ( _oChannel != None ):
+				_oChannel._iCrystalFreq = iCrystalFreq
+		return True
+
+
+
+#
+# == Set the largest relative baud rate error SetBaudrate() and ApplyConfig() accept ==
+#
+	def SetMaxBaudError(self, fMaxError = SC16IS750_BAUD_MAX_ERROR):
+		self._fMaxBaudError = fMaxError
+		return True
+
+
+
+#
+# == Prescaler, divisor and actual baud rate this instance would use for a baud rate; None if out of bounds ==
+#
+	def SolveBaudrate(self, iBaud):
+		return SC16IS750SolveBaudrate(iBaud, self._iCrystalFreq, self._fMaxBaudError)
+
+
+
+#
+# == Actual baud rate programmed into the chip ==
+#
+	def GetBaudrate(self):
+		return self._fBaudrate
+
+
+
+#
+# == Set the Baud rate for the UART ==
+#     The MCR[7] prescaler and the divisor are chosen for the least error; a rate that cannot be
+#     reached within SetMaxBaudError() is rejected.
+#
+	def SetBaudrate(self, iBaud):
+	# -- Solve for the prescaler and divisor
+		_tSolution = self.SolveBaudrate(iBaud)
+		if ( _tSolution == None ):
+			if (self._bPrintDebug == True):	print("SetBaudrate: Desired baudrate =" + str(iBaud) + " cannot be reached within " + str(self._fMaxBaudError * 100.0) + "% from a " + str(self._iCrystalFreq) + " Hz crystal.")
+			return False
+		_iClockDivisorPrescaler, _iClockDivisor, _fRealBaud = _tSolution
+
+		with self.Transaction():
+		# -- Check for sleep mode
+			_bSleepState = self.GetSleepState()
+			if ( _bSleepState == True ):
+			# -- Wake the chip for setting the baud rate
+				if ( self.SetWakeState() == False ):	return False
+
+		# -- Read the LCR register
+			_hRegLCR = self._ReadRegister(SC16IS750_REG_LCR)
+
+		# -- Check that the LCR register is not in the special 0xBF state, else exit.
+			if ( _hRegLCR == 0xbf ):
+				return False
+
+		# -- Set the clock divisor prescaler on MCR[7] (logic 0 = divide-by-1, logic 1 = divide-by-4); MCR[7] needs EFR[4] = 1
+			_hRegMCR = self._ReadRegister(SC16IS750_REG_MCR)
+			_hRegMCRTarget = _hRegMCR & 0x7f
+			if ( _iClockDivisorPrescaler == 4 ):	_hRegMCRTarget |= 0x80
+			if ( _hRegMCRTarget != _hRegMCR ):
+				if ( self._EnableEnhancedFunctionSet(bEnableAdvancedSet = True) == False ):	return False
+				if ( self._WriteRegister(SC16IS750_REG_MCR, _hRegMCRTarget) == False ):	return False
+
+		# -- Set LCR[7] to enable Divisor Latch and expose DLL & DLH registers
+			_hRegLCR |= 0x80
+			if ( self._WriteRegister(SC16IS750_REG_LCR, _hRegLCR) == False ):	return False
+
+		# -- Write the first 8bits of the calculated clock divisor to the divisor latch LSB register
+			if ( self._WriteRegister(SC16IS750_REG_LCR7_DLL, (_iClockDivisor & 0xff)) == False ):	return False
+
+		# -- Write the 8bit overflow of the calculated clock divisor to the divisor latch MSB register
+			if ( self._WriteRegister(SC16IS750_REG_LCR7_DLH, (_iClockDivisor>>8)) == False ):	return False
+
+		# -- Set LCR[7] to disable Divisor Latch again and return the remaining LCR register flags to their prior states
+			_hRegLCR = self._ReadRegister(SC16IS750_REG_LCR)
+			_hRegLCR &= 0x7F
+			if ( self._WriteRegister(SC16IS750_REG_LCR,_hRegLCR) == False ):	return False
+
+		# -- The difference between desired and actual baud rate, in parts per thousand
+			_eBaudError = (_fRealBaud - iBaud) * 1000.0 / iBaud
+
+		# -- Keep the actual rate for timing the FIFO polling
+			self._fBaudrate = _fRealBaud
+
+		# -- Print calculation debugging if enabled
+			if (self._bPrintDebug == True):	print("Desired baudrate =" + str(iBaud) + " ; Prescaler =" + str(_iClockDivisorPrescaler) + " ; Calculated divisor =" + str(_iClockDivisor) + " ; Actual baudrate =" + str(_fRealBaud) + " ; Baudrate error =" + str(_eBaudError) + " ;")
+
+		# -- If the chip was in sleep mode prior, return it to sleep state
+			if ( _bSleepState == True ):
+				if ( self.SetSleepState() == False ):	return False
+
+		# -- If everything worked, return True
+			return True
+
+
+
+#
+# == Set the line attributes for the UART ==
+#
+	def SetLine(self, iDataBits, sParityTyp, iStopBits):
+		with self.Transaction():
+		# -- Read the LCR register
+			_hRegLCR = self._ReadRegister(SC16IS750_REG_LCR)
+
+		# -- Check that the LCR register is not in the special 0xBF state, else exit.
+			if ( _hRegLCR == 0xbf ):
+				return False
+
+		# -- Setup a Clear bitted var for the LCR
+			_hRegLCR = 0x00;
+
+		# -- Set data length on LCR[1] and LCR[0]  (See spec table 15)
+			if   ( iDataBits == 8 ):
+				_hRegLCR |= 0x03
+			elif ( iDataBits == 7 ):
+				_hRegLCR |= 0x02
+			elif ( iDataBits == 6 ):
+				_hRegLCR |= 0x01
+			elif ( iDataBits == 5 ):
+				_hRegLCR |= 0x00
+			else:
+				return False
+
+		# -- Set the number of stop bits on LCR[2]  (See spec table 14)
+			if   ( iStopBits == 2 ):
+				_hRegLCR |= 0x04
+			elif ( iStopBits == 1 ):
+				_hRegLCR |= 0x00
+			else:
+				return False
+
+		# -- Set parity method on LCR[5], LCR[4], and LCR[3]  (See spec table 13)
+			sParityTyp = sParityTyp[:1]
+			sParityTyp = sParityTyp.upper()
+			if   ( sParityTyp == 'N' ):
+				_hRegLCR |= 0x00
+			elif ( sParityTyp == 'O' ):
+				_hRegLCR |= 0x08
+			elif ( sParityTyp == 'E' ):
+				_hRegLCR |= 0x18
+			elif ( sParityTyp == 'M' ):
+				_hRegLCR |= 0x28
+			elif ( sParityTyp == 'S' ):
+				_hRegLCR |= 0x38
+			else:
+				return False
+
+		# -- Write the line attributes into the LCR register
+			if ( self._WriteRegister(SC16IS750_REG_LCR, _hRegLCR) == False ):	return False
+
+		# -- Keep the character length on the wire (start + data + parity + stop bits) for timing the FIFO polling
+			self._fCharBits = 1.0 + iDataBits + iStopBits
+			if ( iDataBits == 5 and iStopBits == 2 ):
+				self._fCharBits -= 0.5
+			if ( sParityTyp != 'N' ):
+				self._fCharBits += 1.0
+
+		# -- If everything worked, return True
+			return True
+
+
+
+#
+# == Enable/Configure/Disable FIFO Buffers ==
+#
+	def SetFifo(self, bFifoEnable = True, iRxFifoTriggerSpaces = 8, iTxFifoTriggerSpaces = 0):
+		with self.Transaction():
+		# -- FCR is write only (a read returns IIR), so start from a clear bitted var
+			_hRegFCR = 0x00
+
+		# -- If both FIFO modes are False, we can just set the global FIFO flags to 0s
+			if ( bFifoEnable == False ):
+				if ( self._WriteRegister(SC16IS750_REG_FCR, 0x00, False) == True ):
+					return True
+				else:
+					return False
+
+		# -- If either FIFO mode is enabled, set the global FIFO flag on FCR[0]
+			_hRegFCR |= 0x01
+
+		# -- Check the trigger levels against the ones the chip offers before touching anything
+			if ( iRxFifoTriggerSpaces not in SC16IS750_FCR_RX_TRIGGERS ):
+				if (self._bPrintDebug == True):	print("Desired iRxFifoTriggerSpaces =" + str(iRxFifoTriggerSpaces) + " is not a valid input. Must be 8, 16, 56, or 60.")
+				return False
+			if ( ( iTxFifoTriggerSpaces > 0 ) and ( iTxFifoTriggerSpaces not in SC16IS750_FCR_TX_TRIGGERS ) ):
+				if (self._bPrintDebug == True):	print("Desired iTxFifoTriggerSpaces =" + str(iTxFifoTriggerSpaces) + " is not a valid input. Must be 8, 16, 32, or 56.")
+				return False
+
+		# -- Set the receive FIFO buffer on FCR[6:7]
+			_hRegFCR |= SC16IS750_FCR_RX_TRIGGERS[iRxFifoTriggerSpaces]
+
+		# -- See if TxFifo trigger spaces was defined
+			if ( iTxFifoTriggerSpaces > 0 ):
+			# -- Enable enhanced function set as this is required for Tx FIFO
+				if ( self._EnableEnhancedFunctionSet(bEnableAdvancedSet = True) == False ):	return False
+
+			# -- Set the transmit FIFO buffer on FCR[4:5]
+				_hRegFCR |= SC16IS750_FCR_TX_TRIGGERS[iTxFifoTriggerSpaces]
+
+		# -- Write out the modified FCR register
+			if ( self._WriteRegister(SC16IS750_REG_FCR, _hRegFCR, False) == False ):	return False
+
+		# -- Keep the trigger levels for timing the FIFO polling
+			self._iRxTriggerLevel = iRxFifoTriggerSpaces
+			self._iTxTriggerLevel = iTxFifoTriggerSpaces
+
+		# -- If everything worked, return True
+			return True
+
+
+
+#
+# == Enable the Automatic chip internal Hardware flow control with GPIO[4:7] control pins ==
+#
+	def SetAutoHardFlowcontrol(self):
+		with self.Transaction():
+			if (self._bPrintDebug == True):	print("SetAutoHardFlowcontrol: Enable Automatic Hardware Flow control.")
+		# -- Enable Enhanced Register access
+			if ( self._ExposeEnhancedRegisterSet(bExposeRegisterSet = True) == False ):	return False
+
+		# -- Read the EFR register
+			_hRegValue = self._ReadRegister(SC16IS750_REG_LCR_0XBF_EFR)
+
+		# -- Enable Auto RTS with EFR[6]
+			_hRegValue |= 0x40
+
+		# -- Enable Auto CTS with EFR[7]
+			_hRegValue |= 0x80
+
+		# -- Write out the modified EFR register
+			if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_EFR, _hRegValue) == False ):	return False
+
+		# -- Empty out the XON1 Register
+			if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_XON1, 0x00) == False ):	return False
+
+		# -- Empty out the XON2 Register
+			if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_XON2, 0x00) == False ):	return False
+
+		# -- Empty out the XOFF1 Register
+			if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_XOFF1, 0x00) == False ):	return False
+
+		# -- Empty out the XOFF2 Register
+			if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_XOFF2, 0x00) == False ):	return False
+
+		# -- Enable special GPIO[4:7] pins for Modem flow control signals
+			if ( self._SetGPIO47forModemFlowcontrol(bModemUse = True) == False ):	return False
+
+		# -- Disable Enhanced Register access
+			if ( self._ExposeEnhancedRegisterSet(bExposeRegisterSet = False) == False ):	return False
+
+		# -- If everything worked, return True
+			return True
+
+
+
+#
+# == Enable the Hardware flow control GPIO[4:7] control pins ==
+#
+	def SetHardFlowcontrol(self):
+		with self.Transaction():
+			if (self._bPrintDebug == True):	print("SetHardFlowcontrol: Enable Hardware Flow control.")
+		# -- Enable Enhanced Register access
+			if ( self._ExposeEnhancedRegisterSet(bExposeRegisterSet = True) == False ):	return False
+
+		# -- Read the EFR register
+			_hRegValue = self._ReadRegister(SC16IS750_REG_LCR_0XBF_EFR)
+
+		# -- Disable Auto RTS with EFR[6]
+			_hRegValue &= 0xbf
+
+		# -- Disable Auto CTS with EFR[7]
+			_hRegValue &= 0x7f
+
+		# -- Write out the modified EFR register
+			if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_EFR, _hRegValue) == False ):	return False
+
+		# -- Empty out the XON1 Register
+			if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_XON1, 0x00) == False ):	return False
+
+		# -- Empty out the XON2 Register
+			if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_XON2, 0x00) == False ):	return False
+
+		# -- Empty out the XOFF1 Register
+			if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_XOFF1, 0x00) == False ):	return False
+
+		# -- Empty out the XOFF2 Register
+			if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_XOFF2, 0x00) == False ):	return False
+
+		# -- Enable special GPIO[4:7] pins for Modem flow control signals
+			if ( self._SetGPIO47forModemFlowcontrol(bModemUse = True) == False ):	return False
+
+		# -- Disable Enhanced Register access
+			if ( self._ExposeEnhancedRegisterSet(bExposeRegisterSet = False) == False ):	return False
+
+		# -- If everything worked, return True
+			return True
+
+
+
+#
+# == Enable the Software flow control and define XOn/XOff fields ==
+#
+	def SetSoftFlowcontrol(self, bTxXOnOff, bRxXOnOff, hXOn1 = 0x11, hXOff1 = 0x13, hXOn2 = None, hXOff2 = None):
+		with self.Transaction():
+			if (self._bPrintDebug == True):	print("SetSoftFlowcontrol: Enable Software Flow control.")
+		# -- Make sure we have sane input before proceeding
+			if ( (hXOn1 == None) and (hXOff1 == None) and (hXOn2 == None) and (hXOff2 == None) ):
+				if (self._bPrintDebug == True):	print("SetSoftFlowcontrol: Invalid input.  No XOn/XOff chars defined.")
+				return False
+
+		# -- Enable Enhanced Register access
+			if ( self._ExposeEnhancedRegisterSet(bExposeRegisterSet = True) == False ):	return False
+
+		# -- Read the EFR register
+			_hRegEFR = self._ReadRegister(SC16IS750_REG_LCR_0XBF_EFR)
+
+		# -- Disable Auto RTS with EFR[6]
+			_hRegEFR &= 0xbf
+
+		# -- Disable Auto CTS with EFR[7]
+			_hRegEFR &= 0x7f
+
+		# -- Reset EFR[0:3]
+			_hRegEFR &= 0xF0
+
+		# -- Enable software flow control method required with EFR[0:3]
+			if   ( (bTxXOnOff == True) and (hXOn1 != None) and (hXOff1 != None) ):
+				_hRegEFR |= 0x08
+				if (self._bPrintDebug == True):	print("SetSoftFlowcontrol: TX On for XON/XOFF 1.")
+			if   ( (bTxXOnOff == True) and (hXOn2 != None) and (hXOff2 != None) ):
+				_hRegEFR |= 0x04
+				if (self._bPrintDebug == True):	print("SetSoftFlowcontrol: TX On for XON/XOFF 2.")
+			if   ( (bRxXOnOff == True) and (hXOn1 != None) and (hXOff1 != None) ):
+				_hRegEFR |= 0x02
+				if (self._bPrintDebug == True):	print("SetSoftFlowcontrol: RX On for XON/XOFF 1.")
+			if   ( (bRxXOnOff == True) and (hXOn2 != None) and (hXOff2 != None) ):
+				_hRegEFR |= 0x01
+				if (self._bPrintDebug == True):	print("SetSoftFlowcontrol: RX On for XON/XOFF 2.")
+
+		# -- Write out the modified EFR register
+			if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_EFR, _hRegEFR) == False ):	return False
+
+		# -- If defined, write out the XON1 Register
+			if ( hXOn1 != None ):
+				if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_XON1, hXOn1) == False ):	return False
+
+		# -- If defined, write out the XON2 Register
+			if ( hXOn2 != None ):
+				if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_XON2, hXOn2) == False ):	return False
+
+		# -- If defined, write out the XOFF1 Register
+			if ( hXOff1 != None ):
+				if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_XOFF1, hXOff1) == False ):	return False
+
+		# -- If defined, write out the XOFF2 Register
+			if ( hXOff2 != None ):
+				if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_XOFF2, hXOff2) == False ):	return False
+
+		# -- Disable special GPIO[4:7] pins for Modem flow control signals
+			if ( self._SetGPIO47forModemFlowcontrol(bModemUse = False) == False ):	return False
+
+		# -- Disable Enhanced Register access
+			if ( self._ExposeEnhancedRegisterSet(bExposeRegisterSet = False) == False ):	return False
+
+		# -- If everything worked, return True
+			return True
+
+
+
+#
+# == Disable all flow control methods ==
+#
+	def SetNoFlowcontrol(self):
+		with self.Transaction():
+		# -- Enable Enhanced Register access
+			if ( self._ExposeEnhancedRegisterSet(bExposeRegisterSet = True) == False ):	return False
+
+		# -- Read the EFR register
+			_hRegEFR = self._ReadRegister(SC16IS750_REG_LCR_0XBF_EFR)
+
+		# -- Disable all bits in EFR except EFR[4:5]
+			_hRegEFR &= 0x30
+
+		# -- Write out the modified EFR register
+			if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_EFR, _hRegEFR) == False ):	return False
+
+		# -- Empty out the XON1 Register
+			if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_XON1, 0x00) == False ):	return False
+
+		# -- Empty out the XON2 Register
+			if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_XON2, 0x00) == False ):	return False
+
+		# -- Empty out the XOFF1 Register
+			if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_XOFF1, 0x00) == False ):	return False
+
+		# -- Empty out the XOFF2 Register
+			if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_XOFF2, 0x00) == False ):	return False
+
+		# -- Disable special GPIO[4:7] pins for Modem flow control signals
+			if ( self._SetGPIO47forModemFlowcontrol(bModemUse = False) == False ):	return False
+
+		# -- Disable Enhanced Register access
+			if ( self._ExposeEnhancedRegisterSet(bExposeRegisterSet = False) == False ):	return False
+
+		# -- If everything worked, return True
+			return True
+
+
+
+
+# ----------------------------------------------------
+#   C O N F I G U R A T I O N   P L A N N E R
+# ----------------------------------------------------
+
+#
+# == Apply a complete UART configuration with the fewest register writes ==
+#     The target register image is compared with the shadow cache and only the differences are
+#     written, grouped by register bank, in one combined transfer where the device handle allows.
+#     bResync = True reloads the cache from the chip first.  The default, None, reloads it only when it
+#     is incomplete, after a failed register write, or when one LCR read shows the chip lost its
+#     settings (a reset or brown out).  bResync = False trusts the cache without any read.
+#
+	def ApplyConfig(self, oConfig, bResync = None):
+		with self.Transaction():
+		# -- Modified registers need a known current value
+			if ( bResync == None ):
+				bResync = ( self._RegisterCacheValid() == False )
+			elif ( None in [ self._dRegCache.get(_tCacheKey) for _tCacheKey in SC16IS750_REG_CONFIG_BASE_KEYS ] ):
+				bResync = True
+			if ( bResync == True ):
+				if ( self.Resync() == False ):	return False
+
+			_tPlan = self._PlanConfig(oConfig)
+			if ( _tPlan == None ):
+				if (self._bPrintDebug == True):	print("ApplyConfig: Invalid configuration " + repr(oConfig))
+				return False
+			_lWrites, _fRealBaud, _fCharBits = _tPlan
+			if (self._bPrintDebug == True):	print("ApplyConfig: " + str(len(_lWrites)) + " register writes; actual baudrate = " + str(_fRealBaud))
+
+			if ( len(_lWrites) > 0 ):
+				if ( self._WriteRegisters(_lWrites) == False ):	return False
+
+		# -- Keep the line settings for timing the FIFO polling
+			self._fBaudrate = _fRealBaud
+			self._fCharBits = _fCharBits
+			if ( oConfig.bFifoEnable == True ):
+				self._iRxTriggerLevel = oConfig.iRxTrigger
+				self._iTxTriggerLevel = oConfig.iTxTrigger
+			self._oConfig = oConfig
+
+		# -- If everything worked, return True
+			return True
+
+
+
+#
+# == The register writes ApplyConfig() would issue, as ( register, value, verify ) tuples; None if invalid ==
+#
+	def PlanConfig(self, oConfig):
+		with self._oBusLock:
+			_tPlan = self._PlanConfig(oConfig)
+		if ( _tPlan == None ):
+			return None
+		return _tPlan[0]
+
+
+
+#
+# == The configuration last applied by ApplyConfig() or Connect() ==
+#
+	def GetConfig(self):
+		return self._oConfig
+
+
+
+#
+# == LOCAL: Plan a configuration against the shadow cache; returns ( writes, actual baud rate, bits per character ) ==
+#
+	def _PlanConfig(self, oConfig):
+	# -- Check the settings
+		_sParity = str(oConfig.eParity)[:1].upper()
+		_sFlowControl = str(oConfig.eFlowControl)[:4].upper()
+		if ( ( oConfig.iDataBits not in SC16IS750_LCR_DATA_BITS ) or ( oConfig.iStopBits not in SC16IS750_LCR_STOP_BITS ) or ( _sParity not in SC16IS750_LCR_PARITY ) ):
+			return None
+		if ( ( _sFlowControl not in ( "NONE", "SOFT", "HARD", "AUTO" ) ) or ( oConfig.iBaudRate <= 0 ) ):
+			return None
+		if ( ( oConfig.bFifoEnable == True ) and ( ( oConfig.iRxTrigger not in SC16IS750_FCR_RX_TRIGGERS ) or ( ( oConfig.iTxTrigger > 0 ) and ( oConfig.iTxTrigger not in SC16IS750_FCR_TX_TRIGGERS ) ) ) ):
+			return None
+		for _iLevel in ( oConfig.iTcrHalt, oConfig.iTcrResume, oConfig.iTlrRx, oConfig.iTlrTx ):
+			if ( ( _iLevel != None ) and ( ( _iLevel < 0 ) or ( _iLevel > 60 ) or ( ( _iLevel % 4 ) != 0 ) ) ):
+				return None
+	# -- The RS-485 address match takes XOFF2, so it cannot go with the second XOn/XOff pair; 9-bit data goes out with space parity
+		_hAddress = oConfig.hRS485Address
+		if ( _hAddress != None ):
+			if ( ( _sFlowControl == "SOFT" ) and ( oConfig.hXOff2 != None ) ):
+				return None
+			_sParity = 'S'
+		_dCurrent = self._dRegCache
+
+	# -- LCR: line settings; the characters on the wire are start + data + parity + stop bits
+		_hRegLCR = SC16IS750_LCR_DATA_BITS[oConfig.iDataBits] | SC16IS750_LCR_STOP_BITS[oConfig.iStopBits] | SC16IS750_LCR_PARITY[_sParity]
+		_fCharBits = 1.0 + oConfig.iDataBits + oConfig.iStopBits
+		if ( ( oConfig.iDataBits == 5 ) and ( oConfig.iStopBits == 2 ) ):	_fCharBits -= 0.5
+		if ( _sParity != 'N' ):	_fCharBits += 1.0
+
+	# -- MCR[7] prescaler, DLL & DLH divisor: the solver's pick for the least error
+		_tSolution = self.SolveBaudrate(oConfig.iBaudRate)
+		if ( _tSolution == None ):
+			return None
+		_iClockDivisorPrescaler, _iClockDivisor, _fRealBaud = _tSolution
+		_hRegMCRNow = _dCurrent[(SC16IS750_BANK_GENERAL, SC16IS750_REG_MCR)]
+		_hRegMCR = _hRegMCRNow & 0x7f
+		if ( _iClockDivisorPrescaler == 4 ):	_hRegMCR |= 0x80
+
+	# -- EFR & XOn/XOff: flow control as the Set*Flowcontrol() functions set it up
+		_hRegEFR = _dCurrent[(SC16IS750_BANK_LCR_0XBF, SC16IS750_REG_LCR_0XBF_EFR)]
+		_lXOnOff = [ 0x00, 0x00, 0x00, 0x00 ]
+		_bModemPins = False
+		if ( _sFlowControl == "NONE" ):
+			_hRegEFR &= 0x30
+		elif ( _sFlowControl == "SOFT" ):
+			_hRegEFR &= 0x30
+			if ( ( oConfig.hXOn1 != None ) and ( oConfig.hXOff1 != None ) ):	_hRegEFR |= 0x0A
+			if ( ( oConfig.hXOn2 != None ) and ( oConfig.hXOff2 != None ) ):	_hRegEFR |= 0x05
+			_lXOnOff = [ oConfig.hXOn1, oConfig.hXOn2, oConfig.hXOff1, oConfig.hXOff2 ]
+		elif ( _sFlowControl == "HARD" ):
+			_hRegEFR &= 0x3F
+			_bModemPins = True
+		else:
+			_hRegEFR |= 0xC0
+			_bModemPins = True
+
+	# -- EFR[5] & XOFF2: the RS-485 address match
+		_hRegEFR &= ~SC16IS750_EFR_SPECIAL_CHAR & 0xFF
+		if ( _hAddress != None ):
+			_hRegEFR |= SC16IS750_EFR_SPECIAL_CHAR
+			_lXOnOff[3] = _hAddress
+
+	# -- FCR: FIFO enable and trigger levels; a TX trigger level, TCR and TLR need the enhanced functions (EFR[4])
+		_hRegFCR = 0x00
+		if ( oConfig.bFifoEnable == True ):
+			_hRegFCR = 0x01 | SC16IS750_FCR_RX_TRIGGERS[oConfig.iRxTrigger]
+			if ( oConfig.iTxTrigger > 0 ):
+				_hRegFCR |= SC16IS750_FCR_TX_TRIGGERS[oConfig.iTxTrigger]
+				_hRegEFR |= 0x10
+		_hRegTCR = None
+		if ( ( oConfig.iTcrHalt != None ) or ( oConfig.iTcrResume != None ) ):
+			_hRegTCR = ( ( ( oConfig.iTcrResume or 0 ) // 4 ) << 4 ) | ( ( oConfig.iTcrHalt or 0 ) // 4 )
+		_hRegTLR = None
+		if ( ( oConfig.iTlrRx != None ) or ( oConfig.iTlrTx != None ) ):
+			_hRegTLR = ( ( ( oConfig.iTlrRx or 0 ) // 4 ) << 4 ) | ( ( oConfig.iTlrTx or 0 ) // 4 )
+		if ( ( _hRegTCR != None ) or ( _hRegTLR != None ) or ( _hRegMCR != _hRegMCRNow ) ):
+			_hRegEFR |= 0x10
+
+	# -- EFCR: RS-485 multidrop (9-bit) mode on EFCR[0], auto direction on EFCR[4:5], and the receiver held off
+	#     on EFCR[1] when the address match is turned on or moved;  IOControl: this channel's modem pins flag
+		_hRegEFCRNow = _dCurrent[(SC16IS750_BANK_GENERAL, SC16IS750_REG_EFCR)]
+		_hRegEFCR = _hRegEFCRNow & ~( SC16IS750_EFCR_9BIT_MODE | SC16IS750_EFCR_RTS_CONTROL | SC16IS750_EFCR_RTS_INVERT ) & 0xFF
+		if ( ( oConfig.bRS485Mode == True ) or ( _hAddress != None ) ):	_hRegEFCR |= SC16IS750_EFCR_9BIT_MODE
+		if ( oConfig.bRS485AutoRts == True ):	_hRegEFCR |= SC16IS750_EFCR_RTS_CONTROL
+		if ( oConfig.bRS485InvertRts == True ):	_hRegEFCR |= SC16IS750_EFCR_RTS_INVERT
+		_bAddressMatchNow = ( ( _dCurrent[(SC16IS750_BANK_LCR_0XBF, SC16IS750_REG_LCR_0XBF_EFR)] & SC16IS750_EFR_SPECIAL_CHAR ) > 0 )
+		if ( ( _hAddress != None ) and ( ( _bAddressMatchNow == False ) or ( _dCurrent.get((SC16IS750_BANK_LCR_0XBF, SC16IS750_REG_LCR_0XBF_XOFF2)) != _hAddress ) ) ):
+			_hRegEFCR |= SC16IS750_EFCR_RX_DISABLE
+		elif ( ( _hAddress == None ) and ( _bAddressMatchNow == True ) ):
+			_hRegEFCR &= ~SC16IS750_EFCR_RX_DISABLE & 0xFF
+		_hRegIOC = _dCurrent[(SC16IS750_BANK_GENERAL, SC16IS750_REG_IOCONTROL)] & ( ~SC16IS750_IOCONTROL_MODEM_PINS[self._iChannel] & 0xff )
+		if ( _bModemPins == True ):	_hRegIOC |= SC16IS750_IOCONTROL_MODEM_PINS[self._iChannel]
+
+	# -- Steps in order, as ( bank, register, value, verify ); unchanged registers are left out
+		_lSteps = []
+		def _AddStep(iBank, hRegisterAddr, hValue, bVerify = True, bAlways = False):
+			if ( ( hValue != None ) and ( ( bAlways == True ) or ( _dCurrent.get((iBank, hRegisterAddr)) != hValue ) ) ):
+				_lSteps.append(( iBank, hRegisterAddr, hValue, bVerify ))
+
+	# -- The divisor latches are only written with the chip awake (IER[4] = 0)
+		_hRegIER = _dCurrent[(SC16IS750_BANK_GENERAL, SC16IS750_REG_IER)]
+		_bDivisorChange = ( ( _dCurrent.get((SC16IS750_BANK_LCR7, SC16IS750_REG_LCR7_DLL)) != ( _iClockDivisor & 0xFF ) ) or ( _dCurrent.get((SC16IS750_BANK_LCR7, SC16IS750_REG_LCR7_DLH)) != ( _iClockDivisor >> 8 ) ) )
+		_bWake = ( ( _bDivisorChange or ( _hRegMCR != _hRegMCRNow ) ) and ( ( _hRegIER & 0x10 ) > 0 ) )
+		if ( _bWake == True ):	_AddStep(SC16IS750_BANK_GENERAL, SC16IS750_REG_IER, _hRegIER & 0xef)
+
+	# -- Enhanced bank first: EFR[4] unlocks the FCR, MCR, TCR and TLR bits written later
+		_AddStep(SC16IS750_BANK_LCR_0XBF, SC16IS750_REG_LCR_0XBF_EFR, _hRegEFR)
+		for _hRegisterAddr, _hValue in zip(( SC16IS750_REG_LCR_0XBF_XON1, SC16IS750_REG_LCR_0XBF_XON2, SC16IS750_REG_LCR_0XBF_XOFF1, SC16IS750_REG_LCR_0XBF_XOFF2 ), _lXOnOff):
+			_AddStep(SC16IS750_BANK_LCR_0XBF, _hRegisterAddr, _hValue)
+
+	# -- Divisor latches
+		if ( _bDivisorChange == True ):
+			_AddStep(SC16IS750_BANK_LCR7, SC16IS750_REG_LCR7_DLL, _iClockDivisor & 0xFF)
+			_AddStep(SC16IS750_BANK_LCR7, SC16IS750_REG_LCR7_DLH, _iClockDivisor >> 8)
+
+	# -- General bank; FCR is write only, so its shadow copy cannot be checked and it is always written,
+	#     and TCR & TLR are reached with MCR[2] = 1 for just as long as needed
+		_AddStep(SC16IS750_BANK_GENERAL, SC16IS750_REG_MCR, _hRegMCR)
+		_AddStep(SC16IS750_BANK_GENERAL, SC16IS750_REG_FCR, _hRegFCR, bVerify = False, bAlways = True)
+		_AddStep(SC16IS750_BANK_GENERAL, SC16IS750_REG_EFCR, _hRegEFCR)
+		_AddStep(SC16IS750_BANK_GENERAL, SC16IS750_REG_IOCONTROL, _hRegIOC)
+		if ( ( _hRegTCR != None ) or ( _hRegTLR != None ) ):
+			_AddStep(SC16IS750_BANK_GENERAL, SC16IS750_REG_MCR, _hRegMCR | 0x04, bAlways = True)
+			_AddStep(SC16IS750_BANK_GENERAL, SC16IS750_REG_TCR, _hRegTCR, bAlways = True)
+			_AddStep(SC16IS750_BANK_GENERAL, SC16IS750_REG_TLR, _hRegTLR, bAlways = True)
+			_AddStep(SC16IS750_BANK_GENERAL, SC16IS750_REG_MCR, _hRegMCR, bAlways = True)
+		if ( _bWake == True ):	_AddStep(SC16IS750_BANK_GENERAL, SC16IS750_REG_IER, _hRegIER, bAlways = True)
+
+	# -- Switch banks through LCR only where the bank changes, and leave LCR holding the line settings
+		_hRegLCR7 = _hRegLCR | 0x80
+		if ( _hRegLCR7 == 0xbf ):	_hRegLCR7 = 0x80
+		_dBankLCR = { SC16IS750_BANK_GENERAL:_hRegLCR, SC16IS750_BANK_LCR7:_hRegLCR7, SC16IS750_BANK_LCR_0XBF:0xbf }
+		_iBank = self._iRegBank
+		_hRegLCRNow = _dCurrent.get((SC16IS750_BANK_GENERAL, SC16IS750_REG_LCR))
+		_lWrites = []
+		for _iStepBank, _hRegisterAddr, _hValue, _bVerify in _lSteps:
+			if ( _iStepBank != _iBank ):
+				_lWrites.append(( SC16IS750_REG_LCR, _dBankLCR[_iStepBank], True ))
+				_iBank = _iStepBank
+				_hRegLCRNow = _dBankLCR[_iStepBank]
+			_lWrites.append(( _hRegisterAddr, _hValue, _bVerify ))
+		if ( _hRegLCRNow != _hRegLCR ):
+			_lWrites.append(( SC16IS750_REG_LCR, _hRegLCR, True ))
+
+		return ( _lWrites, _fRealBaud, _fCharBits )
+
+
+
+# ----------------------------------------------------
+#   U A R T   T I M I N G   F U N C T I O N S
+# ----------------------------------------------------
+
+#
+# == Set the CPU versus latency trade-off for blocking waits on the FIFOs ==
+#     fCpuFactor is the fraction of the expected arrival (or drain) time to sleep before polling again:
+#     0.0 polls every fMinPollSec (lowest latency, most bus traffic and CPU), 1.0 sleeps until the data is due.
+#
+	def SetPollPolicy(self, fCpuFactor = 0.5, fMinPollSec = SC16IS750_POLL_MIN_SEC, fMaxPollSec = SC16IS750_POLL_MAX_SEC):
+	# -- Check the inputs are sensible
+		if ( ( fCpuFactor < 0.0 ) or ( fCpuFactor > 1.0 ) ):
+			if (self._bPrintDebug == True):	print("SetPollPolicy: fCpuFactor =" + str(fCpuFactor) + " is not a valid input. Must be 0.0 to 1.0.")
+			return False
+		if ( ( fMinPollSec < 0.0 ) or ( fMaxPollSec < fMinPollSec ) ):
+			if (self._bPrintDebug == True):	print("SetPollPolicy: Poll interval bounds are not valid.")
+			return False
+
+		self._fPollCpuFactor = fCpuFactor
+		self._fPollMinSec = fMinPollSec
+		self._fPollMaxSec = fMaxPollSec
+
+	# -- If everything worked, return True
+		return True
+
+
+
+#
+# == Time one character takes on the wire at the configured baud rate and line settings, in seconds ==
+#
+	def GetCharTime(self):
+		return ( self._fCharBits / self._fBaudrate )
+
+
+
+#
+# == Sleep before polling again for iBytes more received bytes ==
+#     Waits for no more than the RX trigger level, so the FIFO cannot overflow while sleeping.
+#
+	def GetRxWaitInterval(self, iBytes = 1):
+		return self._PollInterval(min(iBytes, max(self._iRxTriggerLevel, 1)))
+
+
+
+#
+# == Sleep before polling again for iSpaces free transmit FIFO spaces ==
+#     Waits for no more than the TX trigger level (or half the FIFO), so the transmitter does not run dry while sleeping.
+#
+	def GetTxWaitInterval(self, iSpaces = 1):
+		_iTriggerLevel = self._iTxTriggerLevel
+		if ( _iTriggerLevel <= 0 ):
+			_iTriggerLevel = SC16IS750_FIFO_SIZE // 2
+		return self._PollInterval(min(iSpaces, _iTriggerLevel))
+
+
+
+#
+# == LOCAL: Poll interval for iChars characters to cross the line, scaled by the CPU factor and bounded ==
+#
+	def _PollInterval(self, iChars):
+		_fWaitSec = max(iChars, 1) * self.GetCharTime() * self._fPollCpuFactor
+		return min(max(_fWaitSec, self._fPollMinSec), self._fPollMaxSec)
+
+
+
+#
+# == LOCAL: Sleep one poll interval without passing the deadline; False once the deadline has passed ==
+#
+	def _SleepUntilPoll(self, fIntervalSec, fDeadline):
+		if ( fDeadline != None ):
+			_fRemaining = fDeadline - time.time()
+			if ( _fRemaining <= 0 ):
+				return False
+			fIntervalSec = min(fIntervalSec, _fRemaining)
+		time.sleep(fIntervalSec)
+		return True
+
+
+
+
+# ----------------------------------------------------
+#   U A R T   O P E R A T I O N S   F U N C T I O N S
+# ----------------------------------------------------
+
+#
+# == Clear and Reset the Transmit FIFO Buffer ==
+#
+	def ResetTxFifoBuffer(self):
+	# -- FCR is write only (a read returns IIR), so take the FCR register from the shadow cache
+		_hRegFCR = self._GetCachedRegister(SC16IS750_BANK_GENERAL, SC16IS750_REG_FCR)
+		if ( _hRegFCR == None ):	_hRegFCR = 0x00
+
+	# -- Set the TX FIFO buffer clear flag on FCR[2]
+		_hRegFCR |= 0x04
+
+	# -- Write out the modified IOControl register
+		if ( self._WriteRegister(SC16IS750_REG_FCR, _hRegFCR, False) == False ):	return False
+
+	# -- FIFO reset requires at least two XTAL1 clock cycles; the next bus transaction takes far longer than that
+
+	# -- If everything worked, return True
+		return True
+
+
+
+#
+# == Clear and Reset the Receive FIFO Buffer ==
+#
+	def ResetRxFifoBuffer(self):
+	# -- FCR is write only (a read returns IIR), so take the FCR register from the shadow cache
+		_hRegFCR = self._GetCachedRegister(SC16IS750_BANK_GENERAL, SC16IS750_REG_FCR)
+		if ( _hRegFCR == None ):	_hRegFCR = 0x00
+
+	# -- Set the RX FIFO buffer clear flag on FCR[1]
+		_hRegFCR |= 0x02
+
+	# -- Write out the modified IOControl register
+		if ( self._WriteRegister(SC16IS750_REG_FCR, _hRegFCR, False) == False ):	return False
+
+	# -- FIFO reset requires at least two XTAL1 clock cycles; the next bus transaction takes far longer than that
+
+	# -- If everything worked, return True
+		return True
+
+
+
+#
+# == Find how much data has been received into the FIFO Receive Buffer ==
+#
+	def RxFifoBufferUsed(self):
+	# -- Read the RXLVL register
+		_hFifoBufferBytes = self._ReadRegister(SC16IS750_REG_RXLVL)
+		_iFifoBufferBytes = int(_hFifoBufferBytes)
+
+	# -- Return the value
+		return _iFifoBufferBytes
+
+
+
+#
+# == Find how much space is available in the FIFO Transmit Buffer to write to ==
+#
+	def TxFifoBufferAvailable(self):
+	# -- Read the TXLVL register
+		_hFifoBufferBytes = self._ReadRegister(SC16IS750_REG_TXLVL)
+		_iFifoBufferBytes = int(_hFifoBufferBytes)
+
+	# -- Return the value
+		return _iFifoBufferBytes
+
+
+
+#
+# == LOCAL: Transmit FIFO space open to writers; none while WriteRS485Frame() holds THR for an address byte ==
+#     Call with the bus lock held, so the check and the THR write that follows go together.
+#
+	def _TxFifoSpace(self, iFifoBufferSpace = None):
+		if ( self._bRS485FrameHold == True ):
+			return 0
+		if ( iFifoBufferSpace == None ):
+			iFifoBufferSpace = self.TxFifoBufferAvailable()
+		return iFifoBufferSpace
+
+
+
+#
+# == Read the Line Status flags ==
+#     Returns an SC16IS750LineStatus: attributes like .thr_empty, or status['thr-empty'] as before.
+#
+	def GetLineStatus(self):
+	# -- Read in the current LSR register
+		_hRegLSR = self._ReadRegister(SC16IS750_REG_LSR)
+		if ( _hRegLSR == None ):	return None
+
+	# -- Wrap the raw byte; the flags are decoded on access
+		return SC16IS750LineStatus(_hRegLSR)
+
+
+
+#
+# == Read the Modem Status flags ==
+#     Returns an SC16IS750ModemStatus: attributes like .cts_high, or status['cts-high'] as before.
+#
+	def GetModemStatus(self):
+	# -- Read in the current MSR register
+		_hRegMSR = self._ReadRegister(SC16IS750_REG_MSR)
+		if ( _hRegMSR == None ):	return None
+
+	# -- MSR[7:5] are only modem inputs with the Modem Pins (GPIO[4:7]) flag at IOControl[1]; IOControl comes from the shadow cache
+		return SC16IS750ModemStatus(_hRegMSR, self._ModemPinsEnabled())
+
+
+
+#
+# == Read the line status, modem status and both FIFO levels together ==
+#
+	def GetStatusSnapshot(self):
+		with self.Transaction():
+			_lValues = self._ReadRegisters(( SC16IS750_REG_LSR, SC16IS750_REG_MSR, SC16IS750_REG_RXLVL, SC16IS750_REG_TXLVL ))
+			if ( ( _lValues == None ) or ( None in _lValues ) ):	return None
+			_hRegLSR, _hRegMSR, _hRegRXLVL, _hRegTXLVL = _lValues
+
+			return SC16IS750StatusSnapshot(SC16IS750LineStatus(_hRegLSR), SC16IS750ModemStatus(_hRegMSR, self._ModemPinsEnabled()), _hRegRXLVL, _hRegTXLVL)
+
+
+
+#
+# == LOCAL: Modem Pins (GPIO[4:7]) flag at IOControl[1]; IOControl is host owned, so this is served from the shadow cache ==
+#
+	def _ModemPinsEnabled(self):
+		return ( ( self._ReadRegister(SC16IS750_REG_IOCONTROL) & SC16IS750_IOCONTROL_MODEM_PINS[self._iChannel] ) != 0 )
+
+
+
+#
+# == Set/Release the line break state ==
+#
+	def SetLineBreak(self, bBreakConditionSet):
+		with self.Transaction():
+		# -- Read in the current LCR register
+			_hRegLCR = self._ReadRegister(SC16IS750_REG_LCR)
+
+		# -- Modify the LCR register as appropriate...
+			if ( bBreakConditionSet == True ):
+			# -- Set the break flag on LCR[6]
+				_hRegLCR |= 0x40
+			else:
+			# -- Clear the break flag on LCR[6]
+				_hRegLCR &= 0xbf
+
+		# -- Write out the modified LCR register
+			if ( self._WriteRegister(SC16IS750_REG_LCR, _hRegLCR) == False ):	return False
+
+		# -- If everything worked, return True
+			return True
+
+
+
+#
+# == Set the Modem RTS Status flag ==
+#
+	def SetModemRTS(self, bRtsLow):
+		with self.Transaction():
+		# -- RTS is a dedicated pin (not one of GPIO[4:7]), so it does not need the modem pins enabled
+		# -- Read in the current MCR register
+			_hRegMCR = self._ReadRegister(SC16IS750_REG_MCR)
+
+		# -- Modify the MCR register as appropriate...
+			if ( bRtsLow == True ):
+			# -- Set RTS flag active (logic 1; LOW) on MCR[1]
+				_hRegMCR |= 0x02
+			else:
+			# -- Set RTS flag inactive (logic 0; HIGH) on MCR[1]
+				_hRegMCR &= 0xfd
+
+		# -- Write out the modified MCR register
+			if ( self._WriteRegister(SC16IS750_REG_MCR, _hRegMCR) == False ):	return False
+
+		# -- If everything worked, return True
+			return True
+
+
+
+#
+# == Set the Modem DTR Status flag ==
+#
+	def SetModemDTR(self, bDtrLow):
+		with self.Transaction():
+		# -- Check that hardware flow control pins are enabled first
+			if ( self._CheckGPIO47forModemFlowcontrol() == False ):
+				return False
+
+		# -- Read in the current MCR register
+			_hRegMCR = self._ReadRegister(SC16IS750_REG_MCR)
+
+		# -- Modify the MCR register as appropriate...
+			if ( bDtrLow == True ):
+			# -- Set DTR flag active (logic 1; LOW) on MCR[0]
+				_hRegMCR |= 0x01
+			else:
+			# -- Set DTR flag inactive (logic 0; HIGH) on MCR[0]
+				_hRegMCR &= 0xfe
+
+		# -- Write out the modified MCR register
+			if ( self._WriteRegister(SC16IS750_REG_MCR, _hRegMCR) == False ):	return False
+
+		# -- If everything worked, return True
+			return True
+
+
+
+
+# ----------------------------------------------------
+#   U A R T   F R O N T - E N D   F U N C T I O N S
+# ----------------------------------------------------
+
+#
+# == Connect Wrapper Function to simplify use... ==
+#     Only the registers that differ from the shadow cache are written.  The cache is reloaded from the chip
+#     when it is in doubt (see ApplyConfig()), so a chip that was reset since the last call is programmed
+#     again; bResync = True always reloads it, bResync = False trusts it without any read.
+#
+	def Connect(self, iBaudRate = 9600, eParity = 'N', iDataBits = 8, iStopBits = 1, eFlowControl = 'NONE', bRS485Mode = False, bResync = None):
+		if (self._bPrintDebug == True):	print("Connect: INIT iBaudRate = " + str(iBaudRate) + " ; eParity = " + str(eParity) + " ; iDataBits = " + str(iDataBits) + " ; iStopBits = " + str(iStopBits) + " ; eFlowControl = " + str(eFlowControl) + " ; bRS485Mode = " + str(bRS485Mode) + " ;")
+
+	# -- One planned write sequence for mode, baud rate, line, FIFO and flow control
+		return self.ApplyConfig(SC16IS750UartConfig(iBaudRate, eParity, iDataBits, iStopBits, eFlowControl, bRS485Mode), bResync = bResync)
+
+
+
+#
+# == Write a Hex defined Byte to the UART ==
+#     Without bDieOnNoTxBufferSpace it waits for transmit FIFO space, for at most fTimeoutSec when given.
+#
+	def WriteByte(self, hValue, bDieOnNoTxBufferSpace = False, fTimeoutSec = None):
+		_fDeadline = None
+		if ( fTimeoutSec != None ):	_fDeadline = time.time() + fTimeoutSec
+
+		while ( True ):
+		# -- The space check and the write go together; the lock is not held while sleeping
+			with self._oBusLock:
+			# -- Check if there is transmit hold buffer space available to write to
+				if ( self._TxFifoSpace() > 0 ):
+				# -- Write the data byte to the THR Register
+					if ( self._WriteRegister(SC16IS750_REG_THR, hValue, bReadVerifyWrite = False) == False ):	return False
+
+				# -- If everything worked, return True
+					return True
+
+		# -- If requested, fail out if there is no space to write
+			if ( bDieOnNoTxBufferSpace == True ):
+				if (self._bPrintDebug == True):	print("WriteByte: No available space in transmit hold buffer. Aborting on request.")
+				return False
+
+		# -- Else, sleep about one character time between polls until the transmit FIFO has space
+			if ( self._SleepUntilPoll(self.GetTxWaitInterval(1), _fDeadline) == False ):
+				if (self._bPrintDebug == True):	print("WriteByte: Timeout waiting for transmit hold buffer space.")
+				return False
+
+
+
+#
+# == Write a buffer of bytes to the UART, filling the transmit FIFO with block writes ==
+#
+	def WriteBytes(self, aData, bBlocking = True, fTimeoutSec = None):
+	# -- Take one copy of the data so it can be sliced into FIFO sized blocks
+		_aData = bytearray(aData)
+		_iDataLen = len(_aData)
+		_iSentBytes = 0
+
+	# -- Work out when to give up if a timeout was requested
+		_fDeadline = None
+		if ( fTimeoutSec != None ):
+			_fDeadline = time.time() + fTimeoutSec
+
+		while ( _iSentBytes < _iDataLen ):
+		# -- The level read and the block write go together; the lock is not held while sleeping
+			with self._oBusLock:
+			# -- Check how much transmit FIFO space is available; one TXLVL read per block
+				_iFifoBufferSpace = self._TxFifoSpace()
+
+				if ( _iFifoBufferSpace > 0 ):
+				# -- Send as much as fits in the FIFO to the THR Register in one block write
+					_aBlock = _aData[_iSentBytes:(_iSentBytes + _iFifoBufferSpace)]
+					if ( self._WriteRegisterBlock(SC16IS750_REG_THR, _aBlock) == False ):
+						if (self._bPrintDebug == True):	print("WriteBytes: Block write to THR failed after " + str(_iSentBytes) + " bytes.")
+						return _iSentBytes
+					_iSentBytes += len(_aBlock)
+
+		# -- Non-blocking mode only does one pass; return what was written
+			if ( ( bBlocking == False ) or ( _iSentBytes >= _iDataLen ) ):
+				break
+
+		# -- Sleep until the FIFO is expected to have drained enough for the rest, or stop at the timeout
+			if ( self._SleepUntilPoll(self.GetTxWaitInterval(_iDataLen - _iSentBytes), _fDeadline) == False ):
+				if (self._bPrintDebug == True):	print("WriteBytes: Timeout with " + str(_iSentBytes) + " of " + str(_iDataLen) + " bytes written.")
+				break
+
+	# -- Return the number of bytes written
+		return _iSentBytes
+
+
+
+#
+# == Send one RS-485 frame: an optional 9-bit address byte, then the data ==
+#     Starts no sooner than the turnaround (GetRS485Turnaround) after the end of the last frame sent, so
+#     the other nodes have released the bus.  The address byte goes out with mark parity (9th bit 1); the
+#     data keeps the line settings, which have space parity (9th bit 0) once SetRS485Address() or
+#     hRS485Address has set up 9-bit mode.  THR is held for the frame from the first wait to the parity
+#     restore, so no other writer of this channel can put a byte under the 9th bit; the bus lock is only
+#     held for the register accesses, not while waiting for the transmitter to empty, so other devices on
+#     the bus carry on.  LCR is restored on every exit.  Returns the number of data bytes written, as
+#     WriteBytes().
+#
+	def WriteRS485Frame(self, aData, hAddress = None, fTimeoutSec = None):
+		_fDeadline = None
+		if ( fTimeoutSec != None ):
+			_fDeadline = time.time() + fTimeoutSec
+
+	# -- Keep the bus quiet for the turnaround after the previous frame
+		_fWaitSec = self._fRS485FrameEnd + self.GetRS485Turnaround() - time.time()
+		if ( _fWaitSec > 0.0 ):
+			if ( self._SleepUntilPoll(_fWaitSec, _fDeadline) == False ):	return 0
+
+		_aData = bytearray(aData)
+		_iSentBytes = 0
+		if ( hAddress != None ):
+		# -- Hold THR for this frame; another frame of this channel finishes first
+			while ( True ):
+				with self._oBusLock:
+					if ( self._bRS485FrameHold == False ):
+						self._bRS485FrameHold = True
+						break
+				if ( self._SleepUntilPoll(self.GetTxWaitInterval(1), _fDeadline) == False ):	return 0
+
+			_hRegLCR = None
+			try:
+			# -- Bytes already queued by other writers leave with the line settings first
+				if ( self._WaitTxIdle(_fDeadline) == False ):
+					if (self._bPrintDebug == True):	print("WriteRS485Frame: Timeout waiting for the transmitter to empty.")
+					return 0
+
+			# -- Address byte with the 9th bit set: mark parity on LCR[5:3]
+				with self.Transaction():
+					_hRegLCRFound = self._ReadRegister(SC16IS750_REG_LCR)
+					if ( ( _hRegLCRFound == None ) or ( _hRegLCRFound == 0xbf ) ):	return 0
+					_hRegLCR = _hRegLCRFound
+					if ( self._WriteRegister(SC16IS750_REG_LCR, ( _hRegLCR & 0xC7 ) | SC16IS750_LCR_PARITY['M']) == False ):	return 0
+					if ( self._WriteRegister(SC16IS750_REG_THR, hAddress, bReadVerifyWrite = False) == False ):	return 0
+
+			# -- The address has to leave the shift register before the parity changes back
+				if ( self._WaitTxIdle(_fDeadline) == False ):
+					if (self._bPrintDebug == True):	print("WriteRS485Frame: Timeout sending the address byte.")
+					return 0
+
+			# -- Restore the line settings and start the data straight after the address
+				with self.Transaction():
+					_bRestored = self._WriteRegister(SC16IS750_REG_LCR, _hRegLCR)
+					_hRegLCR = None
+					self._bRS485FrameHold = False
+					if ( _bRestored == False ):	return 0
+					_iSentBytes = self.WriteBytes(_aData, bBlocking = False)
+			finally:
+			# -- Restore the line settings, whichever way the address went, and release THR
+				with self.Transaction():
+					if ( _hRegLCR != None ):
+						self._WriteRegister(SC16IS750_REG_LCR, _hRegLCR)
+					self._bRS485FrameHold = False
+
+	# -- The rest of the data, then note when the last of it (at most a FIFO full) will have left the chip
+		if ( _iSentBytes < len(_aData) ):
+			_fRemainingSec = None
+			if ( _fDeadline != None ):
+				_fRemainingSec = max(_fDeadline - time.time(), 0.0)
+			_iSentBytes += self.WriteBytes(_aData[_iSentBytes:], fTimeoutSec = _fRemainingSec)
+		self._fRS485FrameEnd = time.time() + min(_iSentBytes, SC16IS750_FIFO_SIZE) * self.GetCharTime()
+		return _iSentBytes
+
+
+
+#
+# == LOCAL: Wait for the transmit FIFO and shift register to empty (LSR[6]); False at the deadline ==
+#
+	def _WaitTxIdle(self, fDeadline):
+		while True:
+			_hRegLSR = self._ReadRegister(SC16IS750_REG_LSR)
+			if ( _hRegLSR == None ):
+				return False
+			if ( ( _hRegLSR & 0x40 ) > 0 ):
+				return True
+			if ( self._SleepUntilPoll(self.GetTxWaitInterval(1), fDeadline) == False ):
+				return False
+
+
+
+#
+# == Read a Hex defined Byte to the UART ==
+#     Without bDieOnNoRxBufferData it waits for data, for at most fTimeoutSec when given (returns None on timeout).
+#
+	def ReadByte(self, bDieOnNoRxBufferData = True, fTimeoutSec = None):
+	# -- Check if there is data in the receive buffer to read
+		if ( self.RxFifoBufferUsed() == 0 ):
+		# -- If requested, fail out if there is nothing to read
+			if ( bDieOnNoRxBufferData == True ):
+				if (self._bPrintDebug == True):	print("ReadByte: No data available in buffer to read. Aborting on request.")
+				return None
+			else:
+		# -- Else, sleep about one character time between polls until the receive buffer is not empty
+				if (self._bPrintDebug == True):	print("ReadByte: No data available in buffer to read. Waiting for RXLVL > 0.")
+				_fDeadline = None
+				if ( fTimeoutSec != None ):	_fDeadline = time.time() + fTimeoutSec
+				while ( self.RxFifoBufferUsed() == 0 ):
+					if ( self._SleepUntilPoll(self.GetRxWaitInterval(1), _fDeadline) == False ):
+						if (self._bPrintDebug == True):	print("ReadByte: Timeout waiting for data.")
+						return None
+
+	# -- Read the data byte from the RHR Register
+		hValue = self._ReadRegister(SC16IS750_REG_RHR)
+
+	# -- If everything worked, return the value
+		return hValue
+
+
+
+#
+# == Read bytes from the receive FIFO with one block transaction per drain ==
+#     Non-blocking by default: returns whatever is waiting.  With bBlocking it keeps draining until
+#     iMaxLen bytes have arrived or fTimeoutSec has passed, and returns what it has.  A blocking read
+#     needs iMaxLen to know when it is done: without one it raises SC16IS750Error.
+#
+	def ReadBytes(self, iMaxLen = None, bBlocking = False, fTimeoutSec = None):
+	# -- A blocking read needs to know when it is done
+		if ( bBlocking == True ):
+			if ( iMaxLen == None ):
+				raise SC16IS750Error("ReadBytes: a blocking read needs iMaxLen")
+			_aBuffer = bytearray(iMaxLen)
+			_iReadBytes = self.ReadInto(_aBuffer, bBlocking, fTimeoutSec)
+			if ( _iReadBytes == None ):	return None
+			return bytes(_aBuffer[:_iReadBytes])
+
+	# -- The level read and the block read go together
+		with self._oBusLock:
+		# -- Check how much data is waiting in the receive buffer; one RXLVL read per drain
+			_iFifoBufferBytes = self.RxFifoBufferUsed()
+
+		# -- Limit the drain to the requested maximum length
+			if ( ( iMaxLen != None ) and ( _iFifoBufferBytes > iMaxLen ) ):
+				_iFifoBufferBytes = iMaxLen
+
+		# -- Nothing to read, return an empty result
+			if ( _iFifoBufferBytes <= 0 ):
+				return bytes()
+
+		# -- Pull the bytes from the RHR Register in one block read
+			_aData = self._ReadRegisterBlock(SC16IS750_REG_RHR, _iFifoBufferBytes)
+			if ( _aData == None ):	return None
+
+	# -- If everything worked, return the bytes
+		return bytes(_aData)
+
+
+
+#
+# == Read the receive FIFO into a caller supplied buffer with one block transaction per drain ==
+#     Non-blocking by default: fills what is waiting.  With bBlocking it keeps draining until the
+#     buffer is full or fTimeoutSec has passed.  Returns the number of bytes placed in the buffer, or
+#     None if a block read failed before any were.
+#
+	def ReadInto(self, aBuffer, bBlocking = False, fTimeoutSec = None):
+		_iBufferLen = len(aBuffer)
+		_iReadBytes = 0
+
+	# -- Work out when to give up if a timeout was requested
+		_fDeadline = None
+		if ( fTimeoutSec != None ):
+			_fDeadline = time.time() + fTimeoutSec
+
+		while ( True ):
+		# -- The level read and the block read go together; the lock is not held while sleeping
+			with self._oBusLock:
+			# -- Check how much data is waiting in the receive buffer; one RXLVL read per drain
+				_iFifoBufferBytes = self.RxFifoBufferUsed()
+
+			# -- Limit the drain to the space left in the buffer
+				if ( _iFifoBufferBytes > ( _iBufferLen - _iReadBytes ) ):
+					_iFifoBufferBytes = _iBufferLen - _iReadBytes
+
+				_aData = None
+				if ( _iFifoBufferBytes > 0 ):
+				# -- Pull the bytes from the RHR Register in one block read
+					_aData = self._ReadRegisterBlock(SC16IS750_REG_RHR, _iFifoBufferBytes)
+					if ( _aData == None ):
+					# -- Keep the count of what earlier drains already placed in the buffer
+						if (self._bPrintDebug == True):	print("ReadInto: Block read from RHR failed after " + str(_iReadBytes) + " bytes.")
+						if ( _iReadBytes > 0 ):	return _iReadBytes
+						return None
+
+		# -- Copy the block into the caller's buffer in a single slice assignment
+			if ( _aData != None ):
+				_iDrained = len(_aData)
+				if ( _iReadBytes == 0 ):
+					aBuffer[:_iDrained] = _aData
+				else:
+					memoryview(aBuffer)[_iReadBytes:(_iReadBytes + _iDrained)] = _aData
+				_iReadBytes += _iDrained
+
+		# -- Non-blocking mode only does one pass
+			if ( ( bBlocking == False ) or ( _iReadBytes >= _iBufferLen ) ):
+				break
+
+		# -- Sleep until the rest is expected to have arrived, or stop at the timeout
+			if ( self._SleepUntilPoll(self.GetRxWaitInterval(_iBufferLen - _iReadBytes), _fDeadline) == False ):
+				if (self._bPrintDebug == True):	print("ReadInto: Timeout with " + str(_iReadBytes) + " of " + str(_iBufferLen) + " bytes read.")
+				break
+
+	# -- If everything worked, return the number of bytes placed in the buffer
+		return _iReadBytes
+
+
+
+
+# ----------------------------------------------------
+#   B A C K G R O U N D   R X   P U M P
+# ----------------------------------------------------
+
+#
+# == Start a background thread draining the receive FIFO into a host side ring buffer ==
+#
+	def StartRxPump(self, iBufferSize = 4096, iHighWater = None, fnHighWater = None, fPollSec = None):
+	# -- Only one pump per device
+		if ( ( self._oRxPumpThread != None ) and ( self._oRxPumpThread.is_alive() == True ) ):
+			if (self._bPrintDebug == True):	print("StartRxPump: RX pump already running.")
+			return False
+		if ( self._oScheduler != None ):
+			if (self._bPrintDebug == True):	print("StartRxPump: Device is served by a bus scheduler.")
+			return False
+		if ( ( self._oIrqThread != None ) and ( self._oIrqThread.is_alive() == True ) ):
+			if (self._bPrintDebug == True):	print("StartRxPump: Device is served in IRQ mode.")
+			return False
+
+	# -- Preallocate the ring buffer; a restart with the same size keeps the buffered data
+		if ( ( self._oRxRing == None ) or ( self._oRxRing.Size() != iBufferSize ) ):
+			self._oRxRing = SC16IS750RingBuffer(iBufferSize)
+			self._iRxPumpDropped = 0
+
+	# -- High-water callback fnHighWater(device, bytes buffered), called when the level crosses iHighWater
+		self._iRxPumpHighWater = iHighWater
+		self._fnRxPumpHighWater = fnHighWater
+	# -- Idle poll interval; None polls at the baud rate aware interval for the RX trigger level
+		self._fRxPumpPollSec = fPollSec
+
+	# -- Start the pump thread
+		self._oRxPumpError = None
+		self._oRxPumpStop = threading.Event()
+		self._oRxPumpThread = threading.Thread(target = self._RxPumpRun, name = "SC16IS750-RxPump")
+		self._oRxPumpThread.daemon = True
+		self._oRxPumpThread.start()
+		return True
+
+
+
+#
+# == Stop the RX pump; returns once the thread has finished its last bus transaction ==
+#
+	def StopRxPump(self, fTimeoutSec = None):
+		if ( self._oRxPumpThread == None ):
+			return True
+
+		self._oRxPumpStop.set()
+		self._oRxPumpThread.join(fTimeoutSec)
+		if ( self._oRxPumpThread.is_alive() == True ):
+			return False
+
+		self._oRxPumpThread = None
+		return True
+
+
+
+#
+# == Read bytes buffered by the RX pump (no bus access) ==
+#
+	def RxPumpRead(self, iMaxLen = None):
+		if ( self._oRxRing == None ):
+			return bytes()
+		return self._oRxRing.Read(iMaxLen)
+
+
+
+#
+# == Read bytes buffered by the RX pump into a caller supplied buffer (no bus access) ==
+#
+	def RxPumpReadInto(self, aBuffer):
+		if ( self._oRxRing == None ):
+			return 0
+		return self._oRxRing.ReadInto(aBuffer)
+
+
+
+#
+# == Number of bytes buffered by the RX pump ==
+#
+	def RxPumpAvailable(self):
+		if ( self._oRxRing == None ):
+			return 0
+		return self._oRxRing.Used()
+
+
+
+#
+# == Number of received bytes dropped because the ring buffer was full ==
+#
+	def RxPumpDropped(self):
+		return self._iRxPumpDropped
+
+
+
+#
+# == LOCAL: Drain the receive FIFO into the ring buffer once; returns the bytes drained ==
+#
+	def _RxPumpDrain(self, iFifoBufferBytes = None):
+		if ( iFifoBufferBytes == None ):
+		# -- One RXLVL read, then one block read of everything waiting
+			_aData = self.ReadBytes()
+		elif ( iFifoBufferBytes > 0 ):
+		# -- The RXLVL level is already known; one block read
+			_aData = self._ReadRegisterBlock(SC16IS750_REG_RHR, iFifoBufferBytes)
+		else:
+			return 0
+		if ( ( _aData == None ) or ( len(_aData) == 0 ) ):
+			return 0
+
+	# -- The FIFO has been drained either way; whatever does not fit in the ring is dropped
+		_iStored = self._oRxRing.Write(_aData)
+		if ( _iStored < len(_aData) ):
+			self._iRxPumpDropped += ( len(_aData) - _iStored )
+
+	# -- Notify when the buffered level crosses the high-water mark
+		if ( ( self._fnRxPumpHighWater != None ) and ( self._iRxPumpHighWater != None ) ):
+			_iUsed = self._oRxRing.Used()
+			if ( ( _iUsed >= self._iRxPumpHighWater ) and ( ( _iUsed - _iStored ) < self._iRxPumpHighWater ) ):
+				self._fnRxPumpHighWater(self, _iUsed)
+
+		return len(_aData)
+
+
+
+#
+# == LOCAL: RX pump thread body ==
+#
+	def _RxPumpRun(self):
+		try:
+			while ( self._oRxPumpStop.is_set() == False ):
+			# -- Poll again straight away while data keeps arriving; otherwise wait
+				if ( self._RxPumpDrain() == 0 ):
+					_fPollSec = self._fRxPumpPollSec
+					if ( _fPollSec == None ):	_fPollSec = self.GetRxWaitInterval(SC16IS750_FIFO_SIZE)
+					self._oRxPumpStop.wait(_fPollSec)
+		except Exception as _oError:
+			self._oRxPumpError = _oError
+			if (self._bPrintDebug == True):	print("_RxPumpRun: RX pump stopped on error: " + str(_oError))
+		return
+
+
+
+
+# ----------------------------------------------------
+#   B U F F E R E D   T X   W R I T E R
+# ----------------------------------------------------
+
+#
+# == Start a background thread sending queued data in FIFO sized bursts ==
+#     eFullPolicy selects what TxWriterWrite() does when the queue is full:
+#     'BLOCK' waits for space, 'RAISE' raises SC16IS750BufferFull, 'DROP' drops the oldest queued bytes.
+#
+	def StartTxWriter(self, iQueueSize = 4096, eFullPolicy = "BLOCK", fPollSec = None):
+	# -- Only one writer per device
+		if ( ( self._oTxWriterThread != None ) and ( self._oTxWriterThread.is_alive() == True ) ):
+			if (self._bPrintDebug == True):	print("StartTxWriter: TX writer already running.")
+			return False
+		if ( self._oScheduler != None ):
+			if (self._bPrintDebug == True):	print("StartTxWriter: Device is served by a bus scheduler.")
+			return False
+		if ( ( self._oIrqThread != None ) and ( self._oIrqThread.is_alive() == True ) ):
+			if (self._bPrintDebug == True):	print("StartTxWriter: Device is served in IRQ mode.")
+			return False
+
+	# -- Check for a sane policy
+		eFullPolicy = eFullPolicy[:5].upper()
+		if ( eFullPolicy not in ("BLOCK", "RAISE", "DROP") ):
+			if (self._bPrintDebug == True):	print("StartTxWriter: Invalid queue full policy " + str(eFullPolicy) + ". Must be BLOCK, RAISE, or DROP.")
+			return False
+		self._eTxWriterFullPolicy = eFullPolicy
+
+	# -- Preallocate the queue; a restart with the same size keeps the queued data
+		if ( ( self._oTxQueue == None ) or ( self._oTxQueue.Size() != iQueueSize ) ):
+			self._oTxQueue = SC16IS750RingBuffer(iQueueSize)
+			self._iTxWriterDropped = 0
+		if ( self._oTxWriterCondition == None ):
+			self._oTxWriterCondition = threading.Condition()
+	# -- FIFO poll interval; None polls at the baud rate aware interval for the TX trigger level
+		self._fTxWriterPollSec = fPollSec
+
+	# -- Start the writer thread
+		self._oTxWriterError = None
+		self._oTxWriterStop = threading.Event()
+		self._oTxWriterThread = threading.Thread(target = self._TxWriterRun, name = "SC16IS750-TxWriter")
+		self._oTxWriterThread.daemon = True
+		self._oTxWriterThread.start()
+		return True
+
+
+
+#
+# == Stop the TX writer, optionally sending everything queued first ==
+#
+	def StopTxWriter(self, bDrain = False, fTimeoutSec = None):
+		if ( self._oTxWriterThread == None ):
+			return True
+
+		if ( bDrain == True ):
+			self.TxWriterDrain(fTimeoutSec)
+
+		self._oTxWriterStop.set()
+		with self._oTxWriterCondition:
+			self._oTxWriterCondition.notify_all()
+		self._oTxWriterThread.join(fTimeoutSec)
+		if ( self._oTxWriterThread.is_alive() == True ):
+			return False
+
+		self._oTxWriterThread = None
+		return True
+
+
+
+#
+# == Queue data for the TX writer and return straight away; returns the number of bytes queued ==
+#
+	def TxWriterWrite(self, aData, fTimeoutSec = None):
+		if ( self._oTxQueue == None ):
+			return 0
+		_aData = bytearray(aData)
+		_iDataLen = len(_aData)
+		_iQueued = 0
+
+		with self._oTxWriterCondition:
+		# -- RAISE: queue all of the data or none of it
+			if ( ( self._eTxWriterFullPolicy == "RAISE" ) and ( _iDataLen > self._oTxQueue.Free() ) ):
+				raise SC16IS750BufferFull("TX writer queue full: " + str(self._oTxQueue.Free()) + " bytes free, " + str(_iDataLen) + " bytes offered")
+
+		# -- DROP: make room by discarding the oldest queued bytes
+			if ( self._eTxWriterFullPolicy == "DROP" ):
+				if ( _iDataLen > self._oTxQueue.Size() ):
+					self._iTxWriterDropped += ( _iDataLen - self._oTxQueue.Size() )
+					_aData = _aData[(_iDataLen - self._oTxQueue.Size()):]
+				_iShortfall = len(_aData) - self._oTxQueue.Free()
+				if ( _iShortfall > 0 ):
+					self._iTxWriterDropped += self._oTxQueue.Discard(_iShortfall)
+				_iQueued = self._oTxQueue.Write(_aData)
+				self._oTxWriterCondition.notify_all()
+				self._TxServiceWake()
+				return _iQueued
+
+		# -- BLOCK: queue what fits and wait for the writer to free more space
+			if ( fTimeoutSec != None ):
+				_fDeadline = time.time() + fTimeoutSec
+			while ( _iQueued < _iDataLen ):
+				_iQueued += self._oTxQueue.Write(_aData[_iQueued:])
+				self._oTxWriterCondition.notify_all()
+				self._TxServiceWake()
+				if ( _iQueued >= _iDataLen ):
+					break
+			# -- Nothing frees space once the writer has stopped, so do not wait for it
+				if ( self._TxServiceAlive() == False ):
+					if (self._bPrintDebug == True):	print("TxWriterWrite: No TX writer is running; " + str(_iQueued) + " of " + str(_iDataLen) + " bytes queued.")
+					break
+			# -- Wait in bounded polls so a writer that stops meanwhile is noticed
+				_fWaitSec = self._TxWriterPollSec(SC16IS750_FIFO_SIZE)
+				if ( fTimeoutSec != None ):
+					_fRemaining = _fDeadline - time.time()
+					if ( _fRemaining <= 0 ):
+						break
+					_fWaitSec = min(_fWaitSec, _fRemaining)
+				self._oTxWriterCondition.wait(_fWaitSec)
+
+		return _iQueued
+
+
+
+#
+# == Number of bytes queued and not yet handed to the chip ==
+#
+	def TxWriterPending(self):
+		if ( self._oTxQueue == None ):
+			return 0
+		return self._oTxQueue.Used() + self._iTxWriterInFlight
+
+
+
+#
+# == Number of queued bytes dropped by the DROP policy ==
+#
+	def TxWriterDropped(self):
+		return self._iTxWriterDropped
+
+
+
+#
+# == LOCAL: Check that a TX writer thread, the IRQ thread or a bus scheduler is sending the queue ==
+#
+	def _TxServiceAlive(self):
+		if ( ( self._oScheduler != None ) and ( self._oScheduler.IsRunning() == True ) ):
+			return True
+		for _oThread in ( self._oTxWriterThread, self._oIrqThread ):
+			if ( ( _oThread != None ) and ( _oThread.is_alive() == True ) ):
+				return True
+		return False
+
+
+
+#
+# == LOCAL: Tell the IRQ thread or the bus scheduler that data was queued ==
+#
+	def _TxServiceWake(self):
+		self._IrqWake()
+		if ( self._oScheduler != None ):
+			self._oScheduler.Wake()
+		return
+
+
+
+#
+# == Wait until the queue is empty and the chip has shifted out the last bit (THR & TSR empty) ==
+#
+	def TxWriterDrain(self, fTimeoutSec = None):
+		if ( fTimeoutSec != None ):
+			_fDeadline = time.time() + fTimeoutSec
+
+	# -- Wait for the writer to hand everything to the chip
+		if ( self._oTxQueue != None ):
+			with self._oTxWriterCondition:
+				while ( self.TxWriterPending() > 0 ):
+					if ( self._TxServiceAlive() == False ):
+						return False
+					if ( fTimeoutSec != None ):
+						_fRemaining = _fDeadline - time.time()
+						if ( _fRemaining <= 0 ):	return False
+						self._oTxWriterCondition.wait(_fRemaining)
+					else:
+						self._oTxWriterCondition.wait(self._TxWriterPollSec(SC16IS750_FIFO_SIZE))
+
+	# -- Wait for the transmit FIFO and shift register to empty, LSR[6]
+		while ( True ):
+			_hRegLSR = self._ReadRegister(SC16IS750_REG_LSR)
+			if ( _hRegLSR == None ):
+				if (self._bPrintDebug == True):	print("TxWriterDrain: LSR read failed.")
+				return False
+			if ( ( _hRegLSR & 0x40 ) > 0 ):
+				break
+			if ( ( fTimeoutSec != None ) and ( time.time() >= _fDeadline ) ):
+				return False
+			time.sleep(self._TxWriterPollSec(1))
+
+		return True
+
+
+
+#
+# == LOCAL: TX writer poll interval for iSpaces free FIFO spaces ==
+#
+	def _TxWriterPollSec(self, iSpaces):
+		if ( self._fTxWriterPollSec != None ):
+			return self._fTxWriterPollSec
+		return self.GetTxWaitInterval(iSpaces)
+
+
+
+#
+# == LOCAL: Send one burst of queued data; returns the bytes sent, or -1 when the FIFO is full ==
+#     aBlock is a FIFO sized scratch buffer owned by the calling thread.
+#
+	def _TxWriterSendBurst(self, aBlock, iFifoBufferSpace = None):
+	# -- The space check and the block write go together
+		with self._oBusLock:
+		# -- One TXLVL read per burst, unless the level is already known
+			_iFifoBufferSpace = self._TxFifoSpace(iFifoBufferSpace)
+			if ( _iFifoBufferSpace <= 0 ):
+				return -1
+
+		# -- Coalesce everything queued, up to the FIFO space, into one block
+			with self._oTxWriterCondition:
+				_iCount = self._oTxQueue.ReadInto(memoryview(aBlock)[:_iFifoBufferSpace])
+				self._iTxWriterInFlight = _iCount
+				self._oTxWriterCondition.notify_all()
+			if ( _iCount == 0 ):
+				return 0
+
+		# -- Send the block to the THR Register in one block write
+			try:
+				self._WriteRegisterBlock(SC16IS750_REG_THR, aBlock[:_iCount])
+			finally:
+				with self._oTxWriterCondition:
+					self._iTxWriterInFlight = 0
+					self._oTxWriterCondition.notify_all()
+			return _iCount
+
+
+
+#
+# == LOCAL: TX writer thread body ==
+#
+	def _TxWriterRun(self):
+		_aBlock = bytearray(SC16IS750_FIFO_SIZE)
+		try:
+			while ( self._oTxWriterStop.is_set() == False ):
+			# -- Wait for queued data
+				with self._oTxWriterCondition:
+					if ( self._oTxQueue.Used() == 0 ):
+						self._oTxWriterCondition.wait(self._TxWriterPollSec(SC16IS750_FIFO_SIZE))
+						continue
+
+			# -- Send one burst; wait for the FIFO to drain when it is full
+				if ( self._TxWriterSendBurst(_aBlock) < 0 ):
+					self._oTxWriterStop.wait(self._TxWriterPollSec(SC16IS750_FIFO_SIZE))
+		except Exception as _oError:
+			self._oTxWriterError = _oError
+			self._iTxWriterInFlight = 0
+			if (self._bPrintDebug == True):	print("_TxWriterRun: TX writer stopped on error: " + str(_oError))
+		return
+
+
+
+
+# ----------------------------------------------------
+#   I N T E R R U P T   S E R V I C E
+# ----------------------------------------------------
+
+#
+# == Enable the interrupt sources reported through IIR (IER bits, see SC16IS750_IER_*) ==
+#     The sleep mode flag on IER[4] is kept.  IER[7:5] need the enhanced functions, which are enabled as required.
+#
+	def SetInterrupts(self, hInterrupts):
+		with self.Transaction():
+			if ( ( hInterrupts & ( SC16IS750_IER_XOFF | SC16IS750_IER_RTS | SC16IS750_IER_CTS ) ) > 0 ):
+				if ( self._EnableEnhancedFunctionSet(bEnableAdvancedSet = True) == False ):	return False
+
+			_hRegIER = self._ReadRegister(SC16IS750_REG_IER)
+			_hRegIER = ( _hRegIER & SC16IS750_IER_SLEEP ) | ( hInterrupts & ~SC16IS750_IER_SLEEP & 0xFF )
+			if ( self._WriteRegister(SC16IS750_REG_IER, _hRegIER) == False ):	return False
+
+		# -- If everything worked, return True
+			return True
+
+
+
+#
+# == Register a Service() callback for an event ==
+#     sEvent is one of SC16IS750_IIR_EVENTS ("line-status", "rx-timeout", "rx-data", "tx-empty",
+#     "modem-status", "io-pins", "xoff", "cts-rts").  Callbacks are called as fnCallback(device, event, value),
+#     where value is the event's register from SC16IS750_EVENT_REGISTERS (LSR, RXLVL, TXLVL, MSR or IOSTATE), or None.
+#
+	def RegisterCallback(self, sEvent, fnCallback):
+		if ( sEvent not in SC16IS750_EVENT_REGISTERS ):
+			if (self._bPrintDebug == True):	print("RegisterCallback: Unknown event " + str(sEvent) + ".")
+			return False
+		self._dCallbacks.setdefault(sEvent, []).append(fnCallback)
+		return True
+
+
+
+#
+# == Remove a Service() callback, or every callback for the event when fnCallback is None ==
+#
+	def UnregisterCallback(self, sEvent, fnCallback = None):
+		_lCallbacks = self._dCallbacks.get(sEvent)
+		if ( _lCallbacks == None ):
+			return False
+		if ( fnCallback == None ):
+			del self._dCallbacks[sEvent]
+			return True
+		if ( fnCallback not in _lCallbacks ):
+			return False
+		_lCallbacks.remove(fnCallback)
+		if ( len(_lCallbacks) == 0 ):
+			del self._dCallbacks[sEvent]
+		return True
+
+
+
+#
+# == Serve up to iMaxEvents pending interrupts; returns the number served ==
+#     One IIR read per pass decodes the highest priority source; only that event's register is read,
+#     and only when a callback wants it or the read clears the interrupt.  An idle pass is one transaction.
+#
+	def Service(self, iMaxEvents = 1):
+		_iServed = 0
+
+		while ( _iServed < iMaxEvents ):
+		# -- Read the interrupt identification; IIR[0] = 1 means nothing is pending
+			_hRegIIR = self._ReadRegister(SC16IS750_REG_IIR)
+			if ( ( _hRegIIR == None ) or ( ( _hRegIIR & SC16IS750_IIR_NO_INTERRUPT ) != 0 ) ):
+				break
+			_iServed += 1
+
+		# -- Decode the priority encoded source
+			_sEvent = SC16IS750_IIR_EVENTS.get(_hRegIIR & SC16IS750_IIR_SOURCE_MASK)
+			if ( _sEvent == None ):
+				if (self._bPrintDebug == True):	print("Service: Unknown interrupt source IIR = " + hex(_hRegIIR) + ".")
+				continue
+			_lCallbacks = self._dCallbacks.get(_sEvent, ())
+
+		# -- Read the event's register only when it is needed
+			_hValue = None
+			_hRegisterAddr = SC16IS750_EVENT_REGISTERS[_sEvent]
+			if ( ( _hRegisterAddr != None ) and ( ( len(_lCallbacks) > 0 ) or ( _sEvent in SC16IS750_EVENT_CLEARING_READS ) ) ):
+				_hValue = self._ReadRegister(_hRegisterAddr)
+
+		# -- Dispatch; a copy of the list lets callbacks unregister themselves
+			for _fnCallback in list(_lCallbacks):
+				_fnCallback(self, _sEvent, _hValue)
+
+		return _iServed
+
+
+
+
+# ----------------------------------------------------
+#   I R Q   M O D E
+# ----------------------------------------------------
+
+#
+# == Serve the chip from its IRQ output instead of polling the FIFO levels ==
+#     oIrqSource is an IRQ edge source (see SC16IS750GpioIrqSource / SC16IS750FdIrqSource).  Received data
+#     lands in the RX pump ring buffer (RxPumpRead) and data queued with TxWriterWrite is sent on THR
+#     interrupts, so an idle link costs no bus traffic.  hInterrupts is written to IER.
+#
+	def StartIrqMode(self, oIrqSource, iRxBufferSize = 4096, iTxQueueSize = 4096, hInterrupts = SC16IS750_IER_IRQ_DEFAULT):
+	# -- The IRQ thread takes over from the polling threads
+		if ( self._ServiceThreadAlive() == True ):
+			if (self._bPrintDebug == True):	print("StartIrqMode: IRQ mode, RX pump, TX writer or bus scheduler already running.")
+			return False
+
+	# -- Preallocate the RX ring and the TX queue; a restart with the same sizes keeps their data
+		self._AllocateServiceBuffers(iRxBufferSize, iTxQueueSize)
+
+	# -- Enable the chip interrupts, keeping the sleep mode flag on IER[4]
+		self._hIrqSavedIER = self._ReadRegister(SC16IS750_REG_IER)
+		if ( self.SetInterrupts(hInterrupts) == False ):	return False
+
+	# -- Move data through the buffers from the Service() events
+		self._aIrqTxBlock = bytearray(SC16IS750_FIFO_SIZE)
+		self.RegisterCallback("rx-data", self._IrqOnRxData)
+		self.RegisterCallback("rx-timeout", self._IrqOnRxData)
+		self.RegisterCallback("line-status", self._IrqOnLineStatus)
+		self.RegisterCallback("tx-empty", self._IrqOnTxEmpty)
+
+	# -- A pipe lets writers wake the IRQ thread when new data is queued
+		self._lIrqWakePipe = os.pipe()
+		self._oIrqSource = oIrqSource
+		self._oIrqError = None
+		self._oIrqStop = threading.Event()
+		self._oIrqThread = threading.Thread(target = self._IrqRun, name = "SC16IS750-Irq")
+		self._oIrqThread.daemon = True
+		self._oIrqThread.start()
+		return True
+
+
+
+#
+# == Leave IRQ mode; restores IER and returns once the thread has finished ==
+#
+	def StopIrqMode(self, fTimeoutSec = None):
+		if ( self._oIrqThread == None ):
+			return True
+
+		self._oIrqStop.set()
+		self._IrqWake()
+		self._oIrqThread.join(fTimeoutSec)
+		if ( self._oIrqThread.is_alive() == True ):
+			return False
+		self._oIrqThread = None
+
+		for _iFd in self._lIrqWakePipe:
+			os.close(_iFd)
+		self._lIrqWakePipe = None
+		self._oIrqSource = None
+
+		self.UnregisterCallback("rx-data", self._IrqOnRxData)
+		self.UnregisterCallback("rx-timeout", self._IrqOnRxData)
+		self.UnregisterCallback("line-status", self._IrqOnLineStatus)
+		self.UnregisterCallback("tx-empty", self._IrqOnTxEmpty)
+
+	# -- Put the interrupt enables back as they were
+		if ( self._WriteRegister(SC16IS750_REG_IER, self._hIrqSavedIER) == False ):	return False
+		return True
+
+
+
+#
+# == Serve every pending interrupt; returns the number of interrupts served ==
+#     Called by the IRQ thread on each edge.  Stops without another IIR read once the source reports the IRQ line released.
+#
+	def ServiceIrq(self):
+		_iServed = 0
+		while ( _iServed < SC16IS750_IRQ_MAX_PASSES ):
+			if ( self.Service(1) == 0 ):
+				break
+			_iServed += 1
+			if ( ( self._oIrqSource != None ) and ( self._oIrqSource.IsAsserted() == False ) ):
+				break
+		return _iServed
+
+
+
+#
+# == LOCAL: IRQ mode event handlers ==
+#
+	def _IrqOnRxData(self, oDevice, sEvent, hRegRXLVL):
+	# -- The RXLVL level came with the event; one block read into the ring
+		self._RxPumpDrain(hRegRXLVL)
+		return
+
+	def _IrqOnLineStatus(self, oDevice, sEvent, hRegLSR):
+	# -- Reading LSR cleared the interrupt; the data with the error is drained as usual
+		self._iIrqLineErrors += 1
+		self._RxPumpDrain()
+		return
+
+	def _IrqOnTxEmpty(self, oDevice, sEvent, hRegTXLVL):
+	# -- Refill the transmit FIFO from the queue; reading IIR has cleared the interrupt
+		if ( self._oTxQueue.Used() > 0 ):
+			self._TxWriterSendBurst(self._aIrqTxBlock, hRegTXLVL)
+		return
+
+
+
+#
+# == LOCAL: Preallocate the RX ring and the TX queue used by IRQ mode and the bus scheduler ==
+#     A restart with the same sizes keeps the buffered data.
+#
+	def _AllocateServiceBuffers(self, iRxBufferSize, iTxQueueSize):
+		if ( ( self._oRxRing == None ) or ( self._oRxRing.Size() != iRxBufferSize ) ):
+			self._oRxRing = SC16IS750RingBuffer(iRxBufferSize)
+			self._iRxPumpDropped = 0
+		if ( ( self._oTxQueue == None ) or ( self._oTxQueue.Size() != iTxQueueSize ) ):
+			self._oTxQueue = SC16IS750RingBuffer(iTxQueueSize)
+			self._iTxWriterDropped = 0
+		if ( self._oTxWriterCondition == None ):
+			self._oTxWriterCondition = threading.Condition()
+		return
+
+
+
+#
+# == LOCAL: Check for a thread (RX pump, TX writer, IRQ mode) or a bus scheduler already serving this device ==
+#
+	def _ServiceThreadAlive(self):
+		if ( self._oScheduler != None ):
+			return True
+		for _oThread in ( self._oIrqThread, self._oRxPumpThread, self._oTxWriterThread ):
+			if ( ( _oThread != None ) and ( _oThread.is_alive() == True ) ):
+				return True
+		return False
+
+
+
+#
+# == Number of IRQ edges seen and receive line status errors served ==
+#
+	def IrqStats(self):
+		return { "edges":self._iIrqEdges, "line-errors":self._iIrqLineErrors, "rx-dropped":self._iRxPumpDropped }
+
+
+
+#
+# == LOCAL: Wake the IRQ thread (new TX data or stop request) ==
+#
+	def _IrqWake(self):
+		if ( self._lIrqWakePipe != None ):
+			try:
+				os.write(self._lIrqWakePipe[1], b'\x00')
+			except OSError:
+				pass
+		return
+
+
+
+#
+# == LOCAL: IRQ thread body ==
+#
+	def _IrqRun(self):
+		_iIrqFd = self._oIrqSource.Fileno()
+		_iWakeFd = self._lIrqWakePipe[0]
+		try:
+		# -- Serve anything that was pending before the first edge
+			self.ServiceIrq()
+
+			while ( self._oIrqStop.is_set() == False ):
+			# -- Sleep until an IRQ edge or a wake up; no bus traffic while the link is idle
+				_lReady = select.select([_iIrqFd, _iWakeFd], [], [])[0]
+				if ( self._oIrqStop.is_set() == True ):
+					break
+
+				if ( _iWakeFd in _lReady ):
+					os.read(_iWakeFd, 4096)
+				# -- Start a transmission; once the FIFO drains, THR interrupts keep it going
+					if ( ( self._oTxQueue.Used() > 0 ) and ( self._iTxWriterInFlight == 0 ) ):
+						self._TxWriterSendBurst(self._aIrqTxBlock)
+
+				if ( _iIrqFd in _lReady ):
+					self._oIrqSource.Acknowledge()
+					self._iIrqEdges += 1
+					self.ServiceIrq()
+		except Exception as _oError:
+			self._oIrqError = _oError
+			if (self._bPrintDebug == True):	print("_IrqRun: IRQ thread stopped on error: " + str(_oError))
+		return
+
+
+
+
+# ----------------------------------------------------
+#   D U A L   C H A N N E L   S E R V I C E
+# ----------------------------------------------------
+
+#
+# == Read RXLVL and TXLVL of every open channel back to back in one bus transaction ==
+#     Returns one ( channel, RX FIFO level, TX FIFO space ) tuple per open channel.
+#
+	def PollChannels(self):
+		_lLevels = []
+		with self._oBusLock:
+			for _oChannel in self._lChannels:
+				if ( _oChannel == None ):	continue
+				_iRxLevel, _iTxLevel = _oChannel._ReadRegisters(( SC16IS750_REG_RXLVL, SC16IS750_REG_TXLVL ))
+				_lLevels.append(( _oChannel._iChannel, _iRxLevel, _iTxLevel ))
+		return _lLevels
+
+
+
+#
+# == Serve every open channel in one pass: poll all FIFO levels, drain each RX FIFO, send one TX burst each ==
+#     Data moves through each channel's ring buffers as in IRQ mode: RxPumpRead() to receive,
+#     TxWriterWrite() to send.  Returns the PollChannels() levels, or None if a channel is served
+#     by its own threads or a bus scheduler.
+#
+	def ServiceChannels(self, iRxBufferSize = 4096, iTxQueueSize = 4096):
+		_lChannels = [ _oChannel for _oChannel in self._lChannels if ( _oChannel != None ) ]
+		for _oChannel in _lChannels:
+			if ( _oChannel._ServiceThreadAlive() == True ):
+				if (self._bPrintDebug == True):	print("ServiceChannels: Channel " + str(_oChannel._iChannel) + " is served by a thread or a bus scheduler.")
+				return None
+			_oChannel._AllocateServiceBuffers(iRxBufferSize, iTxQueueSize)
+		if ( self._aServiceTxBlock == None ):
+			self._aServiceTxBlock = bytearray(SC16IS750_FIFO_SIZE)
+
+		with self._oBusLock:
+		# -- All levels first, so one pass costs two reads per channel plus the data moved
+			_lLevels = self.PollChannels()
+			for _iChannel, _iFifoBufferBytes, _iFifoBufferSpace in _lLevels:
+				_oChannel = self._lChannels[_iChannel]
+				_oChannel._RxPumpDrain(_iFifoBufferBytes)
+				if ( _oChannel._oTxQueue.Used() > 0 ):
+					_oChannel._TxWriterSendBurst(self._aServiceTxBlock, _iFifoBufferSpace)
+		return _lLevels
+
+
+
+
+###################### ---------------------------------
+
+
+
+
+# ----------------------------------------------------
+#   G P I O   S E T U P   F U N C T I O N S
+# ----------------------------------------------------
+
+#
+# == Mask of the I/O pins in GPIO mode; a channel's modem pins are left out while IOControl flags them ==
+#     Served from the shadow cache, so no bus traffic.
+#
+	def GetGpioPins(self):
+		_hPins = ( 1 << SC16IS750_GPIO_PINS ) - 1
+		_hRegIOC = self._GetCachedRegister(SC16IS750_BANK_GENERAL, SC16IS750_REG_IOCONTROL)
+		if ( _hRegIOC == None ):
+			_hRegIOC = self._ReadRegister(SC16IS750_REG_IOCONTROL)
+		for _iChannel, _hModemFlag in SC16IS750_IOCONTROL_MODEM_PINS.items():
+			if ( ( _hRegIOC & _hModemFlag ) > 0 ):
+				_hPins &= ~SC16IS750_GPIO_MODEM_PINS[_iChannel] & 0xFF
+		return _hPins
+
+
+
+#
+# == Set the direction of the pins in hMask: a 1 in hOutputs makes the pin an output, a 0 an input ==
+#     Written only if IODIR changes; the current direction comes from the shadow cache.
+#
+	def SetGpioDirection(self, hMask, hOutputs):
+		with self.Transaction():
+			_hRegIODIR = self.GetGpioDirection()
+			_hRegIODIRNew = ( ( _hRegIODIR & ~hMask ) | ( hOutputs & hMask ) ) & 0xFF
+			if ( _hRegIODIRNew == _hRegIODIR ):
+				return True
+			return self._WriteRegister(SC16IS750_REG_IODIR, _hRegIODIRNew)
+
+
+
+#
+# == Set the direction of one pin ==
+#
+	def SetPinDirection(self, iPin, bOutput):
+		if ( ( iPin < 0 ) or ( iPin >= SC16IS750_GPIO_PINS ) ):
+			if (self._bPrintDebug == True):	print("SetPinDirection: iPin =" + str(iPin) + " is not a valid input. Must be 0 to " + str(SC16IS750_GPIO_PINS - 1) + ".")
+			return False
+		_hOutputs = 0x00
+		if ( bOutput == True ):	_hOutputs = ( 1 << iPin )
+		return self.SetGpioDirection(( 1 << iPin ), _hOutputs)
+
+
+
+#
+# == IODIR: a 1 for each output pin; served from the shadow cache ==
+#
+	def GetGpioDirection(self):
+		_hRegIODIR = self._GetCachedRegister(SC16IS750_BANK_GENERAL, SC16IS750_REG_IODIR)
+		if ( _hRegIODIR == None ):
+			_hRegIODIR = self._ReadRegister(SC16IS750_REG_IODIR)
+		return _hRegIODIR
+
+
+
+#
+# == Call fnCallback(device, pins, state) when input pins in hMask change ==
+#     sEdge is one of SC16IS750_GPIO_EDGES; pins holds the bits that changed that way and state the whole
+#     port.  The pins are enabled on IOINTENA, so a change raises the IIR I/O pins interrupt and is reported
+#     by the next Service() pass (or IRQ mode) with the one IOSTATE read that clears it.  A pulse that is
+#     over before that read leaves no change to report.
+#
+	def WatchPins(self, hMask, fnCallback, sEdge = "both"):
+		if ( sEdge not in SC16IS750_GPIO_EDGES ):
+			if (self._bPrintDebug == True):	print("WatchPins: sEdge =" + str(sEdge) + " is not a valid input. Must be one of " + str(SC16IS750_GPIO_EDGES) + ".")
+			return False
+
+		with self.Transaction():
+		# -- The first watch hooks the I/O pins event
+			if ( len(self._lGpioWatches) == 0 ):
+				self.RegisterCallback("io-pins", self._GpioOnIoPins)
+			self._lGpioWatches.append(( hMask & 0xFF, sEdge, fnCallback ))
+
+			if ( self._SetGpioInterrupts() == False ):	return False
+
+		# -- Take the pin levels now, so the first report is a change from them
+			if ( self.ReadPort() == None ):	return False
+
+		# -- If everything worked, return True
+			return True
+
+
+
+#
+# == Stop reporting pin changes to fnCallback, or to every callback of this channel when fnCallback is None ==
+#
+	def UnwatchPins(self, fnCallback = None):
+		_iWatches = len(self._lGpioWatches)
+		self._lGpioWatches = [ _tWatch for _tWatch in self._lGpioWatches if ( ( fnCallback != None ) and ( _tWatch[2] != fnCallback ) ) ]
+		if ( len(self._lGpioWatches) == _iWatches ):
+			return False
+		if ( len(self._lGpioWatches) == 0 ):
+			self.UnregisterCallback("io-pins", self._GpioOnIoPins)
+		return self._SetGpioInterrupts()
+
+
+
+#
+# == LOCAL: Enable the I/O pin interrupts (IOINTENA) on the pins watched by any channel ==
+#
+	def _SetGpioInterrupts(self):
+		_hRegIOINTENA = 0x00
+		for _oChannel in self._lChannels:
+			if ( _oChannel == None ):	continue
+			for _hMask, _sEdge, _fnCallback in _oChannel._lGpioWatches:
+				_hRegIOINTENA |= _hMask
+		if ( self._GetCachedRegister(SC16IS750_BANK_GENERAL, SC16IS750_REG_IOINTENA) == _hRegIOINTENA ):
+			return True
+		return self._WriteRegister(SC16IS750_REG_IOINTENA, _hRegIOINTENA)
+
+
+
+
+# ----------------------------------------------------
+#   G P I O   O P E R A T I O N S   F U N C T I O N S
+# ----------------------------------------------------
+
+#
+# == Read the levels of all eight I/O pins with one IOSTATE read; None if the read failed ==
+#     The read also clears a pending I/O pins interrupt, so any watched pin changes it shows are reported here.
+#
+	def ReadPort(self):
+		with self._oBusLock:
+			_hRegIOSTATE = self._ReadRegister(SC16IS750_REG_IOSTATE)
+			if ( _hRegIOSTATE == None ):
+				return None
+			self._GpioUpdate(_hRegIOSTATE)
+			return _hRegIOSTATE
+
+
+
+#
+# == Drive the output pins in hMask to the levels in hValue with one IOSTATE write ==
+#     The output latch is kept on the host, so no read is needed first; the write is skipped if the latch
+#     already holds the levels.  Input pins keep their latch bits for when they are made outputs.
+#
+	def WritePort(self, hMask, hValue):
+		with self._oBusLock:
+			_hLatch = self._dGpio["latch"]
+			_hLatchNew = ( ( _hLatch & ~hMask ) | ( hValue & hMask ) ) & 0xFF
+			if ( _hLatchNew == _hLatch ):
+				return True
+
+		# -- IOSTATE reads back the pin levels, not the latch, so a write cannot be read back to verify
+			if ( self._WriteRegister(SC16IS750_REG_IOSTATE, _hLatchNew, bReadVerifyWrite = False) == False ):	return False
+			self._dGpio["latch"] = _hLatchNew
+
+		# -- If everything worked, return True
+			return True
+
+
+
+#
+# == Port levels from the last read, with the output pins as last written; no bus traffic ==
+#     The input pins read 0 until ReadPort() (or a watched pin change) has read the port.
+#
+	def GetPort(self):
+		_hRegIODIR = self.GetGpioDirection()
+		_hState = self._dGpio["state"]
+		if ( _hState == None ):	_hState = 0x00
+		return ( ( self._dGpio["latch"] & _hRegIODIR ) | ( _hState & ~_hRegIODIR ) ) & 0xFF
+
+
+
+#
+# == Level of one pin from GetPort(); no bus traffic ==
+#
+	def GetPin(self, iPin):
+		return ( ( self.GetPort() >> iPin ) & 0x01 ) == 0x01
+
+
+
+#
+# == Drive one output pin high (True) or low (False) ==
+#
+	def SetPin(self, iPin, bHigh):
+		_hValue = 0x00
+		if ( bHigh == True ):	_hValue = ( 1 << iPin )
+		return self.WritePort(( 1 << iPin ), _hValue)
+
+
+
+#
+# == Invert one output pin, from the output latch ==
+#
+	def TogglePin(self, iPin):
+		return self.WritePort(( 1 << iPin ), ~self._dGpio["latch"])
+
+
+
+#
+# == LOCAL: I/O pins event from Service(); reading IOSTATE there has cleared the interrupt ==
+#
+	def _GpioOnIoPins(self, oDevice, sEvent, hRegIOSTATE):
+		if ( hRegIOSTATE != None ):
+			self._GpioUpdate(hRegIOSTATE)
+		return
+
+
+
+#
+# == LOCAL: Keep a new IOSTATE reading and report the input pin changes to every channel's watches ==
+#     The pins are shared by the channels, so one read serves the watches of both.
+#
+	def _GpioUpdate(self, hRegIOSTATE):
+		_hLast = self._dGpio["state"]
+		self._dGpio["state"] = hRegIOSTATE
+		if ( _hLast == None ):
+			return
+
+		_hChanged = ( _hLast ^ hRegIOSTATE ) & ~self.GetGpioDirection() & 0xFF
+		if ( _hChanged == 0 ):
+			return
+		_dEdges = { "rising":( _hChanged & hRegIOSTATE ), "falling":( _hChanged & ~hRegIOSTATE & 0xFF ), "both":_hChanged }
+
+		for _oChannel in self._lChannels:
+			if ( _oChannel == None ):	continue
+		# -- A copy of the list lets callbacks unwatch themselves
+			for _hMask, _sEdge, _fnCallback in list(_oChannel._lGpioWatches):
+				_hPins = _dEdges[_sEdge] & _hMask
+				if ( _hPins > 0 ):
+					_fnCallback(_oChannel, _hPins, hRegIOSTATE)
+		return
 
-	# -- Empty out the XOFF1 Register
-		if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_XOFF1, 0x00) == False ):	return False
 
-	# -- Empty out the XOFF2 Register
-		if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_XOFF2, 0x00) == False ):	return False
 
-	# -- Enable special GPIO[4:7] pins for Modem flow control signals
-		if ( self._SetGPIO47forModemFlowcontrol(bModemUse = True) == False ):	return False
 
-	# -- Disable Enhanced Register access
-		if ( self._ExposeEnhancedRegisterSet(bExposeRegisterSet = False) == False ):	return False
+# ====================================================
+#   B U S   M E T R I C S
+#      C L A S S   D E F I N I T I O N S
+# ====================================================
+
+# -- Latency histogram bucket upper bounds in microseconds (powers of two)
+SC16IS750_METRICS_BUCKETS_US = tuple( (1 << _iBucket) for _iBucket in range(0, 24) )
 
-	# -- If everything worked, return True
-		return True
+# -- Monotonic high resolution clock for the latency histograms; Python 2 only has the wall clock
+_SC16IS750MetricsClock = getattr(time, "perf_counter", time.time)
 
+# -- Code objects of the driver's public methods, used to attribute transactions to a method
+_SC16IS750_PUBLIC_CODES = frozenset( _oFunc.__code__ for _sName, _oFunc in vars(SC16IS750).items() if ( ( _sName.startswith("_") == False ) and ( hasattr(_oFunc, "__code__") == True ) ) )
 
+class SC16IS750Metrics(object):
 
 #
-# == Enable the Hardware flow control GPIO[4:7] control pins ==
+# == Class Initialization ==
 #
-	def SetHardFlowcontrol(self):
-		if (self._bPrintDebug == True):	print "SetHardFlowcontrol: Enable Hardware Flow control."
-	# -- Enable Enhanced Register access
-		if ( self._ExposeEnhancedRegisterSet(bExposeRegisterSet = True) == False ):	return False
+	def __init__(self):
+		self.Reset()
+		return
+
+
 
-	# -- Read the EFR register
-		_hRegValue = self._ReadRegister(SC16IS750_REG_LCR_0XBF_EFR)
+#
+# == Zero all counters and histograms ==
+#
+	def Reset(self):
+		self.dCounters = { "register-reads":0, "register-writes":0, "block-reads":0, "block-writes":0, "combined-reads":0, "combined-writes":0, "bytes-read":0, "bytes-written":0, "readback-verify-failures":0, "swallowed-write-exceptions":0 }
+		self.dRegisters = {}
+		self.dMethods = {}
+		self.dHistograms = {}
+		return
 
-	# -- Disable Auto RTS with EFR[6]
-		_hRegValue &= 0xbf
 
-	# -- Disable Auto CTS with EFR[7]
-		_hRegValue &= 0x7f
 
-	# -- Write out the modified EFR register
-		if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_EFR, _hRegValue) == False ):	return False
+#
+# == Count an event ==
+#
+	def Count(self, sCounter, iIncrement = 1):
+		self.dCounters[sCounter] = self.dCounters.get(sCounter, 0) + iIncrement
+		return
 
-	# -- Empty out the XON1 Register
-		if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_XON1, 0x00) == False ):	return False
 
-	# -- Empty out the XON2 Register
-		if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_XON2, 0x00) == False ):	return False
 
-	# -- Empty out the XOFF1 Register
-		if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_XOFF1, 0x00) == False ):	return False
+#
+# == Record one device I/O call; sMethod is None when per-method attribution is off ==
+#
+	def Record(self, sOperation, hRegisterAddr, iBytes, fLatencySec, sMethod):
+	# -- Totals by operation type
+		if ( sOperation == "readU8" ):
+			self.dCounters["register-reads"] += 1
+			self.dCounters["bytes-read"] += iBytes
+		elif ( sOperation == "write8" ):
+			self.dCounters["register-writes"] += 1
+			self.dCounters["bytes-written"] += iBytes
+		elif ( sOperation == "readList" ):
+			self.dCounters["block-reads"] += 1
+			self.dCounters["bytes-read"] += iBytes
+	# -- Combined transfers count each register access, and the transfer once against its first register
+		elif ( sOperation == "readRegisters" ):
+			self.dCounters["combined-reads"] += 1
+			self.dCounters["register-reads"] += iBytes
+			self.dCounters["bytes-read"] += iBytes
+		elif ( sOperation == "writeRegisters" ):
+			self.dCounters["combined-writes"] += 1
+			self.dCounters["register-writes"] += iBytes
+			self.dCounters["bytes-written"] += iBytes
+		else:
+			self.dCounters["block-writes"] += 1
+			self.dCounters["bytes-written"] += iBytes
+
+	# -- Per register and per public method transaction counts
+		_dRegister = self.dRegisters.get(hRegisterAddr)
+		if ( _dRegister == None ):
+			_dRegister = self.dRegisters[hRegisterAddr] = {}
+		_dRegister[sOperation] = _dRegister.get(sOperation, 0) + 1
+		if ( sMethod != None ):
+			self.dMethods[sMethod] = self.dMethods.get(sMethod, 0) + 1
+
+	# -- Log2 latency histogram; bucket N holds latencies up to 2^N microseconds
+		_lHistogram = self.dHistograms.get(sOperation)
+		if ( _lHistogram == None ):
+			_lHistogram = self.dHistograms[sOperation] = [ 0, 0.0, None, 0.0, [ 0 ] * len(SC16IS750_METRICS_BUCKETS_US) ]
+		_fLatencyUs = fLatencySec * 1e6
+		_iBucket = min(int(_fLatencyUs).bit_length(), len(SC16IS750_METRICS_BUCKETS_US) - 1)
+		_lHistogram[0] += 1
+		_lHistogram[1] += _fLatencyUs
+		if ( ( _lHistogram[2] == None ) or ( _fLatencyUs < _lHistogram[2] ) ):	_lHistogram[2] = _fLatencyUs
+		if ( _fLatencyUs > _lHistogram[3] ):	_lHistogram[3] = _fLatencyUs
+		_lHistogram[4][_iBucket] += 1
+		return
 
-	# -- Empty out the XOFF2 Register
-		if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_XOFF2, 0x00) == False ):	return False
 
-	# -- Enable special GPIO[4:7] pins for Modem flow control signals
-		if ( self._SetGPIO47forModemFlowcontrol(bModemUse = True) == False ):	return False
 
-	# -- Disable Enhanced Register access
-		if ( self._ExposeEnhancedRegisterSet(bExposeRegisterSet = False) == False ):	return False
+#
+# == Plain dictionary copy of all metrics ==
+#
+	def Snapshot(self):
+		_dHistograms = {}
+		for _sOperation, _lHistogram in self.dHistograms.items():
+			_dHistograms[_sOperation] = { "count":_lHistogram[0], "sum_us":_lHistogram[1], "min_us":_lHistogram[2], "max_us":_lHistogram[3], "bucket_le_us":list(SC16IS750_METRICS_BUCKETS_US), "bucket_counts":list(_lHistogram[4]) }
+		return {
+			"counters": dict(self.dCounters),
+			"registers": dict( (_hRegisterAddr, dict(_dRegister)) for _hRegisterAddr, _dRegister in self.dRegisters.items() ),
+			"methods": dict(self.dMethods),
+			"latency": _dHistograms,
+		}
 
-	# -- If everything worked, return True
-		return True
 
 
+class _SC16IS750MeteredDevice(object):
 
 #
-# == Enable the Software flow control and define XOn/XOff fields ==
+# == Class Initialization: wrap a device object ==
 #
-	def SetSoftFlowcontrol(self, bTxXOnOff, bRxXOnOff, hXOn1 = 0x11, hXOff1 = 0x13, hXOn2 = None, hXOff2 = None):
-		if (self._bPrintDebug == True):	print "SetSoftFlowcontrol: Enable Software Flow control."
-	# -- Make sure we have sane input before proceeding
-		if ( (hXOn1 == None) and (hXOff1 == None) and (hXOn2 == None) and (hXOff2 == None) ):
-			if (self._bPrintDebug == True):	print "SetSoftFlowcontrol: Invalid input.  No XOn/XOff chars defined."
-			return False
+	def __init__(self, oDevice, oMetrics, bPerMethod = False):
+		self._oDevice = oDevice
+		self._oMetrics = oMetrics
+		self._bPerMethod = bPerMethod
+		return
+
+
 
-	# -- Enable Enhanced Register access
-		if ( self._ExposeEnhancedRegisterSet(bExposeRegisterSet = True) == False ):	return False
+#
+# == Pass any other attribute through to the wrapped device ==
+#
+	def __getattr__(self, sName):
+		return getattr(self._oDevice, sName)
 
-	# -- Read the EFR register
-		_hRegEFR = self._ReadRegister(SC16IS750_REG_LCR_0XBF_EFR)
 
-	# -- Disable Auto RTS with EFR[6]
-		_hRegEFR &= 0xbf
 
-	# -- Disable Auto CTS with EFR[7]
-		_hRegEFR &= 0x7f
+#
+# == LOCAL: Name of the outermost driver public method on the call stack; None unless per-method attribution is on ==
+#
+	def _CallingMethod(self):
+		if ( self._bPerMethod == False ):
+			return None
+		_sMethod = "(internal)"
+		_oFrame = sys._getframe(2)
+		_iDepth = 0
+		while ( ( _oFrame != None ) and ( _iDepth < 16 ) ):
+			if ( _oFrame.f_code in _SC16IS750_PUBLIC_CODES ):
+				_sMethod = _oFrame.f_code.co_name
+			_oFrame = _oFrame.f_back
+			_iDepth += 1
+		return _sMethod
+
 
-	# -- Reset EFR[0:3]
-		_hRegEFR &= 0xF0
 
-	# -- Enable software flow control method required with EFR[0:3]
-		if   ( (bTxXOnOff == True) and (hXOn1 != None) and (hXOff1 != None) ):
-			_hRegEFR |= 0x08
-			if (self._bPrintDebug == True):	print "SetSoftFlowcontrol: TX On for XON/XOFF 1."
-		if   ( (bTxXOnOff == True) and (hXOn2 != None) and (hXOff2 != None) ):
-			_hRegEFR |= 0x04
-			if (self._bPrintDebug == True):	print "SetSoftFlowcontrol: TX On for XON/XOFF 2."
-		if   ( (bRxXOnOff == True) and (hXOn1 != None) and (hXOff1 != None) ):
-			_hRegEFR |= 0x02
-			if (self._bPrintDebug == True):	print "SetSoftFlowcontrol: RX On for XON/XOFF 1."
-		if   ( (bRxXOnOff == True) and (hXOn2 != None) and (hXOff2 != None) ):
-			_hRegEFR |= 0x01
-			if (self._bPrintDebug == True):	print "SetSoftFlowcontrol: RX On for XON/XOFF 2."
+#
+# == Metered device I/O calls ==
+#
+	def readU8(self, register):
+		_fStart = _SC16IS750MetricsClock()
+		try:
+			return self._oDevice.readU8(register)
+		finally:
+			self._oMetrics.Record("readU8", ( register >> 3 ) & 0x0F, 1, _SC16IS750MetricsClock() - _fStart, self._CallingMethod())
 
-	# -- Write out the modified EFR register
-		if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_EFR, _hRegEFR) == False ):	return False
+	def write8(self, register, value):
+		_fStart = _SC16IS750MetricsClock()
+		try:
+			return self._oDevice.write8(register, value)
+		finally:
+			self._oMetrics.Record("write8", ( register >> 3 ) & 0x0F, 1, _SC16IS750MetricsClock() - _fStart, self._CallingMethod())
 
-	# -- If defined, write out the XON1 Register
-		if ( hXOn1 != None ):
-			if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_XON1, hXOn1) == False ):	return False
+	def readList(self, register, length):
+		_fStart = _SC16IS750MetricsClock()
+		try:
+			return self._oDevice.readList(register, length)
+		finally:
+			self._oMetrics.Record("readList", ( register >> 3 ) & 0x0F, length, _SC16IS750MetricsClock() - _fStart, self._CallingMethod())
 
-	# -- If defined, write out the XON2 Register
-		if ( hXOn2 != None ):
-			if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_XON2, hXOn2) == False ):	return False
+	def writeList(self, register, data):
+		_fStart = _SC16IS750MetricsClock()
+		try:
+			return self._oDevice.writeList(register, data)
+		finally:
+			self._oMetrics.Record("writeList", ( register >> 3 ) & 0x0F, len(data), _SC16IS750MetricsClock() - _fStart, self._CallingMethod())
 
-	# -- If defined, write out the XOFF1 Register
-		if ( hXOff1 != None ):
-			if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_XOFF1, hXOff1) == False ):	return False
+	def readRegisters(self, registers):
+		_fStart = _SC16IS750MetricsClock()
+		try:
+			return self._oDevice.readRegisters(registers)
+		finally:
+			self._oMetrics.Record("readRegisters", ( registers[0] >> 3 ) & 0x0F, len(registers), _SC16IS750MetricsClock() - _fStart, self._CallingMethod())
 
-	# -- If defined, write out the XOFF2 Register
-		if ( hXOff2 != None ):
-			if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_XOFF2, hXOff2) == False ):	return False
+	def writeRegisters(self, registervalues):
+		_fStart = _SC16IS750MetricsClock()
+		try:
+			return self._oDevice.writeRegisters(registervalues)
+		finally:
+			self._oMetrics.Record("writeRegisters", ( registervalues[0][0] >> 3 ) & 0x0F, len(registervalues), _SC16IS750MetricsClock() - _fStart, self._CallingMethod())
 
-	# -- Disable special GPIO[4:7] pins for Modem flow control signals
-		if ( self._SetGPIO47forModemFlowcontrol(bModemUse = False) == False ):	return False
 
-	# -- Disable Enhanced Register access
-		if ( self._ExposeEnhancedRegisterSet(bExposeRegisterSet = False) == False ):	return False
 
-	# -- If everything worked, return True
-		return True
 
+# ====================================================
+#   S I N G L E   P R O D U C E R   /   C O N S U M E R
+#      R I N G   B U F F E R
+# ====================================================
 
+class SC16IS750RingBuffer(object):
 
 #
-# == Disable all flow control methods ==
+# == Class Initialization ==
+#     The producer only moves the head count and the consumer only moves the tail count,
+#     so one producer thread and one consumer thread need no lock.
 #
-	def SetNoFlowcontrol(self):
-	# -- Enable Enhanced Register access
-		if ( self._ExposeEnhancedRegisterSet(bExposeRegisterSet = True) == False ):	return False
-
-	# -- Read the EFR register
-		_hRegEFR = self._ReadRegister(SC16IS750_REG_LCR_0XBF_EFR)
-
-	# -- Disable all bits in EFR except EFR[4:5]
-		_hRegEFR &= 0x30
+	def __init__(self, iSize):
+		self._aBuffer = bytearray(iSize)
+		self._oView = memoryview(self._aBuffer)
+		self._iSize = iSize
+		self._iHead = 0
+		self._iTail = 0
+		return
 
-	# -- Write out the modified EFR register
-		if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_EFR, _hRegEFR) == False ):	return False
 
-	# -- Empty out the XON1 Register
-		if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_XON1, 0x00) == False ):	return False
 
-	# -- Empty out the XON2 Register
-		if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_XON2, 0x00) == False ):	return False
+#
+# == Capacity, bytes buffered and space free ==
+#
+	def Size(self):
+		return self._iSize
 
-	# -- Empty out the XOFF1 Register
-		if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_XOFF1, 0x00) == False ):	return False
+	def Used(self):
+		return self._iHead - self._iTail
 
-	# -- Empty out the XOFF2 Register
-		if ( self._WriteRegister(SC16IS750_REG_LCR_0XBF_XOFF2, 0x00) == False ):	return False
+	def Free(self):
+		return self._iSize - ( self._iHead - self._iTail )
 
-	# -- Disable special GPIO[4:7] pins for Modem flow control signals
-		if ( self._SetGPIO47forModemFlowcontrol(bModemUse = False) == False ):	return False
 
-	# -- Disable Enhanced Register access
-		if ( self._ExposeEnhancedRegisterSet(bExposeRegisterSet = False) == False ):	return False
 
-	# -- If everything worked, return True
-		return True
+#
+# == Producer: append as much of the data as fits; returns the number of bytes stored ==
+#
+	def Write(self, aData):
+		_iCount = min(len(aData), self.Free())
+		if ( _iCount <= 0 ):
+			return 0
 
+	# -- Copy in up to two slices, wrapping at the end of the buffer
+		_iStart = self._iHead % self._iSize
+		_iFirst = min(_iCount, self._iSize - _iStart)
+		self._oView[_iStart:(_iStart + _iFirst)] = aData[:_iFirst]
+		if ( _iFirst < _iCount ):
+			self._oView[0:(_iCount - _iFirst)] = aData[_iFirst:_iCount]
 
+	# -- Publish the data only after it has been copied
+		self._iHead += _iCount
+		return _iCount
 
 
-# ----------------------------------------------------
-#   U A R T   O P E R A T I O N S   F U N C T I O N S
-# ----------------------------------------------------
 
 #
-# == Clear and Reset the Transmit FIFO Buffer ==
+# == Consumer: copy buffered bytes into a caller supplied buffer; returns the count ==
 #
-	def ResetTxFifoBuffer(self):
-	# -- Read the FCR register
-		_hRegFCR = self._ReadRegister(SC16IS750_REG_FCR)
+	def ReadInto(self, aBuffer):
+		_iCount = min(len(aBuffer), self.Used())
+		if ( _iCount <= 0 ):
+			return 0
 
-	# -- Check if reset is already in progress
-		if ( ( int(_hRegFCR) & (1 << 2) ) > 0 ):
-		# -- Flag still set, so abort.
-			return False
+	# -- Copy out up to two slices, wrapping at the end of the buffer
+		_iStart = self._iTail % self._iSize
+		_iFirst = min(_iCount, self._iSize - _iStart)
+		aBuffer[:_iFirst] = self._oView[_iStart:(_iStart + _iFirst)]
+		if ( _iFirst < _iCount ):
+			aBuffer[_iFirst:_iCount] = self._oView[0:(_iCount - _iFirst)]
 
-	# -- Set the TX FIFO buffer clear flag on FCR[2]
-		_hRegFCR |= 0x04
+	# -- Release the space only after it has been copied
+		self._iTail += _iCount
+		return _iCount
 
-	# -- Write out the modified IOControl register
-		if ( self._WriteRegister(SC16IS750_REG_FCR, _hRegFCR, False) == False ):	return False
 
-	# -- FIFO reset requires at least two XTAL1 clock cycles 
-		time.sleep(self._iTimeoutLockIOmsec)
 
-	# -- If everything worked, return True
-		return True
+#
+# == Consumer: take up to iMaxLen buffered bytes ==
+#
+	def Read(self, iMaxLen = None):
+		_iCount = self.Used()
+		if ( ( iMaxLen != None ) and ( iMaxLen < _iCount ) ):
+			_iCount = iMaxLen
+		_aData = bytearray(_iCount)
+		self.ReadInto(_aData)
+		return bytes(_aData)
 
 
 
 #
-# == Clear and Reset the Receive FIFO Buffer ==
+# == Consumer: discard up to iCount of the oldest buffered bytes; returns the number discarded ==
 #
-	def ResetRxFifoBuffer(self):
-	# -- Read the FCR register
-		_hRegFCR = self._ReadRegister(SC16IS750_REG_FCR)
+	def Discard(self, iCount):
+		_iCount = min(iCount, self.Used())
+		self._iTail += _iCount
+		return _iCount
 
-	# -- Check if reset is already in progress
-		if ( ( int(_hRegFCR) & (1 << 1) ) > 0 ):
-		# -- Flag still set, so abort.
-			return False
 
-	# -- Set the RX FIFO buffer clear flag on FCR[1]
-		_hRegFCR |= 0x02
 
-	# -- Write out the modified IOControl register
-		if ( self._WriteRegister(SC16IS750_REG_FCR, _hRegFCR, False) == False ):	return False
+#
+# == Consumer: discard everything buffered ==
+#
+	def Clear(self):
+		self._iTail = self._iHead
+		return
+
 
-	# -- FIFO reset requires at least two XTAL1 clock cycles 
-		time.sleep(self._iTimeoutLockIOmsec)
 
-	# -- If everything worked, return True
-		return True
 
+# ====================================================
+#   I R Q   E D G E   S O U R C E S
+# ====================================================
 
+# An IRQ edge source tells the IRQ thread (SC16IS750.StartIrqMode) when the chip's IRQ output
+#  goes active.  It provides:
+#     Fileno()		a file descriptor that select() reports readable on an edge
+#     Acknowledge()	consume the pending edge events
+#     IsAsserted()	current IRQ level: True, False, or None when the source cannot tell
+#     Close()		release the source
 
 #
-# == Find how much data has been received into the FIFO Receive Buffer ==
+# == IRQ output wired to a GPIO, through the Linux GPIO character device ==
+#     The SC16IS750 IRQ output is active LOW (open drain), so falling edges are requested.
 #
-	def RxFifoBufferUsed(self):
-	# -- Read the RXLVL register
-		_hFifoBufferBytes = self._ReadRegister(SC16IS750_REG_RXLVL)
-		_iFifoBufferBytes = int(_hFifoBufferBytes)
-		if (self._bPrintDebug == True):	print("RxFifoBufferUsed: " + str(_iFifoBufferBytes) + " bytes used.")
+class SC16IS750GpioIrqSource(object):
 
-	# -- Return the value
-		return _iFifoBufferBytes
+#
+# == Class Initialization: request falling edge events for one GPIO line ==
+#
+	def __init__(self, iLineOffset, sChipPath = "/dev/gpiochip0", sConsumer = "sc16is750-irq"):
+	# -- Linux only; imported here so the driver loads everywhere else
+		import fcntl
+		import struct
+		self._oFcntl = fcntl
+
+	# -- struct gpioevent_request { u32 lineoffset; u32 handleflags; u32 eventflags; char consumer_label[32]; int fd; }
+		_aRequest = bytearray(struct.pack("=III32si", iLineOffset, SC16IS750_GPIOHANDLE_REQUEST_INPUT, SC16IS750_GPIOEVENT_REQUEST_FALLING_EDGE, sConsumer.encode("ascii")[:31], -1))
+		_iChipFd = os.open(sChipPath, os.O_RDONLY)
+		try:
+			fcntl.ioctl(_iChipFd, SC16IS750_GPIO_GET_LINEEVENT_IOCTL, _aRequest, True)
+		finally:
+			os.close(_iChipFd)
+		self._iFd = struct.unpack_from("=i", _aRequest, 44)[0]
 
+	# -- Non-blocking, so Acknowledge() can drain every queued event
+		fcntl.fcntl(self._iFd, fcntl.F_SETFL, fcntl.fcntl(self._iFd, fcntl.F_GETFL) | os.O_NONBLOCK)
+		return
 
+	def Fileno(self):
+		return self._iFd
 
-#
-# == Find how much space is available in the FIFO Transmit Buffer to write to ==
-#
-	def TxFifoBufferAvailable(self):
-	# -- Read the TXLVL register
-		_hFifoBufferBytes = self._ReadRegister(SC16IS750_REG_TXLVL)
-		_iFifoBufferBytes = int(_hFifoBufferBytes)
-		if (self._bPrintDebug == True):	print("TxFifoBufferAvailable: " + str(_iFifoBufferBytes) + " bytes available.")
+	def Acknowledge(self):
+		try:
+			while ( len(os.read(self._iFd, SC16IS750_GPIOEVENT_DATA_SIZE * 16)) > 0 ):
+				pass
+		except OSError:
+			pass
+		return
 
-	# -- Return the value
-		return _iFifoBufferBytes
+	def IsAsserted(self):
+	# -- struct gpiohandle_data { u8 values[64]; }; the line reads 0 while the IRQ output pulls it LOW
+		_aValues = bytearray(64)
+		self._oFcntl.ioctl(self._iFd, SC16IS750_GPIOHANDLE_GET_LINE_VALUES_IOCTL, _aValues, True)
+		return ( _aValues[0] == 0 )
+
+	def Close(self):
+		if ( self._iFd != None ):
+			os.close(self._iFd)
+			self._iFd = None
+		return
 
 
 
 #
-# == Read the Line Status flags ==
+# == Any selectable file descriptor as the edge source: an eventfd, a pipe, a socket ==
+#     Each readable event counts as one edge.  fnIsAsserted optionally reports the IRQ level.
 #
-	def GetLineStatus(self):
-	# -- Read in the current LSR register
-		_hRegLSR = self._ReadRegister(SC16IS750_REG_LSR)
+class SC16IS750FdIrqSource(object):
+
+	def __init__(self, iFd, fnIsAsserted = None):
+		self._iFd = iFd
+		self._fnIsAsserted = fnIsAsserted
+		return
 
-	# -- Create the LSR output dictionary
-		_dLSR = {}
+	def Fileno(self):
+		return self._iFd
+
+	def Acknowledge(self):
+	# -- Reads an eventfd counter (8 bytes) or whatever a pipe holds; only called once select() saw data
+		try:
+			os.read(self._iFd, 4096)
+		except OSError:
+			pass
+		return
+
+	def IsAsserted(self):
+		if ( self._fnIsAsserted == None ):
+			return None
+		return self._fnIsAsserted()
+
+	def Close(self):
+		return
 
-	# -- Loop each bit and add the state to the output dictionary
-		for x in range(0, 8):
-			if ( ( int(_hRegLSR) & (1 << x) ) > 0 ):
-				_dLSR.update({ SC16IS750_REG_LSR_FIELDS[x]:True })
-			else:
-				_dLSR.update({ SC16IS750_REG_LSR_FIELDS[x]:False })
 
-	# -- Return the output dictionary
-		return _dLSR
 
 
+# ====================================================
+#   S P I   T R A N S P O R T
+# ====================================================
 
 #
-# == Read the Modem Status flags ==
+# == SPI device handle: the readU8/write8/readList/writeList interface of an Adafruit_GPIO.I2C device over SPI ==
+#     oSpi is an open spidev.SpiDev style object (xfer2).  The register byte is the I2C sub-address with
+#     the R/W flag in bit 7 - see spec table 32 - so every access, FIFO bursts included, is one full
+#     duplex transfer.  Hand it to SC16IS750.__init__ as oTransport.  sBusPath names the SPI device, e.g.
+#     "/dev/spidev0.0", so transports on one device share a bus lock; without it the transport is a bus of
+#     its own.
 #
-	def GetModemStatus(self):
-	# -- Read the IOControl register
-		_hRegIOC = self._ReadRegister(SC16IS750_REG_IOCONTROL)
+class SC16IS750SpiTransport(object):
 
-	# -- Read in the current MSR register
-		_hRegMSR = self._ReadRegister(SC16IS750_REG_MSR)
+#
+# == Class Initialization ==
+#
+	def __init__(self, oSpi, iMaxSpeedHz = SC16IS750_SPI_MAX_SPEED_HZ, iMode = 0, sBusPath = None):
+		self._oSpi = oSpi
+		if ( iMaxSpeedHz != None ):	self._oSpi.max_speed_hz = iMaxSpeedHz
+		if ( iMode != None ):		self._oSpi.mode = iMode
+		if ( sBusPath == None ):	sBusPath = SC16IS750NewBusPath("spi")
+		self._sBusPath = sBusPath
+		return
 
-	# -- Create the MSR output dictionary
-		_dMSR = {}
 
-	# -- Define the MSR useful range based on Modem Pins (GPIO[4:7]) flag at IOControl[1]
-		if ( ( int(_hRegIOC) & (1 << 1) ) > 0 ):
-		# -- All MSR fields used
-			_lMsrUsefulBitsRange = range(0, 8)
-		else:
-		# -- Only MSR[0:4] fields used. Other modem pins are I/O via IOState
-			_lMsrUsefulBitsRange = range(0, 5)
 
-	# -- Loop each bit in the defined range and add the state to the output dictionary
-		for x in _lMsrUsefulBitsRange:
-			if ( ( int(_hRegMSR) & (1 << x) ) > 0 ):
-				_dMSR.update({ SC16IS750_REG_MSR_FIELDS[x]:True })
-			else:
-				_dMSR.update({ SC16IS750_REG_MSR_FIELDS[x]:False })
+#
+# == Path of the SPI device; the key of its bus lock ==
+#
+	def GetBusPath(self, busnum = None):
+		return self._sBusPath
+
 
-	# -- Return the output dictionary
-		return _dMSR
+
+#
+# == Read an unsigned byte ==
+#
+	def readU8(self, register):
+		return self._oSpi.xfer2([ register | SC16IS750_SPI_READ, 0x00 ])[1]
 
 
 
 #
-# == Set/Release the line break state ==
+# == Write a byte ==
 #
-	def SetLineBreak(self, bBreakConditionSet):
-	# -- Read in the current LCR register
-		_hRegLCR = self._ReadRegister(SC16IS750_REG_LCR)
+	def write8(self, register, value):
+		self._oSpi.xfer2([ register, value & 0xFF ])
+		return
 
-	# -- Modify the LCR register as appropriate...
-		if ( bBreakConditionSet == True ):
-		# -- Set the break flag on LCR[6]
-			_hRegLCR |= 0x40
-		else:
-		# -- Clear the break flag on LCR[6]
-			_hRegLCR &= 0xbf
 
-	# -- Write out the modified LCR register
-		if ( self._WriteRegister(SC16IS750_REG_LCR, _hRegLCR) == False ):	return False
 
-	# -- If everything worked, return True
-		return True
+#
+# == Read a block of bytes from one register in one transfer ==
+#
+	def readList(self, register, length):
+		_lTransfer = [ 0x00 ] * ( length + 1 )
+		_lTransfer[0] = register | SC16IS750_SPI_READ
+		return bytearray(self._oSpi.xfer2(_lTransfer)[1:])
 
 
 
 #
-# == Set the Modem RTS Status flag ==
+# == Write a block of bytes to one register in one transfer ==
 #
-	def SetModemRTS(self, bRtsLow):
-	# -- Check that hardware flow control pins are enabled first
-		if ( _CheckGPIO47forModemFlowcontrol == False ):
-			return False
+	def writeList(self, register, data):
+		_lTransfer = [ register ]
+		_lTransfer.extend(bytearray(data))
+		self._oSpi.xfer2(_lTransfer)
+		return
 
-	# -- Read in the current MCR register
-		_hRegMCR = self._ReadRegister(SC16IS750_REG_MCR)
 
-	# -- Modify the MCR register as appropriate...
-		if ( bRtsLow == True ):
-		# -- Set RTS flag active (logic 1; LOW) on MCR[1]
-			_hRegMCR |= 0x02
-		else:
-		# -- Set RTS flag inactive (logic 0; HIGH) on MCR[1]
-			_hRegMCR &= 0xfd
 
-	# -- Write out the modified MCR register
-		if ( self._WriteRegister(SC16IS750_REG_MCR, _hRegMCR) == False ):	return False
+#
+# == Close the SPI device ==
+#
+	def close(self):
+		self._oSpi.close()
+		return
+
 
-	# -- If everything worked, return True
-		return True
+
+
+# ====================================================
+#   L I N U X   I 2 C - D E V   B A C K E N D
+# ====================================================
+
+# -- struct i2c_msg and struct i2c_rdwr_ioctl_data from <linux/i2c.h> and <linux/i2c-dev.h>
+class _SC16IS750I2CMsg(ctypes.Structure):
+	_fields_ = [ ("addr", ctypes.c_uint16), ("flags", ctypes.c_uint16), ("len", ctypes.c_uint16), ("buf", ctypes.POINTER(ctypes.c_uint8)) ]
+
+class _SC16IS750I2CRdwrData(ctypes.Structure):
+	_fields_ = [ ("msgs", ctypes.POINTER(_SC16IS750I2CMsg)), ("nmsgs", ctypes.c_uint32) ]
 
 
 
 #
-# == Set the Modem DTR Status flag ==
+# == I2C provider on the Linux i2c-dev interface, a drop-in for Adafruit_GPIO.I2C (pass as _oExistingI2CInstance) ==
+#     Every access is an I2C_RDWR ioctl: a register read is the sub-address write and the data read joined by
+#     a repeated start, and several register accesses can share one ioctl.  One file descriptor is opened
+#     per bus and shared by its devices.  fnOpen, fnIoctl and fnClose stand in for os.open, fcntl.ioctl and
+#     os.close, so the backend can run against a mock ioctl layer (see SC16IS750Sim.SC16IS750SimI2CDev).
 #
-	def SetModemDTR(self, bDtrLow):
-	# -- Check that hardware flow control pins are enabled first
-		if ( _CheckGPIO47forModemFlowcontrol == False ):
-			return False
+class SC16IS750I2CDev(object):
 
-	# -- Read in the current MCR register
-		_hRegMCR = self._ReadRegister(SC16IS750_REG_MCR)
+#
+# == Class Initialization ==
+#
+	def __init__(self, iBusNum = 1, fnOpen = None, fnIoctl = None, fnClose = None):
+		if ( fnIoctl == None ):
+			import fcntl
+			fnIoctl = fcntl.ioctl
+		self._iBusNum = iBusNum
+		self._fnOpen = fnOpen or os.open
+		self._fnIoctl = fnIoctl
+		self._fnClose = fnClose or os.close
+		self._dFds = {}
+		self._oFdsLock = threading.Lock()
+		return
 
-	# -- Modify the MCR register as appropriate...
-		if ( bDtrLow == True ):
-		# -- Set DTR flag active (logic 1; LOW) on MCR[0]
-			_hRegMCR |= 0x01
-		else:
-		# -- Set DTR flag inactive (logic 0; HIGH) on MCR[0]
-			_hRegMCR &= 0xfe
 
-	# -- Write out the modified MCR register
-		if ( self._WriteRegister(SC16IS750_REG_MCR, _hRegMCR) == False ):	return False
 
-	# -- If everything worked, return True
-		return True
+#
+# == Adafruit_GPIO.I2C interface: get the device at an address ==
+#
+	def get_i2c_device(self, address, busnum = None, i2c_interface = None, **kwargs):
+		if ( busnum == None ):	busnum = self._iBusNum
+		with self._oFdsLock:
+			if ( busnum not in self._dFds ):
+				self._dFds[busnum] = self._fnOpen(self.GetBusPath(busnum), os.O_RDWR)
+			return SC16IS750I2CDevDevice(self, self._dFds[busnum], address)
 
 
 
+#
+# == Device path of a bus; also the key of its bus lock ==
+#
+	def GetBusPath(self, busnum = None):
+		if ( busnum == None ):	busnum = self._iBusNum
+		return ( "/dev/i2c-" + str(busnum) )
+
 
-# ----------------------------------------------------
-#   U A R T   F R O N T - E N D   F U N C T I O N S
-# ----------------------------------------------------
 
 #
-# == Connect Wrapper Function to simplify use... ==
+# == Close every bus file descriptor ==
 #
-	def Connect(self, iBaudRate = 9600, eParity = 'N', iDataBits = 8, iStopBits = 1, eFlowControl = 'NONE', bRS485Mode = False):
+	def close(self):
+		with self._oFdsLock:
+			for _iFd in self._dFds.values():
+				self._fnClose(_iFd)
+			self._dFds = {}
+		return
 
-		if (self._bPrintDebug == True):	print("Connect: INIT iBaudRate = " + str(iBaudRate) + " ; eParity = " + str(eParity) + " ; iDataBits = " + str(iDataBits) + " ; iStopBits = " + str(iStopBits) + " ; eFlowControl = " + str(eFlowControl) + " ; bRS485Mode = " + str(bRS485Mode) + " ;")
 
-		if (self._bPrintDebug == True):	print("Connect: Set RS-232 / RS-485 Multidrop mode.")
-		if ( self.SetMultidropMode(bRS485Mode) == False ):
-			if (self._bPrintDebug == True):	print("Connect: Set RS-232 / RS-485 Multidrop mode failed.")
-			return False
 
-		if (self._bPrintDebug == True):	print("Connect: Set Baud Rate.")
-		if ( self.SetBaudrate(iBaudRate) == False ):
-			if (self._bPrintDebug == True):	print("Connect: Set Baud Rate failed.")
-			return False
+#
+# == LOCAL: Run the messages ( address, flags, buffer ) as I2C_RDWR ioctls; returns the number of ioctls ==
+#
+	def _Transfer(self, iFd, lMessages):
+		_iIoctls = 0
+		for _iStart in range(0, len(lMessages), SC16IS750_I2C_RDWR_MAX_MSGS):
+			_lChunk = lMessages[_iStart:(_iStart + SC16IS750_I2C_RDWR_MAX_MSGS)]
+			_aMsgs = ( _SC16IS750I2CMsg * len(_lChunk) )()
+			for _iIndex, ( _hAddress, _hFlags, _aBuffer ) in enumerate(_lChunk):
+				_aMsgs[_iIndex].addr = _hAddress
+				_aMsgs[_iIndex].flags = _hFlags
+				_aMsgs[_iIndex].len = len(_aBuffer)
+				_aMsgs[_iIndex].buf = ctypes.cast(_aBuffer, ctypes.POINTER(ctypes.c_uint8))
+			self._fnIoctl(iFd, SC16IS750_I2C_RDWR, _SC16IS750I2CRdwrData(_aMsgs, len(_lChunk)))
+			_iIoctls += 1
+		return _iIoctls
 
-		if (self._bPrintDebug == True):	print("Connect: Set Line.")
-		if ( self.SetLine(iDataBits, eParity, iStopBits) == False ):
-			if (self._bPrintDebug == True):	print("Connect: Set Line failed.")
-			return False
 
-		if (self._bPrintDebug == True):	print("Connect: Set FIFO.")
-		if ( self.SetFifo(True) == False ):
-			if (self._bPrintDebug == True):	print("Connect: Set FIFO failed.")
-			return False
 
-		eFlowControl = eFlowControl[:4]
-		eFlowControl = eFlowControl.upper()
-		if   ( eFlowControl == 'NONE' ):
-			if (self._bPrintDebug == True):	print("Connect: Set No Flow Control.")
-			if ( self.SetNoFlowcontrol() == False ):
-				if (self._bPrintDebug == True):	print("Connect: Set No Flow Control failed.")
-				return False
-		elif ( eFlowControl == 'SOFT' ):
-			if (self._bPrintDebug == True):	print("Connect: Set XOn/XOff Flow Control.")
-			if ( self.SetSoftFlowcontrol(bTxXOnOff = True, bRxXOnOff = True) == False ):
-				if (self._bPrintDebug == True):	print("Connect: Set XOn/XOff Flow Control failed.")
-				return False
-		elif ( eFlowControl == 'HARD' ):
-			if (self._bPrintDebug == True):	print("Connect: Set Hardware Flow Control.")
-			if ( self.SetHardFlowcontrol() == False ):
-				if (self._bPrintDebug == True):	print("Connect: Set Hardware Flow Control failed.")
-				return False
-		elif ( eFlowControl == 'AUTO' ):
-			if (self._bPrintDebug == True):	print("Connect: Set Automatic Chip Internal Hardware Flow Control.")
-			if ( self.SetAutoHardFlowcontrol() == False ):
-				if (self._bPrintDebug == True):	print("Connect: Set Automatic Chip Internal Hardware Flow Control failed.")
-				return False
-		else:
-			if (self._bPrintDebug == True):	print("Connect: Invalid flow control setting")
-			return False
+# -- The i2c-dev provider used by every SC16IS750 created without an I2C provider
+_oSC16IS750DefaultI2CDev = None
 
-	# -- If everything worked, return True
-		return True
+#
+# == Get the shared i2c-dev provider, so devices on one bus share its file descriptor and bus lock ==
+#
+def SC16IS750GetI2CDev():
+	global _oSC16IS750DefaultI2CDev
+	with _oSC16IS750BusLocksGuard:
+		if ( _oSC16IS750DefaultI2CDev == None ):
+			_oSC16IS750DefaultI2CDev = SC16IS750I2CDev()
+		return _oSC16IS750DefaultI2CDev
 
 
 
 #
-# == Write a Hex defined Byte to the UART ==
+# == One device on an i2c-dev bus: the Adafruit_GPIO.I2C device interface plus combined transfers ==
 #
-	def WriteByte(self, hValue, bDieOnNoTxBufferSpace = False):
-	# -- Check if there is transmit hold buffer space available to write to
-		if ( self.TxFifoBufferAvailable() == 0 ):
-		# -- If requested, fail out if there is no space to write
-			if ( bDieOnNoTxBufferSpace == True ):
-				if (self._bPrintDebug == True):	print("WriteByte: No available space in transmit hold buffer. Aborting on request.")
-				return False
-			else:
-		# -- Else, wait and loop each clock cycle until the transmit hold buffer is empty
-				if (self._bPrintDebug == True):	print("WriteByte: No available space in transmit hold buffer. Waiting for THR empty flag.")
-				while ( GetLineStatus()['thr-empty'] == False ):
-				# -- Wait one chip cycle
-					time.sleep(self._fSleepMsec)
+class SC16IS750I2CDevDevice(object):
 
-	# -- Write the data byte to the THR Register
-		if ( self._WriteRegister(SC16IS750_REG_THR, hValue, bReadVerifyWrite = False) == False ):	return False
-		if (self._bPrintDebug == True):	print("++++++++++++Data sent")
+# -- The driver packs register accesses into readRegisters() / writeRegisters() for handles with this flag
+	bCombinedTransfers = True
 
-	# -- If everything worked, return True
-		return True
+#
+# == Class Initialization ==
+#
+	def __init__(self, oProvider, iFd, hAddress):
+		self._oProvider = oProvider
+		self._iFd = iFd
+		self._hAddress = hAddress
+		self.iIoctls = 0
+		return
 
 
 
 #
-# == Read a Hex defined Byte to the UART ==
+# == Read an unsigned byte: sub-address write, repeated start, one byte read ==
 #
-	def ReadByte(self, bDieOnNoRxBufferData = True):
-	# -- Check if there is data in the receive buffer to read
-		if ( self.RxFifoBufferUsed() == 0 ):
-		# -- If requested, fail out if there is nothing to read
-			if ( bDieOnNoRxBufferData == True ):
-				if (self._bPrintDebug == True):	print("ReadByte: No data available in buffer to read. Aborting on request.")
-				return None
-			else:
-		# -- Else, wait and loop each clock cycle until the receive buffer is not empty
-				if (self._bPrintDebug == True):	print("ReadByte: No data available in buffer to read. Waiting for RXLVL > 0.")
-				while ( self.RxFifoBufferUsed() == 0 ):
-				# -- Wait one chip cycle
-					time.sleep(self._fSleepMsec)
+	def readU8(self, register):
+		return self.readRegisters([ register ])[0]
 
-	# -- Read the data byte from the RHR Register
-		if (self._bPrintDebug == True):	print("***********Data available***********")
-		hValue = self._ReadRegister(SC16IS750_REG_RHR)
 
-	# -- If everything worked, return the value
-		return hValue
 
+#
+# == Write a byte ==
+#
+	def write8(self, register, value):
+		return self.writeRegisters([ ( register, value ) ])
 
 
 
-###################### ---------------------------------
+#
+# == Read a block of bytes from one register: sub-address write, repeated start, block read ==
+#
+	def readList(self, register, length):
+		_aData = ( ctypes.c_uint8 * length )()
+		self.iIoctls += self._oProvider._Transfer(self._iFd, [ ( self._hAddress, 0, ( ctypes.c_uint8 * 1 )(register) ), ( self._hAddress, SC16IS750_I2C_M_RD, _aData ) ])
+		return bytearray(_aData)
 
 
 
+#
+# == Write a block of bytes to one register ==
+#
+	def writeList(self, register, data):
+		_aData = bytearray(data)
+		_aData.insert(0, register)
+		self.iIoctls += self._oProvider._Transfer(self._iFd, [ ( self._hAddress, 0, ( ctypes.c_uint8 * len(_aData) ).from_buffer(_aData) ) ])
+		return
 
-# ----------------------------------------------------
-#   G P I O   S E T U P   F U N C T I O N S
-# ----------------------------------------------------
 
 
-# ----------------------------------------------------
-#   G P I O   O P E R A T I O N S   F U N C T I O N S
-# ----------------------------------------------------
+#
+# == Read several registers in one ioctl, each as a sub-address write and a one byte read ==
+#
+	def readRegisters(self, registers):
+		_lMessages = []
+		_lData = []
+		for _hRegister in registers:
+			_aData = ( ctypes.c_uint8 * 1 )()
+			_lData.append(_aData)
+			_lMessages.append(( self._hAddress, 0, ( ctypes.c_uint8 * 1 )(_hRegister) ))
+			_lMessages.append(( self._hAddress, SC16IS750_I2C_M_RD, _aData ))
+		self.iIoctls += self._oProvider._Transfer(self._iFd, _lMessages)
+		return [ _aData[0] for _aData in _lData ]
+
 
+
+#
+# == Write several ( register, value ) pairs in one ioctl, in order ==
+#
+	def writeRegisters(self, registervalues):
+		_lMessages = [ ( self._hAddress, 0, ( ctypes.c_uint8 * 2 )(_hRegister, _hValue & 0xFF) ) for _hRegister, _hValue in registervalues ]
+		self.iIoctls += self._oProvider._Transfer(self._iFd, _lMessages)
+		return
@@ -0,0 +1,368 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+######################################################
+#
+#   N X P 's   S C 1 6 I S 7 5 0   I 2 C   U A R T
+#      A S Y N C I O   T R A N S P O R T
+#
+#  (C) 2 0 1 7,   P e t e r   B r u n n e n g r ä b e r
+#
+######################################################
+
+# NOTES
+#
+#  - Python 3 only (asyncio)
+#  - Every bus access runs on an executor with a single worker thread, so the
+#     event loop never blocks on I2C and the transport's reads and writes are
+#     serialised.  Transports for devices on the same bus can share one executor.
+#  - Received data is delivered to Protocol.data_received() one FIFO drain
+#     (one RXLVL read plus one block read) at a time.
+#  - Writes are buffered; pause_writing()/resume_writing() are called on the
+#     protocol around the high and low water marks.
+#  - Without fPollSec the FIFOs are polled at the driver's baud rate aware
+#     intervals (see SC16IS750.SetPollPolicy()).
+#
+#  Usage:
+#     oTransport, oProtocol = await create_connection(MyProtocol, oUart)
+#     oReader, oWriter = await open_connection(oUart)
+#
+
+
+# ====================================================
+#   L O A D   L I B R A R I E S
+# ====================================================
+
+# Import core python functions
+import asyncio
+import concurrent.futures
+
+# Import the driver
+from SC16IS750 import SC16IS750_FIFO_SIZE
+
+
+
+
+# ====================================================
+#   C O N S T A N T S
+# ====================================================
+
+# -- Default write buffer water marks in bytes
+SC16IS750ASYNCIO_HIGH_WATER		= 64 * 1024
+SC16IS750ASYNCIO_LOW_WATER		= 16 * 1024
+
+# -- Default stream reader buffer limit in bytes
+SC16IS750ASYNCIO_STREAM_LIMIT	= 64 * 1024
+
+
+
+
+# ====================================================
+#   A S Y N C I O   T R A N S P O R T
+# ====================================================
+
+class SC16IS750Transport(asyncio.Transport):
+
+#
+# == Class Initialization ==
+#
+	def __init__(self, oLoop, oUart, oProtocol, oExecutor = None, fPollSec = None):
+		super(SC16IS750Transport, self).__init__(extra = { "uart":oUart })
+		self._oLoop = oLoop
+		self._oUart = oUart
+		self._oProtocol = oProtocol
+		self._fPollSec = fPollSec
+
+	# -- One worker thread for all bus access, unless a (per bus) executor is shared in
+		self._bOwnExecutor = ( oExecutor == None )
+		if ( oExecutor == None ):
+			oExecutor = concurrent.futures.ThreadPoolExecutor(max_workers = 1, thread_name_prefix = "SC16IS750-Bus")
+		self._oExecutor = oExecutor
+
+	# -- Write buffer and flow control state
+		self._aWriteBuffer = bytearray()
+		self._iHighWater = SC16IS750ASYNCIO_HIGH_WATER
+		self._iLowWater = SC16IS750ASYNCIO_LOW_WATER
+		self._bProtocolPaused = False
+		self._oWriteTask = None
+
+	# -- Read state
+		self._oReadingEvent = asyncio.Event()
+		self._oReadingEvent.set()
+		self._oReadTask = None
+
+		self._bClosing = False
+		self._bConnectionLost = False
+		return
+
+
+
+#
+# == LOCAL: Hand the transport to the protocol and start receiving ==
+#
+	def _Start(self):
+		self._oProtocol.connection_made(self)
+		self._oReadTask = self._oLoop.create_task(self._ReadLoop())
+		return
+
+
+
+#
+# == LOCAL: Run a blocking driver call on the bus executor ==
+#
+	def _RunOnBus(self, fnCall, *lArgs):
+		return self._oLoop.run_in_executor(self._oExecutor, fnCall, *lArgs)
+
+
+
+#
+# == LOCAL: Sleep between two FIFO polls; the fixed interval if one was given, else the driver's ==
+#
+	def _PollSec(self, fnWaitInterval, iBytes):
+		if ( self._fPollSec != None ):
+			return self._fPollSec
+		return fnWaitInterval(iBytes)
+
+
+
+# ----------------------------------------------------
+#   R E A D   S I D E
+# ----------------------------------------------------
+
+#
+# == LOCAL: Receive loop ==
+#
+	async def _ReadLoop(self):
+		try:
+			while ( self._bClosing == False ):
+				await self._oReadingEvent.wait()
+
+			# -- One FIFO drain per bus round trip; deliver it as one burst
+				_aData = await self._RunOnBus(self._oUart.ReadBytes)
+				if ( self._bClosing == True ):
+					break
+				if ( _aData ):
+					self._oProtocol.data_received(_aData)
+				else:
+					await asyncio.sleep(self._PollSec(self._oUart.GetRxWaitInterval, SC16IS750_FIFO_SIZE))
+		except asyncio.CancelledError:
+			pass
+		except Exception as _oError:
+			self._FatalError(_oError)
+		return
+
+
+
+	def pause_reading(self):
+		self._oReadingEvent.clear()
+		return
+
+	def resume_reading(self):
+		self._oReadingEvent.set()
+		return
+
+	def is_reading(self):
+		return ( ( self._oReadingEvent.is_set() == True ) and ( self._bClosing == False ) )
+
+
+
+# ----------------------------------------------------
+#   W R I T E   S I D E
+# ----------------------------------------------------
+
+#
+# == Buffer data for sending; never blocks ==
+#
+	def write(self, aData):
+		if ( self._bClosing == True ):
+			raise RuntimeError("SC16IS750Transport: write() after close()")
+		if ( len(aData) == 0 ):
+			return
+
+		self._aWriteBuffer.extend(aData)
+		self._MaybePauseProtocol()
+
+	# -- Start the writer if it is idle
+		if ( ( self._oWriteTask == None ) or ( self._oWriteTask.done() == True ) ):
+			self._oWriteTask = self._oLoop.create_task(self._WriteLoop())
+		return
+
+
+
+	def writelines(self, lData):
+		for _aData in lData:
+			self.write(_aData)
+		return
+
+
+
+	def can_write_eof(self):
+		return False
+
+	def write_eof(self):
+		raise NotImplementedError("SC16IS750Transport: a UART has no half-close")
+
+	def get_write_buffer_size(self):
+		return len(self._aWriteBuffer)
+
+	def get_write_buffer_limits(self):
+		return ( self._iLowWater, self._iHighWater )
+
+
+
+	def set_write_buffer_limits(self, high = None, low = None):
+		if ( high == None ):
+			if ( low == None ):
+				high = SC16IS750ASYNCIO_HIGH_WATER
+			else:
+				high = 4 * low
+		if ( low == None ):
+			low = high // 4
+		if ( not ( high >= low >= 0 ) ):
+			raise ValueError("high (%r) must be >= low (%r) must be >= 0" % (high, low))
+		self._iHighWater = high
+		self._iLowWater = low
+		self._MaybePauseProtocol()
+		return
+
+
+
+#
+# == LOCAL: Send loop; one non-blocking FIFO fill (one TXLVL read plus one block write) per bus round trip ==
+#
+	async def _WriteLoop(self):
+		try:
+			while ( len(self._aWriteBuffer) > 0 ):
+				_aBlock = bytes(self._aWriteBuffer[:SC16IS750_FIFO_SIZE])
+				_iSent = await self._RunOnBus(self._oUart.WriteBytes, _aBlock, False)
+				if ( _iSent > 0 ):
+					del self._aWriteBuffer[:_iSent]
+					self._MaybeResumeProtocol()
+				else:
+					await asyncio.sleep(self._PollSec(self._oUart.GetTxWaitInterval, len(self._aWriteBuffer)))
+		except asyncio.CancelledError:
+			pass
+		except Exception as _oError:
+			self._FatalError(_oError)
+			return
+
+	# -- A close() waiting for the buffer to empty can finish now
+		if ( ( self._bClosing == True ) and ( len(self._aWriteBuffer) == 0 ) ):
+			self._oLoop.call_soon(self._ConnectionLost, None)
+		return
+
+
+
+#
+# == LOCAL: Flow control towards the protocol ==
+#
+	def _MaybePauseProtocol(self):
+		if ( ( self._bProtocolPaused == False ) and ( len(self._aWriteBuffer) > self._iHighWater ) ):
+			self._bProtocolPaused = True
+			self._oProtocol.pause_writing()
+		return
+
+	def _MaybeResumeProtocol(self):
+		if ( ( self._bProtocolPaused == True ) and ( len(self._aWriteBuffer) <= self._iLowWater ) ):
+			self._bProtocolPaused = False
+			self._oProtocol.resume_writing()
+		return
+
+
+
+# ----------------------------------------------------
+#   C L O S I N G
+# ----------------------------------------------------
+
+#
+# == Close after the buffered data has been sent ==
+#
+	def close(self):
+		if ( self._bClosing == True ):
+			return
+		self._bClosing = True
+		self._oReadingEvent.set()
+
+		if ( ( len(self._aWriteBuffer) == 0 ) or ( self._oWriteTask == None ) or ( self._oWriteTask.done() == True ) ):
+			self._oLoop.call_soon(self._ConnectionLost, None)
+		return
+
+
+
+#
+# == Close straight away, discarding buffered data ==
+#
+	def abort(self):
+		self._bClosing = True
+		self._aWriteBuffer = bytearray()
+		if ( self._oWriteTask != None ):
+			self._oWriteTask.cancel()
+		self._oLoop.call_soon(self._ConnectionLost, None)
+		return
+
+
+
+	def is_closing(self):
+		return self._bClosing
+
+
+
+#
+# == LOCAL: Fail the connection on a bus error ==
+#
+	def _FatalError(self, oError):
+		self._bClosing = True
+		self._aWriteBuffer = bytearray()
+		self._oLoop.call_soon(self._ConnectionLost, oError)
+		return
+
+
+
+#
+# == LOCAL: Tear down and tell the protocol ==
+#
+	def _ConnectionLost(self, oError):
+		if ( self._bConnectionLost == True ):
+			return
+		self._bConnectionLost = True
+
+		if ( self._oReadTask != None ):
+			self._oReadTask.cancel()
+		if ( self._oWriteTask != None ):
+			self._oWriteTask.cancel()
+		try:
+			self._oProtocol.connection_lost(oError)
+		finally:
+			if ( self._bOwnExecutor == True ):
+				self._oExecutor.shutdown(wait = False)
+		return
+
+
+
+
+# ====================================================
+#   C O N N E C T I O N   S E T U P
+# ====================================================
+
+#
+# == Wrap a set up SC16IS750 in a transport; like loop.create_connection() ==
+#
+async def create_connection(protocol_factory, oUart, oExecutor = None, fPollSec = None):
+	_oLoop = asyncio.get_running_loop()
+	_oProtocol = protocol_factory()
+	_oTransport = SC16IS750Transport(_oLoop, oUart, _oProtocol, oExecutor, fPollSec)
+	_oTransport._Start()
+	return ( _oTransport, _oProtocol )
+
+
+
+#
+# == Stream (reader, writer) pair over an SC16IS750; like asyncio.open_connection() ==
+#     The reader provides read(), readexactly() and readuntil().
+#
+async def open_connection(oUart, limit = SC16IS750ASYNCIO_STREAM_LIMIT, oExecutor = None, fPollSec = None):
+	_oLoop = asyncio.get_running_loop()
+	_oReader = asyncio.StreamReader(limit = limit, loop = _oLoop)
+	_oProtocol = asyncio.StreamReaderProtocol(_oReader, loop = _oLoop)
+	_oTransport, _oProtocol = await create_connection(lambda: _oProtocol, oUart, oExecutor, fPollSec)
+	_oWriter = asyncio.StreamWriter(_oTransport, _oProtocol, _oReader, _oLoop)
+	return ( _oReader, _oWriter )
@@ -0,0 +1,447 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+######################################################
+#
+#   N X P 's   S C 1 6 I S 7 5 0   I 2 C   U A R T
+#      D R I V E R   B E N C H M A R K S
+#
+#  (C) 2 0 1 7,   P e t e r   B r u n n e n g r ä b e r
+#
+######################################################
+
+# NOTES
+#
+#  - Runs the driver's data paths against the SC16IS750Sim chip model with a
+#     configurable per-transaction bus delay and reports, per scenario:
+#     bytes/s, I2C transactions per call and per byte, p50/p99 per-call
+#     latency and host CPU per call and per byte.  Background modes (RxPump, TxWriter)
+#     count the bus work of their worker threads against the consuming call.
+#  - Per-call latency is the host time spent in the driver plus the simulated
+#     bus time of the transactions the call made.  The model's own host cost
+#     is calibrated and removed from the host figures.
+#  - Results are written as JSON.  With --compare, a previous result file is
+#     used as the baseline and the run fails (exit code 1) when transaction
+#     counts or latencies regress beyond the tolerance.
+#
+#  Usage:
+#     python SC16IS750Bench.py --output before.json
+#     python SC16IS750Bench.py --compare before.json --tolerance 0.10
+#
+
+
+# ====================================================
+#   L O A D   L I B R A R I E S
+# ====================================================
+
+# Import core python functions
+import sys
+import time
+import json
+import argparse
+
+# Import the driver and the chip model
+import SC16IS750
+import SC16IS750Sim
+
+
+
+
+# ====================================================
+#   C O N S T A N T S
+# ====================================================
+
+# -- I2C address used for the simulated device
+SC16IS750BENCH_I2C_ADDRESS	= 0x48
+
+# -- Baud rate the device is set up with before each scenario
+SC16IS750BENCH_BAUDRATE		= 115200
+
+# -- Result keys compared against a baseline, and whether any increase is a regression
+SC16IS750BENCH_COMPARE_KEYS	= ( "transactions_per_call", "latency_p50_us", "latency_p99_us" )
+
+# -- Host CPU time source
+if ( hasattr(time, "process_time") ):
+	_fnCpuTime = time.process_time
+else:
+	_fnCpuTime = time.clock
+
+
+
+
+# ====================================================
+#   B E N C H M A R K   H A R N E S S
+# ====================================================
+
+class SC16IS750Bench(object):
+
+#
+# == Class Initialization ==
+#
+	def __init__(self, fBusLatencySec = 0.0, iBusHz = 400000, iIterations = 2000):
+		self.fBusLatencySec = fBusLatencySec
+		self.iBusHz = iBusHz
+		self.iIterations = iIterations
+		self.dScenarios = {}
+		self._fSimCostSec = 0.0
+
+	# -- Register the built-in scenarios
+		self.AddScenario("ReadByte", self._BenchReadByte)
+		self.AddScenario("WriteByte", self._BenchWriteByte)
+		self.AddScenario("ReadBytes", self._BenchReadBytes)
+		self.AddScenario("WriteBytes", self._BenchWriteBytes)
+		self.AddScenario("GetLineStatus", self._BenchGetLineStatus)
+		self.AddScenario("GetModemStatus", self._BenchGetModemStatus)
+		self.AddScenario("GetStatusSnapshot", self._BenchGetStatusSnapshot)
+		self.AddScenario("Connect", self._BenchConnect)
+		self.AddScenario("RxPump", self._BenchRxPump)
+		self.AddScenario("TxWriter", self._BenchTxWriter)
+		return
+
+
+
+#
+# == Register a scenario: fnScenario(oUart, oSimUart, fnTimed) runs the timed calls ==
+#
+	def AddScenario(self, sName, fnScenario):
+		self.dScenarios[sName] = fnScenario
+		return
+
+
+
+#
+# == Create a simulated bus with a connected device ==
+#
+	def NewDevice(self):
+		_oBus = SC16IS750Sim.SC16IS750Sim(iBusHz = self.iBusHz, fBusLatencySec = self.fBusLatencySec)
+		_oUart = SC16IS750.SC16IS750(SC16IS750BENCH_I2C_ADDRESS, _oExistingI2CInstance = _oBus)
+		_oUart.Connect(SC16IS750BENCH_BAUDRATE)
+		return ( _oBus, _oUart, _oBus.dChips[SC16IS750BENCH_I2C_ADDRESS].oUart )
+
+
+
+#
+# == Measure the host cost of the chip model itself, per transaction ==
+#
+	def Calibrate(self):
+		_oBus, _oUart, _oSimUart = self.NewDevice()
+		_oChip = _oBus.dChips[SC16IS750BENCH_I2C_ADDRESS]
+		_iCalls = max(self.iIterations, 1000)
+		_hShiftedRegisterAddr = ( SC16IS750.SC16IS750_REG_LSR << 3 )
+
+		_fStart = time.time()
+		for _iIndex in range(_iCalls):
+			_oChip.readU8(_hShiftedRegisterAddr)
+		self._fSimCostSec = ( time.time() - _fStart ) / _iCalls
+		return self._fSimCostSec
+
+
+
+#
+# == Run one scenario and summarise it ==
+#
+	def RunScenario(self, sName):
+		_oBus, _oUart, _oSimUart = self.NewDevice()
+		_lLatencies = []
+		_dTotals = { "calls":0, "bytes":0, "transactions":0, "host_sec":0.0, "cpu_sec":0.0, "bus_sec":0.0 }
+
+	# -- Time one driver call; fnCall returns the number of data bytes it moved
+		def _fnTimed(fnCall):
+			_iStartTransactions = _oBus.iTransactions
+			_fStartBus = _oBus.fBusTime
+			_fStartCpu = _fnCpuTime()
+			_fStart = time.time()
+			_iBytes = fnCall()
+			_fHost = time.time() - _fStart
+			_fCpu = _fnCpuTime() - _fStartCpu
+			_iTransactions = _oBus.iTransactions - _iStartTransactions
+			_fBus = _oBus.fBusTime - _fStartBus
+
+		# -- Remove the chip model's own host cost
+			_fHost = max(0.0, _fHost - ( _iTransactions * self._fSimCostSec ))
+			_fCpu = max(0.0, _fCpu - ( _iTransactions * self._fSimCostSec ))
+
+			_lLatencies.append(_fHost + _fBus)
+			_dTotals["calls"] += 1
+			_dTotals["bytes"] += ( _iBytes or 0 )
+			_dTotals["transactions"] += _iTransactions
+			_dTotals["host_sec"] += _fHost
+			_dTotals["cpu_sec"] += _fCpu
+			_dTotals["bus_sec"] += _fBus
+			return _iBytes
+
+		self.dScenarios[sName](_oUart, _oSimUart, _fnTimed)
+		return self._Summarise(_dTotals, _lLatencies)
+
+
+
+#
+# == Run every registered scenario ==
+#
+	def Run(self, lNames = None):
+		if ( lNames == None ):
+			lNames = sorted(self.dScenarios.keys())
+		self.Calibrate()
+
+		_dResults = {}
+		for _sName in lNames:
+			_dResults[_sName] = self.RunScenario(_sName)
+
+		return {
+			"config": { "bus_latency_us":self.fBusLatencySec * 1e6, "bus_hz":self.iBusHz, "iterations":self.iIterations, "baudrate":SC16IS750BENCH_BAUDRATE, "sim_cost_us":self._fSimCostSec * 1e6 },
+			"scenarios": _dResults,
+		}
+
+
+
+#
+# == LOCAL: Summarise the totals and latencies of one scenario ==
+#
+	def _Summarise(self, dTotals, lLatencies):
+		_iCalls = max(dTotals["calls"], 1)
+		_fElapsed = dTotals["host_sec"] + dTotals["bus_sec"]
+		_dResult = {
+			"calls": dTotals["calls"],
+			"bytes": dTotals["bytes"],
+			"transactions": dTotals["transactions"],
+			"transactions_per_call": float(dTotals["transactions"]) / _iCalls,
+			"latency_p50_us": _Percentile(lLatencies, 50) * 1e6,
+			"latency_p99_us": _Percentile(lLatencies, 99) * 1e6,
+			"host_cpu_us_per_call": ( dTotals["cpu_sec"] / _iCalls ) * 1e6,
+		}
+		if ( dTotals["bytes"] > 0 ):
+			_dResult["transactions_per_byte"] = float(dTotals["transactions"]) / dTotals["bytes"]
+			_dResult["host_cpu_us_per_byte"] = ( dTotals["cpu_sec"] / dTotals["bytes"] ) * 1e6
+			if ( _fElapsed > 0.0 ):
+				_dResult["bytes_per_sec"] = dTotals["bytes"] / _fElapsed
+		return _dResult
+
+
+
+# ----------------------------------------------------
+#   S C E N A R I O S
+# ----------------------------------------------------
+
+#
+# == ReadByte with data always waiting in the receive FIFO ==
+#
+	def _BenchReadByte(self, oUart, oSimUart, fnTimed):
+		for _iIndex in range(self.iIterations):
+			if ( len(oSimUart.oRxFifo) == 0 ):
+				_FillRxFifo(oSimUart)
+			fnTimed(lambda: ( oUart.ReadByte() != None ) and 1 or 0)
+		return
+
+
+
+#
+# == WriteByte with space always available in the transmit FIFO ==
+#
+	def _BenchWriteByte(self, oUart, oSimUart, fnTimed):
+		for _iIndex in range(self.iIterations):
+			if ( len(oSimUart.oTxFifo) >= SC16IS750Sim.SC16IS750SIM_FIFO_SIZE ):
+				oSimUart.oTxFifo.clear()
+			fnTimed(lambda: ( oUart.WriteByte(0x55) == True ) and 1 or 0)
+		return
+
+
+
+#
+# == ReadBytes draining a full receive FIFO ==
+#
+	def _BenchReadBytes(self, oUart, oSimUart, fnTimed):
+		for _iIndex in range(max(1, self.iIterations // SC16IS750Sim.SC16IS750SIM_FIFO_SIZE)):
+			_FillRxFifo(oSimUart)
+			fnTimed(lambda: len(oUart.ReadBytes()))
+		return
+
+
+
+#
+# == WriteBytes filling an empty transmit FIFO ==
+#
+	def _BenchWriteBytes(self, oUart, oSimUart, fnTimed):
+		_aPacket = bytearray(b"U" * SC16IS750Sim.SC16IS750SIM_FIFO_SIZE)
+		for _iIndex in range(max(1, self.iIterations // SC16IS750Sim.SC16IS750SIM_FIFO_SIZE)):
+			oSimUart.oTxFifo.clear()
+			fnTimed(lambda: oUart.WriteBytes(_aPacket, bBlocking = False))
+		return
+
+
+
+#
+# == GetLineStatus ==
+#
+	def _BenchGetLineStatus(self, oUart, oSimUart, fnTimed):
+		for _iIndex in range(self.iIterations):
+			fnTimed(lambda: ( oUart.GetLineStatus() and 0 ))
+		return
+
+
+
+#
+# == GetModemStatus ==
+#
+	def _BenchGetModemStatus(self, oUart, oSimUart, fnTimed):
+		for _iIndex in range(self.iIterations):
+			fnTimed(lambda: ( oUart.GetModemStatus() and 0 ))
+		return
+
+
+
+#
+# == GetStatusSnapshot ==
+#
+	def _BenchGetStatusSnapshot(self, oUart, oSimUart, fnTimed):
+		for _iIndex in range(self.iIterations):
+			fnTimed(lambda: ( oUart.GetStatusSnapshot() and 0 ))
+		return
+
+
+
+#
+# == Connect (re-applying the full UART setup) ==
+#
+	def _BenchConnect(self, oUart, oSimUart, fnTimed):
+		for _iIndex in range(max(1, self.iIterations // 100)):
+			fnTimed(lambda: ( oUart.Connect(SC16IS750BENCH_BAUDRATE) and 0 ))
+		return
+
+
+
+
+#
+# == Background RX pump receiving line rate bursts; one call per 256 byte burst ==
+#
+	def _BenchRxPump(self, oUart, oSimUart, fnTimed):
+		_aBurst = b"U" * 256
+		oUart.StartRxPump(iBufferSize = 4096)
+		for _iIndex in range(max(1, self.iIterations // len(_aBurst))):
+			oSimUart.InjectRx(_aBurst)
+			fnTimed(lambda: _ConsumeRxPump(oUart, len(_aBurst)))
+		oUart.StopRxPump()
+		return
+
+
+
+#
+# == Buffered TX writer sending 256 byte bursts; one call per queued and drained burst ==
+#
+	def _BenchTxWriter(self, oUart, oSimUart, fnTimed):
+		_aBurst = b"U" * 256
+		oUart.StartTxWriter(iQueueSize = 4096)
+		for _iIndex in range(max(1, self.iIterations // len(_aBurst))):
+			fnTimed(lambda: ( oUart.TxWriterDrain(5.0) and oUart.TxWriterWrite(_aBurst) ))
+			oSimUart.TakeTx()
+		oUart.StopTxWriter(bDrain = True)
+		return
+
+
+
+
+# ====================================================
+#   H E L P E R S
+# ====================================================
+
+#
+# == Consume iBytes from the RX pump ring buffer, giving up after fTimeoutSec ==
+#
+def _ConsumeRxPump(oUart, iBytes, fTimeoutSec = 5.0):
+	_iReceived = 0
+	_fDeadline = time.time() + fTimeoutSec
+	while ( ( _iReceived < iBytes ) and ( time.time() < _fDeadline ) ):
+		_iReceived += len(oUart.RxPumpRead())
+		if ( _iReceived < iBytes ):
+			time.sleep(0.0001)
+	return _iReceived
+
+
+
+
+#
+# == Fill the simulated receive FIFO directly, bypassing line timing ==
+#
+def _FillRxFifo(oSimUart):
+	while ( len(oSimUart.oRxFifo) < SC16IS750Sim.SC16IS750SIM_FIFO_SIZE ):
+		oSimUart.oRxFifo.append( (0x55, 0x00) )
+	return
+
+
+
+#
+# == Nearest-rank percentile of a list of samples ==
+#
+def _Percentile(lSamples, iPercent):
+	if ( len(lSamples) == 0 ):
+		return 0.0
+	_lSorted = sorted(lSamples)
+	_iIndex = int(round(( iPercent / 100.0 ) * ( len(_lSorted) - 1 )))
+	return _lSorted[_iIndex]
+
+
+
+#
+# == Compare a result set against a baseline; returns the list of regressions ==
+#
+def CompareResults(dBaseline, dResults, fTolerance = 0.10):
+	_lRegressions = []
+	for _sName, _dResult in sorted(dResults["scenarios"].items()):
+		_dBase = dBaseline.get("scenarios", {}).get(_sName)
+		if ( _dBase == None ):	continue
+
+		for _sKey in SC16IS750BENCH_COMPARE_KEYS:
+			if ( ( _sKey not in _dBase ) or ( _sKey not in _dResult ) ):	continue
+
+		# -- Transaction counts are deterministic, so any increase is a regression
+			if ( _sKey.startswith("transactions") == True ):
+				_fLimit = _dBase[_sKey]
+			else:
+				_fLimit = _dBase[_sKey] * ( 1.0 + fTolerance )
+
+			if ( _dResult[_sKey] > ( _fLimit + 1e-9 ) ):
+				_lRegressions.append("%s.%s: %.3f > baseline %.3f" % (_sName, _sKey, _dResult[_sKey], _dBase[_sKey]))
+	return _lRegressions
+
+
+
+
+# ====================================================
+#   C O M M A N D   L I N E
+# ====================================================
+
+def main(lArgs = None):
+	_oParser = argparse.ArgumentParser(description = "SC16IS750 driver throughput and latency benchmarks")
+	_oParser.add_argument("--latency-us", type = float, default = 0.0, help = "simulated bus delay added to every I2C transaction (microseconds)")
+	_oParser.add_argument("--bus-hz", type = int, default = 400000, help = "simulated I2C clock (Hz)")
+	_oParser.add_argument("--iterations", type = int, default = 2000, help = "calls per scenario")
+	_oParser.add_argument("--scenario", action = "append", help = "run only the named scenario (repeatable)")
+	_oParser.add_argument("--output", help = "write the JSON results to this file instead of stdout")
+	_oParser.add_argument("--compare", help = "baseline JSON results to compare against")
+	_oParser.add_argument("--tolerance", type = float, default = 0.10, help = "allowed relative latency increase over the baseline")
+	_oArgs = _oParser.parse_args(lArgs)
+
+	_oBench = SC16IS750Bench(fBusLatencySec = _oArgs.latency_us / 1e6, iBusHz = _oArgs.bus_hz, iIterations = _oArgs.iterations)
+	_dResults = _oBench.Run(_oArgs.scenario)
+
+# -- Emit the results
+	_sResults = json.dumps(_dResults, indent = 2, sort_keys = True)
+	if ( _oArgs.output != None ):
+		with open(_oArgs.output, "w") as _oFile:
+			_oFile.write(_sResults + "\n")
+	else:
+		print(_sResults)
+
+# -- Fail the run on regressions against the baseline
+	if ( _oArgs.compare != None ):
+		with open(_oArgs.compare) as _oFile:
+			_dBaseline = json.load(_oFile)
+		_lRegressions = CompareResults(_dBaseline, _dResults, _oArgs.tolerance)
+		for _sRegression in _lRegressions:
+			sys.stderr.write("REGRESSION " + _sRegression + "\n")
+		if ( len(_lRegressions) > 0 ):
+			return 1
+
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
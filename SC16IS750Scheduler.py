@@ -0,0 +1,757 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+######################################################
+#
+#   N X P 's   S C 1 6 I S 7 5 0   I 2 C   U A R T
+#      B U S   S C H E D U L I N G
+#
+#  (C) 2 0 1 7,   P e t e r   B r u n n e n g r ä b e r
+#
+######################################################
+
+# NOTES
+#
+#  - SC16IS750BusScheduler serves every SC16IS750 on one bus from a single
+#     worker thread, in place of a polling thread per device.
+#  - SC16IS750BusManager serves SC16IS750s on several buses, one
+#     SC16IS750BusScheduler worker thread per bus, each optionally pinned to
+#     CPUs.  RX callbacks run on an SC16IS750WorkerPool, off the bus workers.
+#  - A device in a schedule is served through its RX pump ring buffer and TX
+#     writer queue (RxPumpRead() / TxWriterWrite()); its own StartRxPump(),
+#     StartTxWriter() and StartIrqMode() refuse to run meanwhile.
+#
+#  Usage:
+#     oScheduler = SC16IS750BusScheduler()
+#     oScheduler.AddDevice(oUart)
+#     oScheduler.Start()
+#
+#     oManager = SC16IS750BusManager({ 1:[ 2 ], 3:[ 3 ] })
+#     oManager.AddDevice(oUart, fnOnRx = OnRx)
+#     oManager.Start()
+#
+
+
+# ====================================================
+#   L O A D   L I B R A R I E S
+# ====================================================
+
+# Import core python functions
+import os
+import time
+import threading
+import collections
+
+# Import the driver
+from SC16IS750 import *
+
+
+
+
+# ====================================================
+#   C O N S T A N T S
+# ====================================================
+
+# -- Bus scheduler: fraction of the receive FIFO a busy device may fill before it is served, the FIFO headroom
+#     (in characters) kept for an idle device that could start receiving at line rate, the weight of the newest
+#     sample in the per device line activity average, and the number of service latency samples kept per device
+SC16IS750_SCHED_FILL_TARGET		= 0.5
+SC16IS750_SCHED_GUARD_CHARS		= 8
+SC16IS750_SCHED_ACTIVITY_WEIGHT	= 0.25
+SC16IS750_SCHED_LATENCY_SAMPLES	= 1024
+
+
+
+
+# ====================================================
+#   B U S   S C H E D U L E R
+# ====================================================
+
+#
+# == Serves many SC16IS750s on one I2C bus from a single worker thread ==
+#     Instead of one polling thread per device fighting for the bus, each device gets a receive due time
+#     predicted from its baud rate and the RXLVL levels it has shown: busy devices are served before their
+#     FIFO passes SC16IS750_SCHED_FILL_TARGET, idle ones before a line rate burst could fill it.  The device
+#     closest to overrun is always served first.  Transmit time is shared out in FIFO sized bursts, round
+#     robin, one burst between receive services.  Data moves through the device's ring buffers as in IRQ
+#     mode: RxPumpRead() to receive, TxWriterWrite() to send.
+#     The worker can be pinned to the CPUs in lCpus, and RX callbacks can be handed to an oDispatchPool
+#     (SC16IS750WorkerPool) so that user code never holds up the bus.
+#
+class SC16IS750BusScheduler(object):
+
+#
+# == Class Initialization ==
+#
+	def __init__(self, fFillTarget = SC16IS750_SCHED_FILL_TARGET, iGuardChars = SC16IS750_SCHED_GUARD_CHARS, lCpus = None, oDispatchPool = None, sName = "SC16IS750-BusScheduler"):
+		self._fFillTarget = fFillTarget
+		self._iGuardChars = iGuardChars
+		self._lCpus = lCpus
+		self._oDispatchPool = oDispatchPool
+		self._sName = sName
+		self._oBusLock = None
+		self._lSlots = []
+		self._oSlotsLock = threading.Lock()
+		self._iTxTurn = 0
+		self._oWake = threading.Event()
+		self._oStop = None
+		self._oThread = None
+		self._oError = None
+		return
+
+
+
+#
+# == Add a device to the schedule; every device must sit on the same bus ==
+#     fnOnRx(device, bytes received) is called after every receive service that brought data.
+#
+	def AddDevice(self, oUart, iRxBufferSize = 4096, iTxQueueSize = 4096, fnOnRx = None):
+	# -- The scheduler takes over from the device's own service threads
+		if ( oUart._ServiceThreadAlive() == True ):
+			if (oUart._bPrintDebug == True):	print("AddDevice: Device already served by IRQ mode, a pump, a writer or a scheduler.")
+			return False
+
+	# -- One scheduler per bus; the bus is known by its lock
+		if ( self._oBusLock == None ):
+			self._oBusLock = oUart._oBusLock
+		elif ( oUart._oBusLock is not self._oBusLock ):
+			if (oUart._bPrintDebug == True):	print("AddDevice: Device is on another bus.")
+			return False
+
+		oUart._AllocateServiceBuffers(iRxBufferSize, iTxQueueSize)
+		oUart._oScheduler = self
+
+	# -- The worker walks a copy of the slot list, so it is replaced rather than changed
+		with self._oSlotsLock:
+			self._lSlots = self._lSlots + [ _SC16IS750BusSlot(oUart, fnOnRx) ]
+		self.Wake()
+		return True
+
+
+
+#
+# == Remove a device from the schedule; its buffered data stays in its ring buffers ==
+#
+	def RemoveDevice(self, oUart):
+		with self._oSlotsLock:
+			_lSlots = [ _oSlot for _oSlot in self._lSlots if ( _oSlot.oUart is not oUart ) ]
+			if ( len(_lSlots) == len(self._lSlots) ):
+				return False
+			self._lSlots = _lSlots
+
+	# -- Wait for a service of this device already in progress to finish
+		with self._oBusLock:
+			oUart._oScheduler = None
+		return True
+
+
+
+#
+# == Start the worker thread ==
+#
+	def Start(self):
+		if ( self.IsRunning() == True ):
+			return False
+
+		self._oError = None
+		self._oStop = threading.Event()
+		self._oThread = threading.Thread(target = self._Run, name = self._sName)
+		self._oThread.daemon = True
+		self._oThread.start()
+		return True
+
+
+
+#
+# == Stop the worker thread; returns once it has finished its last bus transaction ==
+#
+	def Stop(self, fTimeoutSec = None):
+		if ( self._oThread == None ):
+			return True
+
+		self._oStop.set()
+		self.Wake()
+		self._oThread.join(fTimeoutSec)
+		if ( self._oThread.is_alive() == True ):
+			return False
+
+		self._oThread = None
+		return True
+
+
+
+#
+# == Check that the worker thread is running ==
+#
+	def IsRunning(self):
+		return ( ( self._oThread != None ) and ( self._oThread.is_alive() == True ) )
+
+
+
+#
+# == Wake the worker (new TX data queued, device added, stop request) ==
+#
+	def Wake(self):
+		self._oWake.set()
+		return
+
+
+
+#
+# == Error that stopped the worker thread, if any ==
+#
+	def GetError(self):
+		return self._oError
+
+
+
+#
+# == Devices in the schedule ==
+#
+	def GetDevices(self):
+		return [ _oSlot.oUart for _oSlot in self._lSlots ]
+
+
+
+#
+# == Per device service statistics, one dictionary per device in schedule order ==
+#     Service latency is how late a device was served against its predicted due time.
+#     full-fifo-reads counts RXLVL reads that found the receive FIFO full, when an overrun is likely.
+#
+	def GetStats(self):
+		_lStats = []
+		for _oSlot in self._lSlots:
+			_lLatencies = sorted(_oSlot.lLatencies[:min(_oSlot.iLatencyCount, len(_oSlot.lLatencies))])
+			_dStats = dict(_oSlot.dCounters)
+			_dStats["address"] = _oSlot.oUart._hI2CAddress
+			_dStats["rx-dropped"] = _oSlot.oUart._iRxPumpDropped
+			_dStats["latency-p50-us"] = _SC16IS750Percentile(_lLatencies, 50) * 1e6
+			_dStats["latency-p99-us"] = _SC16IS750Percentile(_lLatencies, 99) * 1e6
+			_dStats["latency-max-us"] = _SC16IS750Percentile(_lLatencies, 100) * 1e6
+			_dStats["max-gap-us"] = _oSlot.fMaxGapSec * 1e6
+			_dStats["line-activity"] = _oSlot.fActivity
+			_dStats["error"] = _oSlot.oError
+			_lStats.append(_dStats)
+		return _lStats
+
+
+
+#
+# == Zero the per device statistics ==
+#
+	def ResetStats(self):
+		for _oSlot in self._lSlots:
+			_oSlot.ResetStats()
+		return
+
+
+
+#
+# == LOCAL: Time at which a device's receive FIFO is due for service ==
+#     A busy line reaches the fill target after ( target / activity ) character times; an idle line could
+#     start at line rate any moment, so it is never left longer than the FIFO less the guard takes to fill.
+#
+	def _RxDue(self, oSlot):
+		_fCharSec = oSlot.oUart.GetCharTime()
+		_fIdleSec = ( SC16IS750_FIFO_SIZE - self._iGuardChars ) * _fCharSec
+		_fBusySec = ( SC16IS750_FIFO_SIZE * self._fFillTarget * _fCharSec ) / max(oSlot.fActivity, 0.001)
+		return oSlot.fLastRxTime + min(_fIdleSec, _fBusySec)
+
+
+
+#
+# == LOCAL: Serve one device's receive FIFO; one RXLVL read and one block read ==
+#     The other channels of a dual channel chip in the schedule are served in the same pass, their
+#     RXLVL reads back to back with this one's.
+#
+	def _ServeRx(self, oSlot, fNow, lSlots):
+		_lGroup = [ oSlot ]
+		if ( oSlot.oUart._lChannels.count(None) < ( SC16IS750_CHANNELS - 1 ) ):
+			_lGroup += [ _oSlot for _oSlot in lSlots if ( ( _oSlot is not oSlot ) and ( _oSlot.oError == None ) and ( _oSlot.oUart._lChannels is oSlot.oUart._lChannels ) ) ]
+
+		with self._oBusLock:
+			_lLevels = [ _oSlot.oUart.RxFifoBufferUsed() for _oSlot in _lGroup ]
+			for _oSlot, _iFifoBufferBytes in zip(_lGroup, _lLevels):
+				_oSlot.oUart._RxPumpDrain(_iFifoBufferBytes)
+
+		for _oSlot, _iFifoBufferBytes in zip(_lGroup, _lLevels):
+			self._AccountRx(_oSlot, _iFifoBufferBytes, fNow)
+		return
+
+
+
+#
+# == LOCAL: Book one receive service of a device and predict its next due time ==
+#
+	def _AccountRx(self, oSlot, iFifoBufferBytes, fNow):
+		_oUart = oSlot.oUart
+
+	# -- Learn how busy the line is: the share of the elapsed character times that brought a byte
+		_fGapSec = fNow - oSlot.fLastRxTime
+		if ( _fGapSec > 0.0 ):
+			_fActivity = min(1.0, ( iFifoBufferBytes * _oUart.GetCharTime() ) / _fGapSec)
+			oSlot.fActivity += SC16IS750_SCHED_ACTIVITY_WEIGHT * ( _fActivity - oSlot.fActivity )
+		oSlot.fMaxGapSec = max(oSlot.fMaxGapSec, _fGapSec)
+
+	# -- Statistics
+		oSlot.AddLatency(max(0.0, fNow - oSlot.fRxDue))
+		oSlot.dCounters["serves"] += 1
+		oSlot.dCounters["rx-bytes"] += iFifoBufferBytes
+		oSlot.dCounters["max-rx-level"] = max(oSlot.dCounters["max-rx-level"], iFifoBufferBytes)
+		if ( iFifoBufferBytes >= SC16IS750_FIFO_SIZE ):
+			oSlot.dCounters["full-fifo-reads"] += 1
+
+		oSlot.fLastRxTime = fNow
+		oSlot.fRxDue = self._RxDue(oSlot)
+
+	# -- Hand the data to the user off the bus: on the dispatch pool if there is one
+		if ( ( oSlot.fnOnRx != None ) and ( iFifoBufferBytes > 0 ) ):
+			if ( self._oDispatchPool != None ):
+				self._oDispatchPool.Submit(oSlot.fnOnRx, _oUart, iFifoBufferBytes)
+			else:
+				oSlot.fnOnRx(_oUart, iFifoBufferBytes)
+		return
+
+
+
+#
+# == LOCAL: Give the next device in turn with queued data one transmit burst; returns True if one was sent ==
+#
+	def _ServeTx(self, lSlots, aBlock, fNow):
+		for _iOffset in range(len(lSlots)):
+			_iIndex = ( self._iTxTurn + _iOffset ) % len(lSlots)
+			_oSlot = lSlots[_iIndex]
+			if ( ( _oSlot.oError != None ) or ( _oSlot.fTxDue > fNow ) or ( _oSlot.oUart._oTxQueue.Used() == 0 ) ):
+				continue
+			self._iTxTurn = _iIndex + 1
+
+			_oUart = _oSlot.oUart
+			with self._oBusLock:
+				_iFifoBufferSpace = _oUart.TxFifoBufferAvailable()
+				_iSent = _oUart._TxWriterSendBurst(aBlock, _iFifoBufferSpace)
+
+		# -- A full FIFO is not looked at again until it is expected to have drained; with space left over
+		#     the queue ran empty, and new data can go out straight away
+			if ( ( _iSent < 0 ) or ( _iSent >= _iFifoBufferSpace ) ):
+				_oSlot.fTxDue = fNow + _oUart._TxWriterPollSec(SC16IS750_FIFO_SIZE)
+			if ( _iSent > 0 ):
+				_oSlot.dCounters["tx-bytes"] += _iSent
+				_oSlot.dCounters["tx-bursts"] += 1
+			return True
+		return False
+
+
+
+#
+# == LOCAL: Serve one slot, taking it out of the schedule if its device fails ==
+#
+	def _ServeSlot(self, fnServe, oSlot, *lArgs):
+		try:
+			return fnServe(oSlot, *lArgs)
+		except Exception as _oError:
+			oSlot.oError = _oError
+			if (oSlot.oUart._bPrintDebug == True):	print("SC16IS750BusScheduler: Device at " + str(oSlot.oUart._hI2CAddress) + " dropped on error: " + str(_oError))
+		return False
+
+
+
+#
+# == LOCAL: Worker thread body ==
+#
+	def _Run(self):
+		_aBlock = bytearray(SC16IS750_FIFO_SIZE)
+		try:
+			if ( self._lCpus != None ):
+				_SC16IS750SetThreadAffinity(self._lCpus)
+			while ( self._oStop.is_set() == False ):
+			# -- Clear before looking, so a wake up during the pass is not lost
+				self._oWake.clear()
+				_lSlots = self._lSlots
+				_fNow = time.time()
+
+			# -- The device closest to overrun first
+				_oUrgent = None
+				for _oSlot in _lSlots:
+					if ( ( _oSlot.oError == None ) and ( ( _oUrgent == None ) or ( _oSlot.fRxDue < _oUrgent.fRxDue ) ) ):
+						_oUrgent = _oSlot
+				_bServed = False
+				if ( ( _oUrgent != None ) and ( _oUrgent.fRxDue <= _fNow ) ):
+					self._ServeSlot(self._ServeRx, _oUrgent, _fNow, _lSlots)
+					_bServed = True
+
+			# -- Then one transmit burst, so transmit time is shared out even while receiving keeps the bus busy
+				_lTxSlots = [ _oSlot for _oSlot in _lSlots if ( _oSlot.oError == None ) ]
+				if ( len(_lTxSlots) > 0 ):
+					if ( self._ServeTx(_lTxSlots, _aBlock, time.time()) == True ):
+						_bServed = True
+				if ( _bServed == True ):
+					continue
+
+			# -- Nothing due; sleep until the next device is, or until woken
+				_fNextDue = None
+				for _oSlot in _lSlots:
+					if ( _oSlot.oError != None ):	continue
+					_fDue = _oSlot.fRxDue
+					if ( _oSlot.oUart._oTxQueue.Used() > 0 ):
+						_fDue = min(_fDue, _oSlot.fTxDue)
+					if ( ( _fNextDue == None ) or ( _fDue < _fNextDue ) ):
+						_fNextDue = _fDue
+				if ( _fNextDue == None ):
+					self._oWake.wait()
+				else:
+					self._oWake.wait(max(SC16IS750_POLL_MIN_SEC, _fNextDue - time.time()))
+		except Exception as _oError:
+			self._oError = _oError
+		return
+
+
+
+#
+# == LOCAL: Schedule state and statistics of one device ==
+#
+class _SC16IS750BusSlot(object):
+
+	def __init__(self, oUart, fnOnRx = None):
+		self.oUart = oUart
+		self.fnOnRx = fnOnRx
+		self.oError = None
+
+	# -- Start out assuming a busy line; the activity average settles within a few services
+		self.fActivity = 1.0
+		self.fLastRxTime = time.time()
+		self.fRxDue = self.fLastRxTime
+		self.fTxDue = 0.0
+
+		self.lLatencies = [ 0.0 ] * SC16IS750_SCHED_LATENCY_SAMPLES
+		self.ResetStats()
+		return
+
+	def ResetStats(self):
+		self.dCounters = { "serves":0, "rx-bytes":0, "tx-bytes":0, "tx-bursts":0, "max-rx-level":0, "full-fifo-reads":0 }
+		self.iLatencyCount = 0
+		self.fMaxGapSec = 0.0
+		return
+
+	def AddLatency(self, fLatencySec):
+		self.lLatencies[self.iLatencyCount % len(self.lLatencies)] = fLatencySec
+		self.iLatencyCount += 1
+		return
+
+
+
+#
+# == Nearest-rank percentile of a sorted list of samples ==
+#
+def _SC16IS750Percentile(lSorted, iPercent):
+	if ( len(lSorted) == 0 ):
+		return 0.0
+	return lSorted[int(round(( iPercent / 100.0 ) * ( len(lSorted) - 1 )))]
+
+
+
+
+#
+# == Pin the calling thread to a set of CPUs (Linux); a no-op where the platform cannot ==
+#
+def _SC16IS750SetThreadAffinity(lCpus):
+	if ( hasattr(os, "sched_setaffinity") == False ):
+		return False
+	if ( isinstance(lCpus, int) == True ):
+		lCpus = [ lCpus ]
+# -- pid 0 is the calling thread on Linux
+	os.sched_setaffinity(0, set(lCpus))
+	return True
+
+
+
+
+# ====================================================
+#   W O R K E R   P O O L
+# ====================================================
+
+#
+# == Small pool of threads for bus independent work: framing, parsing, user callbacks ==
+#     Jobs run in submission order per thread; an exception in a job is kept in GetErrors() and
+#     does not stop the pool.
+#
+class SC16IS750WorkerPool(object):
+
+#
+# == Class Initialization ==
+#
+	def __init__(self, iThreads = 2, lCpus = None, iMaxErrors = 64):
+		self._iThreads = iThreads
+		self._lCpus = lCpus
+		self._oJobs = collections.deque()
+		self._oCondition = threading.Condition()
+		self._lThreads = []
+		self._bStop = False
+		self._lErrors = collections.deque(maxlen = iMaxErrors)
+		self._iJobsDone = 0
+		return
+
+
+
+#
+# == Start the pool threads ==
+#
+	def Start(self):
+		if ( len(self._lThreads) > 0 ):
+			return False
+
+		self._bStop = False
+		for _iThread in range(self._iThreads):
+			_oThread = threading.Thread(target = self._Run, name = "SC16IS750-Worker-" + str(_iThread))
+			_oThread.daemon = True
+			_oThread.start()
+			self._lThreads.append(_oThread)
+		return True
+
+
+
+#
+# == Stop the pool threads once the queued jobs have run ==
+#
+	def Stop(self, fTimeoutSec = None):
+		with self._oCondition:
+			self._bStop = True
+			self._oCondition.notify_all()
+
+		_fDeadline = None
+		if ( fTimeoutSec != None ):	_fDeadline = time.time() + fTimeoutSec
+		for _oThread in self._lThreads:
+			if ( _fDeadline == None ):
+				_oThread.join()
+			else:
+				_oThread.join(max(0.0, _fDeadline - time.time()))
+		self._lThreads = [ _oThread for _oThread in self._lThreads if ( _oThread.is_alive() == True ) ]
+		return ( len(self._lThreads) == 0 )
+
+
+
+#
+# == Queue fnJob(*lArgs) to run on a pool thread ==
+#
+	def Submit(self, fnJob, *lArgs):
+		with self._oCondition:
+			self._oJobs.append(( fnJob, lArgs ))
+			self._oCondition.notify()
+		return
+
+
+
+#
+# == Number of jobs waiting to run ==
+#
+	def Pending(self):
+		return len(self._oJobs)
+
+
+
+#
+# == Number of jobs run so far ==
+#
+	def JobsDone(self):
+		return self._iJobsDone
+
+
+
+#
+# == Exceptions raised by jobs, oldest first ==
+#
+	def GetErrors(self):
+		return list(self._lErrors)
+
+
+
+#
+# == LOCAL: Pool thread body ==
+#
+	def _Run(self):
+		if ( self._lCpus != None ):
+			_SC16IS750SetThreadAffinity(self._lCpus)
+		while ( True ):
+			with self._oCondition:
+				while ( ( len(self._oJobs) == 0 ) and ( self._bStop == False ) ):
+					self._oCondition.wait()
+				if ( len(self._oJobs) == 0 ):
+					return
+				_fnJob, _lArgs = self._oJobs.popleft()
+			try:
+				_fnJob(*_lArgs)
+			except Exception as _oError:
+				self._lErrors.append(_oError)
+			self._iJobsDone += 1
+
+
+
+
+# ====================================================
+#   M U L T I   B U S   M A N A G E R
+# ====================================================
+
+#
+# == Serves SC16IS750s on several I2C buses: one bus scheduler (and worker thread) per bus ==
+#     Devices are grouped by the bus they sit on, so the buses are worked in parallel; the I2C
+#     transfers release the interpreter lock while the kernel waits on the bus.  dBusCpus maps a
+#     bus number to the CPU (or list of CPUs) its worker is pinned to.  RX callbacks and other bus
+#     independent work run on a shared SC16IS750WorkerPool of iPoolThreads threads.
+#
+class SC16IS750BusManager(object):
+
+#
+# == Class Initialization ==
+#
+	def __init__(self, dBusCpus = None, iPoolThreads = 2, lPoolCpus = None, fFillTarget = SC16IS750_SCHED_FILL_TARGET, iGuardChars = SC16IS750_SCHED_GUARD_CHARS):
+		if ( dBusCpus == None ):	dBusCpus = {}
+		self._dBusCpus = dBusCpus
+		self._fFillTarget = fFillTarget
+		self._iGuardChars = iGuardChars
+		self._oPool = None
+		if ( iPoolThreads > 0 ):
+			self._oPool = SC16IS750WorkerPool(iPoolThreads, lPoolCpus)
+	# -- Schedulers in order of creation, as ( bus number, bus lock, scheduler )
+		self._lBuses = []
+		self._oBusesLock = threading.Lock()
+		self._bRunning = False
+		return
+
+
+
+#
+# == Add a device; it joins the scheduler of its bus, which is created on first use ==
+#
+	def AddDevice(self, oUart, iRxBufferSize = 4096, iTxQueueSize = 4096, fnOnRx = None):
+		with self._oBusesLock:
+			_oScheduler = self._GetScheduler(oUart)
+			if ( _oScheduler == None ):
+				_oScheduler = SC16IS750BusScheduler(self._fFillTarget, self._iGuardChars, self._dBusCpus.get(oUart._hI2CBus), self._oPool, "SC16IS750-Bus" + str(oUart._hI2CBus))
+				self._lBuses.append(( oUart._hI2CBus, oUart._oBusLock, _oScheduler ))
+				if ( self._bRunning == True ):
+					_oScheduler.Start()
+		return _oScheduler.AddDevice(oUart, iRxBufferSize, iTxQueueSize, fnOnRx)
+
+
+
+#
+# == Remove a device from its bus scheduler ==
+#
+	def RemoveDevice(self, oUart):
+		_oScheduler = self._GetScheduler(oUart)
+		if ( _oScheduler == None ):
+			return False
+		return _oScheduler.RemoveDevice(oUart)
+
+
+
+#
+# == Submit bus independent work fnJob(*lArgs) to the worker pool (runs inline without a pool) ==
+#
+	def Submit(self, fnJob, *lArgs):
+		if ( self._oPool == None ):
+			fnJob(*lArgs)
+		else:
+			self._oPool.Submit(fnJob, *lArgs)
+		return
+
+
+
+#
+# == Start the worker pool and one scheduler per bus ==
+#
+	def Start(self):
+		if ( self._bRunning == True ):
+			return False
+
+		if ( self._oPool != None ):
+			self._oPool.Start()
+		with self._oBusesLock:
+			for _hI2CBus, _oBusLock, _oScheduler in self._lBuses:
+				_oScheduler.Start()
+			self._bRunning = True
+		return True
+
+
+
+#
+# == Stop the bus schedulers, then the worker pool once its queued jobs have run ==
+#
+	def Stop(self, fTimeoutSec = None):
+		_bStopped = True
+		with self._oBusesLock:
+			self._bRunning = False
+			for _hI2CBus, _oBusLock, _oScheduler in self._lBuses:
+				_bStopped = ( _oScheduler.Stop(fTimeoutSec) and _bStopped )
+		if ( self._oPool != None ):
+			_bStopped = ( self._oPool.Stop(fTimeoutSec) and _bStopped )
+		return _bStopped
+
+
+
+#
+# == Check that every bus scheduler is running ==
+#
+	def IsRunning(self):
+		if ( len(self._lBuses) == 0 ):
+			return self._bRunning
+		for _hI2CBus, _oBusLock, _oScheduler in self._lBuses:
+			if ( _oScheduler.IsRunning() == False ):
+				return False
+		return True
+
+
+
+#
+# == The bus scheduler of each bus, keyed by bus number ==
+#     Two providers can use the same bus number; the first scheduler created keeps the key.
+#
+	def GetSchedulers(self):
+		_dSchedulers = {}
+		for _hI2CBus, _oBusLock, _oScheduler in self._lBuses:
+			_dSchedulers.setdefault(_hI2CBus, _oScheduler)
+		return _dSchedulers
+
+
+
+#
+# == Per device service statistics grouped by bus number ==
+#
+	def GetStats(self):
+		_dStats = {}
+		for _hI2CBus, _oBusLock, _oScheduler in self._lBuses:
+			_dStats.setdefault(_hI2CBus, []).extend(_oScheduler.GetStats())
+		return _dStats
+
+
+
+#
+# == Errors that stopped a bus worker, and errors raised by pool jobs ==
+#
+	def GetErrors(self):
+		_lErrors = []
+		for _hI2CBus, _oBusLock, _oScheduler in self._lBuses:
+			if ( _oScheduler.GetError() != None ):
+				_lErrors.append(( _hI2CBus, _oScheduler.GetError() ))
+		if ( self._oPool != None ):
+			_lErrors.extend([ ( None, _oError ) for _oError in self._oPool.GetErrors() ])
+		return _lErrors
+
+
+
+#
+# == Zero the per device statistics on every bus ==
+#
+	def ResetStats(self):
+		for _hI2CBus, _oBusLock, _oScheduler in self._lBuses:
+			_oScheduler.ResetStats()
+		return
+
+
+
+#
+# == LOCAL: Scheduler serving the bus a device sits on; the bus is known by its lock ==
+#
+	def _GetScheduler(self, oUart):
+		for _hI2CBus, _oBusLock, _oScheduler in self._lBuses:
+			if ( _oBusLock is oUart._oBusLock ):
+				return _oScheduler
+		return None
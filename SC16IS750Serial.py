@@ -0,0 +1,565 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+######################################################
+#
+#   N X P 's   S C 1 6 I S 7 5 0   I 2 C   U A R T
+#      P Y S E R I A L   C O M P A T I B L E   P O R T
+#
+#  (C) 2 0 1 7,   P e t e r   B r u n n e n g r ä b e r
+#
+######################################################
+
+# NOTES
+#
+#  - SC16IS750Serial has the attributes and methods of pySerial's serial.Serial,
+#     so code written against pySerial can drive an SC16IS750 unchanged.
+#  - read()/readinto() fill the caller's buffer through memoryviews, one RXLVL
+#     read plus one block read per FIFO drain; no per byte bus transactions.
+#  - timeout / write_timeout follow pySerial: None blocks, 0 does not block,
+#     > 0 waits up to that many seconds.
+#  - When pySerial is installed its SerialException / SerialTimeoutException are
+#     raised, so existing exception handlers keep working.
+#
+#  Usage:
+#     oUart = SC16IS750.SC16IS750(0x48)
+#     oPort = SC16IS750Serial(oUart, baudrate = 115200, timeout = 1.0)
+#     oPort.write(b"AT\r\n")
+#     sLine = oPort.readline()
+#
+
+
+# ====================================================
+#   L O A D   L I B R A R I E S
+# ====================================================
+
+# Import core python functions
+import io
+import time
+
+# Import the driver
+from SC16IS750 import SC16IS750_FIFO_SIZE, SC16IS750Error
+
+# Use pySerial's exceptions when it is available
+try:
+	from serial import SerialException, SerialTimeoutException
+except ImportError:
+	class SerialException(SC16IS750Error, IOError):
+		pass
+
+	class SerialTimeoutException(SerialException):
+		pass
+
+
+
+
+# ====================================================
+#   C O N S T A N T S
+# ====================================================
+
+# -- pySerial compatible line settings
+PARITY_NONE, PARITY_EVEN, PARITY_ODD, PARITY_MARK, PARITY_SPACE = 'N', 'E', 'O', 'M', 'S'
+STOPBITS_ONE, STOPBITS_ONE_POINT_FIVE, STOPBITS_TWO = (1, 1.5, 2)
+FIVEBITS, SIXBITS, SEVENBITS, EIGHTBITS = (5, 6, 7, 8)
+
+SC16IS750SERIAL_PARITIES	= ( PARITY_NONE, PARITY_EVEN, PARITY_ODD, PARITY_MARK, PARITY_SPACE )
+SC16IS750SERIAL_STOPBITS	= ( STOPBITS_ONE, STOPBITS_ONE_POINT_FIVE, STOPBITS_TWO )
+SC16IS750SERIAL_BYTESIZES	= ( FIVEBITS, SIXBITS, SEVENBITS, EIGHTBITS )
+
+# -- Line terminator used by readline()
+LF = b'\n'
+
+
+
+
+# ====================================================
+#   P Y S E R I A L   C O M P A T I B L E   P O R T
+#      C L A S S   D E F I N I T I O N
+# ====================================================
+
+class SC16IS750Serial(io.RawIOBase):
+
+#
+# == Class Initialization: configure the UART and open the port ==
+#     oUart is an SC16IS750 instance; the remaining arguments match serial.Serial().
+#
+	def __init__(self, oUart, baudrate = 9600, bytesize = EIGHTBITS, parity = PARITY_NONE, stopbits = STOPBITS_ONE, timeout = None, xonxoff = False, rtscts = False, write_timeout = None):
+		super(SC16IS750Serial, self).__init__()
+		self._oUart = oUart
+		self._bIsOpen = False
+		self._fTimeout = None
+		self._fWriteTimeout = None
+		self._bBreakState = False
+		self._bRtsState = True
+		self._bDtrState = True
+
+	# -- Bytes drained from the receive FIFO beyond what read_until() returned
+		self._aRxPending = bytearray()
+
+	# -- Validate and keep the settings; they are applied to the chip by open()
+		self._iBaudrate = self._CheckBaudrate(baudrate)
+		self._iByteSize = self._CheckByteSize(bytesize)
+		self._eParity = self._CheckParity(parity)
+		self._fStopBits = self._CheckStopBits(stopbits, self._iByteSize)
+		self._bXonXoff = xonxoff
+		self._bRtsCts = rtscts
+		self.timeout = timeout
+		self.write_timeout = write_timeout
+
+		self.open()
+		return
+
+
+
+#
+# == Apply the settings to the UART and mark the port open ==
+#
+	def open(self):
+		if ( self._bIsOpen == True ):
+			raise SerialException("Port is already open.")
+
+	# -- Pick the flow control mode for Connect()
+		if ( self._bRtsCts == True ):
+			_eFlowControl = 'AUTO'
+		elif ( self._bXonXoff == True ):
+			_eFlowControl = 'SOFT'
+		else:
+			_eFlowControl = 'NONE'
+
+		if ( self._oUart.Connect(self._iBaudrate, self._eParity, self._iByteSize, self._LineStopBits(self._fStopBits), _eFlowControl) == False ):
+			raise SerialException("Could not configure the SC16IS750 UART.")
+
+		self._aRxPending = bytearray()
+		self._bIsOpen = True
+		return
+
+
+
+#
+# == Mark the port closed; the chip keeps its configuration ==
+#
+	def close(self):
+		self._bIsOpen = False
+		return
+
+
+
+	@property
+	def is_open(self):
+		return self._bIsOpen
+
+	@property
+	def port(self):
+		return self._oUart
+
+	@property
+	def name(self):
+		return "SC16IS750"
+
+	def readable(self):
+		return True
+
+	def writable(self):
+		return True
+
+	def seekable(self):
+		return False
+
+
+
+# ----------------------------------------------------
+#   L I N E   S E T T I N G S
+# ----------------------------------------------------
+
+	@property
+	def baudrate(self):
+		return self._iBaudrate
+
+	@baudrate.setter
+	def baudrate(self, iBaud):
+		iBaud = self._CheckBaudrate(iBaud)
+		if ( ( self._bIsOpen == True ) and ( self._oUart.SetBaudrate(iBaud) == False ) ):
+			raise SerialException("Could not set the baud rate to " + str(iBaud) + ".")
+		self._iBaudrate = iBaud
+
+	@property
+	def bytesize(self):
+		return self._iByteSize
+
+	@bytesize.setter
+	def bytesize(self, iByteSize):
+		iByteSize = self._CheckByteSize(iByteSize)
+		self._CheckStopBits(self._fStopBits, iByteSize)
+		self._ApplyLine(iByteSize, self._eParity, self._fStopBits)
+
+	@property
+	def parity(self):
+		return self._eParity
+
+	@parity.setter
+	def parity(self, eParity):
+		self._ApplyLine(self._iByteSize, self._CheckParity(eParity), self._fStopBits)
+
+	@property
+	def stopbits(self):
+		return self._fStopBits
+
+	@stopbits.setter
+	def stopbits(self, fStopBits):
+		self._ApplyLine(self._iByteSize, self._eParity, self._CheckStopBits(fStopBits, self._iByteSize))
+
+	@property
+	def xonxoff(self):
+		return self._bXonXoff
+
+	@property
+	def rtscts(self):
+		return self._bRtsCts
+
+
+
+	@property
+	def timeout(self):
+		return self._fTimeout
+
+	@timeout.setter
+	def timeout(self, fTimeout):
+		if ( ( fTimeout != None ) and ( fTimeout < 0 ) ):
+			raise ValueError("Not a valid timeout: " + repr(fTimeout))
+		self._fTimeout = fTimeout
+
+	@property
+	def write_timeout(self):
+		return self._fWriteTimeout
+
+	@write_timeout.setter
+	def write_timeout(self, fTimeout):
+		if ( ( fTimeout != None ) and ( fTimeout < 0 ) ):
+			raise ValueError("Not a valid timeout: " + repr(fTimeout))
+		self._fWriteTimeout = fTimeout
+
+
+
+#
+# == LOCAL: Write the line settings to the LCR register and keep them ==
+#
+	def _ApplyLine(self, iByteSize, eParity, fStopBits):
+		if ( self._bIsOpen == True ):
+			if ( self._oUart.SetLine(iByteSize, eParity, self._LineStopBits(fStopBits)) == False ):
+				raise SerialException("Could not set the line settings.")
+		self._iByteSize = iByteSize
+		self._eParity = eParity
+		self._fStopBits = fStopBits
+		return
+
+#
+# == LOCAL: SetLine() stop bits; 1.5 stop bits is the LCR[2] setting for 5 bit words (See spec table 14) ==
+#
+	def _LineStopBits(self, fStopBits):
+		if ( fStopBits == STOPBITS_ONE ):
+			return 1
+		return 2
+
+
+
+#
+# == LOCAL: Setting validation, raising ValueError like pySerial ==
+#
+	def _CheckBaudrate(self, iBaud):
+		try:
+			iBaud = int(iBaud)
+		except ( TypeError, ValueError ):
+			raise ValueError("Not a valid baudrate: " + repr(iBaud))
+		if ( iBaud <= 0 ):
+			raise ValueError("Not a valid baudrate: " + repr(iBaud))
+		return iBaud
+
+	def _CheckByteSize(self, iByteSize):
+		if ( iByteSize not in SC16IS750SERIAL_BYTESIZES ):
+			raise ValueError("Not a valid byte size: " + repr(iByteSize))
+		return iByteSize
+
+	def _CheckParity(self, eParity):
+		if ( eParity not in SC16IS750SERIAL_PARITIES ):
+			raise ValueError("Not a valid parity: " + repr(eParity))
+		return eParity
+
+	def _CheckStopBits(self, fStopBits, iByteSize):
+		if ( fStopBits not in SC16IS750SERIAL_STOPBITS ):
+			raise ValueError("Not a valid stop bit size: " + repr(fStopBits))
+	# -- The chip sends 1.5 stop bits only with 5 bit words, and 2 stop bits only with longer ones
+		if ( ( fStopBits == STOPBITS_ONE_POINT_FIVE ) and ( iByteSize != FIVEBITS ) ):
+			raise ValueError("1.5 stop bits need a 5 bit byte size")
+		if ( ( fStopBits == STOPBITS_TWO ) and ( iByteSize == FIVEBITS ) ):
+			raise ValueError("2 stop bits need a 6, 7 or 8 bit byte size")
+		return fStopBits
+
+
+
+	def _CheckOpen(self):
+		if ( self._bIsOpen == False ):
+			raise SerialException("Port is not open.")
+		return
+
+
+
+# ----------------------------------------------------
+#   R E C E I V E
+# ----------------------------------------------------
+
+	@property
+	def in_waiting(self):
+		self._CheckOpen()
+		return ( len(self._aRxPending) + self._oUart.RxFifoBufferUsed() )
+
+
+
+#
+# == Read into a caller supplied buffer, honouring the timeout; returns the number of bytes read ==
+#
+	def readinto(self, aBuffer):
+		self._CheckOpen()
+		_oView = memoryview(aBuffer)
+		if ( _oView.ndim != 1 or _oView.itemsize != 1 ):
+			_oView = _oView.cast('B')
+		_iSize = len(_oView)
+		_iRead = 0
+
+	# -- Hand out anything read_until() drained earlier first
+		if ( len(self._aRxPending) > 0 ):
+			_iRead = min(len(self._aRxPending), _iSize)
+			_oView[:_iRead] = self._aRxPending[:_iRead]
+			del self._aRxPending[:_iRead]
+
+	# -- Drain the FIFO straight into the remaining part of the caller's buffer; a zero timeout drains once
+		if ( _iRead < _iSize ):
+			_iDrained = self._oUart.ReadInto(_oView[_iRead:], ( self._fTimeout != 0 ), self._fTimeout)
+			if ( _iDrained == None ):
+				raise SerialException("Read from the receive FIFO failed.")
+			_iRead += _iDrained
+
+		return _iRead
+
+
+
+#
+# == Read up to iSize bytes, honouring the timeout ==
+#
+	def read(self, size = 1):
+		if ( size == None or size < 0 ):
+			size = self.in_waiting
+		_aBuffer = bytearray(size)
+		_iRead = self.readinto(_aBuffer)
+		del _aBuffer[_iRead:]
+		return bytes(_aBuffer)
+
+
+
+#
+# == Read until the expected sequence, iSize bytes or the timeout ==
+#     Drains whole FIFOs and keeps whatever follows the sequence for the next read.
+#
+	def read_until(self, expected = LF, size = None):
+		self._CheckOpen()
+		_aLine = bytearray()
+		_iSearchFrom = 0
+
+		if ( self._fTimeout != None ):
+			_fDeadline = time.time() + self._fTimeout
+
+		while ( True ):
+		# -- Move pending bytes into the line and look for the sequence
+			_aLine += self._aRxPending
+			del self._aRxPending[:]
+
+			_iEnd = _aLine.find(expected, _iSearchFrom)
+			if ( _iEnd >= 0 ):
+				_iEnd += len(expected)
+			if ( ( size != None ) and ( ( _iEnd < 0 ) or ( _iEnd > size ) ) and ( len(_aLine) >= size ) ):
+				_iEnd = size
+			if ( _iEnd >= 0 ):
+				self._aRxPending[:0] = _aLine[_iEnd:]
+				del _aLine[_iEnd:]
+				return bytes(_aLine)
+			_iSearchFrom = max(0, len(_aLine) - len(expected) + 1)
+
+		# -- Drain the FIFO in one block read
+			_aData = self._oUart.ReadBytes()
+			if ( _aData == None ):
+				raise SerialException("Read from the receive FIFO failed.")
+			if ( len(_aData) > 0 ):
+				self._aRxPending += _aData
+				continue
+
+		# -- Nothing new; stop or wait for more according to the timeout
+			if ( self._fTimeout == 0 ):
+				break
+			if ( self._fTimeout != None ):
+				_fRemaining = _fDeadline - time.time()
+				if ( _fRemaining <= 0 ):
+					break
+				time.sleep(min(self._oUart.GetRxWaitInterval(len(expected)), _fRemaining))
+			else:
+				time.sleep(self._oUart.GetRxWaitInterval(len(expected)))
+
+		return bytes(_aLine)
+
+
+
+	def readline(self, size = -1):
+		if ( size == None or size < 0 ):
+			size = None
+		return self.read_until(LF, size)
+
+
+
+#
+# == Throw away everything received and not read yet ==
+#
+	def reset_input_buffer(self):
+		self._CheckOpen()
+		del self._aRxPending[:]
+		if ( self._oUart.ResetRxFifoBuffer() == False ):
+			raise SerialException("Could not reset the receive FIFO.")
+		return
+
+
+
+# ----------------------------------------------------
+#   T R A N S M I T
+# ----------------------------------------------------
+
+	@property
+	def out_waiting(self):
+		self._CheckOpen()
+		return ( SC16IS750_FIFO_SIZE - self._oUart.TxFifoBufferAvailable() )
+
+
+
+#
+# == Write data, honouring the write timeout; returns the number of bytes written ==
+#
+	def write(self, data):
+		self._CheckOpen()
+		_iDataLen = len(data)
+		if ( _iDataLen == 0 ):
+			return 0
+
+	# -- write_timeout 0 is a single non-blocking FIFO fill
+		if ( self._fWriteTimeout == 0 ):
+			_iWritten = self._oUart.WriteBytes(data, bBlocking = False)
+			if ( _iWritten == None ):
+				raise SerialException("Write to the transmit FIFO failed.")
+			return _iWritten
+
+		_iWritten = self._oUart.WriteBytes(data, bBlocking = True, fTimeoutSec = self._fWriteTimeout)
+		if ( _iWritten == None ):
+			raise SerialException("Write to the transmit FIFO failed.")
+		if ( _iWritten < _iDataLen ):
+			if ( self._fWriteTimeout != None ):
+				raise SerialTimeoutException("Write timeout")
+			raise SerialException("Write to the transmit FIFO failed after " + str(_iWritten) + " bytes.")
+		return _iWritten
+
+
+
+#
+# == Wait until all written data has been sent (THR & TSR empty) ==
+#
+	def flush(self):
+		self._CheckOpen()
+		while ( True ):
+			_oLineStatus = self._oUart.GetLineStatus()
+			if ( _oLineStatus == None ):
+				raise SerialException("Could not read the line status.")
+			if ( _oLineStatus.thr_tsr_empty == True ):
+				break
+			time.sleep(self._oUart.GetTxWaitInterval(SC16IS750_FIFO_SIZE - self._oUart.TxFifoBufferAvailable()))
+		return
+
+
+
+#
+# == Throw away everything written and not sent yet ==
+#
+	def reset_output_buffer(self):
+		self._CheckOpen()
+		if ( self._oUart.ResetTxFifoBuffer() == False ):
+			raise SerialException("Could not reset the transmit FIFO.")
+		return
+
+
+
+# ----------------------------------------------------
+#   M O D E M   L I N E S   A N D   B R E A K
+# ----------------------------------------------------
+
+	def send_break(self, duration = 0.25):
+		self.break_condition = True
+		time.sleep(duration)
+		self.break_condition = False
+		return
+
+	@property
+	def break_condition(self):
+		return self._bBreakState
+
+	@break_condition.setter
+	def break_condition(self, bBreak):
+		self._CheckOpen()
+		if ( self._oUart.SetLineBreak(bBreak) == False ):
+			raise SerialException("Could not set the break condition.")
+		self._bBreakState = bBreak
+
+
+
+	@property
+	def rts(self):
+		return self._bRtsState
+
+	@rts.setter
+	def rts(self, bActive):
+		self._CheckOpen()
+		if ( self._oUart.SetModemRTS(bActive) == False ):
+			raise SerialException("Could not set RTS.")
+		self._bRtsState = bActive
+
+	@property
+	def dtr(self):
+		return self._bDtrState
+
+	@dtr.setter
+	def dtr(self, bActive):
+		self._CheckOpen()
+		if ( self._oUart.SetModemDTR(bActive) == False ):
+			raise SerialException("Could not set DTR; the GPIO[4:7] modem pins are not enabled.")
+		self._bDtrState = bActive
+
+
+
+#
+# == Modem inputs; DSR, RI and CD read False unless the GPIO[4:7] modem pins are enabled ==
+#
+	@property
+	def cts(self):
+		self._CheckOpen()
+		return self._oUart.GetModemStatus().cts_high
+
+	@property
+	def dsr(self):
+		self._CheckOpen()
+		return self._oUart.GetModemStatus().dsr_high
+
+	@property
+	def ri(self):
+		self._CheckOpen()
+		return self._oUart.GetModemStatus().ri_high
+
+	@property
+	def cd(self):
+		self._CheckOpen()
+		return self._oUart.GetModemStatus().cd_high
+
+
+
+# -- pySerial style alias
+Serial = SC16IS750Serial
@@ -0,0 +1,1068 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+######################################################
+#
+#   N X P 's   S C 1 6 I S 7 5 0   I 2 C   U A R T
+#      S O F T W A R E   C H I P   M O D E L
+#
+#  (C) 2 0 1 7,   P e t e r   B r u n n e n g r ä b e r
+#
+######################################################
+
+# NOTES
+#
+#  - Drop-in stand-in for the Adafruit_GPIO.I2C module: pass an SC16IS750Sim
+#     instance as _oExistingI2CInstance to SC16IS750.__init__
+#  - Time is virtual by default and advances by the modeled I2C transaction
+#     time of every bus access (plus the simulated bus latency) and by Advance().
+#     With bRealTime = True the wall clock is used and every transaction sleeps.
+#  - UART byte timing is derived from the programmed divisor, the MCR[7]
+#     prescaler, the LCR line settings and the crystal frequency.
+#  - Automatic RTS/CTS and XOn/XOff flow control are register-only; their
+#     effect on the line is not modeled.
+#  - RS-485 9-bit mode: mark parity sends an address byte (InjectRx hAddress on the
+#     receive side) and EFR[5] matches it against XOFF2; the EFCR[4:5] auto RTS
+#     direction is register-only.
+#  - SC16IS750SimI2CDev is a mock of the i2c-dev open/ioctl/close layer for the driver's native
+#     backend (SC16IS750I2CDev); each I2C_RDWR ioctl is one bus transaction.
+#  - SC16IS750SimSpiDev is a spidev.SpiDev stand-in for the SPI transport
+#     (SC16IS750SpiTransport); its transfers are timed at max_speed_hz.
+#  - SC16IS750SimIrqSource turns the modeled IRQ output into edges for the
+#     driver's IRQ mode; it lets simulated time run while the link is idle.
+#
+
+
+# ====================================================
+#   L O A D   L I B R A R I E S
+# ====================================================
+
+# Import core python functions
+import os
+import time
+import random
+import threading
+import collections
+
+# Import the register map from the driver
+from SC16IS750 import *
+
+
+
+
+# ====================================================
+#   C O N S T A N T S
+# ====================================================
+
+# -- FIFO depth of both the receive and the transmit FIFO
+SC16IS750SIM_FIFO_SIZE		= 64
+
+# -- I2C bits per byte on the bus (8 data bits + ACK)
+SC16IS750SIM_I2C_BITS_PER_BYTE	= 9
+
+# -- I2C bus bytes per transaction type (address, register, data; reads add a repeated start and address)
+SC16IS750SIM_I2C_WRITE8_BYTES	= 3
+SC16IS750SIM_I2C_READU8_BYTES	= 4
+
+# -- SPI bits per byte on the bus
+SC16IS750SIM_SPI_BITS_PER_BYTE	= 8
+
+# -- FCR[7:6] receive and FCR[5:4] transmit trigger levels - see spec tables 11 & 12
+SC16IS750SIM_RX_TRIGGER_LEVELS	= ( 8, 16, 56, 60 )
+SC16IS750SIM_TX_TRIGGER_LEVELS	= ( 8, 16, 32, 56 )
+
+# -- Per byte receive error flags, kept alongside each byte in the receive FIFO
+SC16IS750SIM_RX_PARITY_ERROR	= 0x04
+SC16IS750SIM_RX_FRAMING_ERROR	= 0x08
+SC16IS750SIM_RX_BREAK			= 0x10
+
+# -- Line flag for a byte sent with its 9th bit set (an RS-485 address byte); never stored in the FIFO
+SC16IS750SIM_LINE_ADDRESS		= 0x100
+
+
+
+
+# ====================================================
+#   S I M U L A T E D   U A R T   C H A N N E L
+# ====================================================
+
+class SC16IS750SimUart(object):
+
+#
+# == Class Initialization ==
+#
+	def __init__(self, oChip, iChannel):
+		self._oChip = oChip
+		self.iChannel = iChannel
+		self.oPeer = None
+		self.Reset()
+		return
+
+
+
+#
+# == Put every register and FIFO into its software reset state ==
+#
+	def Reset(self):
+	# -- Registers - see spec table 9
+		self.hIER = 0x00
+		self.hFCR = 0x00
+		self.hLCR = 0x1D
+		self.hMCR = 0x00
+		self.hSPR = 0xFF
+		self.hTCR = 0x00
+		self.hTLR = 0x00
+		self.hEFCR = 0x00
+		self.hDLL = 0x00
+		self.hDLH = 0x00
+		self.hEFR = 0x00
+		self.lXOnOff = [ 0x00, 0x00, 0x00, 0x00 ]
+
+	# -- Receive side: FIFO of (byte, error flags), bytes still travelling on the line, overrun latch
+		self.oRxFifo = collections.deque()
+		self.oRxLine = collections.deque()
+		self.fRxLineFree = 0.0
+		self.fRxLastTime = 0.0
+		self.bOverrun = False
+
+	# -- Transmit side: FIFO, byte in the shift register (TSR) and when it leaves, THR interrupt latch
+		self.oTxFifo = collections.deque()
+		self.hTsrByte = None
+		self.fTsrDone = 0.0
+		self.bThrIrqAck = False
+		self.aTxLine = bytearray()
+		self.lTxAddresses = []
+
+	# -- Modem inputs (logical active states) and the latched MSR delta bits
+		self.hModemInputs = 0x00
+		self.hMsrDelta = 0x00
+
+	# -- Statistics
+		self.iRxBytes = 0
+		self.iRxOverruns = 0
+		self.iRxNoiseErrors = 0
+		self.iTxBytes = 0
+		self.iTxFifoOverflows = 0
+		return
+
+
+
+#
+# == Duration of one character on the line in seconds (None when no baud rate is programmed) ==
+#
+	def CharTime(self):
+		_iDivisor = ( self.hDLH << 8 ) | self.hDLL
+		if ( _iDivisor == 0 ):
+			return None
+
+	# -- Prescaler from MCR[7]
+		if ( ( self.hMCR & 0x80 ) > 0 ):
+			_iPrescaler = 4
+		else:
+			_iPrescaler = 1
+
+	# -- Start bit + data bits + parity bit + stop bits
+		_iDataBits = 5 + ( self.hLCR & 0x03 )
+		_fBits = 1.0 + _iDataBits
+		if ( ( self.hLCR & 0x08 ) > 0 ):
+			_fBits += 1.0
+		if ( ( self.hLCR & 0x04 ) > 0 ):
+			if ( _iDataBits == 5 ):
+				_fBits += 1.5
+			else:
+				_fBits += 2.0
+		else:
+			_fBits += 1.0
+
+		return ( _fBits * 16.0 * _iDivisor * _iPrescaler ) / self._oChip.iCrystalFreq
+
+
+
+#
+# == Receive trigger level in bytes ==
+#
+	def RxTriggerLevel(self):
+		if ( ( self.hTLR & 0xF0 ) > 0 ):
+			return ( self.hTLR >> 4 ) * 4
+		return SC16IS750SIM_RX_TRIGGER_LEVELS[ self.hFCR >> 6 ]
+
+
+
+#
+# == Transmit trigger level in spaces ==
+#
+	def TxTriggerLevel(self):
+		if ( ( self.hTLR & 0x0F ) > 0 ):
+			return ( self.hTLR & 0x0F ) * 4
+		return SC16IS750SIM_TX_TRIGGER_LEVELS[ ( self.hFCR >> 4 ) & 0x03 ]
+
+
+
+#
+# == Queue bytes sent by the remote end onto the receive line; hAddress goes first as a 9-bit address byte ==
+#
+	def InjectRx(self, aData, fAt = None, hAddress = None):
+		with self._oChip.oBus.oLock:
+			self._InjectRx(aData, fAt, hAddress)
+		return
+
+
+
+#
+# == LOCAL: Queue bytes onto the receive line ==
+#
+	def _InjectRx(self, aData, fAt, hAddress = None):
+		_fCharTime = self.CharTime()
+		if ( _fCharTime == None ):	_fCharTime = 0.0
+
+	# -- Bytes follow each other back to back, starting no earlier than now
+		_fNow = self._oChip.oBus.Now()
+		if ( fAt == None ):	fAt = _fNow
+		_fArrival = max(fAt, self.fRxLineFree, _fNow)
+		if ( hAddress != None ):
+			_fArrival += _fCharTime
+			self.oRxLine.append( (_fArrival, hAddress, SC16IS750SIM_LINE_ADDRESS) )
+		for _hByte in bytearray(aData):
+			_fArrival += _fCharTime
+			self.oRxLine.append( (_fArrival, _hByte, 0x00) )
+		self.fRxLineFree = _fArrival
+		return
+
+
+
+#
+# == Take (and clear) the bytes transmitted onto the line ==
+#
+	def TakeTx(self):
+		_aData = self.aTxLine
+		self.aTxLine = bytearray()
+		return bytes(_aData)
+
+
+
+#
+# == Take (and clear) the ( offset, byte ) of each byte sent with its 9th bit set since the last TakeTx() ==
+#
+	def TakeTxAddresses(self):
+		_lAddresses = self.lTxAddresses
+		self.lTxAddresses = []
+		return _lAddresses
+
+
+
+#
+# == Set the modem input pins (CTS, DSR, RI, CD as MSR[4:7] logical states) ==
+#
+	def SetModemInputs(self, hModemInputs):
+		self.hMsrDelta |= self._MsrChange(self.hModemInputs, hModemInputs)
+		self.hModemInputs = hModemInputs & 0xF0
+		return
+
+
+
+#
+# == LOCAL: MSR delta bits for a change of the modem input states ==
+#
+	def _MsrChange(self, hOld, hNew):
+		_hDelta = ( ( hOld ^ hNew ) >> 4 ) & 0x0B
+	# -- RI only flags its trailing edge
+		if ( ( ( hOld & 0x40 ) > 0 ) and ( ( hNew & 0x40 ) == 0 ) ):
+			_hDelta |= 0x04
+		return _hDelta
+
+
+
+#
+# == LOCAL: Current modem inputs, routed from MCR in loopback mode ==
+#
+	def _ModemInputs(self):
+		if ( ( self.hMCR & 0x10 ) > 0 ):
+		# -- Loopback: RTS -> CTS, DTR -> DSR, MCR[3] -> RI, MCR[2] -> CD
+			return ( ( ( self.hMCR & 0x02 ) << 3 ) | ( ( self.hMCR & 0x01 ) << 5 ) | ( ( self.hMCR & 0x08 ) << 3 ) | ( ( self.hMCR & 0x04 ) << 5 ) )
+		return self.hModemInputs
+
+
+
+#
+# == LOCAL: Advance the line state up to the time fNow ==
+#
+	def Step(self, fNow):
+		_fCharTime = self.CharTime()
+
+	# -- Transmit: the shift register finishes bytes one character time apart
+		while ( ( self.hTsrByte != None ) and ( self.fTsrDone <= fNow ) ):
+			self._TxComplete(self.hTsrByte, self.fTsrDone)
+			if ( ( len(self.oTxFifo) > 0 ) and ( _fCharTime != None ) and ( ( self.hEFCR & 0x04 ) == 0 ) ):
+				self.hTsrByte = self.oTxFifo.popleft()
+				self.fTsrDone += _fCharTime
+			else:
+				self.hTsrByte = None
+
+	# -- Receive: bytes that finished arriving land in the FIFO or overrun it
+		while ( ( len(self.oRxLine) > 0 ) and ( self.oRxLine[0][0] <= fNow ) ):
+			_fArrival, _hByte, _hFlags = self.oRxLine.popleft()
+			self._RxComplete(_hByte, _hFlags, _fArrival)
+		return
+
+
+
+#
+# == LOCAL: Load the shift register when it is idle ==
+#
+	def _StartTx(self, fNow):
+		_fCharTime = self.CharTime()
+		if ( ( self.hTsrByte == None ) and ( len(self.oTxFifo) > 0 ) and ( _fCharTime != None ) ):
+			self.hTsrByte = self.oTxFifo.popleft()
+			self.fTsrDone = fNow + _fCharTime
+		return
+
+
+
+#
+# == LOCAL: A byte finished leaving the shift register ==
+#
+	def _TxComplete(self, hByte, fTime):
+		self.iTxBytes += 1
+
+	# -- Mark parity (forced 1, LCR[5:3] = 101) sends the 9th bit of an RS-485 address byte
+		_hFlags = 0x00
+		if ( ( self.hLCR & 0x38 ) == 0x28 ):
+			_hFlags = SC16IS750SIM_LINE_ADDRESS
+
+	# -- In loopback the transmitter output feeds the receiver and the TX pin stays idle
+		if ( ( self.hMCR & 0x10 ) > 0 ):
+			self._RxComplete(hByte, _hFlags, fTime)
+		elif ( self.oPeer != None ):
+			self.oPeer.oRxLine.append( (fTime, hByte, _hFlags) )
+		else:
+			if ( _hFlags != 0x00 ):	self.lTxAddresses.append( (len(self.aTxLine), hByte) )
+			self.aTxLine.append(hByte)
+		return
+
+
+
+#
+# == LOCAL: A byte finished arriving at the receiver ==
+#
+	def _RxComplete(self, hByte, hFlags, fTime):
+		_bAddress = ( ( hFlags & SC16IS750SIM_LINE_ADDRESS ) > 0 )
+		hFlags &= ~SC16IS750SIM_LINE_ADDRESS
+
+	# -- 9-bit mode (EFCR[0]): the 9th bit of an address byte shows in place of the parity error flag
+		if ( ( ( self.hEFCR & 0x01 ) > 0 ) and ( _bAddress == True ) ):
+			hFlags |= SC16IS750SIM_RX_PARITY_ERROR
+		# -- With EFR[5] a match on XOFF2 enables the receiver, others are dropped while it is disabled;
+		#     without it every address byte reaches the FIFO for the host to examine
+			if ( ( self.hEFR & 0x20 ) > 0 ):
+				if ( hByte == self.lXOnOff[3] ):
+					self.hEFCR &= 0xFD
+				elif ( ( self.hEFCR & 0x02 ) > 0 ):
+					return
+
+	# -- EFCR[1] disables the receiver
+		elif ( ( self.hEFCR & 0x02 ) > 0 ):
+			return
+
+	# -- Line noise corrupts one bit and shows up as a framing or parity error
+		if ( ( self._oChip.oBus.fNoiseRate > 0.0 ) and ( self._oChip.oBus.oRandom.random() < self._oChip.oBus.fNoiseRate ) ):
+			hByte ^= ( 1 << self._oChip.oBus.oRandom.randint(0, 7) )
+			if ( ( self.hLCR & 0x08 ) > 0 ):
+				hFlags |= SC16IS750SIM_RX_PARITY_ERROR
+			else:
+				hFlags |= SC16IS750SIM_RX_FRAMING_ERROR
+			self.iRxNoiseErrors += 1
+
+	# -- A full FIFO loses the byte in the receive shift register
+		if ( len(self.oRxFifo) >= SC16IS750SIM_FIFO_SIZE ):
+			self.bOverrun = True
+			self.iRxOverruns += 1
+		else:
+			self.oRxFifo.append( (hByte & ( ( 1 << ( 5 + ( self.hLCR & 0x03 ) ) ) - 1 ), hFlags) )
+			self.iRxBytes += 1
+		self.fRxLastTime = fTime
+		return
+
+
+
+#
+# == Line Status Register value ==
+#
+	def _LSR(self):
+		_hLSR = 0x00
+		if ( len(self.oRxFifo) > 0 ):
+			_hLSR |= 0x01
+			_hLSR |= ( self.oRxFifo[0][1] & 0x1C )
+		if ( self.bOverrun == True ):
+			_hLSR |= 0x02
+		if ( len(self.oTxFifo) == 0 ):
+			_hLSR |= 0x20
+			if ( self.hTsrByte == None ):
+				_hLSR |= 0x40
+		for _hByte, _hFlags in self.oRxFifo:
+			if ( _hFlags != 0x00 ):
+				_hLSR |= 0x80
+				break
+		return _hLSR
+
+
+
+#
+# == Interrupt Identification Register value (priority encoded - see spec table 14) ==
+#
+	def _IIR(self, fNow):
+		if ( ( self.hFCR & 0x01 ) > 0 ):
+			_hFifoBits = 0xC0
+		else:
+			_hFifoBits = 0x00
+
+	# -- Priority 1: receiver line status
+		if ( ( ( self.hIER & 0x04 ) > 0 ) and ( ( self._LSR() & 0x1E ) > 0 ) ):
+			return _hFifoBits | 0x06
+
+	# -- Priority 2: receiver time-out and RHR data above the trigger level
+		if ( ( self.hIER & 0x01 ) > 0 ) and ( len(self.oRxFifo) > 0 ):
+			_fCharTime = self.CharTime()
+			if ( ( ( self.hFCR & 0x01 ) == 0 ) or ( len(self.oRxFifo) >= self.RxTriggerLevel() ) ):
+				return _hFifoBits | 0x04
+			if ( ( _fCharTime != None ) and ( ( fNow - self.fRxLastTime ) >= ( 4.0 * _fCharTime ) ) ):
+				return _hFifoBits | 0x0C
+
+	# -- Priority 3: transmit holding register empty (or spaces above the trigger level)
+		if ( ( ( self.hIER & 0x02 ) > 0 ) and ( self.bThrIrqAck == False ) ):
+			if ( ( ( ( self.hFCR & 0x01 ) == 0 ) and ( len(self.oTxFifo) == 0 ) ) or ( ( ( self.hFCR & 0x01 ) > 0 ) and ( ( SC16IS750SIM_FIFO_SIZE - len(self.oTxFifo) ) >= self.TxTriggerLevel() ) ) ):
+				return _hFifoBits | 0x02
+
+	# -- Priority 4: modem status change
+		if ( ( ( self.hIER & 0x08 ) > 0 ) and ( self.hMsrDelta > 0 ) ):
+			return _hFifoBits | 0x00
+
+	# -- Priority 5: input pin change of state
+		if ( self._oChip.bIoIrqPending == True ):
+			return _hFifoBits | 0x30
+
+	# -- No interrupt pending
+		return _hFifoBits | 0x01
+
+
+
+#
+# == Read a register ==
+#
+	def Read(self, hRegisterAddr, fNow):
+	# -- Divisor latches with LCR[7] = 1 (and LCR != 0xBF)
+		if ( ( ( self.hLCR & 0x80 ) > 0 ) and ( self.hLCR != 0xbf ) ):
+			if ( hRegisterAddr == SC16IS750_REG_LCR7_DLL ):	return self.hDLL
+			if ( hRegisterAddr == SC16IS750_REG_LCR7_DLH ):	return self.hDLH
+
+	# -- Enhanced registers with LCR = 0xBF
+		if ( self.hLCR == 0xbf ):
+			if ( hRegisterAddr == SC16IS750_REG_LCR_0XBF_EFR ):	return self.hEFR
+			if ( hRegisterAddr in (SC16IS750_REG_LCR_0XBF_XON1, SC16IS750_REG_LCR_0XBF_XON2, SC16IS750_REG_LCR_0XBF_XOFF1, SC16IS750_REG_LCR_0XBF_XOFF2) ):
+				return self.lXOnOff[ hRegisterAddr - SC16IS750_REG_LCR_0XBF_XON1 ]
+
+	# -- TCR & TLR replace MSR & SPR with EFR[4] = 1 and MCR[2] = 1
+		if ( ( ( self.hEFR & 0x10 ) > 0 ) and ( ( self.hMCR & 0x04 ) > 0 ) ):
+			if ( hRegisterAddr == SC16IS750_REG_TCR ):	return self.hTCR
+			if ( hRegisterAddr == SC16IS750_REG_TLR ):	return self.hTLR
+
+	# -- General register set
+		if ( hRegisterAddr == SC16IS750_REG_RHR ):
+			if ( len(self.oRxFifo) == 0 ):	return 0x00
+			return self.oRxFifo.popleft()[0]
+		if ( hRegisterAddr == SC16IS750_REG_IER ):	return self.hIER
+		if ( hRegisterAddr == SC16IS750_REG_IIR ):
+			_hIIR = self._IIR(fNow)
+		# -- Reading IIR acknowledges a THR interrupt
+			if ( ( _hIIR & 0x3F ) == 0x02 ):	self.bThrIrqAck = True
+			return _hIIR
+		if ( hRegisterAddr == SC16IS750_REG_LCR ):	return self.hLCR
+		if ( hRegisterAddr == SC16IS750_REG_MCR ):	return self.hMCR
+		if ( hRegisterAddr == SC16IS750_REG_LSR ):
+			_hLSR = self._LSR()
+			self.bOverrun = False
+			return _hLSR
+		if ( hRegisterAddr == SC16IS750_REG_MSR ):
+			_hMSR = self._ModemInputs() | self.hMsrDelta
+			self.hMsrDelta = 0x00
+			return _hMSR
+		if ( hRegisterAddr == SC16IS750_REG_SPR ):	return self.hSPR
+		if ( hRegisterAddr == SC16IS750_REG_TXLVL ):	return SC16IS750SIM_FIFO_SIZE - len(self.oTxFifo)
+		if ( hRegisterAddr == SC16IS750_REG_RXLVL ):	return len(self.oRxFifo)
+		if ( hRegisterAddr == SC16IS750_REG_EFCR ):	return self.hEFCR
+
+	# -- I/O pin registers are shared by the whole chip
+		return self._oChip.ReadGpio(hRegisterAddr)
+
+
+
+#
+# == Write a register ==
+#
+	def Write(self, hRegisterAddr, hValue, fNow):
+		hValue &= 0xFF
+		_bEnhanced = ( ( self.hEFR & 0x10 ) > 0 )
+
+	# -- Divisor latches with LCR[7] = 1 (and LCR != 0xBF)
+		if ( ( ( self.hLCR & 0x80 ) > 0 ) and ( self.hLCR != 0xbf ) ):
+			if ( hRegisterAddr == SC16IS750_REG_LCR7_DLL ):
+				self.hDLL = hValue
+				return
+			if ( hRegisterAddr == SC16IS750_REG_LCR7_DLH ):
+				self.hDLH = hValue
+				return
+
+	# -- Enhanced registers with LCR = 0xBF
+		if ( self.hLCR == 0xbf ):
+			if ( hRegisterAddr == SC16IS750_REG_LCR_0XBF_EFR ):
+				self.hEFR = hValue
+				return
+			if ( hRegisterAddr in (SC16IS750_REG_LCR_0XBF_XON1, SC16IS750_REG_LCR_0XBF_XON2, SC16IS750_REG_LCR_0XBF_XOFF1, SC16IS750_REG_LCR_0XBF_XOFF2) ):
+				self.lXOnOff[ hRegisterAddr - SC16IS750_REG_LCR_0XBF_XON1 ] = hValue
+				return
+
+	# -- TCR & TLR replace MSR & SPR with EFR[4] = 1 and MCR[2] = 1
+		if ( ( _bEnhanced == True ) and ( ( self.hMCR & 0x04 ) > 0 ) ):
+			if ( hRegisterAddr == SC16IS750_REG_TCR ):
+				self.hTCR = hValue
+				return
+			if ( hRegisterAddr == SC16IS750_REG_TLR ):
+				self.hTLR = hValue
+				return
+
+	# -- General register set
+		if ( hRegisterAddr == SC16IS750_REG_THR ):
+		# -- EFCR[2] disables the transmitter; a full FIFO drops the byte
+			if ( len(self.oTxFifo) >= SC16IS750SIM_FIFO_SIZE ):
+				self.iTxFifoOverflows += 1
+			else:
+				self.oTxFifo.append(hValue)
+			self.bThrIrqAck = False
+			if ( ( self.hEFCR & 0x04 ) == 0 ):
+				self._StartTx(fNow)
+		elif ( hRegisterAddr == SC16IS750_REG_IER ):
+		# -- IER[7:4] can only be modified with EFR[4] set
+			if ( _bEnhanced == False ):	hValue = ( hValue & 0x0F ) | ( self.hIER & 0xF0 )
+			self.hIER = hValue
+		elif ( hRegisterAddr == SC16IS750_REG_FCR ):
+			if ( ( hValue & 0x02 ) > 0 ):
+				self.oRxFifo.clear()
+			if ( ( hValue & 0x04 ) > 0 ):
+				self.oTxFifo.clear()
+		# -- FCR[5:4] can only be modified with EFR[4] set; the reset bits clear themselves
+			if ( _bEnhanced == False ):	hValue = ( hValue & 0xCF ) | ( self.hFCR & 0x30 )
+			self.hFCR = hValue & 0xF9
+		elif ( hRegisterAddr == SC16IS750_REG_LCR ):
+			self.hLCR = hValue
+		elif ( hRegisterAddr == SC16IS750_REG_MCR ):
+		# -- MCR[7:5] & MCR[2] can only be modified with EFR[4] set
+			if ( _bEnhanced == False ):	hValue = ( hValue & 0x1B ) | ( self.hMCR & 0xE4 )
+			_hOldInputs = self._ModemInputs()
+			self.hMCR = hValue
+			self.hMsrDelta |= self._MsrChange(_hOldInputs, self._ModemInputs())
+		elif ( hRegisterAddr == SC16IS750_REG_SPR ):
+			self.hSPR = hValue
+		elif ( hRegisterAddr == SC16IS750_REG_EFCR ):
+			self.hEFCR = hValue
+			if ( ( self.hEFCR & 0x04 ) == 0 ):
+				self._StartTx(fNow)
+		else:
+		# -- I/O pin registers are shared by the whole chip
+			self._oChip.WriteGpio(hRegisterAddr, hValue)
+		return
+
+
+
+
+# ====================================================
+#   S I M U L A T E D   C H I P
+#      ( A D A F R U I T   I 2 C   D E V I C E )
+# ====================================================
+
+class SC16IS750SimChip(object):
+
+#
+# == Class Initialization ==
+#
+	def __init__(self, oBus, hI2CAddress, iChannels = 1):
+		self.oBus = oBus
+		self.hI2CAddress = hI2CAddress
+		self.iCrystalFreq = oBus.iCrystalFreq
+		self.lUarts = [ SC16IS750SimUart(self, _iChannel) for _iChannel in range(iChannels) ]
+		self._ResetGpio()
+		return
+
+
+
+#
+# == Channel A UART, for single channel use ==
+#
+	@property
+	def oUart(self):
+		return self.lUarts[0]
+
+
+
+#
+# == LOCAL: Reset the shared I/O pin registers ==
+#
+	def _ResetGpio(self):
+		self.hIODIR = 0x00
+		self.hIOLatch = 0x00
+		self.hIOINTENA = 0x00
+		self.hIOCONTROL = 0x00
+		self.hGpioInputs = 0x00
+		self.hGpioLastInputs = 0x00
+		self.bIoIrqPending = False
+		return
+
+
+
+#
+# == Software reset of the whole chip ==
+#
+	def Reset(self):
+		for _oUart in self.lUarts:
+			_oUart.Reset()
+		self._ResetGpio()
+		return
+
+
+
+#
+# == Drive the external levels of the I/O pins ==
+#
+	def SetGpioInputs(self, hInputs):
+		_hChanged = ( hInputs ^ self.hGpioInputs ) & ~self.hIODIR & self.hIOINTENA & 0xFF
+		self.hGpioInputs = hInputs & 0xFF
+		if ( _hChanged > 0 ):
+			self.bIoIrqPending = True
+		return
+
+
+
+#
+# == Read a shared I/O pin register ==
+#
+	def ReadGpio(self, hRegisterAddr):
+		if ( hRegisterAddr == SC16IS750_REG_IODIR ):	return self.hIODIR
+		if ( hRegisterAddr == SC16IS750_REG_IOSTATE ):
+		# -- Reading IOState acknowledges an I/O pin interrupt
+			self.bIoIrqPending = False
+			return ( ( self.hIOLatch & self.hIODIR ) | ( self.hGpioInputs & ~self.hIODIR ) ) & 0xFF
+		if ( hRegisterAddr == SC16IS750_REG_IOINTENA ):	return self.hIOINTENA
+		if ( hRegisterAddr == SC16IS750_REG_IOCONTROL ):	return self.hIOCONTROL
+		return 0x00
+
+
+
+#
+# == Write a shared I/O pin register ==
+#
+	def WriteGpio(self, hRegisterAddr, hValue):
+		if ( hRegisterAddr == SC16IS750_REG_IODIR ):
+			self.hIODIR = hValue
+		elif ( hRegisterAddr == SC16IS750_REG_IOSTATE ):
+			self.hIOLatch = hValue
+		elif ( hRegisterAddr == SC16IS750_REG_IOINTENA ):
+			self.hIOINTENA = hValue
+		elif ( hRegisterAddr == SC16IS750_REG_IOCONTROL ):
+		# -- IOControl[3] is the software reset; the chip NAKs the write
+			if ( ( hValue & 0x08 ) > 0 ):
+				self.Reset()
+				raise IOError("SC16IS750Sim: software reset NAK")
+			self.hIOCONTROL = hValue & 0x07
+		return
+
+
+
+#
+# == Level of the IRQ output: True while any channel has an enabled interrupt pending (no bus traffic) ==
+#
+	def IrqAsserted(self):
+		with self.oBus.oLock:
+			_fNow = self.oBus.Now()
+			self.oBus._Step(_fNow)
+			for _oUart in self.lUarts:
+				if ( ( _oUart._IIR(_fNow) & 0x01 ) == 0 ):
+					return True
+		return False
+
+
+
+#
+# == LOCAL: Decode the sub-address byte into the UART channel and register ==
+#
+	def _Decode(self, hSubAddr):
+		_iChannel = ( hSubAddr >> 1 ) & 0x03
+		if ( _iChannel >= len(self.lUarts) ):
+			raise IOError("SC16IS750Sim: channel " + str(_iChannel) + " not present")
+		return ( self.lUarts[_iChannel], ( hSubAddr >> 3 ) & 0x0F )
+
+
+
+#
+# == Adafruit I2C device interface: read an unsigned byte ==
+#
+	def readU8(self, register):
+		with self.oBus.oLock:
+			_fNow = self.oBus._Transaction(SC16IS750SIM_I2C_READU8_BYTES)
+			_oUart, _hRegisterAddr = self._Decode(register)
+			return _oUart.Read(_hRegisterAddr, _fNow)
+
+
+
+#
+# == Adafruit I2C device interface: write a byte ==
+#
+	def write8(self, register, value):
+		with self.oBus.oLock:
+			_fNow = self.oBus._Transaction(SC16IS750SIM_I2C_WRITE8_BYTES)
+			_oUart, _hRegisterAddr = self._Decode(register)
+			_oUart.Write(_hRegisterAddr, value, _fNow)
+		return
+
+
+
+#
+# == Adafruit I2C device interface: block read from one register ==
+#
+	def readList(self, register, length):
+		with self.oBus.oLock:
+			_fNow = self.oBus._Transaction(SC16IS750SIM_I2C_READU8_BYTES - 1 + length)
+			_oUart, _hRegisterAddr = self._Decode(register)
+			_aData = bytearray(length)
+			for _iIndex in range(length):
+				_aData[_iIndex] = _oUart.Read(_hRegisterAddr, _fNow)
+		return _aData
+
+
+
+#
+# == Adafruit I2C device interface: block write to one register ==
+#
+	def writeList(self, register, data):
+		with self.oBus.oLock:
+			_fNow = self.oBus._Transaction(SC16IS750SIM_I2C_WRITE8_BYTES - 1 + len(data))
+			_oUart, _hRegisterAddr = self._Decode(register)
+			for _hValue in bytearray(data):
+				_oUart.Write(_hRegisterAddr, _hValue, _fNow)
+		return
+
+
+
+
+# ====================================================
+#   S I M U L A T E D   I 2 C   B U S
+#      ( A D A F R U I T _ G P I O . I 2 C   S T A N D - I N )
+# ====================================================
+
+class SC16IS750Sim(object):
+
+#
+# == Class Initialization ==
+#
+	def __init__(self, iCrystalFreq = SC16IS750_CRYSTAL_FREQ, iBusHz = 400000, fBusLatencySec = 0.0, bRealTime = False, fNoiseRate = 0.0, iSeed = 0, iChannels = 1):
+		self.iCrystalFreq = iCrystalFreq
+		self.iBusHz = iBusHz
+		self.fBusLatencySec = fBusLatencySec
+		self.bRealTime = bRealTime
+		self.fNoiseRate = fNoiseRate
+		self.oRandom = random.Random(iSeed)
+		self.iChannels = iChannels
+		self.dChips = {}
+
+	# -- The model is a bus of its own, so it gets its own bus lock
+		self.sBusPath = SC16IS750NewBusPath("sim")
+
+	# -- One transaction at a time on the bus, whichever thread issues it
+		self.oLock = threading.RLock()
+
+	# -- Clocks: virtual time, or wall time since creation
+		self._fVirtualNow = 0.0
+		self._fRealStart = time.time()
+
+	# -- Bus statistics
+		self.iTransactions = 0
+		self.iBusBytes = 0
+		self.fBusTime = 0.0
+		return
+
+
+
+#
+# == Adafruit_GPIO.I2C interface: get the (simulated) device at an address ==
+#
+	def get_i2c_device(self, address, busnum = None, i2c_interface = None, **kwargs):
+		if ( address not in self.dChips ):
+			self.dChips[address] = SC16IS750SimChip(self, address, self.iChannels)
+		return self.dChips[address]
+
+
+
+#
+# == Bus path of the model, whatever the bus number; the key of its bus lock ==
+#
+	def GetBusPath(self, busnum = None):
+		return self.sBusPath
+
+
+
+#
+# == Current simulated time in seconds ==
+#
+	def Now(self):
+		if ( self.bRealTime == True ):
+			return time.time() - self._fRealStart
+		return self._fVirtualNow
+
+
+
+#
+# == Let simulated time pass without any bus traffic ==
+#
+	def Advance(self, fSec):
+		if ( self.bRealTime == True ):
+			time.sleep(fSec)
+		with self.oLock:
+			if ( self.bRealTime == False ):
+				self._fVirtualNow += fSec
+			self._Step(self.Now())
+		return
+
+
+
+#
+# == Zero the bus statistics ==
+#
+	def ResetCounters(self):
+		self.iTransactions = 0
+		self.iBusBytes = 0
+		self.fBusTime = 0.0
+		return
+
+
+
+#
+# == LOCAL: Account for one bus transaction and bring every chip up to date ==
+#
+	def _Transaction(self, iBusBytes, iBitsPerByte = SC16IS750SIM_I2C_BITS_PER_BYTE, iBusHz = None):
+		if ( iBusHz == None ):	iBusHz = self.iBusHz
+		_fDuration = ( float(iBusBytes * iBitsPerByte) / iBusHz ) + self.fBusLatencySec
+		self.iTransactions += 1
+		self.iBusBytes += iBusBytes
+		self.fBusTime += _fDuration
+
+		if ( self.bRealTime == True ):
+			time.sleep(_fDuration)
+		else:
+			self._fVirtualNow += _fDuration
+
+		_fNow = self.Now()
+		self._Step(_fNow)
+		return _fNow
+
+
+
+#
+# == LOCAL: Advance every UART on the bus to the time fNow ==
+#
+	def _Step(self, fNow):
+		for _oChip in self.dChips.values():
+			for _oUart in _oChip.lUarts:
+				_oUart.Step(fNow)
+		return
+
+
+
+
+# ====================================================
+#   S I M U L A T E D   I 2 C - D E V   I O C T L   L A Y E R
+# ====================================================
+
+class SC16IS750SimI2CDev(object):
+
+#
+# == Class Initialization: hand Open, Ioctl and Close to SC16IS750I2CDev as fnOpen, fnIoctl and fnClose ==
+#
+	def __init__(self, oSim):
+		self._oSim = oSim
+		self.iIoctls = 0
+		self.lOpened = []
+		return
+
+
+
+#
+# == os.open stand-in; every bus path maps to the one simulated bus ==
+#
+	def Open(self, sPath, iFlags):
+		self.lOpened.append(sPath)
+		return 1000 + len(self.lOpened)
+
+
+
+#
+# == os.close stand-in ==
+#
+	def Close(self, iFd):
+		return
+
+
+
+#
+# == fcntl.ioctl stand-in for I2C_RDWR: runs the messages in order against the addressed chips ==
+#     A write message sets the chip's sub-address and writes any following bytes to that register;
+#     a read message reads from the last sub-address set.
+#
+	def Ioctl(self, iFd, iRequest, oArg):
+		if ( iRequest != SC16IS750_I2C_RDWR ):
+			raise IOError("SC16IS750SimI2CDev: unsupported ioctl " + hex(iRequest))
+
+		with self._oSim.oLock:
+		# -- Each message costs its address byte and data bytes on the bus
+			_iBusBytes = 0
+			for _iIndex in range(oArg.nmsgs):
+				_iBusBytes += 1 + oArg.msgs[_iIndex].len
+			_fNow = self._oSim._Transaction(_iBusBytes)
+			self.iIoctls += 1
+
+			_dSubAddr = {}
+			for _iIndex in range(oArg.nmsgs):
+				_oMsg = oArg.msgs[_iIndex]
+				_oChip = self._oSim.dChips.get(_oMsg.addr)
+				if ( _oChip == None ):
+					raise IOError("SC16IS750SimI2CDev: no device at " + hex(_oMsg.addr))
+				if ( ( _oMsg.flags & SC16IS750_I2C_M_RD ) > 0 ):
+					_oUart, _hRegisterAddr = _oChip._Decode(_dSubAddr.get(_oMsg.addr, 0x00))
+					for _iByte in range(_oMsg.len):
+						_oMsg.buf[_iByte] = _oUart.Read(_hRegisterAddr, _fNow)
+				else:
+					_dSubAddr[_oMsg.addr] = _oMsg.buf[0]
+					_oUart, _hRegisterAddr = _oChip._Decode(_oMsg.buf[0])
+					for _iByte in range(1, _oMsg.len):
+						_oUart.Write(_hRegisterAddr, _oMsg.buf[_iByte], _fNow)
+		return 0
+
+
+
+
+# ====================================================
+#   S I M U L A T E D   S P I   D E V I C E
+#      ( S P I D E V . S P I D E V   S T A N D - I N )
+# ====================================================
+
+class SC16IS750SimSpiDev(object):
+
+#
+# == Class Initialization: the chip at hAddress on oSim, reached over its own chip select ==
+#     The chip shares the simulated clock (and bus statistics) with any I2C chips on oSim.
+#
+	def __init__(self, oSim, hAddress = 0x00, max_speed_hz = 4000000):
+		self._oSim = oSim
+		self.oChip = oSim.get_i2c_device(hAddress)
+		self.max_speed_hz = max_speed_hz
+		self.mode = 0
+		self.iTransfers = 0
+		return
+
+
+
+#
+# == spidev interface: one full duplex transfer; the first byte is R/W flag, register and channel ==
+#
+	def xfer2(self, lData):
+		_lData = list(lData)
+		with self._oSim.oLock:
+			_fNow = self._oSim._Transaction(len(_lData), SC16IS750SIM_SPI_BITS_PER_BYTE, self.max_speed_hz)
+			self.iTransfers += 1
+			_oUart, _hRegisterAddr = self.oChip._Decode(_lData[0] & 0x7F)
+			_lReply = [ 0x00 ] * len(_lData)
+			if ( ( _lData[0] & 0x80 ) > 0 ):
+				for _iIndex in range(1, len(_lData)):
+					_lReply[_iIndex] = _oUart.Read(_hRegisterAddr, _fNow)
+			else:
+				for _hValue in _lData[1:]:
+					_oUart.Write(_hRegisterAddr, _hValue, _fNow)
+		return _lReply
+
+
+
+#
+# == spidev interface: nothing to release ==
+#
+	def close(self):
+		return
+
+
+
+
+# ====================================================
+#   S I M U L A T E D   I R Q   E D G E   S O U R C E
+# ====================================================
+
+class SC16IS750SimIrqSource(object):
+
+#
+# == Class Initialization: watch the modeled IRQ output of one chip ==
+#     A watcher thread samples the IRQ level every fStepSec (advancing virtual time by as much)
+#     and signals a pipe on every assertion, like a GPIO falling edge.
+#
+	def __init__(self, oSim, hI2CAddress, fStepSec = 0.0001):
+		self._oSim = oSim
+		self._oChip = oSim.get_i2c_device(hI2CAddress)
+		self._fStepSec = fStepSec
+		self._lPipe = os.pipe()
+		self._bAsserted = False
+		self.iEdges = 0
+
+		self._oStop = threading.Event()
+		self._oThread = threading.Thread(target = self._Run, name = "SC16IS750Sim-Irq")
+		self._oThread.daemon = True
+		self._oThread.start()
+		return
+
+	def Fileno(self):
+		return self._lPipe[0]
+
+	def Acknowledge(self):
+		os.read(self._lPipe[0], 4096)
+		return
+
+	def IsAsserted(self):
+		return self._Sample()
+
+	def Close(self):
+		self._oStop.set()
+		self._oThread.join()
+		for _iFd in self._lPipe:
+			os.close(_iFd)
+		return
+
+
+
+#
+# == LOCAL: Sample the IRQ level and signal the edge from released to asserted ==
+#     Samples taken for the driver count too: a release it has seen is always followed by an edge.
+#
+	def _Sample(self):
+		with self._oSim.oLock:
+			_bNow = self._oChip.IrqAsserted()
+			if ( ( _bNow == True ) and ( self._bAsserted == False ) ):
+				self.iEdges += 1
+				os.write(self._lPipe[1], b'\x00')
+			self._bAsserted = _bNow
+		return _bNow
+
+
+
+#
+# == LOCAL: Watcher thread body ==
+#
+	def _Run(self):
+		while ( self._oStop.is_set() == False ):
+			if ( self._oSim.bRealTime == True ):
+				time.sleep(self._fStepSec)
+			else:
+				self._oSim.Advance(self._fStepSec)
+				time.sleep(0)
+			self._Sample()
+		return
@@ -0,0 +1,65 @@
+######################################################
+#
+# Shared fixtures for the SC16IS750 driver tests, run against the SC16IS750Sim model
+#
+######################################################
+
+import os
+import sys
+import time
+
+import pytest
+
+# -- The driver and the model are plain modules at the top of the repository
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import SC16IS750
+import SC16IS750Sim
+
+
+SIM_ADDRESS = 0x48
+
+
+@pytest.fixture
+def sim():
+	return SC16IS750Sim.SC16IS750Sim()
+
+
+@pytest.fixture
+def uart(sim):
+	return SC16IS750.SC16IS750(SIM_ADDRESS, _oExistingI2CInstance = sim)
+
+
+@pytest.fixture
+def chip(sim, uart):
+	return sim.dChips[SIM_ADDRESS]
+
+
+# -- Wall clock model for tests with driver threads, which poll on real time
+@pytest.fixture
+def rt_sim():
+	return SC16IS750Sim.SC16IS750Sim(bRealTime = True)
+
+
+@pytest.fixture
+def rt_uart(rt_sim):
+	_oUart = SC16IS750.SC16IS750(SIM_ADDRESS, _oExistingI2CInstance = rt_sim)
+	assert _oUart.Connect(115200) == True
+	return _oUart
+
+
+@pytest.fixture
+def rt_chip(rt_sim, rt_uart):
+	return rt_sim.dChips[SIM_ADDRESS]
+
+
+#
+# == Poll fnCondition until it holds or fTimeoutSec passes ==
+#
+def WaitFor(fnCondition, fTimeoutSec = 5.0):
+	_fDeadline = time.time() + fTimeoutSec
+	while ( time.time() < _fDeadline ):
+		if ( fnCondition() == True ):
+			return True
+		time.sleep(0.001)
+	return fnCondition()
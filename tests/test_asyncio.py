@@ -0,0 +1,117 @@
+######################################################
+#
+# asyncio transport: streams, protocol callbacks, write flow control and closing
+#
+######################################################
+
+import asyncio
+
+import SC16IS750Asyncio
+
+
+class RecordingProtocol(asyncio.Protocol):
+
+	def __init__(self):
+		self.aReceived = bytearray()
+		self.lEvents = []
+		self.oLost = None
+		return
+
+	def connection_made(self, transport):
+		self.lEvents.append("made")
+
+	def data_received(self, data):
+		self.aReceived += data
+
+	def pause_writing(self):
+		self.lEvents.append("pause")
+
+	def resume_writing(self):
+		self.lEvents.append("resume")
+
+	def connection_lost(self, exc):
+		self.lEvents.append("lost")
+		self.oLost = exc
+
+
+
+def test_streams_move_data_both_ways(rt_uart, rt_chip):
+	async def _Main():
+		_oReader, _oWriter = await SC16IS750Asyncio.open_connection(rt_uart)
+		rt_chip.oUart.InjectRx(b"ping\n")
+		assert await asyncio.wait_for(_oReader.readuntil(b"\n"), 5.0) == b"ping\n"
+		_oWriter.write(b"pong\n")
+		await asyncio.wait_for(_oWriter.drain(), 5.0)
+		_oWriter.close()
+		await asyncio.wait_for(_oWriter.wait_closed(), 5.0)
+	asyncio.run(_Main())
+	assert rt_uart.TxWriterDrain(5.0) == True
+	assert rt_chip.oUart.TakeTx() == b"pong\n"
+
+
+def test_protocol_gets_fifo_bursts(rt_uart, rt_chip):
+# -- More than a FIFO of data; 9600 baud keeps the wall clock model from overrunning under host jitter
+	assert rt_uart.Connect(9600) == True
+	async def _Main():
+		_oTransport, _oProtocol = await SC16IS750Asyncio.create_connection(RecordingProtocol, rt_uart)
+		_aData = bytes(bytearray(range(200)))
+		rt_chip.oUart.InjectRx(_aData)
+		for _iIndex in range(500):
+			if ( len(_oProtocol.aReceived) >= len(_aData) ):
+				break
+			await asyncio.sleep(0.01)
+		_oTransport.close()
+		await asyncio.sleep(0.01)
+		return ( _oProtocol, _aData )
+	_oProtocol, _aData = asyncio.run(_Main())
+	assert bytes(_oProtocol.aReceived) == _aData
+	assert _oProtocol.lEvents == [ "made", "lost" ]
+	assert _oProtocol.oLost == None
+
+
+def test_writes_pause_and_resume_the_protocol(rt_uart, rt_chip):
+	async def _Main():
+		_oTransport, _oProtocol = await SC16IS750Asyncio.create_connection(RecordingProtocol, rt_uart)
+		_oTransport.set_write_buffer_limits(high = 64, low = 16)
+		assert _oTransport.get_write_buffer_limits() == ( 16, 64 )
+		_oTransport.write(b"z" * 300)
+		assert _oTransport.get_write_buffer_size() == 300
+		for _iIndex in range(500):
+			if ( _oTransport.get_write_buffer_size() == 0 ):
+				break
+			await asyncio.sleep(0.01)
+		_oTransport.close()
+		await asyncio.sleep(0.01)
+		return _oProtocol
+	_oProtocol = asyncio.run(_Main())
+	assert _oProtocol.lEvents == [ "made", "pause", "resume", "lost" ]
+	assert rt_uart.TxWriterDrain(5.0) == True
+	assert rt_chip.oUart.TakeTx() == b"z" * 300
+
+
+def test_bus_error_fails_the_connection(rt_uart):
+	def _Fail(iMaxLen = None, bBlocking = False, fTimeoutSec = None):
+		raise IOError("bus error")
+	rt_uart.ReadBytes = _Fail
+	async def _Main():
+		_oTransport, _oProtocol = await SC16IS750Asyncio.create_connection(RecordingProtocol, rt_uart)
+		for _iIndex in range(100):
+			if ( "lost" in _oProtocol.lEvents ):
+				break
+			await asyncio.sleep(0.01)
+		assert _oTransport.is_closing() == True
+		return _oProtocol
+	_oProtocol = asyncio.run(_Main())
+	assert isinstance(_oProtocol.oLost, IOError) == True
+
+
+def test_write_after_close_raises(rt_uart):
+	async def _Main():
+		_oTransport, _oProtocol = await SC16IS750Asyncio.create_connection(RecordingProtocol, rt_uart)
+		_oTransport.close()
+		try:
+			_oTransport.write(b"late")
+		except RuntimeError:
+			return True
+		return False
+	assert asyncio.run(_Main()) == True
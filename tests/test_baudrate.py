@@ -0,0 +1,88 @@
+######################################################
+#
+# Baud rate solver: rounding, prescaler choice, error bound, per crystal tables and the per instance crystal
+#
+######################################################
+
+import pytest
+
+import SC16IS750
+
+from conftest import SIM_ADDRESS
+
+
+def _Divisor(oSimUart):
+	return ( oSimUart.hDLH << 8 ) | oSimUart.hDLL
+
+
+
+# ----------------------------------------------------
+#   S O L V E R
+# ----------------------------------------------------
+
+def test_divisor_is_rounded_not_truncated():
+# -- 14.7456MHz / ( 16 * 250000 ) = 3.69; truncating to 3 would be 23% fast
+	assert SC16IS750.SC16IS750SolveBaudrate(250000, 14745600, 0.1) == ( 1, 4, 230400.0 )
+
+
+def test_error_bound_is_applied():
+	assert SC16IS750.SC16IS750SolveBaudrate(100000) == None
+	assert SC16IS750.SC16IS750SolveBaudrate(100000, SC16IS750.SC16IS750_CRYSTAL_FREQ, 0.03) == ( 1, 9, 102400.0 )
+	assert SC16IS750.SC16IS750SolveBaudrate(0) == None
+
+
+def test_table_holds_the_standard_rates_of_a_crystal():
+	_dTable = SC16IS750.SC16IS750GetBaudTable(1843200)
+	assert sorted(_dTable) == sorted(SC16IS750.SC16IS750_STANDARD_BAUDRATES)
+	assert _dTable[115200] == ( 1, 1, 115200.0 )
+# -- Out of reach rates keep their nearest solution in the table, and the solver rejects them
+	assert _dTable[230400] == ( 1, 1, 115200.0 )
+	assert SC16IS750.SC16IS750SolveBaudrate(230400, 1843200) == None
+
+
+def test_non_standard_rates_stay_out_of_the_table():
+	assert SC16IS750.SC16IS750SolveBaudrate(31250, 1000000) == ( 1, 2, 31250.0 )
+	assert 31250 not in SC16IS750.SC16IS750GetBaudTable(1000000)
+
+
+
+# ----------------------------------------------------
+#   I N S T A N C E S
+# ----------------------------------------------------
+
+def test_crystal_is_per_instance(sim, uart, chip):
+	_oOther = SC16IS750.SC16IS750(SIM_ADDRESS + 1, _oExistingI2CInstance = sim, iCrystalFreq = 1843200)
+	assert _oOther.SetBaudrate(9600) == True
+	assert _Divisor(sim.dChips[SIM_ADDRESS + 1].oUart) == 12
+	assert uart.SetBaudrate(9600) == True
+	assert _Divisor(chip.oUart) == 96
+
+
+def test_set_crystal_changes_the_next_solution(uart, chip):
+	assert uart.SetCrystal(1843200) == True
+	assert uart.SolveBaudrate(115200) == ( 1, 1, 115200.0 )
+	assert uart.SetBaudrate(115200) == True
+	assert _Divisor(chip.oUart) == 1
+
+
+def test_max_error_is_per_instance(uart):
+	assert uart.SetBaudrate(100000) == False
+	assert uart.SetMaxBaudError(0.03) == True
+	assert uart.SetBaudrate(100000) == True
+	assert uart.GetBaudrate() == 102400.0
+
+
+def test_timing_uses_the_actual_rate(uart):
+	assert uart.SetMaxBaudError(0.03) == True
+	assert uart.Connect(100000) == True
+	assert uart.GetCharTime() == pytest.approx(10.0 / 102400.0)
+
+
+def test_prescaler_turns_on_the_enhanced_functions(uart, chip):
+	assert uart.Connect(115200) == True
+# -- 14.7456MHz / ( 16 * 10 ) needs a divisor over 16 bits without the divide-by-4 prescaler
+	assert uart.SetBaudrate(10) == True
+	assert ( chip.oUart.hMCR & 0x80 ) == 0x80
+# -- MCR[7] is only writable with EFR[4] set
+	assert ( chip.oUart.hEFR & 0x10 ) == 0x10
+	assert uart.GetBaudrate() == pytest.approx(10.0, rel = SC16IS750.SC16IS750_BAUD_MAX_ERROR)
@@ -0,0 +1,57 @@
+######################################################
+#
+# Benchmark suite: scenario results, the baseline comparison and the command line
+#
+######################################################
+
+import json
+
+import SC16IS750Bench
+
+
+def _Run(lNames):
+	return SC16IS750Bench.SC16IS750Bench(iIterations = 20).Run(lNames)
+
+
+
+def test_transaction_counts_are_exact():
+	_dScenarios = _Run([ "GetLineStatus", "ReadBytes", "WriteBytes", "Connect" ])["scenarios"]
+	assert _dScenarios["GetLineStatus"]["transactions_per_call"] == 1.0
+# -- One level read and one block transfer per FIFO
+	assert _dScenarios["ReadBytes"]["transactions_per_call"] == 2.0
+	assert _dScenarios["WriteBytes"]["transactions_per_call"] == 2.0
+# -- A reconnect is the LCR probe and the FCR write
+	assert _dScenarios["Connect"]["transactions_per_call"] == 2.0
+
+
+def test_results_carry_latency_and_throughput():
+	_dResults = SC16IS750Bench.SC16IS750Bench(iIterations = 256).Run([ "GetLineStatus", "ReadBytes" ])
+	assert _dResults["scenarios"]["GetLineStatus"]["calls"] == 256
+# -- Block scenarios count iterations in bytes: one call per FIFO
+	_dResult = _dResults["scenarios"]["ReadBytes"]
+	assert ( _dResult["calls"], _dResult["bytes"] ) == ( 4, 256 )
+	assert _dResult["latency_p99_us"] >= _dResult["latency_p50_us"] > 0.0
+	assert _dResult["bytes_per_sec"] > 0.0
+	assert _dResults["config"]["iterations"] == 256
+
+
+def test_compare_flags_more_transactions():
+	_dBaseline = { "scenarios":{ "X":{ "transactions_per_call":2.0, "latency_p50_us":100.0, "latency_p99_us":200.0 } } }
+	_dSame = { "scenarios":{ "X":{ "transactions_per_call":2.0, "latency_p50_us":105.0, "latency_p99_us":200.0 } } }
+	_dWorse = { "scenarios":{ "X":{ "transactions_per_call":3.0, "latency_p50_us":150.0, "latency_p99_us":200.0 } } }
+	assert SC16IS750Bench.CompareResults(_dBaseline, _dSame, 0.10) == []
+	assert len(SC16IS750Bench.CompareResults(_dBaseline, _dWorse, 0.10)) == 2
+
+
+def test_command_line_writes_and_compares(tmp_path):
+	_sOutput = str(tmp_path / "before.json")
+	assert SC16IS750Bench.main([ "--iterations", "20", "--scenario", "GetLineStatus", "--output", _sOutput ]) == 0
+	with open(_sOutput) as _oFile:
+		_dBaseline = json.load(_oFile)
+	assert list(_dBaseline["scenarios"].keys()) == [ "GetLineStatus" ]
+
+# -- A baseline that claims fewer transactions than the driver makes fails the run
+	_dBaseline["scenarios"]["GetLineStatus"]["transactions_per_call"] = 0.5
+	with open(_sOutput, "w") as _oFile:
+		json.dump(_dBaseline, _oFile)
+	assert SC16IS750Bench.main([ "--iterations", "20", "--scenario", "GetLineStatus", "--output", str(tmp_path / "after.json"), "--compare", _sOutput, "--tolerance", "1000" ]) == 1
@@ -0,0 +1,113 @@
+######################################################
+#
+# Multi-bus manager and worker pool: one bus scheduler per bus, RX callbacks off the bus workers
+#
+######################################################
+
+import threading
+
+import pytest
+
+import SC16IS750
+import SC16IS750Sim
+import SC16IS750Scheduler
+
+from conftest import SIM_ADDRESS, WaitFor
+
+
+@pytest.fixture
+def pool():
+	_oPool = SC16IS750Scheduler.SC16IS750WorkerPool(2)
+	yield _oPool
+	_oPool.Stop(5.0)
+
+
+@pytest.fixture
+def manager():
+	_oManager = SC16IS750Scheduler.SC16IS750BusManager()
+	yield _oManager
+	_oManager.Stop(5.0)
+
+
+# -- A device on its own wall clock model, on bus hI2CBus
+def _Uart(oSim, hI2CAddress = SIM_ADDRESS, hI2CBus = 1):
+	_oUart = SC16IS750.SC16IS750(hI2CAddress, hI2CBus, _oExistingI2CInstance = oSim)
+	assert _oUart.Connect(115200) == True
+	return _oUart
+
+
+
+# ----------------------------------------------------
+#   W O R K E R   P O O L
+# ----------------------------------------------------
+
+def test_pool_runs_queued_jobs_before_stopping(pool):
+	_lDone = []
+	for _iJob in range(10):
+		pool.Submit(_lDone.append, _iJob)
+	assert pool.Pending() == 10
+	assert pool.Start() == True
+	assert pool.Stop(5.0) == True
+	assert sorted(_lDone) == list(range(10))
+	assert pool.JobsDone() == 10
+
+
+def test_pool_keeps_job_errors(pool):
+	def _Fail():
+		raise ValueError("job failed")
+	assert pool.Start() == True
+	pool.Submit(_Fail)
+	pool.Submit(lambda: None)
+	assert WaitFor(lambda: pool.JobsDone() == 2) == True
+	assert [ str(_oError) for _oError in pool.GetErrors() ] == [ "job failed" ]
+
+
+
+# ----------------------------------------------------
+#   B U S   M A N A G E R
+# ----------------------------------------------------
+
+def test_devices_are_grouped_by_bus(manager):
+	_oBusOne = SC16IS750Sim.SC16IS750Sim(bRealTime = True)
+	_oBusThree = SC16IS750Sim.SC16IS750Sim(bRealTime = True)
+	manager.AddDevice(_Uart(_oBusOne, SIM_ADDRESS))
+	manager.AddDevice(_Uart(_oBusOne, SIM_ADDRESS + 1))
+	manager.AddDevice(_Uart(_oBusThree, SIM_ADDRESS, 3))
+	_dSchedulers = manager.GetSchedulers()
+	assert sorted(_dSchedulers.keys()) == [ 1, 3 ]
+	assert len(_dSchedulers[1].GetDevices()) == 2
+	assert len(_dSchedulers[3].GetDevices()) == 1
+
+
+def test_rx_callbacks_run_on_the_pool(manager, rt_sim, rt_uart, rt_chip):
+	_lCalls = []
+	def _OnRx(oUart, iBytes):
+		_lCalls.append(( oUart, iBytes, threading.current_thread().name ))
+	manager.AddDevice(rt_uart, fnOnRx = _OnRx)
+	assert manager.Start() == True
+	assert manager.IsRunning() == True
+
+	rt_chip.oUart.InjectRx(b"hello")
+	assert WaitFor(lambda: rt_uart.RxPumpAvailable() == 5) == True
+	assert rt_uart.RxPumpRead() == b"hello"
+	assert WaitFor(lambda: len(_lCalls) > 0) == True
+	assert _lCalls[0][0] is rt_uart
+	assert _lCalls[0][2].startswith("SC16IS750-Worker-")
+
+
+def test_managed_device_sends_from_its_queue(manager, rt_uart, rt_chip):
+	manager.AddDevice(rt_uart)
+	assert manager.Start() == True
+	assert rt_uart.TxWriterWrite(b"x" * 100) == 100
+	assert rt_uart.TxWriterDrain(5.0) == True
+	assert rt_chip.oUart.TakeTx() == b"x" * 100
+# -- The device's own service threads stay off while the manager serves it
+	assert rt_uart.StartRxPump() == False
+	assert manager.GetErrors() == []
+
+
+def test_submit_runs_inline_without_a_pool():
+	_oManager = SC16IS750Scheduler.SC16IS750BusManager(iPoolThreads = 0)
+	_lDone = []
+	_oManager.Submit(_lDone.append, 1)
+	assert _lDone == [ 1 ]
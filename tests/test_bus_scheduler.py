@@ -0,0 +1,82 @@
+######################################################
+#
+# Bus scheduler: many devices on one bus served from one worker thread
+#
+######################################################
+
+import pytest
+
+import SC16IS750
+import SC16IS750Sim
+import SC16IS750Scheduler
+
+from conftest import SIM_ADDRESS, WaitFor
+
+
+@pytest.fixture
+def scheduler():
+	_oScheduler = SC16IS750Scheduler.SC16IS750BusScheduler()
+	yield _oScheduler
+	_oScheduler.Stop(5.0)
+
+
+@pytest.fixture
+def second_uart(rt_sim):
+	_oUart = SC16IS750.SC16IS750(SIM_ADDRESS + 1, _oExistingI2CInstance = rt_sim)
+	assert _oUart.Connect(115200) == True
+	return _oUart
+
+
+
+def test_one_worker_serves_every_device(rt_sim, rt_uart, second_uart, scheduler):
+	assert scheduler.AddDevice(rt_uart) == True
+	assert scheduler.AddDevice(second_uart) == True
+	assert scheduler.Start() == True
+	rt_sim.dChips[SIM_ADDRESS].oUart.InjectRx(b"first")
+	rt_sim.dChips[SIM_ADDRESS + 1].oUart.InjectRx(b"second")
+	assert WaitFor(lambda: rt_uart.RxPumpAvailable() == 5 and second_uart.RxPumpAvailable() == 6) == True
+	assert rt_uart.RxPumpRead() == b"first"
+	assert second_uart.RxPumpRead() == b"second"
+	assert [ _dStats["rx-bytes"] for _dStats in scheduler.GetStats() ] == [ 5, 6 ]
+
+
+def test_transmit_queues_are_shared_out(rt_sim, rt_uart, second_uart, scheduler):
+	assert scheduler.AddDevice(rt_uart) == True
+	assert scheduler.AddDevice(second_uart) == True
+	assert scheduler.Start() == True
+	assert rt_uart.TxWriterWrite(b"a" * 200) == 200
+	assert second_uart.TxWriterWrite(b"b" * 200) == 200
+	assert rt_uart.TxWriterDrain(5.0) == True
+	assert second_uart.TxWriterDrain(5.0) == True
+	assert rt_sim.dChips[SIM_ADDRESS].oUart.TakeTx() == b"a" * 200
+	assert rt_sim.dChips[SIM_ADDRESS + 1].oUart.TakeTx() == b"b" * 200
+
+
+def test_line_rate_stream_does_not_overrun(rt_chip, rt_uart, scheduler):
+# -- 9600 baud leaves the worker about 67 ms per FIFO, well above host scheduling jitter
+	assert rt_uart.Connect(9600) == True
+	assert scheduler.AddDevice(rt_uart) == True
+	assert scheduler.Start() == True
+# -- 250 bytes arrive back to back, about 260 ms: four FIFOs worth
+	_aData = bytes(bytearray(range(250)))
+	rt_chip.oUart.InjectRx(_aData)
+	assert WaitFor(lambda: rt_uart.RxPumpAvailable() == len(_aData)) == True
+	assert rt_uart.RxPumpRead() == _aData
+	_dStats = scheduler.GetStats()[0]
+	assert _dStats["rx-dropped"] == 0
+	assert _dStats["max-rx-level"] < SC16IS750.SC16IS750_FIFO_SIZE
+
+
+def test_device_on_another_bus_is_refused(rt_uart, scheduler):
+	_oOther = SC16IS750.SC16IS750(SIM_ADDRESS, _oExistingI2CInstance = SC16IS750Sim.SC16IS750Sim())
+	assert scheduler.AddDevice(rt_uart) == True
+	assert scheduler.AddDevice(_oOther) == False
+
+
+def test_removed_device_gets_its_threads_back(rt_uart, scheduler):
+	assert scheduler.AddDevice(rt_uart) == True
+	assert rt_uart.StartRxPump() == False
+	assert scheduler.RemoveDevice(rt_uart) == True
+	assert scheduler.GetDevices() == []
+	assert rt_uart.StartRxPump() == True
+	rt_uart.StopRxPump()
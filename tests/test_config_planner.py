@@ -0,0 +1,80 @@
+######################################################
+#
+# Configuration planner: ApplyConfig() / Connect() write only the register diff against the shadow cache
+#
+######################################################
+
+import SC16IS750
+
+
+def _Registers(lWrites):
+	return [ _tWrite[0] for _tWrite in lWrites ]
+
+
+
+def test_first_connect_needs_no_resync(sim, uart):
+# -- The software reset in __init__ seeded the cache: one LCR probe, then the writes
+	_iTransactions = sim.iTransactions
+	assert uart.Connect(115200) == True
+	assert sim.iTransactions - _iTransactions == 6
+
+
+def test_reconnect_costs_two_transactions(sim, uart, chip):
+	assert uart.Connect(115200) == True
+	_iTransactions = sim.iTransactions
+	assert uart.Connect(115200) == True
+# -- The LCR probe and the write only FCR
+	assert sim.iTransactions - _iTransactions == 2
+	assert ( chip.oUart.hDLL, chip.oUart.hLCR ) == ( 8, 0x03 )
+
+
+def test_forced_resync_reads_every_bank(sim, uart):
+	assert uart.Connect(115200) == True
+	_iTransactions = sim.iTransactions
+	assert uart.Connect(115200, bResync = True) == True
+	assert sim.iTransactions - _iTransactions > 10
+
+
+def test_chip_reset_is_detected(sim, uart, chip):
+	assert uart.Connect(115200, 'O', 7, 2) == True
+	chip.Reset()
+	assert uart.Connect(115200, 'O', 7, 2) == True
+	assert ( chip.oUart.hDLL, chip.oUart.hLCR ) == ( 8, 0x0E )
+	assert ( chip.oUart.hFCR & 0x01 ) == 0x01
+
+
+def test_failed_write_forces_a_resync(sim, uart, chip):
+	assert uart.Connect(115200) == True
+	_fnWrite8 = chip.write8
+	def _FailOnce(hRegister, hValue):
+		chip.write8 = _fnWrite8
+		raise IOError("bus error")
+	chip.write8 = _FailOnce
+	assert uart.SetBaudrate(9600) == True
+	assert chip.oUart.hDLL == 8
+
+	_iTransactions = sim.iTransactions
+	assert uart.Connect(9600) == True
+	assert sim.iTransactions - _iTransactions > 10
+	assert chip.oUart.hDLL == 96
+
+
+def test_plan_holds_only_the_differences(uart):
+	assert uart.Connect(115200) == True
+# -- A new divisor: the LCR[7] bank switch, DLL (DLH is unchanged), the restore, and FCR
+	assert _Registers(uart.PlanConfig(SC16IS750.SC16IS750UartConfig(9600))) == [ SC16IS750.SC16IS750_REG_LCR, SC16IS750.SC16IS750_REG_LCR7_DLL, SC16IS750.SC16IS750_REG_LCR, SC16IS750.SC16IS750_REG_FCR ]
+# -- A new parity: LCR and FCR only
+	assert _Registers(uart.PlanConfig(SC16IS750.SC16IS750UartConfig(115200, 'O'))) == [ SC16IS750.SC16IS750_REG_FCR, SC16IS750.SC16IS750_REG_LCR ]
+
+
+def test_plan_always_writes_the_fifo_control(uart):
+	assert uart.Connect(115200) == True
+	_lWrites = uart.PlanConfig(SC16IS750.SC16IS750UartConfig(115200))
+	assert _lWrites == [ ( SC16IS750.SC16IS750_REG_FCR, 0x01, False ) ]
+
+
+def test_plan_does_not_touch_the_chip(sim, uart):
+	assert uart.Connect(115200) == True
+	_iTransactions = sim.iTransactions
+	uart.PlanConfig(SC16IS750.SC16IS750UartConfig(9600, 'E', 7, 2, 'AUTO'))
+	assert sim.iTransactions == _iTransactions
@@ -0,0 +1,267 @@
+######################################################
+#
+# Driver regression tests on the SC16IS750Sim model: data path, setup, shadow cache, IRQ mode and GPIO
+#
+######################################################
+
+import time
+
+import SC16IS750
+import SC16IS750Sim
+
+from conftest import SIM_ADDRESS
+
+
+# ----------------------------------------------------
+#   C O N N E C T   &   S E T U P
+# ----------------------------------------------------
+
+def test_connect_programs_line_settings(uart, chip):
+	assert uart.Connect(115200, 'E', 7, 2) == True
+	assert ( chip.oUart.hDLH, chip.oUart.hDLL ) == ( 0, 8 )
+	assert chip.oUart.hLCR == ( 0x02 | 0x04 | 0x18 )
+	assert ( chip.oUart.hFCR & 0x01 ) == 0x01
+	assert uart.GetBaudrate() == 115200.0
+
+
+def test_connect_reprograms_after_chip_reset(uart, chip):
+	assert uart.Connect(115200) == True
+	chip.Reset()
+	assert uart.Connect(115200) == True
+	assert chip.oUart.hDLL == 8
+	assert chip.oUart.hLCR == 0x03
+	assert ( chip.oUart.hFCR & 0x01 ) == 0x01
+
+
+def test_connect_without_resync_trusts_the_cache(sim, uart):
+	assert uart.Connect(115200) == True
+	_iTransactions = sim.iTransactions
+	assert uart.Connect(115200, bResync = False) == True
+# -- Only the write only FCR goes out again
+	assert sim.iTransactions - _iTransactions == 1
+
+
+def test_apply_config_writes_only_differences(uart, chip):
+	_oConfig = SC16IS750.SC16IS750UartConfig(57600, 'E', 7, 2, 'AUTO', iTxTrigger = 16, iTcrHalt = 48, iTcrResume = 16, iTlrRx = 20)
+	assert uart.ApplyConfig(_oConfig) == True
+	assert ( chip.oUart.hEFR & 0xC0 ) == 0xC0
+	assert chip.oUart.hTCR == 0x4C
+	assert chip.oUart.hTLR == 0x50
+	assert ( chip.oUart.hMCR & 0x04 ) == 0x00
+	assert uart.GetConfig() == _oConfig
+
+	_oConfig = SC16IS750.SC16IS750UartConfig(57600, 'E', 7, 2)
+	assert uart.ApplyConfig(_oConfig) == True
+# -- Applied again, only the write only FCR is left in the plan
+	assert [ _tWrite[0] for _tWrite in uart.PlanConfig(_oConfig) ] == [ SC16IS750.SC16IS750_REG_FCR ]
+
+
+def test_apply_config_rejects_invalid(uart):
+	assert uart.ApplyConfig(SC16IS750.SC16IS750UartConfig(9600, iDataBits = 9)) == False
+	assert uart.ApplyConfig(SC16IS750.SC16IS750UartConfig(9600, iRxTrigger = 7)) == False
+	assert uart.PlanConfig(SC16IS750.SC16IS750UartConfig(3)) == None
+
+
+def test_set_fifo_trigger_levels(uart, chip):
+	assert uart.Connect(115200) == True
+	for _iRxTrigger in ( 8, 16, 56, 60 ):
+		assert uart.SetFifo(True, _iRxTrigger) == True
+		assert chip.oUart.RxTriggerLevel() == _iRxTrigger
+	for _iTxTrigger in ( 8, 16, 32, 56 ):
+		assert uart.SetFifo(True, 8, _iTxTrigger) == True
+		assert chip.oUart.TxTriggerLevel() == _iTxTrigger
+	assert uart.SetFifo(True, 7) == False
+	assert uart.SetFifo(True, 8, 60) == False
+
+
+def test_baud_solver_uses_prescaler_for_low_rates(uart, chip):
+	assert uart.Connect(115200) == True
+	assert uart.SetBaudrate(5) == True
+	assert ( chip.oUart.hMCR & 0x80 ) == 0x80
+	assert ( chip.oUart.hDLH << 8 ) | chip.oUart.hDLL == 46080
+	assert uart.SetBaudrate(115200) == True
+	assert ( chip.oUart.hMCR & 0x80 ) == 0x00
+
+
+def test_baud_solver_rejects_large_errors():
+	assert SC16IS750.SC16IS750SolveBaudrate(115200) == ( 1, 8, 115200.0 )
+	assert SC16IS750.SC16IS750SolveBaudrate(5000000) == None
+	assert SC16IS750.SC16IS750SolveBaudrate(100000, 14745600, 0.01) == None
+	assert SC16IS750.SC16IS750GetBaudTable(1843200)[9600] == ( 1, 12, 9600.0 )
+
+
+
+# ----------------------------------------------------
+#   D A T A   P A T H
+# ----------------------------------------------------
+
+def test_write_bytes_reach_the_line(sim, uart, chip):
+	assert uart.Connect(115200) == True
+	_aData = bytes(bytearray(range(200)))
+	assert uart.WriteBytes(_aData) == len(_aData)
+	sim.Advance(0.1)
+	assert chip.oUart.TakeTx() == _aData
+
+
+def test_read_bytes_drains_the_fifo(sim, uart, chip):
+	assert uart.Connect(115200) == True
+	chip.oUart.InjectRx(b"hello world")
+	sim.Advance(0.01)
+	assert uart.ReadBytes() == b"hello world"
+	assert uart.ReadBytes() == b""
+
+
+def test_read_into_blocking_fills_the_buffer(sim, uart, chip):
+	assert uart.Connect(115200) == True
+	chip.oUart.InjectRx(b"0123456789" * 10)
+	_aBuffer = bytearray(100)
+	assert uart.ReadInto(_aBuffer, bBlocking = True, fTimeoutSec = 5.0) == 100
+	assert bytes(_aBuffer) == b"0123456789" * 10
+
+
+def test_read_into_keeps_count_on_later_failure(sim, uart, chip):
+	assert uart.Connect(115200) == True
+	chip.oUart.InjectRx(b"abcd")
+	sim.Advance(0.01)
+	_lCalls = []
+	_fnBlockRead = uart._ReadRegisterBlock
+	def _FailSecond(hRegisterAddr, iLength):
+		_lCalls.append(iLength)
+		if ( len(_lCalls) > 1 ):	return None
+		chip.oUart.InjectRx(b"efgh")
+		return _fnBlockRead(hRegisterAddr, iLength)
+	uart._ReadRegisterBlock = _FailSecond
+	_aBuffer = bytearray(8)
+	assert uart.ReadInto(_aBuffer, bBlocking = True, fTimeoutSec = 1.0) == 4
+	assert bytes(_aBuffer[:4]) == b"abcd"
+
+
+def test_read_bytes_honours_max_len(sim, uart, chip):
+	assert uart.Connect(115200) == True
+	chip.oUart.InjectRx(b"abcdefgh")
+	sim.Advance(0.01)
+	assert uart.ReadBytes(3) == b"abc"
+	assert uart.ReadBytes(10) == b"defgh"
+
+
+
+# ----------------------------------------------------
+#   S H A D O W   C A C H E
+# ----------------------------------------------------
+
+def test_cache_serves_host_owned_registers(sim, uart):
+	assert uart.Connect(115200) == True
+	_iTransactions = sim.iTransactions
+	uart._ReadRegister(SC16IS750.SC16IS750_REG_LCR)
+	uart._ReadRegister(SC16IS750.SC16IS750_REG_IER)
+	assert sim.iTransactions == _iTransactions
+	uart._ReadRegister(SC16IS750.SC16IS750_REG_LSR)
+	assert sim.iTransactions == _iTransactions + 1
+
+
+def test_cache_disabled_reads_the_chip(sim, uart):
+	assert uart.Connect(115200) == True
+	uart.SetRegisterCache(False)
+	_iTransactions = sim.iTransactions
+	uart._ReadRegister(SC16IS750.SC16IS750_REG_LCR)
+	assert sim.iTransactions == _iTransactions + 1
+
+
+def test_resync_reloads_after_chip_reset(uart, chip):
+	assert uart.Connect(115200) == True
+	chip.Reset()
+	assert uart.Resync() == True
+	assert uart._ReadRegister(SC16IS750.SC16IS750_REG_LCR) == 0x1D
+	assert uart._GetCachedRegister(SC16IS750.SC16IS750_BANK_GENERAL, SC16IS750.SC16IS750_REG_FCR) == None
+	assert uart.Connect(115200, bResync = False) == True
+	assert ( chip.oUart.hFCR & 0x01 ) == 0x01
+
+
+
+# ----------------------------------------------------
+#   I R Q   M O D E
+# ----------------------------------------------------
+
+def _WaitFor(fnCondition, fTimeoutSec = 5.0):
+	_fDeadline = time.time() + fTimeoutSec
+	while ( time.time() < _fDeadline ):
+		if ( fnCondition() == True ):
+			return True
+		time.sleep(0.001)
+	return fnCondition()
+
+
+def test_irq_mode_moves_data_both_ways(sim, uart, chip):
+	assert uart.Connect(115200) == True
+	_oIrqSource = SC16IS750Sim.SC16IS750SimIrqSource(sim, SIM_ADDRESS)
+	try:
+		assert uart.StartIrqMode(_oIrqSource) == True
+		chip.oUart.InjectRx(b"x" * 150)
+		_aReceived = bytearray()
+		def _Received():
+			_aReceived.extend(uart.RxPumpRead())
+			return ( len(_aReceived) >= 150 )
+		assert _WaitFor(_Received) == True
+		assert bytes(_aReceived) == b"x" * 150
+
+		assert uart.TxWriterWrite(b"y" * 150) == 150
+		_aSent = bytearray()
+		def _Sent():
+			_aSent.extend(chip.oUart.TakeTx())
+			return ( len(_aSent) >= 150 )
+		assert _WaitFor(_Sent) == True
+		assert bytes(_aSent) == b"y" * 150
+		assert uart.IrqStats()["edges"] > 0
+	finally:
+		assert uart.StopIrqMode(5.0) == True
+		_oIrqSource.Close()
+
+
+
+# ----------------------------------------------------
+#   G P I O
+# ----------------------------------------------------
+
+def test_gpio_port_read_and_write(sim, uart, chip):
+	assert uart.SetGpioDirection(0x0F, 0x0F) == True
+	assert chip.hIODIR == 0x0F
+	_iTransactions = sim.iTransactions
+	assert uart.WritePort(0x0F, 0x05) == True
+	assert sim.iTransactions == _iTransactions + 1
+	assert chip.hIOLatch == 0x05
+	assert uart.WritePort(0x0F, 0x05) == True
+	assert sim.iTransactions == _iTransactions + 1
+
+	chip.SetGpioInputs(0xA0)
+	assert uart.ReadPort() == 0xA5
+	_iTransactions = sim.iTransactions
+	assert uart.GetPin(0) == True
+	assert uart.GetPin(5) == True
+	assert uart.GetPin(4) == False
+	assert sim.iTransactions == _iTransactions
+	assert uart.TogglePin(0) == True
+	assert chip.hIOLatch == 0x04
+
+
+def test_gpio_watch_reports_edges(sim, uart, chip):
+	_lRising = []
+	_lBoth = []
+	assert uart.WatchPins(0x30, lambda oDevice, hPins, hState: _lRising.append(hPins), "rising") == True
+	assert uart.WatchPins(0xF0, lambda oDevice, hPins, hState: _lBoth.append(hPins)) == True
+	assert chip.hIOINTENA == 0xF0
+
+	chip.SetGpioInputs(0x10)
+	_iTransactions = sim.iTransactions
+	assert uart.Service(4) == 1
+# -- One IIR read, the IOSTATE read that clears it, and the idle IIR read
+	assert sim.iTransactions - _iTransactions == 3
+	assert _lRising == [ 0x10 ]
+	assert _lBoth == [ 0x10 ]
+
+	chip.SetGpioInputs(0x00)
+	assert uart.Service(4) == 1
+	assert _lRising == [ 0x10 ]
+	assert _lBoth == [ 0x10, 0x10 ]
+
+	assert uart.UnwatchPins() == True
+	assert chip.hIOINTENA == 0x00
@@ -0,0 +1,113 @@
+######################################################
+#
+# Dual channel SC16IS752/SC16IS762: channel addressing, shared handle and lock, shared GPIO and ServiceChannels()
+#
+######################################################
+
+import pytest
+
+import SC16IS750
+import SC16IS750Sim
+
+from conftest import SIM_ADDRESS
+
+
+@pytest.fixture
+def sim2():
+	return SC16IS750Sim.SC16IS750Sim(iChannels = 2)
+
+
+@pytest.fixture
+def channels(sim2):
+	_oChannelA = SC16IS750.SC16IS750(SIM_ADDRESS, _oExistingI2CInstance = sim2)
+	return ( _oChannelA, _oChannelA.OpenChannel() )
+
+
+@pytest.fixture
+def chip2(sim2, channels):
+	return sim2.dChips[SIM_ADDRESS]
+
+
+
+def test_channels_share_the_handle_and_the_lock(channels):
+	_oChannelA, _oChannelB = channels
+	assert ( _oChannelA.GetChannel(), _oChannelB.GetChannel() ) == ( SC16IS750.SC16IS750_CHANNEL_A, SC16IS750.SC16IS750_CHANNEL_B )
+	assert _oChannelB._oDeviceInst is _oChannelA._oDeviceInst
+	assert _oChannelB._oBusLock is _oChannelA._oBusLock
+	assert _oChannelA.GetChannels() == [ _oChannelA, _oChannelB ]
+	with pytest.raises(SC16IS750.SC16IS750Error):
+		_oChannelA.OpenChannel()
+
+
+def test_each_channel_programs_its_own_uart(channels, chip2):
+	_oChannelA, _oChannelB = channels
+	assert _oChannelA.Connect(115200) == True
+	assert _oChannelB.Connect(9600, 'E', 7, 2) == True
+	assert ( chip2.lUarts[0].hLCR, chip2.lUarts[1].hLCR ) == ( 0x03, 0x1E )
+	assert chip2.lUarts[0].hDLL != chip2.lUarts[1].hDLL
+
+
+def test_data_stays_on_its_channel(sim2, channels, chip2):
+	_oChannelA, _oChannelB = channels
+	assert _oChannelA.Connect(115200) == True
+	assert _oChannelB.Connect(115200) == True
+	chip2.lUarts[1].InjectRx(b"to-b")
+	sim2.Advance(0.01)
+	assert _oChannelA.ReadBytes() == b""
+	assert _oChannelB.ReadBytes() == b"to-b"
+	assert _oChannelA.WriteBytes(b"from-a") == 6
+	sim2.Advance(0.01)
+	assert ( chip2.lUarts[0].TakeTx(), chip2.lUarts[1].TakeTx() ) == ( b"from-a", b"" )
+
+
+def test_gpio_is_shared_across_channels(channels, chip2):
+	_oChannelA, _oChannelB = channels
+	assert _oChannelA.GetGpioDirection() == 0x00
+	assert _oChannelB.SetGpioDirection(0x0F, 0x0F) == True
+	assert chip2.hIODIR == 0x0F
+	assert _oChannelA.GetGpioDirection() == 0x0F
+	assert _oChannelB.WritePort(0x0F, 0x05) == True
+	assert ( _oChannelA.ReadPort() & 0x0F ) == 0x05
+
+
+def test_poll_reads_both_channels_back_to_back(sim2, channels, chip2):
+	_oChannelA, _oChannelB = channels
+	assert _oChannelA.Connect(115200) == True
+	assert _oChannelB.Connect(115200) == True
+	chip2.lUarts[0].InjectRx(b"aa")
+	chip2.lUarts[1].InjectRx(b"bbb")
+	sim2.Advance(0.01)
+	_iTransactions = sim2.iTransactions
+	assert _oChannelB.PollChannels() == [ (0, 2, 64), (1, 3, 64) ]
+	assert sim2.iTransactions - _iTransactions == 4
+
+
+def test_service_channels_moves_data_both_ways(sim2, channels, chip2):
+	_oChannelA, _oChannelB = channels
+# -- Two TX bursts a pass take most of a 400kHz bus; 9600 baud leaves the RX FIFOs room
+	assert _oChannelA.Connect(9600) == True
+	assert _oChannelB.Connect(9600) == True
+	assert _oChannelA.ServiceChannels() != None
+	assert _oChannelA.TxWriterWrite(b"A" * 100) == 100
+	assert _oChannelB.TxWriterWrite(b"B" * 100) == 100
+	chip2.lUarts[0].InjectRx(b"a" * 100)
+	chip2.lUarts[1].InjectRx(b"b" * 100)
+	_lSent = [ bytearray(), bytearray() ]
+	for _iIndex in range(300):
+		_oChannelA.ServiceChannels()
+		sim2.Advance(0.001)
+		for _iChannel in range(2):
+			_lSent[_iChannel] += chip2.lUarts[_iChannel].TakeTx()
+	assert ( bytes(_lSent[0]), bytes(_lSent[1]) ) == ( b"A" * 100, b"B" * 100 )
+	assert ( _oChannelA.RxPumpRead(), _oChannelB.RxPumpRead() ) == ( b"a" * 100, b"b" * 100 )
+
+
+def test_service_channels_leaves_threaded_channels_alone(channels):
+	_oChannelA, _oChannelB = channels
+	assert _oChannelA.Connect(115200) == True
+	assert _oChannelB.Connect(115200) == True
+	assert _oChannelB.StartRxPump() == True
+	try:
+		assert _oChannelA.ServiceChannels() == None
+	finally:
+		assert _oChannelB.StopRxPump(5.0) == True
@@ -0,0 +1,108 @@
+######################################################
+#
+# GPIO: cached direction and latch, pin helpers, modem pin exclusion and watched pin edges
+#
+######################################################
+
+import SC16IS750
+
+
+def _Record(lCalls):
+	return lambda oDevice, hPins, hState: lCalls.append( (hPins, hState) )
+
+
+
+# ----------------------------------------------------
+#   D I R E C T I O N   A N D   L E V E L S
+# ----------------------------------------------------
+
+def test_direction_is_cached(sim, uart, chip):
+	assert uart.SetGpioDirection(0xFF, 0x0F) == True
+	_iTransactions = sim.iTransactions
+	assert uart.GetGpioDirection() == 0x0F
+	assert uart.SetGpioDirection(0x0F, 0x0F) == True
+	assert uart.SetPinDirection(0, True) == True
+	assert sim.iTransactions == _iTransactions
+	assert uart.SetPinDirection(4, True) == True
+	assert chip.hIODIR == 0x1F
+	assert uart.SetPinDirection(8, True) == False
+
+
+def test_set_pin_writes_only_changes(sim, uart, chip):
+	assert uart.SetGpioDirection(0xFF, 0xFF) == True
+	assert uart.SetPin(3, True) == True
+	assert uart.SetPin(6, True) == True
+	assert chip.hIOLatch == 0x48
+	_iTransactions = sim.iTransactions
+	assert uart.SetPin(3, True) == True
+	assert sim.iTransactions == _iTransactions
+	assert uart.SetPin(3, False) == True
+	assert chip.hIOLatch == 0x40
+
+
+def test_latch_is_kept_for_input_pins(uart, chip):
+	assert uart.SetGpioDirection(0xFF, 0x00) == True
+	assert uart.WritePort(0x01, 0x01) == True
+	assert uart.GetPin(0) == False
+	assert uart.SetPinDirection(0, True) == True
+	assert uart.GetPin(0) == True
+	assert ( chip.hIOLatch & 0x01 ) == 0x01
+
+
+def test_modem_pins_leave_gpio_mode(uart):
+	assert uart.Connect(115200) == True
+	assert uart.GetGpioPins() == 0xFF
+	assert uart._SetGPIO47forModemFlowcontrol(True) == True
+	assert uart.GetGpioPins() == 0x0F
+
+
+
+# ----------------------------------------------------
+#   W A T C H E D   P I N S
+# ----------------------------------------------------
+
+def test_watch_rejects_an_unknown_edge(uart):
+	assert uart.WatchPins(0x01, lambda oDevice, hPins, hState: None, "sideways") == False
+
+
+def test_falling_edges(uart, chip):
+	_lCalls = []
+	chip.SetGpioInputs(0x03)
+	assert uart.WatchPins(0x03, _Record(_lCalls), "falling") == True
+	chip.SetGpioInputs(0x01)
+	assert uart.Service(4) == 1
+	assert _lCalls == [ (0x02, 0x01) ]
+
+
+def test_port_read_reports_watched_changes(sim, uart, chip):
+	_lCalls = []
+	assert uart.WatchPins(0x80, _Record(_lCalls)) == True
+	chip.SetGpioInputs(0x80)
+	assert uart.ReadPort() == 0x80
+	assert _lCalls == [ (0x80, 0x80) ]
+# -- The read cleared the interrupt; nothing is left for Service()
+	assert uart.Service(4) == 0
+
+
+def test_output_pins_are_not_reported(uart, chip):
+	_lCalls = []
+	assert uart.SetGpioDirection(0x01, 0x01) == True
+	assert uart.WatchPins(0xFF, _Record(_lCalls)) == True
+	assert uart.SetPin(0, True) == True
+	uart.ReadPort()
+	assert _lCalls == []
+
+
+def test_unwatch_one_callback_keeps_the_others(uart, chip):
+	_lFirst = []
+	_lSecond = []
+	_fnFirst = _Record(_lFirst)
+	assert uart.WatchPins(0x01, _fnFirst) == True
+	assert uart.WatchPins(0x02, _Record(_lSecond)) == True
+	assert chip.hIOINTENA == 0x03
+	assert uart.UnwatchPins(_fnFirst) == True
+	assert chip.hIOINTENA == 0x02
+	assert uart.UnwatchPins(_fnFirst) == False
+	chip.SetGpioInputs(0x03)
+	assert uart.Service(4) == 1
+	assert ( _lFirst, _lSecond ) == ( [], [ (0x02, 0x03) ] )
@@ -0,0 +1,175 @@
+######################################################
+#
+# Native i2c-dev backend (SC16IS750I2CDev) on the SC16IS750SimI2CDev ioctl mock: combined transfers and ioctl counts
+#
+######################################################
+
+import pytest
+
+import SC16IS750
+import SC16IS750Sim
+
+from conftest import SIM_ADDRESS
+
+
+# -- I2C sub-addresses of channel A registers: register << 3
+SUBADDR_IER	= ( SC16IS750.SC16IS750_REG_IER << 3 )
+SUBADDR_LCR	= ( SC16IS750.SC16IS750_REG_LCR << 3 )
+SUBADDR_SPR	= ( SC16IS750.SC16IS750_REG_SPR << 3 )
+
+
+@pytest.fixture
+def ioctls(sim):
+	sim.get_i2c_device(SIM_ADDRESS)
+	return SC16IS750Sim.SC16IS750SimI2CDev(sim)
+
+
+@pytest.fixture
+def i2cdev(ioctls):
+	return SC16IS750.SC16IS750I2CDev(1, ioctls.Open, ioctls.Ioctl, ioctls.Close)
+
+
+@pytest.fixture
+def uart(i2cdev):
+	return SC16IS750.SC16IS750(SIM_ADDRESS, _oExistingI2CInstance = i2cdev)
+
+
+
+# ----------------------------------------------------
+#   D E V I C E   H A N D L E
+# ----------------------------------------------------
+
+def test_bus_opened_once_for_its_devices(ioctls, i2cdev):
+	i2cdev.get_i2c_device(SIM_ADDRESS)
+	i2cdev.get_i2c_device(SIM_ADDRESS)
+	assert ioctls.lOpened == [ "/dev/i2c-1" ]
+
+
+def test_write_registers_is_one_ioctl(sim, ioctls, i2cdev):
+	_oDevice = i2cdev.get_i2c_device(SIM_ADDRESS)
+	_iIoctls = ioctls.iIoctls
+	_oDevice.writeRegisters([ ( SUBADDR_SPR, 0x5A ), ( SUBADDR_IER, 0x01 ), ( SUBADDR_LCR, 0x1B ) ])
+	assert ioctls.iIoctls - _iIoctls == 1
+	assert _oDevice.iIoctls == 1
+	_oUart = sim.dChips[SIM_ADDRESS].oUart
+	assert ( _oUart.hSPR, _oUart.hIER, _oUart.hLCR ) == ( 0x5A, 0x01, 0x1B )
+
+
+def test_read_registers_is_one_ioctl(ioctls, i2cdev):
+	_oDevice = i2cdev.get_i2c_device(SIM_ADDRESS)
+	_oDevice.writeRegisters([ ( SUBADDR_SPR, 0xA5 ), ( SUBADDR_LCR, 0x03 ) ])
+	_iIoctls = ioctls.iIoctls
+	assert _oDevice.readRegisters([ SUBADDR_SPR, SUBADDR_LCR, SUBADDR_SPR ]) == [ 0xA5, 0x03, 0xA5 ]
+	assert ioctls.iIoctls - _iIoctls == 1
+
+
+def test_long_transfers_split_at_the_message_limit(ioctls, i2cdev):
+	_oDevice = i2cdev.get_i2c_device(SIM_ADDRESS)
+	_iIoctls = ioctls.iIoctls
+# -- Each register read is two messages, so 42 reads need 84 messages: two full ioctls
+	assert _oDevice.readRegisters([ SUBADDR_SPR ] * 42) == [ 0xFF ] * 42
+	assert ioctls.iIoctls - _iIoctls == 2
+	_oDevice.writeRegisters([ ( SUBADDR_SPR, _hValue ) for _hValue in range(SC16IS750.SC16IS750_I2C_RDWR_MAX_MSGS + 1) ])
+	assert ioctls.iIoctls - _iIoctls == 4
+	assert _oDevice.readU8(SUBADDR_SPR) == SC16IS750.SC16IS750_I2C_RDWR_MAX_MSGS
+
+
+def test_block_transfers_move_the_fifo(sim, ioctls, i2cdev):
+	_oDevice = i2cdev.get_i2c_device(SIM_ADDRESS)
+	_oUart = sim.dChips[SIM_ADDRESS].oUart
+	_iIoctls = ioctls.iIoctls
+	_oDevice.writeList(0x00, b"0123456789")
+	assert ioctls.iIoctls - _iIoctls == 1
+	assert len(_oUart.oTxFifo) == 10
+	assert _oDevice.readList(( SC16IS750.SC16IS750_REG_TXLVL << 3 ), 1) == bytearray([ 54 ])
+	assert ioctls.iIoctls - _iIoctls == 2
+
+
+
+# ----------------------------------------------------
+#   D R I V E R   O N   I 2 C - D E V
+# ----------------------------------------------------
+
+def test_connect_ioctl_count(ioctls, uart):
+# -- The LCR probe, then the configuration as one combined write
+	_iIoctls = ioctls.iIoctls
+	assert uart.Connect(115200) == True
+	assert ioctls.iIoctls - _iIoctls == 2
+	_iIoctls = ioctls.iIoctls
+	assert uart.Connect(115200) == True
+	assert ioctls.iIoctls - _iIoctls == 2
+# -- With the cache trusted there is no probe
+	_iIoctls = ioctls.iIoctls
+	assert uart.Connect(115200, bResync = False) == True
+	assert ioctls.iIoctls - _iIoctls == 1
+
+
+def test_status_snapshot_is_one_ioctl(sim, ioctls, uart):
+	assert uart.Connect(115200) == True
+	sim.dChips[SIM_ADDRESS].oUart.InjectRx(b"abcde")
+	sim.Advance(0.01)
+	_iIoctls = ioctls.iIoctls
+	_oSnapshot = uart.GetStatusSnapshot()
+	assert ioctls.iIoctls - _iIoctls == 1
+	assert _oSnapshot.iRxLevel == 5
+	assert _oSnapshot.iTxLevel == 64
+
+
+def test_fifo_burst_ioctl_count(sim, ioctls, uart):
+	assert uart.Connect(115200) == True
+	_oUart = sim.dChips[SIM_ADDRESS].oUart
+	_iIoctls = ioctls.iIoctls
+	assert uart.WriteBytes(b"x" * 64) == 64
+# -- TXLVL, then the burst
+	assert ioctls.iIoctls - _iIoctls == 2
+	sim.Advance(0.1)
+	assert _oUart.TakeTx() == b"x" * 64
+
+	_oUart.InjectRx(b"y" * 40)
+	sim.Advance(0.01)
+	_iIoctls = ioctls.iIoctls
+	assert uart.ReadBytes() == b"y" * 40
+	assert ioctls.iIoctls - _iIoctls == 2
+
+
+def test_metrics_count_combined_transfers(ioctls, uart):
+	assert uart.Connect(115200) == True
+	uart.EnableMetrics()
+	assert uart.Connect(115200, bResync = False) == True
+	uart.GetStatusSnapshot()
+	_dCounters = uart.GetMetrics()["counters"]
+	assert _dCounters["combined-writes"] == 1
+	assert _dCounters["combined-reads"] == 1
+	assert "readU8" not in uart.GetMetrics()["latency"]
+
+
+def test_ping(uart):
+	assert uart.Ping() == True
+
+
+
+# ----------------------------------------------------
+#   D E F A U L T   P R O V I D E R   A N D   B U S   L O C K S
+# ----------------------------------------------------
+
+def test_default_provider_is_i2cdev(monkeypatch, i2cdev):
+	monkeypatch.setattr(SC16IS750, "_oSC16IS750DefaultI2CDev", i2cdev)
+	_oUart = SC16IS750.SC16IS750(SIM_ADDRESS)
+	assert _oUart._oI2CInstance is i2cdev
+	assert _oUart.Ping() == True
+
+
+def test_bus_lock_is_keyed_by_the_bus_path(ioctls, i2cdev):
+	_oOther = SC16IS750.SC16IS750I2CDev(1, ioctls.Open, ioctls.Ioctl, ioctls.Close)
+	assert SC16IS750.SC16IS750GetBusLock(_oOther, 1) is SC16IS750.SC16IS750GetBusLock(i2cdev, 1)
+	assert SC16IS750.SC16IS750GetBusLock(i2cdev, 2) is not SC16IS750.SC16IS750GetBusLock(i2cdev, 1)
+# -- A provider without a bus path of its own, like Adafruit_GPIO.I2C, reaches the same /dev/i2c-1
+	assert SC16IS750.SC16IS750GetBusLock(object(), 1) is SC16IS750.SC16IS750GetBusLock(i2cdev, 1)
+
+
+def test_models_and_spi_transports_are_buses_of_their_own(sim):
+	assert SC16IS750.SC16IS750GetBusLock(sim, 1) is not SC16IS750.SC16IS750GetBusLock(SC16IS750Sim.SC16IS750Sim(), 1)
+	_oSpi = SC16IS750Sim.SC16IS750SimSpiDev(sim, SIM_ADDRESS)
+	_lTransports = [ SC16IS750.SC16IS750SpiTransport(_oSpi, sBusPath = "/dev/spidev0.0"), SC16IS750.SC16IS750SpiTransport(_oSpi, sBusPath = "/dev/spidev0.0"), SC16IS750.SC16IS750SpiTransport(_oSpi) ]
+	assert SC16IS750.SC16IS750GetBusLock(_lTransports[0], None) is SC16IS750.SC16IS750GetBusLock(_lTransports[1], None)
+	assert SC16IS750.SC16IS750GetBusLock(_lTransports[2], None) is not SC16IS750.SC16IS750GetBusLock(_lTransports[0], None)
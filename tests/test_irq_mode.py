@@ -0,0 +1,101 @@
+######################################################
+#
+# IRQ mode: interrupt enables, idle bus traffic, wake ups from an fd edge source and the thread handover
+#
+######################################################
+
+import os
+import select
+import time
+
+import pytest
+
+import SC16IS750
+import SC16IS750Sim
+
+from conftest import SIM_ADDRESS, WaitFor
+
+
+@pytest.fixture
+def irq_source(sim, uart):
+	assert uart.Connect(115200) == True
+	_oIrqSource = SC16IS750Sim.SC16IS750SimIrqSource(sim, SIM_ADDRESS)
+	yield _oIrqSource
+	assert uart.StopIrqMode(5.0) == True
+	_oIrqSource.Close()
+
+
+@pytest.fixture
+def pipe():
+	_lPipe = os.pipe()
+	yield _lPipe
+	for _iFd in _lPipe:
+		os.close(_iFd)
+
+
+
+def test_ier_is_programmed_and_restored(uart, chip, irq_source):
+	_hSavedIER = chip.oUart.hIER
+	assert uart.StartIrqMode(irq_source) == True
+	assert chip.oUart.hIER == SC16IS750.SC16IS750_IER_IRQ_DEFAULT
+	assert uart.StopIrqMode(5.0) == True
+	assert chip.oUart.hIER == _hSavedIER
+
+
+def test_idle_link_costs_no_bus_traffic(sim, uart, irq_source):
+	assert uart.StartIrqMode(irq_source) == True
+# -- Let the start up pass serve the pending THR interrupt
+	time.sleep(0.05)
+	_iTransactions = sim.iTransactions
+	time.sleep(0.1)
+	assert sim.iTransactions == _iTransactions
+
+
+def test_small_message_wakes_the_thread_once(sim, uart, chip, irq_source):
+	assert uart.StartIrqMode(irq_source) == True
+	time.sleep(0.05)
+	_iTransactions = sim.iTransactions
+	chip.oUart.InjectRx(b"abc")
+	assert WaitFor(lambda: uart.RxPumpAvailable() == 3) == True
+	assert uart.RxPumpRead() == b"abc"
+# -- IIR, RXLVL and the block read
+	assert sim.iTransactions - _iTransactions == 3
+
+
+def test_fd_source_edges_drive_the_service(sim, uart, chip, pipe):
+	assert uart.Connect(115200) == True
+	_oIrqSource = SC16IS750.SC16IS750FdIrqSource(pipe[0])
+	assert _oIrqSource.IsAsserted() == None
+	try:
+		assert uart.StartIrqMode(_oIrqSource) == True
+		chip.oUart.InjectRx(b"edge")
+		sim.Advance(0.01)
+	# -- Nothing moves until the edge arrives
+		time.sleep(0.05)
+		assert uart.RxPumpAvailable() == 0
+		os.write(pipe[1], b"\x01")
+		assert WaitFor(lambda: uart.RxPumpAvailable() == 4) == True
+		assert uart.RxPumpRead() == b"edge"
+		assert uart.IrqStats()["edges"] == 1
+	finally:
+		assert uart.StopIrqMode(5.0) == True
+
+
+def test_fd_source_reports_the_level_it_is_given(pipe):
+	_oIrqSource = SC16IS750.SC16IS750FdIrqSource(pipe[0], fnIsAsserted = lambda: True)
+	assert _oIrqSource.Fileno() == pipe[0]
+	assert _oIrqSource.IsAsserted() == True
+	os.write(pipe[1], b"\x01\x01")
+	_oIrqSource.Acknowledge()
+	assert select.select([ pipe[0] ], [], [], 0)[0] == []
+
+
+def test_irq_mode_and_polling_threads_exclude_each_other(uart, irq_source):
+	assert uart.StartRxPump() == True
+	try:
+		assert uart.StartIrqMode(irq_source) == False
+	finally:
+		assert uart.StopRxPump(5.0) == True
+	assert uart.StartIrqMode(irq_source) == True
+	assert uart.StartRxPump() == False
+	assert uart.StartTxWriter() == False
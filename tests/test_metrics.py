@@ -0,0 +1,79 @@
+######################################################
+#
+# Per device bus metrics: transaction counters, per register and per method counts, latency histograms
+#
+######################################################
+
+import SC16IS750
+
+
+def test_metrics_are_empty_until_enabled(uart):
+	assert uart.GetMetrics() == {}
+
+
+def test_counters_follow_the_bus_traffic(sim, uart, chip):
+	assert uart.Connect(115200) == True
+	chip.oUart.InjectRx(b"hello")
+	sim.Advance(0.01)
+	uart.EnableMetrics()
+	_iTransactions = sim.iTransactions
+	assert uart.ReadBytes() == b"hello"
+	assert uart.WriteBytes(b"abc") == 3
+	_dCounters = uart.GetMetrics()["counters"]
+# -- RXLVL and TXLVL reads, one block read and one block write
+	assert _dCounters["register-reads"] == 2
+	assert _dCounters["block-reads"] == 1
+	assert _dCounters["block-writes"] == 1
+	assert _dCounters["bytes-read"] == 2 + 5
+	assert _dCounters["bytes-written"] == 3
+	assert sim.iTransactions - _iTransactions == 4
+
+
+def test_registers_are_counted_by_operation(uart):
+	uart.EnableMetrics()
+	uart.GetLineStatus()
+	uart.GetLineStatus()
+	assert uart.GetMetrics()["registers"][SC16IS750.SC16IS750_REG_LSR] == { "readU8":2 }
+
+
+def test_methods_are_counted_when_asked(uart):
+	assert uart.Connect(115200) == True
+	uart.EnableMetrics()
+	uart.GetLineStatus()
+	assert uart.GetMetrics()["methods"] == {}
+
+	uart.EnableMetrics(bPerMethod = True)
+	uart.GetLineStatus()
+	assert uart.SetModemRTS(True) == True
+	assert uart.GetMetrics()["methods"] == { "GetLineStatus":1, "SetModemRTS":1 }
+
+
+def test_latency_histogram_accounts_every_call(uart):
+	uart.EnableMetrics()
+	for _iIndex in range(10):
+		uart.GetLineStatus()
+	_dHistogram = uart.GetMetrics()["latency"]["readU8"]
+	assert _dHistogram["count"] == 10
+	assert sum(_dHistogram["bucket_counts"]) == 10
+	assert 0.0 <= _dHistogram["min_us"] <= _dHistogram["max_us"]
+	assert _dHistogram["bucket_le_us"] == list(SC16IS750.SC16IS750_METRICS_BUCKETS_US)
+
+
+def test_disable_and_reset(uart):
+	uart.EnableMetrics()
+	uart.GetLineStatus()
+	uart.DisableMetrics()
+	uart.GetLineStatus()
+	assert uart.GetMetrics()["counters"]["register-reads"] == 1
+	uart.ResetMetrics()
+	assert uart.GetMetrics()["counters"]["register-reads"] == 0
+
+
+def test_swallowed_write_errors_are_counted(uart, chip):
+	assert uart.Connect(115200) == True
+	uart.EnableMetrics()
+	def _Fail(hRegister, hValue):
+		raise IOError("bus error")
+	chip.write8 = _Fail
+	uart.SetModemRTS(True)
+	assert uart.GetMetrics()["counters"]["swallowed-write-exceptions"] == 1
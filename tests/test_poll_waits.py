@@ -0,0 +1,78 @@
+######################################################
+#
+# Blocking waits: poll intervals from the character time, timeouts, and the Serial port's wait loops
+#
+######################################################
+
+import time
+
+import pytest
+
+import SC16IS750
+import SC16IS750Serial
+
+
+def test_char_time_follows_the_line_settings(uart):
+	assert uart.Connect(9600) == True
+	assert uart.GetCharTime() == pytest.approx(10.0 / 9600, rel = 0.01)
+	assert uart.Connect(9600, 'E', 7, 2) == True
+	assert uart.GetCharTime() == pytest.approx(11.0 / 9600, rel = 0.01)
+
+
+def test_rx_wait_is_capped_at_the_trigger_level(uart):
+	assert uart.Connect(9600) == True
+	assert uart.SetPollPolicy(1.0, 0.0, 1.0) == True
+	assert uart.GetRxWaitInterval(1) == pytest.approx(uart.GetCharTime())
+# -- The default RX trigger is 8: waiting longer could overflow the FIFO
+	assert uart.GetRxWaitInterval(1000) == pytest.approx(8 * uart.GetCharTime())
+
+
+def test_tx_wait_is_capped_at_half_the_fifo(uart):
+	assert uart.Connect(9600) == True
+	assert uart.SetPollPolicy(1.0, 0.0, 1.0) == True
+	assert uart.GetTxWaitInterval(1000) == pytest.approx(( SC16IS750.SC16IS750_FIFO_SIZE // 2 ) * uart.GetCharTime())
+
+
+def test_poll_policy_bounds_the_interval(uart):
+	assert uart.Connect(300) == True
+	assert uart.SetPollPolicy(1.0, 0.001, 0.002) == True
+	assert uart.GetRxWaitInterval(8) == 0.002
+	assert uart.Connect(115200) == True
+	assert uart.GetRxWaitInterval(1) == 0.001
+
+
+def test_poll_policy_rejects_bad_inputs(uart):
+	assert uart.SetPollPolicy(1.5) == False
+	assert uart.SetPollPolicy(0.5, 0.01, 0.001) == False
+
+
+def test_read_byte_honours_the_timeout(uart):
+	assert uart.Connect(115200) == True
+	_fStart = time.time()
+	assert uart.ReadByte(bDieOnNoRxBufferData = False, fTimeoutSec = 0.05) == None
+	assert time.time() - _fStart < 1.0
+
+
+def test_serial_flush_waits_for_the_line(rt_uart, rt_chip):
+	_oPort = SC16IS750Serial.SC16IS750Serial(rt_uart, baudrate = 115200)
+	assert _oPort.write(b"x" * 40) == 40
+	_oPort.flush()
+	assert rt_uart.GetLineStatus().thr_tsr_empty == True
+	assert rt_chip.oUart.TakeTx() == b"x" * 40
+
+
+def test_serial_flush_raises_on_a_bus_error(uart):
+	_oPort = SC16IS750Serial.SC16IS750Serial(uart, baudrate = 115200)
+	uart.GetLineStatus = lambda: None
+	with pytest.raises(SC16IS750Serial.SerialException):
+		_oPort.flush()
+
+
+def test_serial_write_raises_on_a_bus_error(uart):
+	_oPort = SC16IS750Serial.SC16IS750Serial(uart, baudrate = 115200)
+	uart.WriteBytes = lambda aData, bBlocking = True, fTimeoutSec = None: None
+	with pytest.raises(SC16IS750Serial.SerialException):
+		_oPort.write(b"abc")
+	_oPort.write_timeout = 0
+	with pytest.raises(SC16IS750Serial.SerialException):
+		_oPort.write(b"abc")
@@ -0,0 +1,101 @@
+######################################################
+#
+# Burst RX reads: ReadBytes / ReadInto drain the FIFO with one RXLVL read and one block read
+#
+######################################################
+
+import pytest
+
+import SC16IS750
+import SC16IS750Serial
+
+from conftest import SIM_ADDRESS
+
+
+#
+# == smbus style I2C provider on the model: block reads come back as a list of ints ==
+#
+class ListDevice(object):
+
+	def __init__(self, oChip):
+		self._oChip = oChip
+		return
+
+	def readList(self, register, length):
+		return list(self._oChip.readList(register, length))
+
+	def __getattr__(self, sName):
+		return getattr(self._oChip, sName)
+
+
+class ListProvider(object):
+
+	def __init__(self, oSim):
+		self._oSim = oSim
+		return
+
+	def get_i2c_device(self, address, **kwargs):
+		return ListDevice(self._oSim.get_i2c_device(address))
+
+
+@pytest.fixture
+def list_uart(sim):
+	_oUart = SC16IS750.SC16IS750(SIM_ADDRESS, _oExistingI2CInstance = ListProvider(sim))
+	assert _oUart.Connect(115200) == True
+	return _oUart
+
+
+
+def test_drain_is_two_transactions(sim, uart, chip):
+	assert uart.Connect(115200) == True
+	chip.oUart.InjectRx(b"z" * 64)
+	sim.Advance(0.01)
+	_iTransactions = sim.iTransactions
+	assert uart.ReadBytes() == b"z" * 64
+	assert sim.iTransactions - _iTransactions == 2
+
+
+def test_read_into_non_blocking_fills_what_is_waiting(sim, uart, chip):
+	assert uart.Connect(115200) == True
+	chip.oUart.InjectRx(b"abc")
+	sim.Advance(0.01)
+	_aBuffer = bytearray(10)
+	assert uart.ReadInto(_aBuffer) == 3
+	assert bytes(_aBuffer[:3]) == b"abc"
+	assert uart.ReadInto(_aBuffer) == 0
+
+
+def test_blocking_read_times_out_with_what_arrived(sim, uart, chip):
+	assert uart.Connect(115200) == True
+	chip.oUart.InjectRx(b"abc")
+	sim.Advance(0.01)
+	assert uart.ReadBytes(10, bBlocking = True, fTimeoutSec = 0.05) == b"abc"
+
+
+def test_blocking_read_needs_max_len(uart):
+	assert uart.Connect(115200) == True
+	with pytest.raises(SC16IS750.SC16IS750Error):
+		uart.ReadBytes(bBlocking = True)
+
+
+def test_list_provider_read_into(sim, list_uart):
+	sim.dChips[SIM_ADDRESS].oUart.InjectRx(b"0123456789")
+	sim.Advance(0.01)
+	_aBuffer = bytearray(10)
+# -- The second drain copies through a memoryview slice
+	assert list_uart.ReadInto(memoryview(_aBuffer)[:4]) == 4
+	assert list_uart.ReadInto(memoryview(_aBuffer)[4:]) == 6
+	assert bytes(_aBuffer) == b"0123456789"
+
+
+def test_list_provider_read_bytes(sim, list_uart):
+	sim.dChips[SIM_ADDRESS].oUart.InjectRx(b"hello")
+	sim.Advance(0.01)
+	assert list_uart.ReadBytes() == b"hello"
+
+
+def test_list_provider_serial_read(sim, list_uart):
+	_oPort = SC16IS750Serial.SC16IS750Serial(list_uart, baudrate = 115200, timeout = 0)
+	sim.dChips[SIM_ADDRESS].oUart.InjectRx(b"abcdef")
+	sim.Advance(0.01)
+	assert _oPort.read(6) == b"abcdef"
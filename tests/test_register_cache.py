@@ -0,0 +1,72 @@
+######################################################
+#
+# Register shadow cache: one transaction read-modify-write setters, write verification and resync
+#
+######################################################
+
+import SC16IS750
+
+
+def test_setters_cost_one_transaction(sim, uart, chip):
+	assert uart.Connect(115200) == True
+	_iTransactions = sim.iTransactions
+	assert uart.SetModemRTS(True) == True
+	assert sim.iTransactions - _iTransactions == 1
+	assert ( chip.oUart.hMCR & 0x02 ) == 0x02
+
+	_iTransactions = sim.iTransactions
+	assert uart.SetLineBreak(True) == True
+	assert sim.iTransactions - _iTransactions == 1
+	assert ( chip.oUart.hLCR & 0x40 ) == 0x40
+
+
+def test_writes_go_through_to_the_shadow(uart):
+	assert uart.Connect(115200) == True
+	assert uart.SetModemRTS(True) == True
+	assert ( uart._GetCachedRegister(SC16IS750.SC16IS750_BANK_GENERAL, SC16IS750.SC16IS750_REG_MCR) & 0x02 ) == 0x02
+	assert uart._GetCachedRegister(SC16IS750.SC16IS750_BANK_LCR7, SC16IS750.SC16IS750_REG_LCR7_DLL) == 8
+
+
+def test_chip_owned_registers_are_not_cached(sim, uart, chip):
+	assert uart.Connect(115200) == True
+	chip.oUart.InjectRx(b"ab")
+	sim.Advance(0.01)
+	assert uart._ReadRegister(SC16IS750.SC16IS750_REG_RXLVL) == 2
+	assert uart._GetCachedRegister(SC16IS750.SC16IS750_BANK_GENERAL, SC16IS750.SC16IS750_REG_RXLVL) == None
+
+
+def test_fifo_reset_flags_are_not_kept(uart):
+	assert uart.Connect(115200) == True
+	assert uart.ResetRxFifoBuffer() == True
+	assert ( uart._GetCachedRegister(SC16IS750.SC16IS750_BANK_GENERAL, SC16IS750.SC16IS750_REG_FCR) & 0x06 ) == 0
+
+
+def test_write_verify_is_opt_in(sim, uart):
+	assert uart.Connect(115200) == True
+	_iTransactions = sim.iTransactions
+	assert uart.SetModemRTS(False) == True
+	assert sim.iTransactions - _iTransactions == 1
+
+	uart.SetWriteVerify(True)
+	_iTransactions = sim.iTransactions
+	assert uart.SetModemRTS(True) == True
+# -- The write, then the uncached read back
+	assert sim.iTransactions - _iTransactions == 2
+
+
+def test_write_verify_catches_a_mismatch(uart, chip):
+	assert uart.Connect(115200) == True
+	uart.SetWriteVerify(True)
+	_fnReadU8 = chip.readU8
+	chip.readU8 = lambda hRegister: _fnReadU8(hRegister) ^ 0x01
+	assert uart.SetModemRTS(True) == False
+
+
+def test_resync_reads_the_chip_state(uart, chip):
+	assert uart.Connect(115200) == True
+# -- Change the chip behind the driver's back
+	chip.oUart.hMCR = 0x02
+	assert uart._ReadRegister(SC16IS750.SC16IS750_REG_MCR) == 0x00
+	assert uart.Resync() == True
+	assert uart._ReadRegister(SC16IS750.SC16IS750_REG_MCR) == 0x02
+	assert uart._GetCachedRegister(SC16IS750.SC16IS750_BANK_LCR7, SC16IS750.SC16IS750_REG_LCR7_DLL) == 8
@@ -0,0 +1,94 @@
+######################################################
+#
+# RS-485: auto direction, 9-bit address frames and hardware address matching
+#
+######################################################
+
+import threading
+import time
+
+import SC16IS750
+
+from conftest import WaitFor
+
+
+def test_direction_control_sets_efcr(uart, chip):
+	assert uart.Connect(115200) == True
+	assert uart.SetRS485Direction(True, True) == True
+	assert ( chip.oUart.hEFCR & ( SC16IS750.SC16IS750_EFCR_RTS_CONTROL | SC16IS750.SC16IS750_EFCR_RTS_INVERT ) ) == ( SC16IS750.SC16IS750_EFCR_RTS_CONTROL | SC16IS750.SC16IS750_EFCR_RTS_INVERT )
+	assert uart.SetRS485Direction(False) == True
+	assert ( chip.oUart.hEFCR & SC16IS750.SC16IS750_EFCR_RTS_CONTROL ) == 0
+
+
+def test_turnaround_has_a_floor(uart):
+	assert uart.Connect(115200) == True
+	assert uart.GetRS485Turnaround() == SC16IS750.SC16IS750_RS485_TURNAROUND_MIN_SEC
+	assert uart.Connect(1200) == True
+	assert uart.GetRS485Turnaround() == 3.5 * uart.GetCharTime()
+
+
+def test_address_frame_marks_only_the_address(sim, uart, chip):
+	assert uart.Connect(115200) == True
+	assert uart.SetRS485Address(0x10) == True
+	_hRegLCR = chip.oUart.hLCR
+	assert uart.WriteRS485Frame(b"data", 0x42, fTimeoutSec = 1.0) == 4
+	sim.Advance(0.01)
+	assert chip.oUart.TakeTx() == b"\x42data"
+	assert chip.oUart.TakeTxAddresses() == [ ( 0, 0x42 ) ]
+	assert chip.oUart.hLCR == _hRegLCR
+
+
+def test_address_matching_filters_received_frames(sim, uart, chip):
+	assert uart.Connect(115200) == True
+	assert uart.SetRS485Address(0x10) == True
+	chip.oUart.InjectRx(b"other", hAddress = 0x11)
+	chip.oUart.InjectRx(b"mine", hAddress = 0x10)
+	sim.Advance(0.01)
+# -- The other node's frame is dropped; the matching address byte reaches the FIFO ahead of the data
+	assert uart.ReadBytes() == b"\x10mine"
+
+
+def test_lcr_is_restored_when_the_frame_times_out(sim, uart, chip):
+	assert uart.Connect(115200) == True
+	assert uart.SetRS485Address(0x10) == True
+	_hRegLCR = chip.oUart.hLCR
+# -- With the transmitter disabled the address never leaves the shift register
+	chip.oUart.hEFCR |= 0x04
+	assert uart.WriteRS485Frame(b"data", 0x42, fTimeoutSec = 0.05) == 0
+	assert chip.oUart.hLCR == _hRegLCR
+	assert uart._bRS485FrameHold == False
+
+
+def test_bus_is_free_while_the_address_is_sent(rt_uart, rt_chip):
+# -- At 300 baud the address byte takes about 37 ms on the line
+	assert rt_uart.Connect(300) == True
+	assert rt_uart.SetRS485Address(0x10) == True
+	_oFrame = threading.Thread(target = rt_uart.WriteRS485Frame, args = ( b"d", 0x42, 5.0 ))
+	_oFrame.start()
+	try:
+		assert WaitFor(lambda: rt_uart._bRS485FrameHold, 1.0) == True
+		_fStart = time.time()
+		assert rt_uart._oBusLock.acquire(True) == True
+		rt_uart._oBusLock.release()
+		assert time.time() - _fStart < 0.02
+	finally:
+		_oFrame.join(5.0)
+	assert _oFrame.is_alive() == False
+
+
+def test_other_writers_wait_for_the_address(rt_uart, rt_chip):
+	assert rt_uart.Connect(300) == True
+	assert rt_uart.SetRS485Address(0x10) == True
+	_oFrame = threading.Thread(target = rt_uart.WriteRS485Frame, args = ( b"d", 0x42, 5.0 ))
+	_oFrame.start()
+	try:
+		assert WaitFor(lambda: rt_uart._bRS485FrameHold, 1.0) == True
+	# -- THR is held for the frame: nothing gets into the FIFO under the 9th bit
+		assert rt_uart.WriteBytes(b"x", bBlocking = False) == 0
+		assert rt_uart.WriteByte(0x78, bDieOnNoTxBufferSpace = True) == False
+	finally:
+		_oFrame.join(5.0)
+	assert rt_uart.WriteBytes(b"x") == 1
+	assert rt_uart.TxWriterDrain(2.0) == True
+	assert rt_chip.oUart.TakeTx() == b"\x42dx"
+	assert rt_chip.oUart.TakeTxAddresses() == [ ( 0, 0x42 ) ]
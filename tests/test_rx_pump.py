@@ -0,0 +1,111 @@
+######################################################
+#
+# Background RX pump and the single producer / consumer ring buffer
+#
+######################################################
+
+import threading
+import time
+
+import pytest
+
+import SC16IS750
+
+from conftest import WaitFor
+
+
+@pytest.fixture
+def pump(rt_uart):
+	yield rt_uart
+	rt_uart.StopRxPump(fTimeoutSec = 5.0)
+
+
+
+# ----------------------------------------------------
+#   R I N G   B U F F E R
+# ----------------------------------------------------
+
+def test_ring_wraps_and_keeps_order():
+	_oRing = SC16IS750.SC16IS750RingBuffer(8)
+	assert _oRing.Write(b"abcdef") == 6
+	assert _oRing.Read(4) == b"abcd"
+	assert _oRing.Write(b"ghijkl") == 6
+	assert ( _oRing.Used(), _oRing.Free() ) == ( 8, 0 )
+	assert _oRing.Read() == b"efghijkl"
+
+
+def test_ring_stores_what_fits():
+	_oRing = SC16IS750.SC16IS750RingBuffer(4)
+	assert _oRing.Write(b"abcdef") == 4
+	_aBuffer = bytearray(10)
+	assert _oRing.ReadInto(_aBuffer) == 4
+	assert bytes(_aBuffer[:4]) == b"abcd"
+
+
+def test_ring_discard_and_clear():
+	_oRing = SC16IS750.SC16IS750RingBuffer(8)
+	_oRing.Write(b"abcdef")
+	assert _oRing.Discard(2) == 2
+	assert _oRing.Read(1) == b"c"
+	_oRing.Clear()
+	assert _oRing.Used() == 0
+
+
+def test_ring_one_producer_one_consumer():
+	_oRing = SC16IS750.SC16IS750RingBuffer(16)
+	_aData = bytes(bytearray(range(256))) * 4
+	def _Produce():
+		_iSent = 0
+		while ( _iSent < len(_aData) ):
+			_iSent += _oRing.Write(_aData[_iSent:(_iSent + 7)])
+			time.sleep(0)
+	_oProducer = threading.Thread(target = _Produce)
+	_oProducer.start()
+	_aReceived = bytearray()
+	while ( len(_aReceived) < len(_aData) ):
+		_aReceived += _oRing.Read()
+		time.sleep(0)
+	_oProducer.join()
+	assert bytes(_aReceived) == _aData
+
+
+
+# ----------------------------------------------------
+#   R X   P U M P
+# ----------------------------------------------------
+
+def test_pump_moves_the_fifo_into_the_ring(rt_chip, pump):
+	assert pump.StartRxPump() == True
+	assert pump.StartRxPump() == False
+	_aData = bytes(bytearray(range(200)))
+	rt_chip.oUart.InjectRx(_aData)
+	assert WaitFor(lambda: pump.RxPumpAvailable() == len(_aData)) == True
+	assert pump.RxPumpRead() == _aData
+	assert pump.RxPumpDropped() == 0
+
+
+def test_full_ring_drops_and_counts(rt_chip, pump):
+	assert pump.StartRxPump(iBufferSize = 16) == True
+	rt_chip.oUart.InjectRx(b"x" * 40)
+	assert WaitFor(lambda: pump.RxPumpDropped() == 24) == True
+	assert pump.RxPumpRead() == b"x" * 16
+
+
+def test_high_water_callback_fires_on_the_crossing(rt_chip, pump):
+	_lCalls = []
+	assert pump.StartRxPump(iHighWater = 10, fnHighWater = lambda oUart, iUsed: _lCalls.append(iUsed)) == True
+	rt_chip.oUart.InjectRx(b"y" * 12)
+	assert WaitFor(lambda: pump.RxPumpAvailable() == 12) == True
+	rt_chip.oUart.InjectRx(b"y" * 4)
+	assert WaitFor(lambda: pump.RxPumpAvailable() == 16) == True
+	assert len(_lCalls) == 1
+	assert _lCalls[0] >= 10
+
+
+def test_restart_keeps_buffered_data(rt_chip, pump):
+	assert pump.StartRxPump() == True
+	rt_chip.oUart.InjectRx(b"keep")
+	assert WaitFor(lambda: pump.RxPumpAvailable() == 4) == True
+	assert pump.StopRxPump(5.0) == True
+	assert pump.StartRxPump() == True
+	assert pump.RxPumpRead() == b"keep"
@@ -0,0 +1,159 @@
+######################################################
+#
+# pySerial compatible port: line settings, timed reads and writes, buffers and modem lines
+#
+######################################################
+
+import time
+
+import pytest
+
+import SC16IS750Serial
+
+
+@pytest.fixture
+def port(rt_uart):
+	return SC16IS750Serial.SC16IS750Serial(rt_uart, baudrate = 115200, timeout = 1.0)
+
+
+
+# ----------------------------------------------------
+#   L I N E   S E T T I N G S
+# ----------------------------------------------------
+
+def test_open_applies_the_line_settings(uart, chip):
+	_oPort = SC16IS750Serial.Serial(uart, baudrate = 9600, bytesize = 7, parity = 'E', stopbits = 2)
+	assert _oPort.is_open == True
+# -- 7 data bits, 2 stop bits, even parity
+	assert chip.oUart.hLCR == 0x1E
+	_oPort.parity = 'N'
+	_oPort.stopbits = 1
+	assert chip.oUart.hLCR == 0x02
+	assert ( _oPort.bytesize, _oPort.parity, _oPort.stopbits ) == ( 7, 'N', 1 )
+
+
+def test_bad_settings_raise_value_error(uart):
+	with pytest.raises(ValueError):
+		SC16IS750Serial.Serial(uart, baudrate = "fast")
+	with pytest.raises(ValueError):
+		SC16IS750Serial.Serial(uart, bytesize = 8, stopbits = 1.5)
+	_oPort = SC16IS750Serial.Serial(uart)
+	with pytest.raises(ValueError):
+		_oPort.timeout = -1
+	with pytest.raises(ValueError):
+		_oPort.parity = 'X'
+
+
+def test_closed_port_refuses_io(uart):
+	_oPort = SC16IS750Serial.Serial(uart)
+	with pytest.raises(SC16IS750Serial.SerialException):
+		_oPort.open()
+	_oPort.close()
+	with pytest.raises(SC16IS750Serial.SerialException):
+		_oPort.read(1)
+	with pytest.raises(SC16IS750Serial.SerialException):
+		_oPort.write(b"x")
+
+
+
+# ----------------------------------------------------
+#   R E C E I V E
+# ----------------------------------------------------
+
+def test_read_returns_on_size_or_timeout(port, rt_chip):
+	rt_chip.oUart.InjectRx(b"abcdef")
+	assert port.read(4) == b"abcd"
+	port.timeout = 0.05
+	_fStart = time.time()
+	assert port.read(10) == b"ef"
+	assert time.time() - _fStart < 1.0
+
+
+def test_zero_timeout_reads_what_is_there(port, rt_chip):
+	port.timeout = 0
+	assert port.read(10) == b""
+	rt_chip.oUart.InjectRx(b"xyz")
+	time.sleep(0.01)
+	assert port.in_waiting == 3
+	assert port.read(10) == b"xyz"
+
+
+def test_readinto_fills_the_callers_buffer(port, rt_chip):
+	rt_chip.oUart.InjectRx(b"12345678")
+	_aBuffer = bytearray(8)
+	assert port.readinto(_aBuffer) == 8
+	assert bytes(_aBuffer) == b"12345678"
+
+
+def test_readline_keeps_what_follows_the_line(port, rt_chip):
+	rt_chip.oUart.InjectRx(b"one\ntwo\nthr")
+	assert port.readline() == b"one\n"
+	assert port.readline() == b"two\n"
+	port.timeout = 0.05
+	assert port.readline() == b"thr"
+
+
+def test_read_until_stops_at_size(port, rt_chip):
+	rt_chip.oUart.InjectRx(b"abcdefgh;")
+	assert port.read_until(b";", 4) == b"abcd"
+	assert port.read_until(b";") == b"efgh;"
+
+
+def test_reset_input_buffer_drops_pending_bytes(port, rt_chip):
+	rt_chip.oUart.InjectRx(b"line\nrest")
+	assert port.readline() == b"line\n"
+	port.reset_input_buffer()
+	port.timeout = 0
+	assert port.read(10) == b""
+
+
+
+# ----------------------------------------------------
+#   T R A N S M I T
+# ----------------------------------------------------
+
+def test_write_sends_everything(port, rt_uart, rt_chip):
+	_aData = bytes(bytearray(range(200)))
+	assert port.write(_aData) == len(_aData)
+	port.flush()
+	assert rt_chip.oUart.TakeTx() == _aData
+	assert port.out_waiting == 0
+
+
+def test_write_timeout_raises(port, rt_chip):
+# -- A stopped transmitter never frees the FIFO
+	rt_chip.oUart.hEFCR |= 0x04
+	port.write_timeout = 0.05
+	with pytest.raises(SC16IS750Serial.SerialTimeoutException):
+		port.write(b"x" * 200)
+
+
+def test_zero_write_timeout_fills_the_fifo_once(port, rt_chip):
+	rt_chip.oUart.hEFCR |= 0x04
+	port.write_timeout = 0
+	assert port.write(b"x" * 200) <= 64
+	port.reset_output_buffer()
+	assert port.out_waiting == 0
+
+
+
+# ----------------------------------------------------
+#   M O D E M   L I N E S
+# ----------------------------------------------------
+
+def test_rts_and_cts(port, rt_chip):
+	port.rts = True
+	assert ( rt_chip.oUart.hMCR & 0x02 ) == 0x02
+	port.rts = False
+	assert ( rt_chip.oUart.hMCR & 0x02 ) == 0x00
+	rt_chip.oUart.SetModemInputs(0x10)
+	assert port.cts == True
+	rt_chip.oUart.SetModemInputs(0x00)
+	assert port.cts == False
+
+
+def test_break_condition_sets_lcr(port, rt_chip):
+	port.break_condition = True
+	assert ( rt_chip.oUart.hLCR & 0x40 ) == 0x40
+	port.break_condition = False
+	assert ( rt_chip.oUart.hLCR & 0x40 ) == 0x00
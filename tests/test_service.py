@@ -0,0 +1,107 @@
+######################################################
+#
+# IIR driven Service() dispatcher: event decoding, callback registration and the registers read per event
+#
+######################################################
+
+import SC16IS750
+
+
+def _Record(lEvents):
+	return lambda oDevice, sEvent, hValue: lEvents.append( (sEvent, hValue) )
+
+
+
+def test_idle_pass_is_one_transaction(sim, uart):
+	assert uart.Connect(115200) == True
+	assert uart.SetInterrupts(SC16IS750.SC16IS750_IER_RHR | SC16IS750.SC16IS750_IER_MODEM) == True
+	_iTransactions = sim.iTransactions
+	assert uart.Service() == 0
+	assert sim.iTransactions - _iTransactions == 1
+
+
+def test_rx_data_brings_the_fifo_level(sim, uart, chip):
+	assert uart.Connect(115200) == True
+	assert uart.SetInterrupts(SC16IS750.SC16IS750_IER_RHR) == True
+	_lEvents = []
+	assert uart.RegisterCallback("rx-data", _Record(_lEvents)) == True
+	chip.oUart.InjectRx(b"r" * 20)
+	sim.Advance(0.01)
+	_iTransactions = sim.iTransactions
+	assert uart.Service() == 1
+# -- IIR and the RXLVL register the event needs, nothing else
+	assert sim.iTransactions - _iTransactions == 2
+	assert _lEvents == [ ("rx-data", 20) ]
+
+
+def test_rx_timeout_for_data_below_the_trigger(sim, uart, chip):
+	assert uart.Connect(115200) == True
+	assert uart.SetInterrupts(SC16IS750.SC16IS750_IER_RHR) == True
+	_lEvents = []
+	uart.RegisterCallback("rx-timeout", _Record(_lEvents))
+	chip.oUart.InjectRx(b"abc")
+	sim.Advance(0.01)
+	assert uart.Service() == 1
+	assert _lEvents == [ ("rx-timeout", 3) ]
+
+
+def test_event_without_callbacks_skips_its_register(sim, uart, chip):
+	assert uart.Connect(115200) == True
+	assert uart.SetInterrupts(SC16IS750.SC16IS750_IER_RHR) == True
+	chip.oUart.InjectRx(b"r" * 20)
+	sim.Advance(0.01)
+	_iTransactions = sim.iTransactions
+	assert uart.Service() == 1
+	assert sim.iTransactions - _iTransactions == 1
+
+
+def test_line_status_reports_the_overrun(sim, uart, chip):
+	assert uart.Connect(115200) == True
+	assert uart.SetInterrupts(SC16IS750.SC16IS750_IER_RLS) == True
+	_lEvents = []
+	uart.RegisterCallback("line-status", _Record(_lEvents))
+	chip.oUart.InjectRx(b"o" * 80)
+	sim.Advance(0.02)
+	assert uart.Service() == 1
+	assert len(_lEvents) == 1
+	assert _lEvents[0][0] == "line-status"
+	assert ( _lEvents[0][1] & 0x02 ) == 0x02
+
+
+def test_modem_change_brings_msr_and_clears(sim, uart, chip):
+	assert uart.Connect(115200) == True
+	assert uart.SetInterrupts(SC16IS750.SC16IS750_IER_MODEM) == True
+	_lEvents = []
+	uart.RegisterCallback("modem-status", _Record(_lEvents))
+	chip.oUart.SetModemInputs(0x10)
+	assert uart.Service(4) == 1
+# -- CTS high and its delta bit
+	assert _lEvents == [ ("modem-status", 0x11) ]
+
+
+def test_one_call_serves_events_in_priority_order(sim, uart, chip):
+	assert uart.Connect(115200) == True
+	assert uart.SetInterrupts(SC16IS750.SC16IS750_IER_RHR | SC16IS750.SC16IS750_IER_MODEM) == True
+	_lEvents = []
+	def _Drain(oDevice, sEvent, hValue):
+		_lEvents.append( (sEvent, hValue) )
+		oDevice.ReadBytes()
+	uart.RegisterCallback("rx-data", _Drain)
+	uart.RegisterCallback("modem-status", _Record(_lEvents))
+	chip.oUart.InjectRx(b"r" * 20)
+	chip.oUart.SetModemInputs(0x10)
+	sim.Advance(0.01)
+	assert uart.Service(4) == 2
+	assert [ _tEvent[0] for _tEvent in _lEvents ] == [ "rx-data", "modem-status" ]
+
+
+def test_register_and_unregister(uart):
+	_fnFirst = lambda oDevice, sEvent, hValue: None
+	_fnSecond = lambda oDevice, sEvent, hValue: None
+	assert uart.RegisterCallback("no-such-event", _fnFirst) == False
+	assert uart.RegisterCallback("io-pins", _fnFirst) == True
+	assert uart.RegisterCallback("io-pins", _fnSecond) == True
+	assert uart.UnregisterCallback("io-pins", _fnFirst) == True
+	assert uart.UnregisterCallback("io-pins", _fnFirst) == False
+	assert uart.UnregisterCallback("io-pins") == True
+	assert uart.UnregisterCallback("io-pins") == False
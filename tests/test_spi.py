@@ -0,0 +1,152 @@
+######################################################
+#
+# SPI transport (SC16IS750SpiTransport) on the SC16IS750SimSpiDev mock: FIFO bursts and parity with I2C
+#
+######################################################
+
+import pytest
+
+import SC16IS750
+import SC16IS750Sim
+
+from conftest import SIM_ADDRESS
+
+
+#
+# == SC16IS750SimSpiDev that keeps the first byte and length of every transfer ==
+#
+class RecordingSpiDev(SC16IS750Sim.SC16IS750SimSpiDev):
+
+	def __init__(self, oSim, hAddress = 0x00):
+		SC16IS750Sim.SC16IS750SimSpiDev.__init__(self, oSim, hAddress)
+		self.lTransfers = []
+		return
+
+	def xfer2(self, lData):
+		self.lTransfers.append(( lData[0], len(lData) ))
+		return SC16IS750Sim.SC16IS750SimSpiDev.xfer2(self, lData)
+
+
+@pytest.fixture
+def spidev(sim):
+	return RecordingSpiDev(sim, SIM_ADDRESS)
+
+
+@pytest.fixture
+def spi_uart(spidev):
+	return SC16IS750.SC16IS750(None, oTransport = SC16IS750.SC16IS750SpiTransport(spidev))
+
+
+# -- The same driver calls on either bus, against a fresh model
+@pytest.fixture(params = [ "i2c", "spi" ])
+def any_uart(request, sim):
+	if ( request.param == "spi" ):
+		return SC16IS750.SC16IS750(None, oTransport = SC16IS750.SC16IS750SpiTransport(RecordingSpiDev(sim, SIM_ADDRESS)))
+	return SC16IS750.SC16IS750(SIM_ADDRESS, _oExistingI2CInstance = sim)
+
+
+
+# ----------------------------------------------------
+#   T R A N S P O R T
+# ----------------------------------------------------
+
+def test_transport_sets_speed_and_mode(spidev):
+	SC16IS750.SC16IS750SpiTransport(spidev, 1000000, 0)
+	assert ( spidev.max_speed_hz, spidev.mode ) == ( 1000000, 0 )
+
+
+def test_register_access_is_one_transfer(sim, spidev):
+	_oTransport = SC16IS750.SC16IS750SpiTransport(spidev)
+	_hSubAddrSPR = ( SC16IS750.SC16IS750_REG_SPR << 3 )
+	_oTransport.write8(_hSubAddrSPR, 0x5A)
+	assert _oTransport.readU8(_hSubAddrSPR) == 0x5A
+	assert spidev.lTransfers == [ ( _hSubAddrSPR, 2 ), ( _hSubAddrSPR | SC16IS750.SC16IS750_SPI_READ, 2 ) ]
+	assert sim.dChips[SIM_ADDRESS].oUart.hSPR == 0x5A
+
+
+def test_write_burst_is_one_transfer(sim, spidev, spi_uart):
+	assert spi_uart.Connect(115200) == True
+	_iTransfers = spidev.iTransfers
+	assert spi_uart.WriteBytes(b"x" * 64) == 64
+# -- TXLVL, then the whole burst: register byte and 64 data bytes
+	assert spidev.iTransfers - _iTransfers == 2
+	assert spidev.lTransfers[-1] == ( 0x00, 65 )
+	sim.Advance(0.1)
+	assert sim.dChips[SIM_ADDRESS].oUart.TakeTx() == b"x" * 64
+
+
+def test_read_burst_is_one_transfer(sim, spidev, spi_uart):
+	assert spi_uart.Connect(115200) == True
+	sim.dChips[SIM_ADDRESS].oUart.InjectRx(b"y" * 64)
+	sim.Advance(0.01)
+	_iTransfers = spidev.iTransfers
+	assert spi_uart.ReadBytes() == b"y" * 64
+# -- RXLVL, then the whole burst
+	assert spidev.iTransfers - _iTransfers == 2
+	assert spidev.lTransfers[-1] == ( SC16IS750.SC16IS750_SPI_READ, 65 )
+
+
+def test_long_writes_go_out_in_fifo_bursts(sim, spidev, spi_uart):
+	assert spi_uart.Connect(115200) == True
+	_iTransfers = len(spidev.lTransfers)
+	_aData = bytes(bytearray(range(200)))
+	_iSent = 0
+	while ( _iSent < len(_aData) ):
+		_iSent += spi_uart.WriteBytes(_aData[_iSent:], bBlocking = False)
+	# -- Let the FIFO drain on the model's clock
+		sim.Advance(0.01)
+# -- THR writes: sub-address 0x00 with the R/W flag clear; every one is a FIFO load
+	_lBursts = [ _iLength - 1 for _hCommand, _iLength in spidev.lTransfers[_iTransfers:] if ( _hCommand == 0x00 ) ]
+	assert _lBursts == [ 64, 64, 64, 8 ]
+	sim.Advance(0.1)
+	assert sim.dChips[SIM_ADDRESS].oUart.TakeTx() == _aData
+
+
+
+# ----------------------------------------------------
+#   S A M E   B E H A V I O U R   O N   B O T H   B U S E S
+# ----------------------------------------------------
+
+def test_connect_and_ping(sim, any_uart):
+	assert any_uart.Connect(115200, 'E', 7, 2) == True
+	_oUart = sim.dChips[SIM_ADDRESS].oUart
+	assert ( _oUart.hDLL, _oUart.hLCR ) == ( 8, 0x1E )
+	assert any_uart.Ping() == True
+	assert any_uart.GetBaudrate() == 115200.0
+
+
+def test_data_both_ways(sim, any_uart):
+	assert any_uart.Connect(115200) == True
+	_oUart = sim.dChips[SIM_ADDRESS].oUart
+	assert any_uart.WriteBytes(b"hello") == 5
+	sim.Advance(0.01)
+	assert _oUart.TakeTx() == b"hello"
+	_oUart.InjectRx(b"world")
+	sim.Advance(0.01)
+	assert any_uart.ReadBytes() == b"world"
+
+
+def test_status_snapshot(sim, any_uart):
+	assert any_uart.Connect(115200) == True
+	sim.dChips[SIM_ADDRESS].oUart.InjectRx(b"abc")
+	sim.Advance(0.01)
+	_oSnapshot = any_uart.GetStatusSnapshot()
+	assert ( _oSnapshot.iRxLevel, _oSnapshot.iTxLevel ) == ( 3, 64 )
+
+
+def test_fifo_and_gpio(sim, any_uart):
+	assert any_uart.Connect(115200) == True
+	_oChip = sim.dChips[SIM_ADDRESS]
+	assert any_uart.SetFifo(True, 56, 32) == True
+	assert ( _oChip.oUart.RxTriggerLevel(), _oChip.oUart.TxTriggerLevel() ) == ( 56, 32 )
+	assert any_uart.SetGpioDirection(0x0F, 0x0F) == True
+	assert any_uart.WritePort(0x0F, 0x09) == True
+	_oChip.SetGpioInputs(0x30)
+	assert any_uart.ReadPort() == 0x39
+
+
+def test_resync_after_chip_reset(sim, any_uart):
+	assert any_uart.Connect(115200) == True
+	sim.dChips[SIM_ADDRESS].Reset()
+	assert any_uart.Connect(115200) == True
+	assert sim.dChips[SIM_ADDRESS].oUart.hDLL == 8
@@ -0,0 +1,88 @@
+######################################################
+#
+# Status objects: flags held as the raw byte, dictionary compatibility and GetStatusSnapshot()
+#
+######################################################
+
+import pytest
+
+import SC16IS750
+
+
+
+# ----------------------------------------------------
+#   F L A G   O B J E C T S
+# ----------------------------------------------------
+
+def test_line_status_decodes_on_access():
+	_oStatus = SC16IS750.SC16IS750LineStatus(0x61)
+	assert int(_oStatus) == 0x61
+	assert ( _oStatus.data_in_receiver, _oStatus.thr_empty, _oStatus.thr_tsr_empty ) == ( True, True, True )
+	assert _oStatus.overrun_error == False
+	assert _oStatus["thr-empty"] == True
+	assert "thr-empty" in _oStatus
+
+
+def test_flags_keep_the_dictionary_interface():
+	_oStatus = SC16IS750.SC16IS750LineStatus(0x02)
+	_dExpected = dict( (_sField, ( _sField == "overrun-error" )) for _sField in SC16IS750.SC16IS750_REG_LSR_FIELDS.values() )
+	assert _oStatus.as_dict() == _dExpected
+	assert _oStatus == _dExpected
+	assert _oStatus.keys() == [ SC16IS750.SC16IS750_REG_LSR_FIELDS[_iBit] for _iBit in range(8) ]
+	assert _oStatus.get("no-such-field", "default") == "default"
+	with pytest.raises(KeyError):
+		_oStatus["no-such-field"]
+	assert repr(_oStatus) == "SC16IS750LineStatus(0x02: overrun-error)"
+
+
+def test_modem_status_hides_inputs_without_the_modem_pins():
+	_oStatus = SC16IS750.SC16IS750ModemStatus(0xF0, bModemPins = False)
+	assert _oStatus.cts_high == True
+	assert _oStatus.dsr_high == False
+	assert "dsr-high" not in _oStatus
+	assert len(_oStatus) == 5
+	assert len(SC16IS750.SC16IS750ModemStatus(0xF0)) == 8
+	assert SC16IS750.SC16IS750ModemStatus(0xF0).dsr_high == True
+
+
+
+# ----------------------------------------------------
+#   R E A D S
+# ----------------------------------------------------
+
+def test_status_reads_are_one_transaction(sim, uart):
+	assert uart.Connect(115200) == True
+	_iTransactions = sim.iTransactions
+	assert uart.GetLineStatus().thr_tsr_empty == True
+	assert sim.iTransactions - _iTransactions == 1
+
+# -- IOControl, for the modem pin mode, comes from the shadow cache
+	_iTransactions = sim.iTransactions
+	assert uart.GetModemStatus().cts_high == False
+	assert sim.iTransactions - _iTransactions == 1
+
+
+def test_modem_status_follows_the_modem_pin_mode(uart, chip):
+	assert uart.Connect(115200) == True
+	chip.oUart.SetModemInputs(0x30)
+	assert "dsr-high" not in uart.GetModemStatus()
+	assert uart._SetGPIO47forModemFlowcontrol(True) == True
+	_oStatus = uart.GetModemStatus()
+	assert ( _oStatus.cts_high, _oStatus.dsr_high ) == ( True, True )
+
+
+def test_snapshot_reads_everything_together(sim, uart, chip):
+	assert uart.Connect(115200) == True
+# -- Hold the transmitter so the TX level stays put
+	chip.oUart.hEFCR |= 0x04
+	chip.oUart.InjectRx(b"abcde")
+	sim.Advance(0.01)
+	assert uart.WriteBytes(b"xyz", bBlocking = False) == 3
+	_iTransactions = sim.iTransactions
+	_oSnapshot = uart.GetStatusSnapshot()
+	assert sim.iTransactions - _iTransactions == 4
+	assert ( _oSnapshot.iRxLevel, _oSnapshot.iTxLevel ) == ( 5, SC16IS750.SC16IS750_FIFO_SIZE - 3 )
+	assert _oSnapshot.oLineStatus.data_in_receiver == True
+	assert _oSnapshot.as_dict()["rx-level"] == 5
+	assert _oSnapshot.as_dict()["line-status"]["data-in-receiver"] == True
+
@@ -0,0 +1,63 @@
+######################################################
+#
+# Register I/O tracing: per instance ring buffer, caller names, echo and zero cost when off
+#
+######################################################
+
+import SC16IS750
+
+
+def test_trace_is_off_by_default(uart):
+	assert uart.DumpTrace() == []
+# -- Untraced instances call the class functions directly
+	assert "_ReadRegister" not in uart.__dict__
+
+
+def test_trace_records_accesses_and_callers(uart):
+	assert uart.Connect(115200) == True
+	uart.EnableTrace()
+	assert uart.SetModemRTS(True) == True
+	uart.GetLineStatus()
+	_lEntries = uart.DumpTrace()
+	assert [ ( _tEntry[1], _tEntry[2], _tEntry[4] ) for _tEntry in _lEntries ] == [
+		( "R", SC16IS750.SC16IS750_REG_MCR, "SetModemRTS" ),
+		( "W", SC16IS750.SC16IS750_REG_MCR, "SetModemRTS" ),
+		( "R", SC16IS750.SC16IS750_REG_LSR, "GetLineStatus" ),
+	]
+	assert ( _lEntries[1][3] & 0x02 ) == 0x02
+
+
+def test_trace_records_block_transfers(sim, uart, chip):
+	assert uart.Connect(115200) == True
+	chip.oUart.InjectRx(b"abc")
+	sim.Advance(0.01)
+	uart.EnableTrace()
+	assert uart.WriteBytes(b"xyz") == 3
+	assert uart.ReadBytes() == b"abc"
+	_lBlocks = [ ( _tEntry[1], bytes(_tEntry[3]) ) for _tEntry in uart.DumpTrace() if ( _tEntry[1] in ( "RB", "WB" ) ) ]
+	assert _lBlocks == [ ( "WB", b"xyz" ), ( "RB", b"abc" ) ]
+
+
+def test_ring_keeps_the_newest_entries(uart):
+	uart.EnableTrace(iDepth = 4)
+	for _iIndex in range(10):
+		uart.GetLineStatus()
+	_lEntries = uart.DumpTrace(bClear = True)
+	assert len(_lEntries) == 4
+	assert [ _tEntry[0] for _tEntry in _lEntries ] == sorted(_tEntry[0] for _tEntry in _lEntries)
+	assert uart.DumpTrace() == []
+
+
+def test_disable_keeps_the_ring(uart):
+	uart.EnableTrace()
+	uart.GetLineStatus()
+	uart.DisableTrace()
+	uart.GetLineStatus()
+	assert len(uart.DumpTrace()) == 1
+	assert "_ReadRegister" not in uart.__dict__
+
+
+def test_debug_printing_echoes_the_trace(uart, capsys):
+	uart.fPrintDebug()
+	uart.GetLineStatus()
+	assert "GetLineStatus: R register" in capsys.readouterr().out
@@ -0,0 +1,120 @@
+######################################################
+#
+# Bus locks and register transactions: shared locks, nesting, bank restore and concurrent configuration
+#
+######################################################
+
+import sys
+import threading
+import time
+
+import SC16IS750
+
+from conftest import SIM_ADDRESS
+
+
+def test_devices_on_one_bus_share_the_lock(sim, uart):
+	_oOther = SC16IS750.SC16IS750(SIM_ADDRESS + 1, _oExistingI2CInstance = sim)
+	assert _oOther._oBusLock is uart._oBusLock
+
+
+def test_transaction_keeps_other_devices_off_the_bus(sim, uart):
+	_oOther = SC16IS750.SC16IS750(SIM_ADDRESS + 1, _oExistingI2CInstance = sim)
+	_oDone = threading.Event()
+	def _Read():
+		_oOther.GetLineStatus()
+		_oDone.set()
+	with uart.Transaction():
+		_oThread = threading.Thread(target = _Read)
+		_oThread.start()
+		assert _oDone.wait(0.05) == False
+	_oThread.join(5.0)
+	assert _oDone.is_set() == True
+
+
+def test_transactions_nest(uart):
+	with uart.Transaction():
+		with uart.Transaction():
+			assert uart._iTransactionDepth == 2
+			assert uart.GetLineStatus() != None
+	assert uart._iTransactionDepth == 0
+
+
+def test_outermost_transaction_restores_lcr(uart, chip):
+	assert uart.Connect(115200) == True
+	_hRegLCR = chip.oUart.hLCR
+	with uart.Transaction():
+		with uart.Transaction():
+			assert uart._ExposeEnhancedRegisterSet(bExposeRegisterSet = True) == True
+	# -- Still exposed until the outermost transaction ends
+		assert chip.oUart.hLCR == 0xbf
+	assert chip.oUart.hLCR == _hRegLCR
+	assert uart._hRegLCR == None
+
+
+def test_exception_in_a_transaction_restores_lcr(uart, chip):
+	assert uart.Connect(115200) == True
+	_hRegLCR = chip.oUart.hLCR
+	try:
+		with uart.Transaction():
+			uart._ExposeEnhancedRegisterSet(bExposeRegisterSet = True)
+			raise RuntimeError("abort")
+	except RuntimeError:
+		pass
+	assert chip.oUart.hLCR == _hRegLCR
+
+
+def test_bank_state_is_per_instance(sim, uart):
+	_oOther = SC16IS750.SC16IS750(SIM_ADDRESS + 1, _oExistingI2CInstance = sim)
+	with uart.Transaction():
+		uart._ExposeEnhancedRegisterSet(bExposeRegisterSet = True)
+		assert uart._hRegLCR != None
+		assert _oOther._hRegLCR == None
+
+
+def test_fifo_reads_never_see_the_enhanced_bank(sim, uart, chip):
+	assert uart.Connect(9600) == True
+# -- Note the bank every FIFO access lands in; the model itself does not corrupt data there
+	_lBankExposed = []
+	_fnReadU8 = chip.readU8
+	_fnReadList = chip.readList
+	def _ReadU8(hRegister):
+		if ( ( hRegister >> 3 ) == SC16IS750.SC16IS750_REG_RXLVL ):
+			_lBankExposed.append(( chip.oUart.hLCR & 0x80 ) != 0)
+		return _fnReadU8(hRegister)
+	def _ReadList(hRegister, iLength):
+		_lBankExposed.append(( chip.oUart.hLCR & 0x80 ) != 0)
+		return _fnReadList(hRegister, iLength)
+	chip.readU8 = _ReadU8
+	chip.readList = _ReadList
+
+# -- No XOn/XOff characters in the stream
+	_aData = bytes(bytearray(range(0x20, 0x7f))) * 2
+	chip.oUart.InjectRx(_aData)
+	_oStop = threading.Event()
+	_lResults = []
+	def _Configure():
+		while ( _oStop.is_set() == False ):
+			_lResults.append(uart.SetSoftFlowcontrol(False, False))
+			time.sleep(0)
+
+# -- Switch threads often enough to land inside the bank switches
+	_fSwitchInterval = sys.getswitchinterval()
+	sys.setswitchinterval(1e-6)
+	_oThread = threading.Thread(target = _Configure)
+	_oThread.start()
+	_aReceived = bytearray()
+	try:
+		for _iIndex in range(100000):
+			if ( len(_aReceived) >= len(_aData) ):
+				break
+			_aReceived += uart.ReadBytes()
+			time.sleep(0)
+	finally:
+		_oStop.set()
+		_oThread.join(5.0)
+		sys.setswitchinterval(_fSwitchInterval)
+	assert bytes(_aReceived) == _aData
+	assert ( len(_lResults) > 0 ) and ( all(_lResults) == True )
+	assert ( len(_lBankExposed) > 0 ) and ( any(_lBankExposed) == False )
+	assert chip.oUart.hLCR != 0xbf
@@ -0,0 +1,90 @@
+######################################################
+#
+# Buffered TX writer: coalescing, the queue full policies and draining
+#
+######################################################
+
+import threading
+
+import pytest
+
+import SC16IS750
+
+
+@pytest.fixture
+def writer(rt_uart):
+	yield rt_uart
+	rt_uart.StopTxWriter(fTimeoutSec = 5.0)
+
+
+
+def test_queued_data_reaches_the_line(rt_chip, writer):
+	assert writer.StartTxWriter() == True
+	_aData = bytes(bytearray(range(256))) * 2
+	assert writer.TxWriterWrite(_aData) == len(_aData)
+	assert writer.TxWriterDrain(5.0) == True
+	assert writer.TxWriterPending() == 0
+	assert rt_chip.oUart.TakeTx() == _aData
+
+
+def test_small_writes_coalesce_into_fifo_bursts(rt_chip, writer):
+	_lBursts = []
+	_fnWriteList = rt_chip.writeList
+	def _RecordBurst(hRegister, aData):
+		_lBursts.append(len(aData))
+		return _fnWriteList(hRegister, aData)
+	rt_chip.writeList = _RecordBurst
+
+	assert writer.StartTxWriter() == True
+# -- With the bus held the writer cannot send, so the ten writes pile up in the queue
+	with writer.Transaction():
+		for _iIndex in range(10):
+			assert writer.TxWriterWrite(b"0123456789") == 10
+	assert writer.TxWriterDrain(5.0) == True
+	assert rt_chip.oUart.TakeTx() == b"0123456789" * 10
+# -- The first burst fills the whole FIFO from seven queued writes
+	assert _lBursts[0] == SC16IS750.SC16IS750_FIFO_SIZE
+	assert sum(_lBursts) == 100
+
+
+def test_raise_policy_queues_all_or_nothing(writer):
+	assert writer.StartTxWriter(16, "RAISE") == True
+	with writer.Transaction():
+		assert writer.TxWriterWrite(b"x" * 10) == 10
+		with pytest.raises(SC16IS750.SC16IS750BufferFull):
+			writer.TxWriterWrite(b"y" * 10)
+		assert writer.TxWriterPending() == 10
+
+
+def test_drop_policy_discards_the_oldest(rt_chip, writer):
+	assert writer.StartTxWriter(16, "DROP") == True
+	with writer.Transaction():
+		assert writer.TxWriterWrite(b"abcdefghij") == 10
+		assert writer.TxWriterWrite(b"0123456789") == 10
+	assert writer.TxWriterDropped() == 4
+	assert writer.TxWriterDrain(5.0) == True
+	assert rt_chip.oUart.TakeTx() == b"efghij0123456789"
+
+
+def test_block_policy_honours_the_timeout(writer):
+	assert writer.StartTxWriter(16, "BLOCK") == True
+	with writer.Transaction():
+		assert writer.TxWriterWrite(b"x" * 20, fTimeoutSec = 0.05) == 16
+
+
+def test_block_policy_returns_when_no_writer_runs(writer):
+	assert writer.StartTxWriter(16, "BLOCK") == True
+	assert writer.StopTxWriter(fTimeoutSec = 5.0) == True
+# -- The stopped writer keeps its queue; a write that does not fit must not wait forever for it
+	_lResult = []
+	_oThread = threading.Thread(target = lambda: _lResult.append(writer.TxWriterWrite(b"x" * 20)))
+	_oThread.daemon = True
+	_oThread.start()
+	_oThread.join(5.0)
+	assert _oThread.is_alive() == False
+	assert _lResult == [ 16 ]
+
+
+def test_drain_fails_on_a_bus_error(writer):
+	writer._ReadRegister = lambda hRegisterAddr, bUseCache = True: None
+	assert writer.TxWriterDrain(1.0) == False
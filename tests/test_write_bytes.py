@@ -0,0 +1,69 @@
+######################################################
+#
+# Burst TX writes: WriteBytes fills the transmit FIFO with one TXLVL read and one block write
+#
+######################################################
+
+import SC16IS750
+
+
+# -- Record the length of every block written to the chip
+def _RecordBlocks(chip):
+	_lBlocks = []
+	_fnWriteList = chip.writeList
+	def _WriteList(hRegister, aData):
+		_lBlocks.append(len(aData))
+		return _fnWriteList(hRegister, aData)
+	chip.writeList = _WriteList
+	return _lBlocks
+
+
+
+def test_fifo_fill_is_two_transactions(sim, uart, chip):
+	assert uart.Connect(115200) == True
+	_iTransactions = sim.iTransactions
+	assert uart.WriteBytes(b"x" * SC16IS750.SC16IS750_FIFO_SIZE) == SC16IS750.SC16IS750_FIFO_SIZE
+	assert sim.iTransactions - _iTransactions == 2
+
+
+def test_non_blocking_writes_what_fits(sim, uart, chip):
+	assert uart.Connect(115200) == True
+# -- Hold the transmitter so nothing drains between the two writes
+	chip.oUart.hEFCR |= 0x04
+	assert uart.WriteBytes(b"y" * 100, bBlocking = False) == SC16IS750.SC16IS750_FIFO_SIZE
+	assert uart.WriteBytes(b"z", bBlocking = False) == 0
+	assert len(chip.oUart.oTxFifo) == SC16IS750.SC16IS750_FIFO_SIZE
+
+
+def test_blocking_write_goes_out_in_fifo_blocks(sim, uart, chip):
+	assert uart.Connect(115200) == True
+	_lBlocks = _RecordBlocks(chip)
+	_aData = bytes(bytearray(range(200)))
+	assert uart.WriteBytes(_aData) == len(_aData)
+	assert _lBlocks[0] == SC16IS750.SC16IS750_FIFO_SIZE
+	assert max(_lBlocks) <= SC16IS750.SC16IS750_FIFO_SIZE
+	assert sum(_lBlocks) == len(_aData)
+	sim.Advance(0.1)
+	assert chip.oUart.TakeTx() == _aData
+
+
+def test_blocking_write_honours_the_timeout(uart, chip):
+	assert uart.Connect(115200) == True
+# -- With the transmitter disabled the FIFO never drains
+	chip.oUart.hEFCR |= 0x04
+	assert uart.WriteBytes(b"w" * 100, fTimeoutSec = 0.05) == SC16IS750.SC16IS750_FIFO_SIZE
+
+
+def test_failed_block_write_returns_the_count_sent(uart, chip):
+	assert uart.Connect(115200) == True
+	chip.writeList = lambda hRegister, aData: False
+	assert uart.WriteBytes(b"abc") == 0
+
+
+def test_write_byte_on_a_full_fifo(sim, uart, chip):
+	assert uart.Connect(115200) == True
+	chip.oUart.hEFCR |= 0x04
+	assert uart.WriteByte(0x21, bDieOnNoTxBufferSpace = True) == True
+	assert uart.WriteBytes(b"f" * 100, bBlocking = False) == SC16IS750.SC16IS750_FIFO_SIZE - 1
+	assert uart.WriteByte(0x21, bDieOnNoTxBufferSpace = True) == False
+	assert uart.WriteByte(0x21, fTimeoutSec = 0.02) == False